@@ -0,0 +1,45 @@
+#===============================================================================
+# Benchmark of the permutation crossovers on TSP-scale genomes
+# Times each crossover on random tours of 1k, 5k and 20k cities
+#===============================================================================
+
+from pyevolve import G1DList
+from pyevolve import Crossovers
+
+import random
+from time import time
+
+CROSSOVERS = [Crossovers.G1DListCrossoverOX,
+              Crossovers.G1DListCrossoverEdge,
+              Crossovers.G1DListCrossoverCutCrossfill,
+              Crossovers.G1DListCrossoverPMX,
+              Crossovers.G1DListCrossoverCycle]
+CITIES = [1000, 5000, 20000]
+REPEAT = 5
+
+def random_tour(cities):
+    genome = G1DList.G1DList(cities)
+    tour = range(cities)
+    random.shuffle(tour)
+    genome.setInternalList(tour)
+    return genome
+
+def run_main():
+    random.seed(1024)
+    print "%-30s" % "Crossover",
+    for cities in CITIES:
+        print "%12s" % ("%d cities" % cities),
+    print
+
+    for crossover in CROSSOVERS:
+        print "%-30s" % crossover.__name__,
+        for cities in CITIES:
+            mom, dad = random_tour(cities), random_tour(cities)
+            time_init = time()
+            for i in xrange(REPEAT):
+                sister, brother = crossover(None, mom=mom, dad=dad, count=2)
+            print "%10.2fms" % ((time() - time_init) * 1000.0 / REPEAT),
+        print
+
+if __name__ == "__main__":
+    run_main()
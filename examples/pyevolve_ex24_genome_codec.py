@@ -0,0 +1,90 @@
+#===============================================================================
+# Benchmark of the genome codec used by the migration and the multiprocessing
+# Compares the bytes per individual and the encode/decode time of the codec
+# with the pickle (protocol 2) and zlib of the whole individual
+#===============================================================================
+
+from pyevolve import G1DList, G1DBinaryString, GTree
+from pyevolve import Network
+from pyevolve import Consts
+
+import random
+import cPickle
+import zlib
+from time import time
+
+REPEAT = 2000
+FUNCTIONS = {"add": 2, "sub": 2, "mul": 2, "neg": 1}
+TERMINALS = ["x", "y", "1", "2"]
+
+def eval_func(chromosome):
+    return 0.0
+
+def list_genome(size, gene):
+    genome = G1DList.G1DList(size)
+    genome.genomeList = [gene() for i in xrange(size)]
+    genome.evaluator.set(eval_func)
+    return genome
+
+def binary_genome(size):
+    genome = G1DBinaryString.G1DBinaryString(size)
+    genome.genomeList = [random.randint(0, 1) for i in xrange(size)]
+    genome.evaluator.set(eval_func)
+    return genome
+
+def tree_genome(depth):
+    def build(level, parent):
+        if level == depth or (level > 1 and random.random() < 0.2):
+            return GTree.GTreeNodeGP(random.choice(TERMINALS), Consts.nodeType["TERMINAL"], parent)
+        name = random.choice(FUNCTIONS.keys())
+        node = GTree.GTreeNodeGP(name, Consts.nodeType["NONTERMINAL"], parent)
+        for i in xrange(FUNCTIONS[name]):
+            node.addChild(build(level + 1, node))
+        return node
+    genome = GTree.GTreeGP(build(0, None))
+    genome.processNodes()
+    genome.evaluator.set(eval_func)
+    return genome
+
+def pickle_encode(genome, level):
+    pickled = cPickle.dumps(genome, cPickle.HIGHEST_PROTOCOL)
+    return zlib.compress(pickled, level) if level >= 0 else pickled
+
+def pickle_decode(data, template, level):
+    return cPickle.loads(zlib.decompress(data) if level >= 0 else data)
+
+def codec_encode(genome, level):
+    return Network.encodeGenome(genome, level)
+
+def codec_decode(data, template, level):
+    return Network.decodeGenome(data, template)
+
+def benchmark(genome, encode, decode, level):
+    time_init = time()
+    for i in xrange(REPEAT):
+        data = encode(genome, level)
+    encode_time = (time() - time_init) * 1e6 / REPEAT
+    time_init = time()
+    for i in xrange(REPEAT):
+        decode(data, genome, level)
+    decode_time = (time() - time_init) * 1e6 / REPEAT
+    return len(data), encode_time, decode_time
+
+def run_main():
+    random.seed(1024)
+    genomes = [("G1DList 100 ints", list_genome(100, lambda: random.randint(0, 1000))),
+               ("G1DList 100 reals", list_genome(100, random.random)),
+               ("G1DBinaryString 1000", binary_genome(1000)),
+               ("GTreeGP depth 8", tree_genome(8))]
+    methods = [("pickle", pickle_encode, pickle_decode), ("codec", codec_encode, codec_decode)]
+
+    print "%-22s %-8s %6s %10s %12s %12s" % ("Genome", "Method", "Level", "Bytes", "Encode (us)", "Decode (us)")
+    for name, genome in genomes:
+        for method, encode, decode in methods:
+            for level in (-1, 1, 9):
+                size, encode_time, decode_time = benchmark(genome, encode, decode, level)
+                print "%-22s %-8s %6d %10d %12.1f %12.1f" % (name, method, level, size, encode_time, decode_time)
+        print
+
+if __name__ == "__main__":
+    run_main()
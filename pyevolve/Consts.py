@@ -36,6 +36,28 @@ General constants
       >>> minmax = Consts.minimaxType["minimize"]
       >>> minmax = Consts.minimaxType["maximize"]
 
+.. attribute:: duplicateOffspringType
+
+   The handling of duplicated offspring in the evolution: keep, reject or penalize.
+   The rejected offspring are created again and the penalized ones receive the worst
+   raw score of the parents population, without being evaluated.
+
+   Example:
+      >>> dup_type = Consts.duplicateOffspringType["reject"]
+
+   .. versionadded:: 0.6
+
+.. attribute:: boundHandlingType
+
+   The handling of the values out of the bounds on the bounded real-coded
+   operators (like :func:`Crossovers.G1DListCrossoverRealSBXBounded`): clip,
+   reflect or resample, see :func:`Util.boundValues`.
+
+   Example:
+      >>> genome.setParams(bound_handling=Consts.boundHandlingType["reflect"])
+
+   .. versionadded:: 0.6
+
 .. attribute:: CDefESCKey
 
    The ESC key ASCII code. Used to start Interactive Mode.
@@ -48,6 +70,12 @@ General constants
 
    Maximum range. This constant is used as integer and real max/min.
 
+.. attribute:: CDefAlleleTableMinDraws
+
+   The minimum number of alleles drawn at once to use the vectorized draw of the
+   compiled alleles tables (:class:`GAllele.GAllelesTable`), the smaller draws are
+   done one at a time.
+
 .. attribute:: CDefBroadcastAddress
 
    The broadcast address for UDP, 255.255.255.255
@@ -102,6 +130,11 @@ Scaling scheme constants (:mod:`Scaling`)
    If you don't set the start temperature parameter, this will be the default initial
    temperature for the Boltzmann scaling scheme.
 
+.. attribute:: CDefScaleParsimonyCoefficient
+
+   The default coefficient of the size penalty of the (:func:`Scaling.ParsimonyPressureScaling`)
+   scaling scheme.
+
 Population constants (:class:`GPopulation.GPopulation`)
 ----------------------------------------------------------------------------
 
@@ -117,6 +150,11 @@ Population constants (:class:`GPopulation.GPopulation`)
 
    Default scaling scheme.
 
+.. attribute:: CDefPopInitMaxAttempt
+
+   Default max number of attempts to initialize an individual which is not a
+   duplicate, when the *full_diversity* genome parameter is enabled.
+
 
 1D Binary String Defaults (:class:`G1DBinaryString.G1DBinaryString`)
 ----------------------------------------------------------------------------
@@ -177,6 +215,23 @@ Population constants (:class:`GPopulation.GPopulation`)
 
    Default *sigma* value of the 1D List Gaussian Real Mutator (:func:`Mutators.G1DListMutatorRealGaussian`), the *sigma* represents the mean of the distribution.
 
+.. attribute:: CDefG1DListPolyEtam
+
+   Default distribution index of the 1D List Polynomial Mutator (:func:`Mutators.G1DListMutatorRealPolynomial`),
+   the larger values create mutants closer to the parents.
+
+.. attribute:: CDefBoundHandling
+
+   Default bound handling mode of the bounded real-coded operators, see :attr:`boundHandlingType`.
+
+.. attribute:: CDefBoundResampleMaxAttempt
+
+   Default max number of draws of the values out of the bounds on the *resample* bound handling mode.
+
+.. attribute:: CDefLocalSearchNeighbors
+
+   Default number of nearest neighbors of each city used by the 2-opt and Or-opt local searches (:mod:`LocalSearch`).
+
 
 Tree chromosome constants (:class:`GTree.GTree`)
 ----------------------------------------------------------------------------
@@ -193,6 +248,19 @@ Tree chromosome constants (:class:`GTree.GTree`)
 
    Default crossover of the tree chromosome.
 
+.. attribute:: CDefGTreeGPInitMinDepth
+
+   Default min depth of the ramped half-and-half initialization of the GP trees
+   (:func:`Initializators.GTreeGPInitializatorBatch`).
+
+.. attribute:: CDefGPCacheMaxEntries
+
+   Default maximum number of subtree outputs kept by the GP subtree cache (:class:`GTree.GTreeGPSubtreeCache`).
+
+.. attribute:: CDefGPCacheMaxBytes
+
+   Default maximum (estimated) memory in bytes used by the GP subtree cache (:class:`GTree.GTreeGPSubtreeCache`).
+
 
 2D List chromosome constants (:class:`G2DList.G2DList`)
 ----------------------------------------------------------------------------
@@ -230,6 +298,38 @@ Tree chromosome constants (:class:`GTree.GTree`)
    Default uniform probability for the 2D List Uniform Crossover method (:func:`Crossovers.G2DListCrossoverUniform`).
 
 
+2D Array chromosome constants (:class:`G2DArray.G2DArray`)
+----------------------------------------------------------------------------
+
+.. attribute:: CDefG2DArrayMutator
+
+   Default mutator for the 2D Array chromosome.
+
+.. attribute:: CDefG2DArrayCrossover
+
+   Default crossover method for the 2D Array chromosome.
+
+.. attribute:: CDefG2DArrayInit
+
+   Default initializator for the 2D Array chromosome.
+
+.. attribute:: CDefG2DArrayCrossUniformProb
+
+   Default uniform probability for the 2D Array Uniform Crossover method (:func:`Crossovers.G2DArrayCrossoverUniform`).
+
+.. attribute:: CDefG2DBinaryArrayMutator
+
+   Default mutator for the 2D Binary Array chromosome (:class:`G2DArray.G2DBinaryArray`).
+
+.. attribute:: CDefG2DBinaryArrayCrossover
+
+   Default crossover method for the 2D Binary Array chromosome (:class:`G2DArray.G2DBinaryArray`).
+
+.. attribute:: CDefG2DBinaryArrayInit
+
+   Default initializator for the 2D Binary Array chromosome (:class:`G2DArray.G2DBinaryArray`).
+
+
 GA Engine constants (:class:`GSimpleGA.GSimpleGA`)
 ----------------------------------------------------------------------------
 
@@ -253,6 +353,11 @@ GA Engine constants (:class:`GSimpleGA.GSimpleGA`)
 
    Default selector method.
 
+.. attribute:: CDefGADuplicateMaxAttempt
+
+   Default max number of attempts to create a non duplicated pair of offspring,
+   when the duplicated offspring are rejected (see :meth:`GSimpleGA.GSimpleGA.setDuplicateOffspring`).
+
 DB Adapters constants (:mod:`DBAdapters`)
 ----------------------------------------------------------------------------
 Constants for the DB Adapters
@@ -313,6 +418,27 @@ MySQL DB Adapter Constants (:class:`DBAdapters.DBMySQLAdapter`)
 
    Default MySQL connection TCP port.
 
+.. attribute:: CDefMySQLDBTablePopBins
+
+   Default population bins table name, used with the *pop_bins* parameter.
+
+.. attribute:: CDefMySQLBatchSize
+
+   Default number of dumps written by each multi-row insert.
+
+.. attribute:: CDefMySQLInsertRows
+
+   The max number of rows of each multi-row insert statement.
+
+.. attribute:: CDefDBPoolSize
+
+   Default max number of connections of the :class:`DBAdapters.DBConnectionPool`.
+
+.. attribute:: CDefDBPoolTimeout
+
+   Default time, in seconds, the DB Adapters wait for a connection of the
+   :class:`DBAdapters.DBConnectionPool`.
+
 
 URL Post DB Adapter Constants (:class:`DBAdapters.DBURLPost`)
 ^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^
@@ -321,6 +447,18 @@ URL Post DB Adapter Constants (:class:`DBAdapters.DBURLPost`)
 
    Default generational frequency for dump statistics.
 
+.. attribute:: CDefURLPostBatchSize
+
+   Default number of statistics dumps sent on each request.
+
+.. attribute:: CDefURLPostRetrySize
+
+   Default max number of statistics dumps kept when the requests fail.
+
+.. attribute:: CDefURLPostTimeout
+
+   Default timeout of the HTTP connection, in seconds.
+
 
 CSV File DB Adapter Constants (:class:`DBAdapters.DBFileCSV`)
 ^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^
@@ -334,6 +472,50 @@ CSV File DB Adapter Constants (:class:`DBAdapters.DBFileCSV`)
    Default generational frequency for dump statistics.
 
 
+Binary Log DB Adapter Constants (:class:`DBAdapters.DBBinaryLog`)
+^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^
+
+.. attribute:: CDefBinaryLogFileName
+
+   The default binary log filename to dump statistics.
+
+.. attribute:: CDefBinaryLogStatsGenFreq
+
+   Default generational frequency for dump statistics.
+
+.. attribute:: CDefBinaryLogMagic
+
+   The first line of the binary log files.
+
+.. attribute:: CDefBinaryLogVersion
+
+   The version of the binary log layout.
+
+
+Population Snapshot DB Adapter Constants (:class:`DBAdapters.DBPopulationSnapshot`)
+^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^
+
+.. attribute:: CDefPopSnapshotFileName
+
+   The default filename of the population snapshots.
+
+.. attribute:: CDefPopSnapshotGenFreq
+
+   Default generational frequency for dump the population.
+
+.. attribute:: CDefPopSnapshotCompression
+
+   Default zlib compression level of the columns.
+
+.. attribute:: CDefPopSnapshotMagic
+
+   The first line of the population snapshot files.
+
+.. attribute:: CDefPopSnapshotVersion
+
+   The version of the population snapshot layout.
+
+
 XMP RPC DB Adapter Constants (:class:`DBAdapters.DBXMLRPC`)
 ^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^
 
@@ -341,6 +523,26 @@ XMP RPC DB Adapter Constants (:class:`DBAdapters.DBXMLRPC`)
 
    Default generational frequency for dump statistics.
 
+.. attribute:: CDefXMLRPCBatchSize
+
+   Default number of statistics dumps sent on each multicall.
+
+.. attribute:: CDefXMLRPCRetrySize
+
+   Default max number of statistics dumps kept when the calls fail.
+
+
+Async DB Adapter Constants (:class:`DBAdapters.DBAsyncAdapter`)
+^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^
+
+.. attribute:: CDefDBAsyncQueueSize
+
+   Default max number of statistics dumps waiting for the writer thread.
+
+.. attribute:: CDefDBAsyncBatchSize
+
+   Default max number of statistics dumps written at once by the writer thread.
+
 Migration Constants (:mod:`Migration`)
 ----------------------------------------------------------------------------
 .. attribute:: CDefGenMigrationRate
@@ -364,6 +566,28 @@ Migration Constants (:mod:`Migration`)
 
    The default number of individuals to be replaced at the migration stage
 
+.. attribute:: CDefTCPPoolSize
+
+   The default max number of frames on the received pool of the
+   :class:`Network.TCPThreadTransport`
+
+.. attribute:: CDefTCPQueueSize
+
+   The default max number of frames waiting to be sent to each target
+   of the :class:`Network.TCPThreadTransport`
+
+.. attribute:: CDefTCPMaxFrameSize
+
+   The default max size of the frames of the :class:`Network.TCPThreadTransport`
+
+.. attribute:: CDefTCPReconnectDelay
+
+   The seconds to wait before opening again a failed connection
+
+.. attribute:: CDefTCPChunkSize
+
+   The max number of bytes of each socket read or write
+
 
 """
 import Scaling
@@ -395,6 +619,24 @@ minimaxType = {"minimize": 0,
                "maximize": 1
                }
 
+# Duplicated offspring handling
+# - keep: the duplicates are kept and evaluated
+# - reject: the duplicates are created again
+# - penalize: the duplicates receive the worst raw score, without evaluation
+duplicateOffspringType = {"keep": 0,
+                          "reject": 1,
+                          "penalize": 2
+                          }
+
+# Bound handling of the real-coded operators
+# - clip: the values are set to the nearest bound
+# - reflect: the values are reflected back by the bounds
+# - resample: the values are drawn again, and clipped after the max attempts
+boundHandlingType = {"clip": 0,
+                     "reflect": 1,
+                     "resample": 2
+                     }
+
 CDefESCKey = 27
 
 CDefImportList = {"visual.graph": "you must install VPython !",
@@ -403,7 +645,8 @@ CDefImportList = {"visual.graph": "you must install VPython !",
                   "sqlite3": "sqlite3 module not found, are you using Jython or IronPython ?",
                   "xmlrpclib": "xmlrpclib module not found !",
                   "MySQLdb": "MySQLdb module not found, you must install mysql-python !",
-                  "pydot": "Pydot module not found, you must install Pydot to plot graphs !"}
+                  "pydot": "Pydot module not found, you must install Pydot to plot graphs !",
+                  "numpy": "numpy module not found, you must install NumPy !"}
 
 ####################
 # Defaults section #
@@ -420,11 +663,13 @@ CDefScaleBoltzMinTemp = 1.0
 CDefScaleBoltzFactor = 0.05
 # 40 temp. = 500 generations
 CDefScaleBoltzStart = 40.0
+CDefScaleParsimonyCoefficient = 0.001
 
 # - Population Defaults
 CDefPopSortType = sortType["scaled"]
 CDefPopMinimax = minimaxType["maximize"]
 CDefPopScale = Scaling.LinearScaling
+CDefPopInitMaxAttempt = 50
 
 # - GA Engine defaults
 CDefGAGenerations = 100
@@ -433,11 +678,15 @@ CDefGACrossoverRate = 0.9
 CDefGAPopulationSize = 80
 CDefGASelector = Selectors.GRankSelector
 CDefGAElitismReplacement = 1
+CDefGADuplicateMaxAttempt = 10
 
 # - This is general used by integer/real ranges defaults
 CDefRangeMin = 0
 CDefRangeMax = 100
 
+# - Alleles defaults
+CDefAlleleTableMinDraws = 32
+
 # - G1DBinaryString defaults
 CDefG1DBinaryStringMutator = Mutators.G1DBinaryStringMutatorFlip
 CDefG1DBinaryStringCrossover = Crossovers.G1DBinaryStringXSinglePoint
@@ -459,6 +708,9 @@ CDefGTreeCrossover = Crossovers.GTreeCrossoverSinglePointStrict
 CDefGTreeGPInit = Initializators.GTreeGPInitializator
 CDefGGTreeGPMutator = Mutators.GTreeGPMutatorSubtree
 CDefGTreeGPCrossover = Crossovers.GTreeGPCrossoverSinglePoint
+CDefGTreeGPInitMinDepth = 2
+CDefGPCacheMaxEntries = 50000
+CDefGPCacheMaxBytes = 256 * 1024 * 1024
 
 # - G1DList defaults
 CDefG1DListMutIntMU = 2
@@ -479,6 +731,16 @@ CDefG1DListCrossUniformProb = 0.5
 CDefG1DListSBXEtac = 10
 CDefG1DListSBXEPS = 1.0e-14
 
+# Polynomial Mutation defaults
+CDefG1DListPolyEtam = 20
+
+# Bound handling of the bounded real-coded operators
+CDefBoundHandling = boundHandlingType["clip"]
+CDefBoundResampleMaxAttempt = 10
+
+# Local search defaults
+CDefLocalSearchNeighbors = 10
+
 # - G2DList defaults
 CDefG2DListMutIntMU = 2
 CDefG2DListMutIntSIGMA = 10
@@ -491,6 +753,16 @@ CDefG2DListCrossover = Crossovers.G2DListCrossoverUniform
 CDefG2DListInit = Initializators.G2DListInitializatorInteger
 CDefG2DListCrossUniformProb = 0.5
 
+# - G2DArray defaults
+CDefG2DArrayMutator = Mutators.G2DArrayMutatorSwap
+CDefG2DArrayCrossover = Crossovers.G2DArrayCrossoverUniform
+CDefG2DArrayInit = Initializators.G2DArrayInitializatorInteger
+CDefG2DArrayCrossUniformProb = 0.5
+
+CDefG2DBinaryArrayMutator = Mutators.G2DBinaryArrayMutatorFlip
+CDefG2DBinaryArrayCrossover = Crossovers.G2DArrayCrossoverUniform
+CDefG2DBinaryArrayInit = Initializators.G2DBinaryArrayInitializator
+
 # Gaussian Gradient
 CDefGaussianGradientMU = 1.0
 CDefGaussianGradientSIGMA = (1.0 / 3.0)  # approx. +/- 3-sigma is +/- 10%
@@ -510,16 +782,43 @@ CDefMySQLDBHost = "localhost"
 CDefMySQLDBPort = 3306
 CDefMySQLStatsGenFreq = 1
 CDefMySQLStatsCommitFreq = 300
+CDefMySQLDBTablePopBins = "population_bins"
+CDefMySQLBatchSize = 1
+CDefMySQLInsertRows = 1000
+CDefDBPoolSize = 5
+CDefDBPoolTimeout = 60
 
 # - DB Adapters URL Post defaults
 CDefURLPostStatsGenFreq = 100
+CDefURLPostBatchSize = 1
+CDefURLPostRetrySize = 1000
+CDefURLPostTimeout = 30
 
 # - DB Adapters CSV File defaults
 CDefCSVFileName = "pyevolve.csv"
 CDefCSVFileStatsGenFreq = 1
 
+# - DB Adapters Binary Log defaults
+CDefBinaryLogFileName = "pyevolve.blog"
+CDefBinaryLogStatsGenFreq = 1
+CDefBinaryLogMagic = "PYEVOLVE-BINARY-LOG"
+CDefBinaryLogVersion = 1
+
+# - DB Adapters Population Snapshot defaults
+CDefPopSnapshotFileName = "pyevolve.psnap"
+CDefPopSnapshotGenFreq = 10
+CDefPopSnapshotCompression = 1
+CDefPopSnapshotMagic = "PYEVOLVE-POPULATION-SNAPSHOT"
+CDefPopSnapshotVersion = 1
+
 # - DB Adapter XML RPC
 CDefXMLRPCStatsGenFreq = 20
+CDefXMLRPCBatchSize = 1
+CDefXMLRPCRetrySize = 1000
+
+# - DB Adapter Async
+CDefDBAsyncQueueSize = 100
+CDefDBAsyncBatchSize = 20
 
 # Util Consts
 CDefBroadcastAddress = "255.255.255.255"
@@ -534,3 +833,9 @@ CDefGenMigrationReplacement = 3
 
 CDefNetworkIndividual = 1
 CDefNetworkInfo = 2
+
+CDefTCPPoolSize = 100
+CDefTCPQueueSize = 10
+CDefTCPMaxFrameSize = 64 * 1024 * 1024
+CDefTCPReconnectDelay = 1.0
+CDefTCPChunkSize = 65536
@@ -13,6 +13,136 @@ import math
 import Util
 import Consts
 
+try:
+   import numpy
+except ImportError:
+   numpy = None
+
+def _crossoverPairs(crossover, population, moms, dads, offspring, pcross):
+   """ Crosses the pairs one at a time with the per pair *crossover*, used
+   by the batched crossovers when the genes can't be handled with numpy """
+   for i in xrange(len(moms)):
+      gMom = population[moms[i]]
+      gDad = population[dads[i]]
+      if Util.randomFlipCoin(pcross):
+         (sister, brother) = crossover(None, mom=gMom, dad=gDad, count=2)
+      else:
+         sister = gMom.clone()
+         brother = gDad.clone()
+      offspring[2 * i] = sister
+      offspring[2 * i + 1] = brother
+   return offspring
+
+def _crossoverBatch(crossover, make_mask, attr, population, moms, dads, offspring, **args):
+   """ The batched crossover, crosses the pairs of individuals of *population*
+   given by the *moms* and *dads* indexes and writes the children of the pair
+   *i* into the genomes *2i* and *2i + 1* of the *offspring* buffer. The genes
+   of the buffer genomes are replaced, so no genome is cloned.
+
+   Each pair is crossed with the *pcross* probability (default is 1.0), the
+   children of the other pairs are copies of the parents. The genes of the
+   parents are stacked on numeric arrays and the genes swapped between them
+   are drawn at once for all the pairs by *make_mask*. When numpy isn't
+   available or the genes aren't numbers of the same shape, the per pair
+   *crossover* is used and its children are put on the buffer.
+
+   :param crossover: the per pair crossover function
+   :param make_mask: called as make_mask(rng, shape), returns the boolean mask of the
+                     swapped genes, where shape is (pairs,) + the genes shape
+   :param attr: the genome attribute with the genes
+   :rtype: the offspring buffer
+   """
+   pcross = args.get("pcross", 1.0)
+   rng = Util.numpyRandomState()
+   if rng is None or len(moms) == 0:
+      return _crossoverPairs(crossover, population, moms, dads, offspring, pcross)
+
+   mom_genes = numpy.array([getattr(population[i], attr) for i in moms])
+   dad_genes = numpy.array([getattr(population[i], attr) for i in dads])
+   if mom_genes.dtype.kind not in "biuf" or mom_genes.dtype != dad_genes.dtype or \
+      mom_genes.shape != dad_genes.shape:
+      return _crossoverPairs(crossover, population, moms, dads, offspring, pcross)
+
+   mask = make_mask(rng, mom_genes.shape)
+   if pcross < 1.0:
+      mask[rng.random_sample(len(moms)) > pcross] = False
+
+   sisters = numpy.where(mask, dad_genes, mom_genes).tolist()
+   brothers = numpy.where(mask, mom_genes, dad_genes).tolist()
+   for i in xrange(len(moms)):
+      sister = offspring[2 * i]
+      brother = offspring[2 * i + 1]
+      setattr(sister, attr, sisters[i])
+      setattr(brother, attr, brothers[i])
+      sister.resetStats()
+      brother.resetStats()
+   return offspring
+
+def _uniformMask(prob):
+   """ Returns the mask builder of the uniform crossovers, each gene is
+   swapped with the *prob* probability """
+   return lambda rng, shape: rng.random_sample(shape) <= prob
+
+def _cutList(first, second, cuts):
+   """ Returns the list made by the segments of *first* and *second* between
+   the *cuts*, alternating the parents and starting with *first* """
+   parents = (first, second)
+   genes = []
+   start = 0
+   for i, cut in enumerate(cuts):
+      genes.extend(parents[i % 2][start:cut])
+      start = cut
+   genes.extend(parents[len(cuts) % 2][start:])
+   return genes
+
+def _cutRows(first, second, cuts):
+   """ The :func:`_cutList` of the rows of the 2D genes, copying the rows """
+   return [row[:] for row in _cutList(first, second, cuts)]
+
+def _cutColumns(first, second, cuts):
+   """ The :func:`_cutList` applied to each row of the 2D genes """
+   return [_cutList(first_row, second_row, cuts) for first_row, second_row in zip(first, second)]
+
+def _crossoverCutBatch(crossover, cut, points, attr, population, moms, dads, offspring, **args):
+   """ The batched version of the one (*points* = 1) or two point crossovers,
+   writes the children like the :func:`_crossoverBatch`. The cut points of all
+   the pairs are drawn at once and the children are made by the slices of the
+   parents genes given by *cut* (:func:`_cutList`, :func:`_cutRows` or
+   :func:`_cutColumns`), so the genes can be of any type.
+
+   :param crossover: the per pair crossover function, used when numpy isn't available
+   :param cut: the function which makes the genes of a child from the genes of
+               the parents and the list of cut points
+   :param points: the number of cut points
+   :param attr: the genome attribute with the genes
+   :rtype: the offspring buffer
+   """
+   pcross = args.get("pcross", 1.0)
+   rng = Util.numpyRandomState()
+   if rng is None or len(moms) == 0:
+      return _crossoverPairs(crossover, population, moms, dads, offspring, pcross)
+
+   genes = getattr(population[moms[0]], attr)
+   size = len(genes[0]) if cut is _cutColumns else len(genes)
+   if size <= 1:
+      Util.raiseException("The genomes have one element to cut, can't use the Point Crossover methods !", TypeError)
+
+   cuts = rng.randint(1, size, (len(moms), points))
+   cuts.sort(axis=1)
+   if pcross < 1.0:
+      cuts[rng.random_sample(len(moms)) > pcross] = size
+
+   for i, pair_cuts in enumerate(cuts.tolist()):
+      mom_genes = getattr(population[moms[i]], attr)
+      dad_genes = getattr(population[dads[i]], attr)
+      sister = offspring[2 * i]
+      brother = offspring[2 * i + 1]
+      setattr(sister, attr, cut(mom_genes, dad_genes, pair_cuts))
+      setattr(brother, attr, cut(dad_genes, mom_genes, pair_cuts))
+      sister.resetStats()
+      brother.resetStats()
+   return offspring
+
 #############################
 ##     1D Binary String    ##
 #############################
@@ -45,6 +175,19 @@ def G1DBinaryStringXSinglePoint(genome, **args):
 
    return (sister, brother)
 
+def G1DBinaryStringXSinglePointBatch(population, moms, dads, offspring, **args):
+   """ The batched version of the :func:`G1DBinaryStringXSinglePoint`, crosses the
+   individuals of *population* given by the *moms* and *dads* indexes,
+   writing the children into the *offspring* buffer
+
+   .. versionadded:: 0.6
+      The *G1DBinaryStringXSinglePointBatch* function
+   """
+   return _crossoverCutBatch(G1DBinaryStringXSinglePoint, _cutList, 1, "genomeList",
+                             population, moms, dads, offspring, **args)
+
+G1DBinaryStringXSinglePoint.batch = G1DBinaryStringXSinglePointBatch
+
 def G1DBinaryStringXTwoPoint(genome, **args):
    """ The 1D Binary String crossover, Two Point
 
@@ -76,6 +219,19 @@ def G1DBinaryStringXTwoPoint(genome, **args):
 
    return (sister, brother)
 
+def G1DBinaryStringXTwoPointBatch(population, moms, dads, offspring, **args):
+   """ The batched version of the :func:`G1DBinaryStringXTwoPoint`, crosses the
+   individuals of *population* given by the *moms* and *dads* indexes,
+   writing the children into the *offspring* buffer
+
+   .. versionadded:: 0.6
+      The *G1DBinaryStringXTwoPointBatch* function
+   """
+   return _crossoverCutBatch(G1DBinaryStringXTwoPoint, _cutList, 2, "genomeList",
+                             population, moms, dads, offspring, **args)
+
+G1DBinaryStringXTwoPoint.batch = G1DBinaryStringXTwoPointBatch
+
 def G1DBinaryStringXUniform(genome, **args):
    """ The G1DList Uniform Crossover """
    sister = None
@@ -96,6 +252,19 @@ def G1DBinaryStringXUniform(genome, **args):
 
    return (sister, brother)
 
+def G1DBinaryStringXUniformBatch(population, moms, dads, offspring, **args):
+   """ The batched version of the :func:`G1DBinaryStringXUniform`, crosses the
+   individuals of *population* given by the *moms* and *dads* indexes,
+   writing the children into the *offspring* buffer
+
+   .. versionadded:: 0.6
+      The *G1DBinaryStringXUniformBatch* function
+   """
+   return _crossoverBatch(G1DBinaryStringXUniform, _uniformMask(Consts.CDefG1DBinaryStringUniformProb), "genomeList",
+                          population, moms, dads, offspring, **args)
+
+G1DBinaryStringXUniform.batch = G1DBinaryStringXUniformBatch
+
 ####################
 ##     1D List    ##
 ####################
@@ -128,6 +297,19 @@ def G1DListCrossoverSinglePoint(genome, **args):
 
    return (sister, brother)
 
+def G1DListCrossoverSinglePointBatch(population, moms, dads, offspring, **args):
+   """ The batched version of the :func:`G1DListCrossoverSinglePoint`, crosses the
+   individuals of *population* given by the *moms* and *dads* indexes,
+   writing the children into the *offspring* buffer
+
+   .. versionadded:: 0.6
+      The *G1DListCrossoverSinglePointBatch* function
+   """
+   return _crossoverCutBatch(G1DListCrossoverSinglePoint, _cutList, 1, "genomeList",
+                             population, moms, dads, offspring, **args)
+
+G1DListCrossoverSinglePoint.batch = G1DListCrossoverSinglePointBatch
+
 def G1DListCrossoverTwoPoint(genome, **args):
    """ The G1DList crossover, Two Point
 
@@ -159,6 +341,19 @@ def G1DListCrossoverTwoPoint(genome, **args):
 
    return (sister, brother)
 
+def G1DListCrossoverTwoPointBatch(population, moms, dads, offspring, **args):
+   """ The batched version of the :func:`G1DListCrossoverTwoPoint`, crosses the
+   individuals of *population* given by the *moms* and *dads* indexes,
+   writing the children into the *offspring* buffer
+
+   .. versionadded:: 0.6
+      The *G1DListCrossoverTwoPointBatch* function
+   """
+   return _crossoverCutBatch(G1DListCrossoverTwoPoint, _cutList, 2, "genomeList",
+                             population, moms, dads, offspring, **args)
+
+G1DListCrossoverTwoPoint.batch = G1DListCrossoverTwoPointBatch
+
 def G1DListCrossoverUniform(genome, **args):
    """ The G1DList Uniform Crossover
 
@@ -183,6 +378,19 @@ def G1DListCrossoverUniform(genome, **args):
 
    return (sister, brother)
 
+def G1DListCrossoverUniformBatch(population, moms, dads, offspring, **args):
+   """ The batched version of the :func:`G1DListCrossoverUniform`, crosses the
+   individuals of *population* given by the *moms* and *dads* indexes,
+   writing the children into the *offspring* buffer
+
+   .. versionadded:: 0.6
+      The *G1DListCrossoverUniformBatch* function
+   """
+   return _crossoverBatch(G1DListCrossoverUniform, _uniformMask(Consts.CDefG1DListCrossUniformProb), "genomeList",
+                          population, moms, dads, offspring, **args)
+
+G1DListCrossoverUniform.batch = G1DListCrossoverUniformBatch
+
 def G1DListCrossoverOX(genome, **args):
    """ The OX Crossover for G1DList  (order crossover) """
    sister = None
@@ -204,17 +412,18 @@ def G1DListCrossoverOX(genome, **args):
    if args["count"] >= 1:
       sister = gMom.clone()
       sister.resetStats()
-      P1 = [c for c in gMom[c2:] + gMom[:c2] if c not in gDad[c1:c2]]
+      dad_part = set(gDad[c1:c2])
+      P1 = [c for c in gMom[c2:] + gMom[:c2] if c not in dad_part]
       sister.genomeList = P1[listSize - c2:] + gDad[c1:c2] + P1[:listSize - c2]
+      assert listSize == len(sister)
 
    if args["count"] == 2:
       brother = gDad.clone()
       brother.resetStats()
-      P2 = [c for c in gDad[c2:] + gDad[:c2] if c not in gMom[c1:c2]]
+      mom_part = set(gMom[c1:c2])
+      P2 = [c for c in gDad[c2:] + gDad[:c2] if c not in mom_part]
       brother.genomeList = P2[listSize - c2:] + gMom[c1:c2] + P2[:listSize - c2]
-
-   assert listSize == len(sister)
-   assert listSize == len(brother)
+      assert listSize == len(brother)
 
    return (sister, brother)
 
@@ -223,24 +432,45 @@ def G1DListCrossoverEdge(genome, **args):
 
    See more information in the `Edge Recombination Operator <http://en.wikipedia.org/wiki/Edge_recombination_operator>`_
    Wikipedia entry.
+
+   .. versionchanged:: 0.6
+      The neighbours of the cities are found by position indexes and the not
+      visited cities are kept on an indexed list, so the crossover is O(n).
    """
    gMom, sisterl = args["mom"], []
    gDad, brotherl = args["dad"], []
-
-   mom_edges, dad_edges, merge_edges = Util.G1DListGetEdgesComposite(gMom, gDad)
-
-   for c, u in (sisterl, set(gMom)), (brotherl, set(gDad)):
+   mom_list = gMom.genomeList
+   dad_list = gDad.genomeList
+   mom_index = dict((v, i) for i, v in enumerate(mom_list))
+   dad_index = dict((v, i) for i, v in enumerate(dad_list))
+
+   def neighbours(lst, index, v):
+      if v not in index:
+         return ()
+      i = index[v]
+      return (lst[(i + 1) % len(lst)], lst[i - 1])
+
+   for c, parent in (sisterl, mom_list), (brotherl, dad_list):
+      # the not visited cities and their positions in this list
+      left = list(parent)
+      left_index = dict((v, i) for i, v in enumerate(left))
       curr = None
-      for i in xrange(len(gMom)):
-         curr = rand_choice(tuple(u)) if not curr else curr
+      for i in xrange(len(parent)):
+         curr = rand_choice(left) if curr is None else curr
          c.append(curr)
-         u.remove(curr)
-         d = [v for v in merge_edges.get(curr, []) if v in u]
+         pos = left_index.pop(curr)
+         last = left.pop()
+         if pos < len(left):
+            left[pos] = last
+            left_index[last] = pos
+
+         mom_near = [v for v in neighbours(mom_list, mom_index, curr) if v in left_index]
+         dad_near = [v for v in neighbours(dad_list, dad_index, curr) if v in left_index]
+         d = [v for v in mom_near if v in dad_near]
          if d:
             curr = rand_choice(d)
          else:
-            s = [v for v in mom_edges.get(curr, []) if v in u]
-            s += [v for v in dad_edges.get(curr, []) if v in u]
+            s = mom_near + dad_near
             curr = rand_choice(s) if s else None
 
    sister = gMom.clone()
@@ -268,31 +498,114 @@ def G1DListCrossoverCutCrossfill(genome, **args):
 
    if args["count"] >= 1:
       sister = gMom.clone()
-      mother_part = gMom[0:cut]
+      mother_part = set(gMom[0:cut])
       sister.resetStats()
-      i = (len(sister) - cut)
-      x = 0
-      for v in gDad:
-         if v in mother_part:
-            continue
-         if x >= i:
-            break
-         sister[cut + x] = v
-         x += 1
+      fill = [v for v in gDad if v not in mother_part][:len(sister) - cut]
+      sister[cut:cut + len(fill)] = fill
 
    if args["count"] == 2:
       brother = gDad.clone()
-      father_part = gDad[0:cut]
+      father_part = set(gDad[0:cut])
       brother.resetStats()
-      i = (len(brother) - cut)
-      x = 0
-      for v in gMom:
-         if v in father_part:
-            continue
-         if x >= i:
-            break
-         brother[cut + x] = v
-         x += 1
+      fill = [v for v in gMom if v not in father_part][:len(brother) - cut]
+      brother[cut:cut + len(fill)] = fill
+
+   return (sister, brother)
+
+def G1DListCrossoverPMX(genome, **args):
+   """ The PMX Crossover for G1DList (partially matched crossover), for permutations
+
+   The genes between two cut points come from one parent and the remaining
+   genes from the other parent, moved by the mapping between the two
+   segments. The children are built by swaps located by a position index,
+   so the crossover is O(n).
+
+   .. warning:: You can't use this crossover method for lists with just one element.
+
+   .. versionadded:: 0.6
+      The *G1DListCrossoverPMX* function
+   """
+   sister = None
+   brother = None
+   gMom = args["mom"]
+   gDad = args["dad"]
+
+   if len(gMom) == 1:
+      Util.raiseException("The 1D List have one element, can't use the PMX Crossover method !", TypeError)
+
+   cuts = [rand_randint(0, len(gMom) - 1), rand_randint(0, len(gMom) - 1)]
+
+   if cuts[0] > cuts[1]:
+      Util.listSwapElement(cuts, 0, 1)
+
+   def pmx(segment_parent, other_parent):
+      child = list(other_parent)
+      index = dict((v, i) for i, v in enumerate(child))
+      for i in xrange(cuts[0], cuts[1] + 1):
+         j = index[segment_parent[i]]
+         child[i], child[j] = child[j], child[i]
+         index[child[i]] = i
+         index[child[j]] = j
+      return child
+
+   if args["count"] >= 1:
+      sister = gMom.clone()
+      sister.resetStats()
+      sister.genomeList = pmx(gMom.genomeList, gDad.genomeList)
+
+   if args["count"] == 2:
+      brother = gDad.clone()
+      brother.resetStats()
+      brother.genomeList = pmx(gDad.genomeList, gMom.genomeList)
+
+   return (sister, brother)
+
+def G1DListCrossoverCycle(genome, **args):
+   """ The Cycle Crossover for G1DList (CX), for permutations
+
+   The positions are split in the cycles formed by the two parents, the
+   children get the genes of the alternate cycles from each parent, so
+   every gene keeps the position it has in one of the parents.
+
+   .. versionadded:: 0.6
+      The *G1DListCrossoverCycle* function
+   """
+   sister = None
+   brother = None
+   gMom = args["mom"]
+   gDad = args["dad"]
+   mom_list = gMom.genomeList
+   dad_list = gDad.genomeList
+   listSize = len(mom_list)
+
+   mom_index = dict((v, i) for i, v in enumerate(mom_list))
+   sisterl = [None] * listSize
+   brotherl = [None] * listSize
+   visited = [False] * listSize
+   cycle = 0
+
+   for start in xrange(listSize):
+      if visited[start]:
+         continue
+      i = start
+      while not visited[i]:
+         visited[i] = True
+         if cycle % 2 == 0:
+            sisterl[i], brotherl[i] = mom_list[i], dad_list[i]
+         else:
+            sisterl[i], brotherl[i] = dad_list[i], mom_list[i]
+         i = mom_index[dad_list[i]]
+      cycle += 1
+
+   if args["count"] >= 1:
+      sister = gMom.clone()
+      sister.resetStats()
+      sister.genomeList = sisterl
+
+   if args["count"] == 2:
+      brother = gDad.clone()
+      brother.resetStats()
+      brother.genomeList = brotherl
 
    return (sister, brother)
 
@@ -374,6 +687,128 @@ def G1DListCrossoverRealSBX(genome, **args):
 
    return (sister, brother)
 
+def _realSBX(rng, mom, dad, lower, upper, eta, mode):
+   """ The bounded SBX on numpy arrays, the *mom* and *dad* arrays have the
+   genes of a single pair or of many pairs stacked on the rows. The genes out
+   of the bounds are handled with the *mode* of :func:`Util.boundValues`, the
+   resample mode draws the spread of the child again.
+
+   :rtype: the sister and brother arrays
+   """
+   y1 = numpy.minimum(mom, dad)
+   y2 = numpy.maximum(mom, dad)
+   diff = y2 - y1
+   active = diff > Consts.CDefG1DListSBXEPS
+   diff_safe = numpy.where(active, diff, 1.0)
+   lower = numpy.broadcast_to(lower, mom.shape)
+   upper = numpy.broadcast_to(upper, mom.shape)
+
+   middle = 0.5 * (y1 + y2)
+   half = 0.5 * diff
+   beta_low = numpy.maximum(1.0 + 2.0 * (y1 - lower) / diff_safe, 1.0)
+   beta_high = numpy.maximum(1.0 + 2.0 * (upper - y2) / diff_safe, 1.0)
+   exponent = 1.0 / (eta + 1.0)
+
+   def spread(beta, u):
+      alpha = 2.0 - beta ** -(eta + 1.0)
+      return numpy.where(u <= 1.0 / alpha, (u * alpha) ** exponent, (1.0 / (2.0 - u * alpha)) ** exponent)
+
+   def resample(beta, sign):
+      return lambda mask: middle[mask] + sign * spread(beta[mask], rng.random_sample(mask.sum())) * half[mask]
+
+   u = rng.random_sample(mom.shape)
+   brother = Util.boundValues(middle - spread(beta_low, u) * half, lower, upper, mode, resample(beta_low, -1.0))
+   sister = Util.boundValues(middle + spread(beta_high, u) * half, lower, upper, mode, resample(beta_high, 1.0))
+
+   swap = rng.random_sample(mom.shape) > 0.5
+   sister, brother = numpy.where(swap, brother, sister), numpy.where(swap, sister, brother)
+   return numpy.where(active, sister, mom), numpy.where(active, brother, dad)
+
+def G1DListCrossoverRealSBXBounded(genome, **args):
+   """ The SBX crossover of G1DList of real values, computed for all the genes
+   at once with numpy. The parents aren't changed.
+
+   Accepts the *rangemin* and *rangemax* genome parameters, numbers or sequences
+   with the bound of each gene, the *sbx_eta* parameter, the distribution index
+   (default is :attr:`Consts.CDefG1DListSBXEtac`), and the *bound_handling*
+   parameter, one of the :attr:`Consts.boundHandlingType` (default is
+   :attr:`Consts.CDefBoundHandling`).
+
+   .. warning:: This crossover method is Data Type Dependent, which means that
+                must be used for 1D genome of real values.
+
+   .. versionadded:: 0.6
+      The *G1DListCrossoverRealSBXBounded* function
+   """
+   if numpy is None:
+      Util.raiseException("The G1DListCrossoverRealSBXBounded crossover requires numpy !", ImportError)
+
+   sister = None
+   brother = None
+   gMom = args["mom"]
+   gDad = args["dad"]
+
+   lower, upper = Util.realGeneBounds(gMom)
+   children = _realSBX(Util.numpyRandomState(),
+                       numpy.array(gMom.genomeList, dtype=float),
+                       numpy.array(gDad.genomeList, dtype=float), lower, upper,
+                       gMom.getParam("sbx_eta", Consts.CDefG1DListSBXEtac),
+                       gMom.getParam("bound_handling", Consts.CDefBoundHandling))
+
+   if args["count"] >= 1:
+      sister = gMom.clone()
+      sister.resetStats()
+      sister.setInternalList(children[0].tolist())
+
+   if args["count"] == 2:
+      brother = gDad.clone()
+      brother.resetStats()
+      brother.setInternalList(children[1].tolist())
+
+   return (sister, brother)
+
+def G1DListCrossoverRealSBXBoundedBatch(population, moms, dads, offspring, **args):
+   """ The batched version of the :func:`G1DListCrossoverRealSBXBounded`, the
+   genes of all the pairs are stacked on a single array and crossed at once,
+   the children are written into the *offspring* buffer. The parameters are
+   read from the first mom.
+
+   .. versionadded:: 0.6
+      The *G1DListCrossoverRealSBXBoundedBatch* function
+   """
+   if numpy is None:
+      Util.raiseException("The G1DListCrossoverRealSBXBounded crossover requires numpy !", ImportError)
+   if len(moms) == 0:
+      return offspring
+
+   pcross = args.get("pcross", 1.0)
+   rng = Util.numpyRandomState()
+   first = population[moms[0]]
+   lower, upper = Util.realGeneBounds(first)
+
+   mom_genes = numpy.array([population[i].genomeList for i in moms], dtype=float)
+   dad_genes = numpy.array([population[i].genomeList for i in dads], dtype=float)
+   sisters, brothers = _realSBX(rng, mom_genes, dad_genes, lower, upper,
+                                first.getParam("sbx_eta", Consts.CDefG1DListSBXEtac),
+                                first.getParam("bound_handling", Consts.CDefBoundHandling))
+   if pcross < 1.0:
+      kept = rng.random_sample(len(moms)) > pcross
+      sisters[kept] = mom_genes[kept]
+      brothers[kept] = dad_genes[kept]
+
+   sisters = sisters.tolist()
+   brothers = brothers.tolist()
+   for i in xrange(len(moms)):
+      sister = offspring[2 * i]
+      brother = offspring[2 * i + 1]
+      sister.setInternalList(sisters[i])
+      brother.setInternalList(brothers[i])
+      sister.resetStats()
+      brother.resetStats()
+   return offspring
+
+G1DListCrossoverRealSBXBounded.batch = G1DListCrossoverRealSBXBoundedBatch
+
 
 ####################
 ##     2D List    ##
@@ -402,6 +837,19 @@ def G2DListCrossoverUniform(genome, **args):
 
    return (sister, brother)
 
+def G2DListCrossoverUniformBatch(population, moms, dads, offspring, **args):
+   """ The batched version of the :func:`G2DListCrossoverUniform`, crosses the
+   individuals of *population* given by the *moms* and *dads* indexes,
+   writing the children into the *offspring* buffer
+
+   .. versionadded:: 0.6
+      The *G2DListCrossoverUniformBatch* function
+   """
+   return _crossoverBatch(G2DListCrossoverUniform, _uniformMask(Consts.CDefG2DListCrossUniformProb), "genomeList",
+                          population, moms, dads, offspring, **args)
+
+G2DListCrossoverUniform.batch = G2DListCrossoverUniformBatch
+
 
 def G2DListCrossoverSingleVPoint(genome, **args):
    """ The crossover of G2DList, Single Vertical Point """
@@ -426,6 +874,19 @@ def G2DListCrossoverSingleVPoint(genome, **args):
 
    return (sister, brother)
 
+def G2DListCrossoverSingleVPointBatch(population, moms, dads, offspring, **args):
+   """ The batched version of the :func:`G2DListCrossoverSingleVPoint`, crosses the
+   individuals of *population* given by the *moms* and *dads* indexes,
+   writing the children into the *offspring* buffer
+
+   .. versionadded:: 0.6
+      The *G2DListCrossoverSingleVPointBatch* function
+   """
+   return _crossoverCutBatch(G2DListCrossoverSingleVPoint, _cutColumns, 1, "genomeList",
+                             population, moms, dads, offspring, **args)
+
+G2DListCrossoverSingleVPoint.batch = G2DListCrossoverSingleVPointBatch
+
 def G2DListCrossoverSingleHPoint(genome, **args):
    """ The crossover of G2DList, Single Horizontal Point """
    sister = None
@@ -449,6 +910,19 @@ def G2DListCrossoverSingleHPoint(genome, **args):
 
    return (sister, brother)
 
+def G2DListCrossoverSingleHPointBatch(population, moms, dads, offspring, **args):
+   """ The batched version of the :func:`G2DListCrossoverSingleHPoint`, crosses the
+   individuals of *population* given by the *moms* and *dads* indexes,
+   writing the children into the *offspring* buffer
+
+   .. versionadded:: 0.6
+      The *G2DListCrossoverSingleHPointBatch* function
+   """
+   return _crossoverCutBatch(G2DListCrossoverSingleHPoint, _cutRows, 1, "genomeList",
+                             population, moms, dads, offspring, **args)
+
+G2DListCrossoverSingleHPoint.batch = G2DListCrossoverSingleHPointBatch
+
 
 #############################
 ##     2D Binary String    ##
@@ -482,6 +956,19 @@ def G2DBinaryStringXUniform(genome, **args):
 
    return (sister, brother)
 
+def G2DBinaryStringXUniformBatch(population, moms, dads, offspring, **args):
+   """ The batched version of the :func:`G2DBinaryStringXUniform`, crosses the
+   individuals of *population* given by the *moms* and *dads* indexes,
+   writing the children into the *offspring* buffer
+
+   .. versionadded:: 0.6
+      The *G2DBinaryStringXUniformBatch* function
+   """
+   return _crossoverBatch(G2DBinaryStringXUniform, _uniformMask(Consts.CDefG2DBinaryStringUniformProb), "genomeString",
+                          population, moms, dads, offspring, **args)
+
+G2DBinaryStringXUniform.batch = G2DBinaryStringXUniformBatch
+
 
 def G2DBinaryStringXSingleVPoint(genome, **args):
    """ The crossover of G2DBinaryString, Single Vertical Point
@@ -510,6 +997,19 @@ def G2DBinaryStringXSingleVPoint(genome, **args):
 
    return (sister, brother)
 
+def G2DBinaryStringXSingleVPointBatch(population, moms, dads, offspring, **args):
+   """ The batched version of the :func:`G2DBinaryStringXSingleVPoint`, crosses the
+   individuals of *population* given by the *moms* and *dads* indexes,
+   writing the children into the *offspring* buffer
+
+   .. versionadded:: 0.6
+      The *G2DBinaryStringXSingleVPointBatch* function
+   """
+   return _crossoverCutBatch(G2DBinaryStringXSingleVPoint, _cutColumns, 1, "genomeString",
+                             population, moms, dads, offspring, **args)
+
+G2DBinaryStringXSingleVPoint.batch = G2DBinaryStringXSingleVPointBatch
+
 def G2DBinaryStringXSingleHPoint(genome, **args):
    """ The crossover of G2DBinaryString, Single Horizontal Point
 
@@ -538,6 +1038,132 @@ def G2DBinaryStringXSingleHPoint(genome, **args):
 
    return (sister, brother)
 
+def G2DBinaryStringXSingleHPointBatch(population, moms, dads, offspring, **args):
+   """ The batched version of the :func:`G2DBinaryStringXSingleHPoint`, crosses the
+   individuals of *population* given by the *moms* and *dads* indexes,
+   writing the children into the *offspring* buffer
+
+   .. versionadded:: 0.6
+      The *G2DBinaryStringXSingleHPointBatch* function
+   """
+   return _crossoverCutBatch(G2DBinaryStringXSingleHPoint, _cutRows, 1, "genomeString",
+                             population, moms, dads, offspring, **args)
+
+G2DBinaryStringXSingleHPoint.batch = G2DBinaryStringXSingleHPointBatch
+
+##############################
+##     2D Array (ndarray)   ##
+##############################
+
+def G2DArrayCrossoverUniform(genome, **args):
+   """ The G2DArray and G2DBinaryArray Uniform Crossover, the swapped genes
+   are drawn as a boolean mask
+
+   .. versionadded:: 0.6
+      The *G2DArrayCrossoverUniform* function
+   """
+   sister = None
+   brother = None
+   gMom = args["mom"]
+   gDad = args["dad"]
+
+   rng = Util.numpyRandomState()
+   mask = rng.random_sample(gMom.getSize()) <= Consts.CDefG2DArrayCrossUniformProb
+
+   if args["count"] >= 1:
+      sister = gMom.clone()
+      sister.resetStats()
+      numpy.copyto(sister.genomeArray, gDad.genomeArray, where=mask)
+
+   if args["count"] == 2:
+      brother = gDad.clone()
+      brother.resetStats()
+      numpy.copyto(brother.genomeArray, gMom.genomeArray, where=mask)
+
+   return (sister, brother)
+
+def G2DArrayCrossoverSingleVPoint(genome, **args):
+   """ The crossover of G2DArray and G2DBinaryArray, Single Vertical Point,
+   the column blocks after the cut are swapped
+
+   .. versionadded:: 0.6
+      The *G2DArrayCrossoverSingleVPoint* function
+   """
+   sister = None
+   brother = None
+   gMom = args["mom"]
+   gDad = args["dad"]
+
+   cut = rand_randint(1, gMom.getWidth() - 1)
+
+   if args["count"] >= 1:
+      sister = gMom.clone()
+      sister.resetStats()
+      sister.genomeArray[:, cut:] = gDad.genomeArray[:, cut:]
+
+   if args["count"] == 2:
+      brother = gDad.clone()
+      brother.resetStats()
+      brother.genomeArray[:, cut:] = gMom.genomeArray[:, cut:]
+
+   return (sister, brother)
+
+def G2DArrayCrossoverSingleHPoint(genome, **args):
+   """ The crossover of G2DArray and G2DBinaryArray, Single Horizontal Point,
+   the row blocks after the cut are swapped
+
+   .. versionadded:: 0.6
+      The *G2DArrayCrossoverSingleHPoint* function
+   """
+   sister = None
+   brother = None
+   gMom = args["mom"]
+   gDad = args["dad"]
+
+   cut = rand_randint(1, gMom.getHeight() - 1)
+
+   if args["count"] >= 1:
+      sister = gMom.clone()
+      sister.resetStats()
+      sister.genomeArray[cut:] = gDad.genomeArray[cut:]
+
+   if args["count"] == 2:
+      brother = gDad.clone()
+      brother.resetStats()
+      brother.genomeArray[cut:] = gMom.genomeArray[cut:]
+
+   return (sister, brother)
+
+def G2DArrayCrossoverBlock(genome, **args):
+   """ The crossover of G2DArray and G2DBinaryArray, Block Crossover, a random
+   rectangular block of rows and columns is swapped between the parents
+
+   .. versionadded:: 0.6
+      The *G2DArrayCrossoverBlock* function
+   """
+   sister = None
+   brother = None
+   gMom = args["mom"]
+   gDad = args["dad"]
+
+   height, width = gMom.getSize()
+   row_a = rand_randint(0, height - 1)
+   row_b = rand_randint(row_a + 1, height)
+   col_a = rand_randint(0, width - 1)
+   col_b = rand_randint(col_a + 1, width)
+
+   if args["count"] >= 1:
+      sister = gMom.clone()
+      sister.resetStats()
+      sister.genomeArray[row_a:row_b, col_a:col_b] = gDad.genomeArray[row_a:row_b, col_a:col_b]
+
+   if args["count"] == 2:
+      brother = gDad.clone()
+      brother.resetStats()
+      brother.genomeArray[row_a:row_b, col_a:col_b] = gMom.genomeArray[row_a:row_b, col_a:col_b]
+
+   return (sister, brother)
+
 #############################
 ##          Tree           ##
 #############################
@@ -716,18 +1342,24 @@ def GTreeGPCrossoverSinglePoint(genome, **args):
             *max_depth* parameter.
 
    Accepts the *max_attempt* parameter, *max_depth* (required).
+
+   To control the bloat, it also accepts the *max_nodes* parameter, the
+   maximum number of nodes of the offspring, and the *tarpeian_prob*
+   parameter, the probability of rejecting an offspring bigger than the
+   average size of its parents. The crossover points are checked against
+   these limits on the parents, before any offspring is built, when all
+   the attempts are rejected the offspring are copies of the parents.
    """
    sister = None
    brother = None
 
-   gMom = args["mom"].clone()
-   gDad = args["dad"].clone()
-
-   gMom.resetStats()
-   gDad.resetStats()
+   gMom = args["mom"]
+   gDad = args["dad"]
 
    max_depth = gMom.getParam("max_depth", None)
    max_attempt = gMom.getParam("max_attempt", 15)
+   max_nodes = gMom.getParam("max_nodes", None)
+   tarpeian_prob = gMom.getParam("tarpeian_prob", 0.0)
 
    if max_depth is None:
       Util.raiseException("You must specify the max_depth genome parameter !", ValueError)
@@ -735,6 +1367,9 @@ def GTreeGPCrossoverSinglePoint(genome, **args):
    if max_depth < 0:
       Util.raiseException("The max_depth must be >= 1, if you want to use GTreeCrossoverSinglePointStrict crossover !", ValueError)
 
+   check_size = max_nodes is not None or tarpeian_prob > 0.0
+   parents_ave = (len(gMom) + len(gDad)) / 2.0
+
    momRandom = None
    dadRandom = None
 
@@ -762,20 +1397,43 @@ def GTreeGPCrossoverSinglePoint(genome, **args):
       if mD + dH > max_depth:
          continue
 
-      break
+      if check_size:
+         mS = gMom.getNodesCount(momRandom)
+         dS = gDad.getNodesCount(dadRandom)
+         offspring_sizes = [len(gMom) - mS + dS]
+         if args["count"] == 2:
+            offspring_sizes.append(len(gDad) - dS + mS)
 
-   if i == (max_attempt - 1):
-      assert gMom.getHeight() <= max_depth
-      return (gMom, gDad)
+         if max_nodes is not None and max(offspring_sizes) > max_nodes:
+            continue
+
+         if tarpeian_prob > 0.0 and max(offspring_sizes) > parents_ave:
+            if Util.randomFlipCoin(tarpeian_prob):
+               continue
+
+      break
    else:
-      nodeMom, nodeDad = momRandom, dadRandom
+      sister = gMom.clone()
+      sister.resetStats()
+      if args["count"] == 2:
+         brother = gDad.clone()
+         brother.resetStats()
+      return (sister, brother)
+
+   # The clones have the same nodes order of the parents
+   sister = gMom.clone()
+   brother = gDad.clone()
+   sister.resetStats()
+   brother.resetStats()
+
+   nodeMom = sister.nodes_list[gMom.nodes_list.index(momRandom)]
+   nodeDad = brother.nodes_list[gDad.nodes_list.index(dadRandom)]
 
    nodeMom_parent = nodeMom.getParent()
    nodeDad_parent = nodeDad.getParent()
 
    # Sister
    if args["count"] >= 1:
-      sister = gMom
       nodeDad.setParent(nodeMom_parent)
 
       if nodeMom_parent is None:
@@ -787,7 +1445,6 @@ def GTreeGPCrossoverSinglePoint(genome, **args):
 
    # Brother
    if args["count"] == 2:
-      brother = gDad
       nodeMom.setParent(nodeDad_parent)
 
       if nodeDad_parent is None:
@@ -796,5 +1453,7 @@ def GTreeGPCrossoverSinglePoint(genome, **args):
          nodeDad_parent.replaceChild(nodeDad, nodeMom)
       brother.processNodes()
       assert brother.getHeight() <= max_depth
+   else:
+      brother = None
 
    return (sister, brother)
@@ -18,11 +18,22 @@ module, you'll find the adapters above cited.
 """
 
 from pyevolve import __version__
+from collections import namedtuple, deque
 import Consts
 import Util
 import logging
 import types
 import datetime
+import time
+import threading
+import Queue
+import sys
+import os
+import struct
+import zlib
+import array
+import httplib
+import urlparse
 import Statistics
 
 
@@ -97,6 +108,19 @@ class DBBaseAdapter(object):
       """
       Util.raiseException("This method is not implemented on the ABC", NotImplementedError)
 
+   def insertBatch(self, ga_engines):
+      """ Insert the stats of many dumps at once, used by the
+      :class:`DBAsyncAdapter`. The default calls :meth:`insert` for each one,
+      the adapters may override it to write all the dumps together.
+
+      :param ga_engines: the list of GA Engines (or :class:`DBEngineSnapshot`)
+
+      .. versionadded:: 0.6
+         The *insertBatch* method.
+      """
+      for ga_engine in ga_engines:
+         self.insert(ga_engine)
+
 class DBFileCSV(DBBaseAdapter):
    """ DBFileCSV Class - Adapter to dump statistics in CSV format
 
@@ -176,7 +200,562 @@ class DBFileCSV(DBBaseAdapter):
       line.extend(stats.asTuple())
       self.csvWriter.writerow(line)
 
-class DBURLPost(DBBaseAdapter):
+class DBBinaryLog(DBBaseAdapter):
+   """ DBBinaryLog Class - Adapter to append the statistics to a binary log file
+
+   Inheritance diagram for :class:`DBAdapters.DBBinaryLog`:
+
+   .. inheritance-diagram:: DBAdapters.DBBinaryLog
+
+   Each dump appends a fixed-width record with the generation (a 64 bits
+   integer) and the :class:`Statistics.Statistics` fields (64 bits floats),
+   and when *scores* is True, the raw scores and the fitness of all the
+   individuals (two vectors of 64 bits floats). The numbers are little-endian
+   and the file starts with a text header describing the layout, so the
+   whole run can be memory-mapped and read back as numpy arrays with the
+   :func:`readBinaryLog` function:
+
+      >>> adapter = DBBinaryLog(filename="run.blog", identify="run_01", scores=True)
+      >>> ga_engine.setDBAdapter(adapter)
+      >>> ga_engine.evolve()
+      >>> header, records = DBAdapters.readBinaryLog("run.blog")
+      >>> records["rawMax"]
+      memmap([ 12.,  14.,  17., ...])
+      >>> records["raw"].shape
+      (100, 80)
+
+   The header is written on the first dump, when the population size is
+   known; the population size can't change during the run when the
+   scores are written.
+
+   :param filename: the log filename
+   :param identify: the identify of the run
+   :param frequency: the generational dump frequency
+   :param reset: if True, the file old data will be overwrite with the new,
+                 otherwise the records are appended to the file, which must
+                 have the same layout
+   :param scores: if True, the raw scores and the fitness of the individuals are written
+
+   .. versionadded:: 0.6
+      The :class:`DBBinaryLog` class.
+   """
+   def __init__(self, filename=Consts.CDefBinaryLogFileName, identify=None,
+                frequency=Consts.CDefBinaryLogStatsGenFreq, reset=True, scores=False):
+      """ The creator of DBBinaryLog Class """
+
+      super(DBBinaryLog, self).__init__(frequency, identify)
+
+      self.filename = filename
+      self.reset = reset
+      self.scores = scores
+      self.fHandle = None
+      self.fields = None
+      self.popSize = None
+      self.recordStruct = None
+
+   def __repr__(self):
+      """ The string representation of adapter """
+      ret = "DBBinaryLog DB Adapter [File='%s', identify='%s']" % (self.filename, self.getIdentify())
+      return ret
+
+   def open(self, ga_engine):
+      """ Opens the log file, the header is written on the first dump. When
+      appending, an incomplete record at the end of the file is removed
+
+      :param ga_engine: the GA Engine
+      """
+      logging.debug("Opening the binary log file to dump statistics [%s]", self.filename)
+      self.fields = sorted(Statistics.Statistics().internalDict.keys())
+      self.recordStruct = struct.Struct("<q%dd" % (len(self.fields),))
+      self.popSize = None
+
+      if not self.reset and os.path.exists(self.filename) and os.path.getsize(self.filename) > 0:
+         header = readBinaryLogHeader(self.filename)
+         if header["fields"] != self.fields or header["scores"] != self.scores:
+            Util.raiseException("The binary log [%s] has another layout, can't append the records" % (self.filename,),
+                                ValueError)
+         self.popSize = header["population"]
+         record_size = self.recordStruct.size + 16 * self.popSize
+         end = os.path.getsize(self.filename)
+         end -= (end - header["header"]) % record_size
+         self.fHandle = open(self.filename, "r+b")
+         self.fHandle.truncate(end)
+         self.fHandle.seek(end)
+      else:
+         self.fHandle = open(self.filename, "wb")
+
+   def writeHeader(self, population_size):
+      """ Writes the header of the log file
+
+      :param population_size: the number of individuals of each record
+      """
+      self.popSize = population_size if self.scores else 0
+      lines = ["version=%d" % (Consts.CDefBinaryLogVersion,),
+               "identify=%s" % (self.getIdentify().replace("\n", " "),),
+               "fields=%s" % (",".join(self.fields),),
+               "scores=%d" % (int(self.scores),),
+               "population=%d" % (self.popSize,)]
+      self.fHandle.write(_textHeader(Consts.CDefBinaryLogMagic, lines))
+
+   def insert(self, ga_engine):
+      """ Appends the record of the statistics to the log file
+
+      :param ga_engine: the GA Engine
+      """
+      stats = ga_engine.getStatistics()
+      population = ga_engine.getPopulation()
+
+      if self.popSize is None:
+         self.writeHeader(len(population))
+
+      self.fHandle.write(self.recordStruct.pack(ga_engine.getCurrentGeneration(), *[stats[k] for k in self.fields]))
+
+      if self.scores:
+         if len(population) != self.popSize:
+            Util.raiseException("The population size changed from %d to %d, can't write the scores" %
+                                (self.popSize, len(population)), ValueError)
+         raw = array.array("d", [ind.score for ind in population])
+         fitness = array.array("d", [ind.fitness for ind in population])
+         if sys.byteorder == "big":
+            raw.byteswap()
+            fitness.byteswap()
+         self.fHandle.write(raw.tostring())
+         self.fHandle.write(fitness.tostring())
+
+   def commitAndClose(self):
+      """ Flushes and closes the log file """
+      logging.debug("Closing the binary log file [%s]", self.filename)
+      if self.fHandle:
+         self.fHandle.close()
+         self.fHandle = None
+
+def _textHeader(magic, lines):
+   """ Returns the text header of the binary files, the magic line, the
+   header size and the "key=value" lines, padded with spaces to a multiple
+   of 64 bytes, so the data after the header is aligned """
+   text = "\n".join([magic] + lines) + "\n"
+   size = (len(text) + len("header=%08d\n" % 0) + 63) // 64 * 64
+   text = "\n".join([magic, "header=%08d" % (size,)] + lines) + "\n"
+   return text.ljust(size, " ")
+
+def _readTextHeader(filename, magic, description):
+   """ Reads the text header written by *_textHeader*, returns the
+   dictionary with the values (strings) and the header size """
+   fHandle = open(filename, "rb")
+   try:
+      if fHandle.readline().rstrip("\n") != magic:
+         Util.raiseException("The file [%s] isn't a %s" % (filename, description), ValueError)
+      size = int(fHandle.readline().rstrip("\n").split("=", 1)[1])
+      text = fHandle.read(size - fHandle.tell())
+   finally:
+      fHandle.close()
+
+   header = {"header": size}
+   for line in text.rstrip(" ").splitlines():
+      key, value = line.split("=", 1)
+      header[key] = value
+   return header
+
+def readBinaryLogHeader(filename):
+   """ Reads the header of a binary log file of the :class:`DBBinaryLog`
+
+   :param filename: the log filename
+   :rtype: a dictionary with the *identify*, *fields* (the list of the statistics
+           names), *scores* (True when the score vectors are written), *population*
+           (the number of scores on each vector), *version* and *header* (the header size)
+
+   .. versionadded:: 0.6
+      The *readBinaryLogHeader* function
+   """
+   header = _readTextHeader(filename, Consts.CDefBinaryLogMagic, "binary log")
+   header["version"] = int(header["version"])
+   header["fields"] = header["fields"].split(",")
+   header["scores"] = header["scores"] == "1"
+   header["population"] = int(header["population"])
+   return header
+
+def readBinaryLog(filename):
+   """ Loads a binary log file of the :class:`DBBinaryLog` as a numpy record
+   array, the file is memory-mapped (read only) and not copied.
+
+   The record array has the *generation* field, one field for each statistic
+   (like *rawMax*) and, when the scores are written, the *raw* and *fitness*
+   fields with the scores of each generation:
+
+      >>> header, records = DBAdapters.readBinaryLog("run.blog")
+      >>> records["generation"]
+      memmap([  0,   1,   2, ...])
+      >>> records["raw"][-1].max()
+      17.0
+
+   An incomplete record at the end of the file, like of an interrupted run,
+   is ignored.
+
+   :param filename: the log filename
+   :rtype: a tuple with the header (see :func:`readBinaryLogHeader`) and the records
+
+   .. versionadded:: 0.6
+      The *readBinaryLog* function
+   """
+   numpy = Util.importSpecial("numpy")
+   header = readBinaryLogHeader(filename)
+   layout = [("generation", "<i8")] + [(field, "<f8") for field in header["fields"]]
+   if header["scores"]:
+      layout += [("raw", "<f8", (header["population"],)), ("fitness", "<f8", (header["population"],))]
+   dtype = numpy.dtype(layout)
+
+   count = (os.path.getsize(filename) - header["header"]) // dtype.itemsize
+   if count <= 0:
+      return header, numpy.zeros(0, dtype=dtype)
+   return header, numpy.memmap(filename, dtype=dtype, mode="r", offset=header["header"], shape=(count,))
+
+_snapshotBlock = struct.Struct("<4sqIQ")
+_snapshotIndexEntry = struct.Struct("<qQ")
+_snapshotFooter = struct.Struct("<4sQ")
+
+def _populationGenes(population):
+   """ Returns the genes of the population as a numpy array, the first
+   dimension is the individual """
+   numpy = Util.importSpecial("numpy")
+   rows = []
+   for ind in population:
+      genes = getattr(ind, "genomeArray", None)
+      if genes is None:
+         genes = getattr(ind, "genomeList", None)
+      if genes is None:
+         Util.raiseException("The %s genome isn't array-backed, its genes can't be written" % (ind.__class__.__name__,),
+                             TypeError)
+      rows.append(genes)
+
+   genes = numpy.array(rows)
+   if genes.dtype.kind not in "biuf":
+      Util.raiseException("The genes must be numbers (booleans, integers or reals), not %s" % (genes.dtype,), TypeError)
+   if genes.dtype.kind == "b":
+      genes = genes.astype(numpy.uint8)
+   return genes
+
+class DBPopulationSnapshot(DBBaseAdapter):
+   """ DBPopulationSnapshot Class - Adapter to write the whole population,
+   the genes and the scores, to a columnar snapshot file
+
+   Inheritance diagram for :class:`DBAdapters.DBPopulationSnapshot`:
+
+   .. inheritance-diagram:: DBAdapters.DBPopulationSnapshot
+
+   Each dump appends a block with the generation and three compressed (zlib)
+   columns: the raw scores, the fitness and the genes of the individuals, the
+   genes are written gene by gene (the transposed population), which
+   compresses better than individual by individual. The blocks have the
+   numpy type and the shape of the genes, so the genomes backed by a list or
+   an array of numbers, like the :class:`G1DList.G1DList`,
+   :class:`G1DBinaryString.G1DBinaryString`, :class:`G2DList.G2DList` and
+   :class:`G2DArray.G2DArray`, can be written. At the close, an index with
+   the position of each generation is appended to the file, so any
+   generation can be read without reading the others:
+
+      >>> adapter = DBPopulationSnapshot(filename="run.psnap", frequency=10)
+      >>> ga_engine.setDBAdapter(adapter)
+      >>> ga_engine.evolve()
+      >>> snapshot = DBAdapters.readPopulationSnapshot("run.psnap", 50)
+      >>> snapshot["genes"].shape
+      (80, 100)
+      >>> snapshot["raw"].argmax()
+      12
+
+   The default compression level is the fastest, so the dumps are cheap;
+   the file of an interrupted run, without the index, can still be read.
+   This adapter needs the genomes, so it can't be wrapped by the
+   :class:`DBAsyncAdapter`, which copies only the scores.
+
+   :param filename: the snapshot filename
+   :param identify: the identify of the run
+   :param frequency: the generational dump frequency
+   :param reset: if True, the file old data will be overwrite with the new,
+                 otherwise the blocks are appended to the file
+   :param compression: the zlib compression level, from 1 (fast) to 9 (best)
+
+   .. versionadded:: 0.6
+      The :class:`DBPopulationSnapshot` class.
+   """
+   def __init__(self, filename=Consts.CDefPopSnapshotFileName, identify=None,
+                frequency=Consts.CDefPopSnapshotGenFreq, reset=True,
+                compression=Consts.CDefPopSnapshotCompression):
+      """ The creator of DBPopulationSnapshot Class """
+
+      super(DBPopulationSnapshot, self).__init__(frequency, identify)
+
+      self.filename = filename
+      self.reset = reset
+      self.compression = compression
+      self.fHandle = None
+      self.index = []
+
+   def __repr__(self):
+      """ The string representation of adapter """
+      ret = "DBPopulationSnapshot DB Adapter [File='%s', identify='%s']" % (self.filename, self.getIdentify())
+      return ret
+
+   def open(self, ga_engine):
+      """ Opens the snapshot file, when appending, the index of the file is
+      removed and written again at the close
+
+      :param ga_engine: the GA Engine
+      """
+      logging.debug("Opening the population snapshot file [%s]", self.filename)
+      Util.importSpecial("numpy")
+
+      if not self.reset and os.path.exists(self.filename) and os.path.getsize(self.filename) > 0:
+         header, self.index, end = _readSnapshotIndex(self.filename)
+         self.fHandle = open(self.filename, "r+b")
+         self.fHandle.truncate(end)
+         self.fHandle.seek(end)
+      else:
+         self.index = []
+         self.fHandle = open(self.filename, "wb")
+         lines = ["version=%d" % (Consts.CDefPopSnapshotVersion,),
+                  "identify=%s" % (self.getIdentify().replace("\n", " "),)]
+         self.fHandle.write(_textHeader(Consts.CDefPopSnapshotMagic, lines))
+
+   def insert(self, ga_engine):
+      """ Appends the block of the population to the snapshot file
+
+      :param ga_engine: the GA Engine
+      """
+      numpy = Util.importSpecial("numpy")
+      population = ga_engine.getPopulation()
+      generation = ga_engine.getCurrentGeneration()
+
+      genes = _populationGenes(population)
+      dtype = genes.dtype.newbyteorder("<")
+      columns = [("raw", numpy.array([ind.score for ind in population], dtype="<f8")),
+                 ("fitness", numpy.array([ind.fitness for ind in population], dtype="<f8")),
+                 ("genes", numpy.ascontiguousarray(genes.reshape(len(genes), -1).T, dtype=dtype))]
+      data = [zlib.compress(column.tostring(), self.compression) for name, column in columns]
+
+      descriptor = "individuals=%d\ndtype=%s\nshape=%s\ncolumns=%s\n" % (len(genes), dtype.str,
+                   ",".join(str(dim) for dim in genes.shape[1:]),
+                   ",".join("%s:%d" % (name, len(block)) for (name, column), block in zip(columns, data)))
+
+      self.index.append((generation, self.fHandle.tell()))
+      self.fHandle.write(_snapshotBlock.pack("PBLK", generation, len(descriptor), sum(len(block) for block in data)))
+      self.fHandle.write(descriptor)
+      for block in data:
+         self.fHandle.write(block)
+
+   def commitAndClose(self):
+      """ Writes the index and closes the snapshot file """
+      logging.debug("Closing the population snapshot file [%s]", self.filename)
+      if self.fHandle:
+         offset = self.fHandle.tell()
+         self.fHandle.write(struct.pack("<4sQ", "PIDX", len(self.index)))
+         for generation, position in self.index:
+            self.fHandle.write(_snapshotIndexEntry.pack(generation, position))
+         self.fHandle.write(_snapshotFooter.pack("PEND", offset))
+         self.fHandle.close()
+         self.fHandle = None
+
+def _readSnapshotIndex(filename):
+   """ Returns the header, the list of (generation, position) of the blocks
+   and the position of the end of the last block of a snapshot file, the
+   index is read from the end of the file, or the blocks are scanned when
+   the file has no index """
+   header = _readTextHeader(filename, Consts.CDefPopSnapshotMagic, "population snapshot")
+   header["version"] = int(header["version"])
+   size = os.path.getsize(filename)
+
+   fHandle = open(filename, "rb")
+   try:
+      if size >= header["header"] + _snapshotFooter.size:
+         fHandle.seek(size - _snapshotFooter.size)
+         tag, offset = _snapshotFooter.unpack(fHandle.read(_snapshotFooter.size))
+         if tag == "PEND":
+            fHandle.seek(offset)
+            tag, count = struct.unpack("<4sQ", fHandle.read(12))
+            entries = fHandle.read(count * _snapshotIndexEntry.size)
+            index = [_snapshotIndexEntry.unpack_from(entries, i * _snapshotIndexEntry.size) for i in xrange(count)]
+            return header, index, offset
+
+      index = []
+      position = header["header"]
+      while position + _snapshotBlock.size <= size:
+         fHandle.seek(position)
+         tag, generation, descriptor, length = _snapshotBlock.unpack(fHandle.read(_snapshotBlock.size))
+         end = position + _snapshotBlock.size + descriptor + length
+         if tag != "PBLK" or end > size:
+            break
+         index.append((generation, position))
+         position = end
+      return header, index, position
+   finally:
+      fHandle.close()
+
+def readPopulationSnapshotIndex(filename):
+   """ Reads the index of a population snapshot file of the :class:`DBPopulationSnapshot`
+
+   Example:
+      >>> header, index = DBAdapters.readPopulationSnapshotIndex("run.psnap")
+      >>> [generation for generation, position in index]
+      [0, 10, 20, 30]
+
+   :param filename: the snapshot filename
+   :rtype: a tuple with the header (a dictionary with the *identify*, *version* and
+           *header*, the header size) and the list of (generation, position) of the blocks
+
+   .. versionadded:: 0.6
+      The *readPopulationSnapshotIndex* function
+   """
+   header, index, end = _readSnapshotIndex(filename)
+   return header, index
+
+def readPopulationSnapshot(filename, generation, index=None):
+   """ Reads the population of a generation from a snapshot file of the
+   :class:`DBPopulationSnapshot`, only the block of the generation is read
+
+   Example:
+      >>> snapshot = DBAdapters.readPopulationSnapshot("run.psnap", 30)
+      >>> snapshot["genes"][snapshot["raw"].argmax()]
+      array([1, 0, 1, ...])
+
+   :param filename: the snapshot filename
+   :param generation: the generation
+   :param index: the index returned by :func:`readPopulationSnapshotIndex`, to
+                 read many generations without reading the index again
+   :rtype: a dictionary with the *generation*, the *raw* and *fitness* scores and
+           the *genes*, a numpy array with the genes of each individual
+
+   .. versionadded:: 0.6
+      The *readPopulationSnapshot* function
+   """
+   numpy = Util.importSpecial("numpy")
+   if index is None:
+      header, index = readPopulationSnapshotIndex(filename)
+
+   positions = [position for gen, position in index if gen == generation]
+   if not positions:
+      Util.raiseException("The generation %d isn't on the snapshot file [%s]" % (generation, filename), KeyError)
+
+   fHandle = open(filename, "rb")
+   try:
+      fHandle.seek(positions[-1])
+      tag, gen, length, size = _snapshotBlock.unpack(fHandle.read(_snapshotBlock.size))
+      descriptor = dict(line.split("=", 1) for line in fHandle.read(length).splitlines())
+      data = fHandle.read(size)
+   finally:
+      fHandle.close()
+
+   individuals = int(descriptor["individuals"])
+   shape = tuple(int(dim) for dim in descriptor["shape"].split(",") if dim)
+   dtypes = {"raw": "<f8", "fitness": "<f8", "genes": descriptor["dtype"]}
+   snapshot = {"generation": gen}
+   position = 0
+   for column in descriptor["columns"].split(","):
+      name, length = column.split(":")
+      values = numpy.fromstring(zlib.decompress(data[position:position + int(length)]), dtype=dtypes[name])
+      position += int(length)
+      if name == "genes":
+         values = values.reshape(-1, individuals).T.reshape((individuals,) + shape)
+      snapshot[name] = values
+   return snapshot
+
+class DBBatchAdapter(DBBaseAdapter):
+   """ DBBatchAdapter Class - The base class of the adapters which send the
+   statistics to a server in batches
+
+   The statistics of each dump are kept on a buffer and sent together, with
+   the :meth:`send` method of the subclass, when the buffer has *batch_size*
+   dumps and at the close. When the sending fails, the dumps stay on the
+   buffer and are sent again with the next dump; the buffer keeps up to
+   *retry_size* dumps, the older ones are discarded when it's full.
+
+   :param frequency: the generational dump frequency
+   :param identify: the identify of the run
+   :param batch_size: the number of dumps sent together
+   :param retry_size: the max number of dumps kept on the buffer
+
+   .. versionadded:: 0.6
+      The :class:`DBBatchAdapter` class.
+   """
+   def __init__(self, frequency, identify, batch_size, retry_size):
+      """ The class constructor """
+      super(DBBatchAdapter, self).__init__(frequency, identify)
+      self.batchSize = max(1, batch_size)
+      self.retrySize = max(retry_size, self.batchSize)
+      self.pending = deque()
+      self.discarded = 0
+
+   def getPending(self):
+      """ Returns the number of dumps not sent yet
+
+      :rtype: the number of dumps on the buffer
+      """
+      return len(self.pending)
+
+   def getDiscarded(self):
+      """ Returns the number of dumps discarded because the buffer was full
+
+      :rtype: the number of discarded dumps
+      """
+      return self.discarded
+
+   def record(self, ga_engine):
+      """ Returns the data of a dump, kept on the buffer
+
+      :param ga_engine: the GA Engine
+      """
+      Util.raiseException("This method is not implemented on the ABC", NotImplementedError)
+
+   def send(self, records):
+      """ Sends the dumps to the server
+
+      :param records: the list with the data of the dumps, returned by :meth:`record`
+      """
+      Util.raiseException("This method is not implemented on the ABC", NotImplementedError)
+
+   def sendErrors(self):
+      """ Returns the exception classes of a failed sending, which are retried """
+      return (IOError, httplib.HTTPException)
+
+   def insert(self, ga_engine):
+      """ Puts the statistics on the buffer and sends the buffer when full
+
+      :param ga_engine: the GA Engine
+      """
+      if len(self.pending) >= self.retrySize:
+         self.pending.popleft()
+         self.discarded += 1
+         logging.warning("The retry buffer of %s is full, discarding the oldest statistics", self)
+      self.pending.append(self.record(ga_engine))
+      if len(self.pending) >= self.batchSize:
+         self.flush()
+
+   def flush(self):
+      """ Sends all the dumps of the buffer
+
+      :rtype: True if the dumps were sent, False if the sending failed
+      """
+      if not self.pending:
+         return True
+      records = list(self.pending)
+      try:
+         self.send(records)
+      except self.sendErrors(), expt:
+         logging.warning("Failed to send %d statistics dumps with %s, they will be sent again: %s",
+                         len(records), self, expt)
+         return False
+      self.pending.clear()
+      return True
+
+   def close(self):
+      """ Closes the connection with the server """
+      pass
+
+   def commitAndClose(self):
+      """ Sends the dumps of the buffer and closes the connection """
+      if not self.flush():
+         logging.error("Discarding %d statistics dumps which couldn't be sent with %s", len(self.pending), self)
+      self.close()
+
+class DBURLPost(DBBatchAdapter):
    """ DBURLPost Class - Adapter to call an URL with statistics
 
    Inheritance diagram for :class:`DBAdapters.DBURLPost`:
@@ -197,24 +776,35 @@ class DBURLPost(DBBaseAdapter):
 
    .. note:: see the :class:`Statistics.Statistics` documentation.
 
+   When *batch_size* is greater than 1, the dumps are sent together and each
+   parameter is repeated once for each dump, in the same order, like
+   *generation=20&generation=40&...*; the *cgi.parse_qs* function of the
+   server gives the list of values of each parameter. The requests use a
+   persistent HTTP connection and the failed dumps are sent again later
+   (see :class:`DBBatchAdapter`).
+
    :param url: the URL to be used
    :param identify: the identify of the run
    :param frequency: the generational dump frequency
    :param post: if True, the POST method will be used, otherwise GET will be used.
+   :param batch_size: the number of dumps sent on each request
+   :param retry_size: the max number of dumps kept when the requests fail
 
    .. versionadded:: 0.6
       Removed the stub methods and subclassed the :class:`DBBaseAdapter` class.
    """
 
    def __init__(self, url, identify=None,
-                frequency=Consts.CDefURLPostStatsGenFreq, post=True):
+                frequency=Consts.CDefURLPostStatsGenFreq, post=True,
+                batch_size=Consts.CDefURLPostBatchSize, retry_size=Consts.CDefURLPostRetrySize):
       """ The creator of the DBURLPost Class. """
 
-      super(DBURLPost, self).__init__(frequency, identify)
+      super(DBURLPost, self).__init__(frequency, identify, batch_size, retry_size)
       self.urllibmod = None
 
       self.url = url
       self.post = post
+      self.connection = None
 
    def __repr__(self):
       """ The string representation of adapter """
@@ -233,26 +823,70 @@ class DBURLPost(DBBaseAdapter):
          logging.debug("Loading urllib module...")
          self.urllibmod = Util.importSpecial("urllib")
 
-   def insert(self, ga_engine):
-      """ Sends the data to the URL using POST or GET
+   def record(self, ga_engine):
+      """ Returns the parameters of a dump
 
       :param ga_engine: the GA Engine
-
-      .. versionchanged:: 0.6
-         The method now receives the *ga_engine* parameter.
       """
-      logging.debug("Sending http request to %s.", self.url)
       stats = ga_engine.getStatistics()
-      response = None
       params = stats.internalDict.copy()
       params["generation"] = ga_engine.getCurrentGeneration()
       params["identify"] = self.getIdentify()
+      return params
+
+   def request(self, data):
+      """ Does the HTTP request on the persistent connection
+
+      :param data: the url encoded parameters
+      """
+      parts = urlparse.urlsplit(self.url)
+      if self.connection is None:
+         logging.debug("Opening the HTTP connection to %s.", parts.netloc)
+         if parts.scheme == "https":
+            self.connection = httplib.HTTPSConnection(parts.netloc, timeout=Consts.CDefURLPostTimeout)
+         else:
+            self.connection = httplib.HTTPConnection(parts.netloc, timeout=Consts.CDefURLPostTimeout)
+
+      path = parts.path or "/"
       if self.post:  # POST
-         response = self.urllibmod.urlopen(self.url, self.urllibmod.urlencode(params))
-      else:  # GET
-         response = self.urllibmod.urlopen(self.url + "?%s" % (self.urllibmod.urlencode(params)))
-      if response:
-         response.close()
+         if parts.query:
+            path += "?" + parts.query
+         self.connection.request("POST", path, data, {"Content-Type": "application/x-www-form-urlencoded"})
+      else:  # GET, keeping the query of the URL
+         query = "%s&%s" % (parts.query, data) if parts.query else data
+         self.connection.request("GET", "%s?%s" % (path, query))
+      response = self.connection.getresponse()
+      response.read()
+      if response.status >= 400:
+         raise IOError("HTTP error %d (%s)" % (response.status, response.reason))
+
+   def send(self, records):
+      """ Sends the dumps to the URL using POST or GET
+
+      :param records: the list with the parameters of the dumps
+      """
+      logging.debug("Sending http request to %s.", self.url)
+      if len(records) == 1:
+         data = self.urllibmod.urlencode(records[0])
+      else:
+         params = dict((key, [record[key] for record in records]) for key in records[0])
+         data = self.urllibmod.urlencode(params, True)
+
+      reused = self.connection is not None
+      try:
+         self.request(data)
+      except self.sendErrors():
+         self.close()
+         if not reused:
+            raise
+         # The server may have closed the persistent connection, one more try
+         self.request(data)
+
+   def close(self):
+      """ Closes the HTTP connection """
+      if self.connection is not None:
+         self.connection.close()
+         self.connection = None
 
 class DBSQLite(DBBaseAdapter):
    """ DBSQLite Class - Adapter to dump data in SQLite3 database format
@@ -273,17 +907,33 @@ class DBSQLite(DBBaseAdapter):
    The *resetDB* parameter is different from the *resetIdentify* parameter, the *resetIdentify*
    only erases the rows with the same "identify" name.
 
+   The rows of each dump are written with a single statement per table on
+   a transaction committed at each *commit_freq* generations and at the
+   close, when the indexes on the (identify, generation) columns are created. For long runs with large
+   populations, the *wal* parameter enables the write-ahead log journal and
+   the *pop_sample* parameter reduces the population table:
+
+      >>> dbadapter = DBSQLite(identify="test", wal=True, pop_sample=10)
+
    :param dbname: the database filename
    :param identify: the identify if the run
    :param resetDB: if True, the database structure will be recreated
    :param resetIdentify: if True, the identify with the same name will be overwrite with new data
    :param frequency: the generational dump frequency
    :param commit_freq: the commit frequency
+   :param wal: if True, the database uses the WAL journal mode with the normal synchronous mode
+   :param pop_sample: the number of individuals written on the population table each
+                      generation, evenly spaced over the sorted population and always
+                      with the best and the worst; None writes all the individuals and
+                      0 writes none, only the statistics
+
+   .. versionchanged:: 0.6
+      The batched transactions and the *wal* and *pop_sample* parameters.
    """
 
    def __init__(self, dbname=Consts.CDefSQLiteDBName, identify=None, resetDB=False,
                 resetIdentify=True, frequency=Consts.CDefSQLiteStatsGenFreq,
-                commit_freq=Consts.CDefSQLiteStatsCommitFreq):
+                commit_freq=Consts.CDefSQLiteStatsCommitFreq, wal=False, pop_sample=None):
       """ The creator of the DBSQLite Class """
 
       super(DBSQLite, self).__init__(frequency, identify)
@@ -296,6 +946,10 @@ class DBSQLite(DBBaseAdapter):
       self.typeDict = {types.FloatType: "real"}
       self.cursorPool = None
       self.commitFreq = commit_freq
+      self.wal = wal
+      self.popSample = pop_sample
+      self.statsStmt = None
+      self.popStmt = None
 
    def __repr__(self):
       """ The string representation of adapter """
@@ -317,6 +971,11 @@ class DBSQLite(DBBaseAdapter):
       logging.debug("Opening database, dbname=%s", self.dbName)
       self.connection = self.sqlite3mod.connect(self.dbName)
 
+      if self.wal:
+         logging.debug("Enabling the WAL journal mode.")
+         self.connection.execute("PRAGMA journal_mode=WAL")
+         self.connection.execute("PRAGMA synchronous=NORMAL")
+
       temp_stats = Statistics.Statistics()
 
       if self.resetDB:
@@ -327,9 +986,14 @@ class DBSQLite(DBBaseAdapter):
       if self.resetIdentify:
          self.resetTableIdentify()
 
+      self.statsStmt = "insert into %s values (%s)" % (Consts.CDefSQLiteDBTable,
+                                                       ", ".join(["?"] * (len(temp_stats) + 2)))
+      self.popStmt = "insert into %s values(?, ?, ?, ?, ?)" % (Consts.CDefSQLiteDBTablePop,)
+
    def commitAndClose(self):
-      """ Commit changes on database and closes connection """
+      """ Commit changes on database, creates the indexes and closes connection """
       self.commit()
+      self.createIndexes()
       self.close()
 
    def close(self):
@@ -358,6 +1022,19 @@ class DBSQLite(DBBaseAdapter):
       else:
          return self.cursorPool
 
+   def createIndexes(self):
+      """ Creates the indexes on the (identify, generation) columns of the
+      tables, they are created after the rows are written
+
+      .. versionadded:: 0.6
+         The *createIndexes* method.
+      """
+      c = self.getCursor()
+      for table in (Consts.CDefSQLiteDBTable, Consts.CDefSQLiteDBTablePop):
+         logging.debug("Creating the index of the table %s.", table)
+         c.execute("create index if not exists %s_identify_generation on %s(identify, generation)" % (table, table))
+      self.connection.commit()
+
    def createStructure(self, stats):
       """ Create table using the Statistics class structure
 
@@ -418,25 +1095,36 @@ class DBSQLite(DBBaseAdapter):
       stats = ga_engine.getStatistics()
       population = ga_engine.getPopulation()
       generation = ga_engine.getCurrentGeneration()
+      identify = self.getIdentify()
 
       c = self.getCursor()
-      pstmt = "insert into %s values (?, ?, " % (Consts.CDefSQLiteDBTable)
-      for i in xrange(len(stats)):
-         pstmt += "?, "
-      pstmt = pstmt[:-2] + ")"
-      c.execute(pstmt, (self.getIdentify(), generation) + stats.asTuple())
-
-      pstmt = "insert into %s values(?, ?, ?, ?, ?)" % (Consts.CDefSQLiteDBTablePop,)
-      tups = []
-      for i in xrange(len(population)):
-         ind = population[i]
-         tups.append((self.getIdentify(), generation, i, ind.fitness, ind.score))
+      c.execute(self.statsStmt, (identify, generation) + stats.asTuple())
+      c.executemany(self.popStmt, [(identify, generation, i, population[i].fitness, population[i].score)
+                                   for i in self.populationSample(len(population))])
 
-      c.executemany(pstmt, tups)
       if (generation % self.commitFreq == 0):
          self.commit()
 
-class DBXMLRPC(DBBaseAdapter):
+   def populationSample(self, size):
+      """ Returns the indexes of the individuals written on the population
+      table, see the *pop_sample* parameter
+
+      :param size: the population size
+      :rtype: the list of indexes
+
+      .. versionadded:: 0.6
+         The *populationSample* method.
+      """
+      if self.popSample is None or self.popSample >= size:
+         return range(size)
+      if self.popSample <= 0:
+         return []
+      if self.popSample == 1:
+         return [0]
+      step = (size - 1) / float(self.popSample - 1)
+      return sorted(set(int(round(k * step)) for k in xrange(self.popSample)))
+
+class DBXMLRPC(DBBatchAdapter):
    """ DBXMLRPC Class - Adapter to dump statistics to a XML Remote Procedure Call
 
    Inheritance diagram for :class:`DBAdapters.DBXMLRPC`:
@@ -453,7 +1141,9 @@ class DBXMLRPC(DBBaseAdapter):
 
 
    .. note:: The XML RPC Server must implement the *insert* method, wich receives
-             a python dictionary as argument.
+             a python dictionary as argument. When *batch_size* is greater than 1,
+             the dumps are sent together with a multicall, and the server must
+             also implement the *system.multicall* method.
 
    Example of an server in Python: ::
 
@@ -466,16 +1156,23 @@ class DBXMLRPC(DBBaseAdapter):
       server = SimpleXMLRPCServer(("localhost", 8000), allow_none=True)
       print "Listening on port 8000..."
       server.register_function(insert, "insert")
+      server.register_multicall_functions()
       server.serve_forever()
 
+   The failed calls are made again later (see :class:`DBBatchAdapter`).
+
+   :param batch_size: the number of dumps sent on each multicall
+   :param retry_size: the max number of dumps kept when the calls fail
+
    .. versionadded:: 0.6
       The :class:`DBXMLRPC` class.
 
    """
-   def __init__(self, url, identify=None, frequency=Consts.CDefXMLRPCStatsGenFreq):
+   def __init__(self, url, identify=None, frequency=Consts.CDefXMLRPCStatsGenFreq,
+                batch_size=Consts.CDefXMLRPCBatchSize, retry_size=Consts.CDefXMLRPCRetrySize):
       """ The creator of DBXMLRPC Class """
 
-      super(DBXMLRPC, self).__init__(frequency, identify)
+      super(DBXMLRPC, self).__init__(frequency, identify, batch_size, retry_size)
       self.xmlrpclibmod = None
 
       self.url = url
@@ -501,19 +1198,63 @@ class DBXMLRPC(DBBaseAdapter):
       logging.debug("Opening the XML RPC Server Proxy on %s", self.url)
       self.proxy = self.xmlrpclibmod.ServerProxy(self.url, allow_none=True)
 
-   def insert(self, ga_engine):
-      """ Calls the XML RPC procedure
+   def record(self, ga_engine):
+      """ Returns the dictionary of a dump
 
       :param ga_engine: the GA Engine
-
-      .. versionchanged:: 0.6
-         The method now receives the *ga_engine* parameter.
       """
       stats = ga_engine.getStatistics()
       generation = ga_engine.getCurrentGeneration()
       di = stats.internalDict.copy()
       di.update({"identify": self.getIdentify(), "generation": generation})
-      self.proxy.insert(di)
+      return di
+
+   def sendErrors(self):
+      """ Returns the exception classes of a failed call, which are retried,
+      the faults returned by the server aren't retried """
+      return (IOError, httplib.HTTPException, self.xmlrpclibmod.ProtocolError)
+
+   def discardFault(self, record, fault):
+      """ Logs a dump refused by the server, which is discarded """
+      logging.error("The XML RPC server refused the statistics of the generation %s, discarding them: %s",
+                    record["generation"], fault)
+
+   def send(self, records):
+      """ Calls the XML RPC procedure, with a multicall for many dumps
+
+      :param records: the list with the dictionaries of the dumps
+      """
+      if len(records) > 1:
+         multicall = self.xmlrpclibmod.MultiCall(self.proxy)
+         for record in records:
+            multicall.insert(record)
+         try:
+            results = multicall()
+         except self.xmlrpclibmod.Fault, fault:
+            logging.warning("The XML RPC server refused the multicall, using single calls: %s", fault)
+         else:
+            # Each call is checked, the faults discard only their dumps
+            for index, record in enumerate(records):
+               try:
+                  results[index]
+               except self.xmlrpclibmod.Fault, fault:
+                  self.discardFault(record, fault)
+            return
+
+      # The dumps leave the buffer as they are answered, so the ones
+      # already inserted aren't sent again when a later call fails
+      for record in records:
+         try:
+            self.proxy.insert(record)
+         except self.xmlrpclibmod.Fault, fault:
+            self.discardFault(record, fault)
+         if self.pending and self.pending[0] is record:
+            self.pending.popleft()
+
+   def close(self):
+      """ Closes the connection of the XML RPC Server proxy """
+      if self.proxy is not None:
+         self.proxy("close")()
 
 class DBVPythonGraph(DBBaseAdapter):
    """ The DBVPythonGraph Class - A DB Adapter for real-time visualization using VPython
@@ -597,6 +1338,142 @@ class DBVPythonGraph(DBBaseAdapter):
       self.curveDev.plot(pos=(generation, stats["rawDev"]))
       self.curveAvg.plot(pos=(generation, stats["rawAve"]))
 
+_connectionPools = {}
+_connectionPoolsLock = threading.Lock()
+
+class DBConnectionPool(object):
+   """ DBConnectionPool Class - A pool of database connections shared by
+   the DB Adapters
+
+   The connections are created by the *connect* function when the pool has
+   no idle connection, up to *size* connections; when all of them are in
+   use, the :meth:`acquire` waits for a :meth:`release`, up to a timeout. The pool is thread
+   safe, so the GA Engines running on many threads of the same process can
+   share the connections, see the :func:`getConnectionPool` function.
+
+   Example:
+      >>> pool = DBConnectionPool(lambda: sqlite3.connect("pyevolve.db"), 2)
+      >>> connection = pool.acquire()
+      >>> pool.release(connection)
+      >>> pool.closeAll()
+
+   :param connect: the function without arguments which returns a new connection
+   :param size: the max number of connections
+
+   .. versionadded:: 0.6
+      The :class:`DBConnectionPool` class.
+   """
+
+   def __init__(self, connect, size=Consts.CDefDBPoolSize):
+      """ The creator of the DBConnectionPool Class """
+      if size < 1:
+         Util.raiseException("The pool size must be greater than zero", ValueError)
+      self.connect = connect
+      self.size = size
+      self.idle = []
+      self.opened = 0
+      self.condition = threading.Condition()
+
+   def __repr__(self):
+      """ The string representation of the pool """
+      ret = "DBConnectionPool [size=%d, opened=%d, idle=%d]" % (self.size, self.opened, len(self.idle))
+      return ret
+
+   def getSize(self):
+      """ Returns the max number of connections """
+      return self.size
+
+   def getOpened(self):
+      """ Returns the number of connections opened by the pool """
+      return self.opened
+
+   def getIdle(self):
+      """ Returns the number of idle connections """
+      return len(self.idle)
+
+   def acquire(self, timeout=None):
+      """ Returns an idle connection, or a new one if all of them are in use
+
+      :param timeout: the max time in seconds waiting for a connection to be
+                      released, None waits forever; when it expires, a
+                      RuntimeError is raised
+      :rtype: the connection
+      """
+      deadline = None if timeout is None else time.time() + timeout
+      with self.condition:
+         while not self.idle and self.opened >= self.size:
+            if deadline is None:
+               self.condition.wait()
+               continue
+            remaining = deadline - time.time()
+            if remaining <= 0:
+               Util.raiseException("No connection of the pool was released after %s seconds" % (timeout,),
+                                   RuntimeError)
+            self.condition.wait(remaining)
+         if self.idle:
+            return self.idle.pop()
+         self.opened += 1
+
+      try:
+         return self.connect()
+      except:
+         with self.condition:
+            self.opened -= 1
+            self.condition.notify()
+         raise
+
+   def release(self, connection, discard=False):
+      """ Returns the connection to the pool
+
+      :param connection: the connection taken with :meth:`acquire`
+      :param discard: if True, the connection is closed instead, use it
+                      for broken connections
+      """
+      with self.condition:
+         if discard:
+            self.opened -= 1
+         else:
+            self.idle.append(connection)
+         self.condition.notify()
+
+      if discard:
+         try:
+            connection.close()
+         except Exception:
+            logging.debug("Error closing the discarded connection.", exc_info=True)
+
+   def closeAll(self):
+      """ Closes the idle connections, the connections in use are closed
+      when released with *discard* """
+      with self.condition:
+         idle, self.idle = self.idle, []
+         self.opened -= len(idle)
+         self.condition.notify_all()
+      for connection in idle:
+         connection.close()
+
+def getConnectionPool(key, connect, size=Consts.CDefDBPoolSize):
+   """ Returns the pool of connections shared by the DB Adapters with the
+   same *key*, the pool is created on the first call
+
+   Example:
+      >>> pool = DBAdapters.getConnectionPool(("localhost", 3306, "user", "pyevolve"), connect)
+
+   :param key: the key of the pool, like the database address
+   :param connect: the function which creates a new connection
+   :param size: the max number of connections of a new pool
+   :rtype: the :class:`DBConnectionPool` instance
+
+   .. versionadded:: 0.6
+      The *getConnectionPool* function
+   """
+   with _connectionPoolsLock:
+      pool = _connectionPools.get(key)
+      if pool is None:
+         pool = DBConnectionPool(connect, size)
+         _connectionPools[key] = pool
+      return pool
+
 class DBMySQLAdapter(DBBaseAdapter):
    """ DBMySQLAdapter Class - Adapter to dump data in MySql database server
 
@@ -620,6 +1497,19 @@ class DBMySQLAdapter(DBBaseAdapter):
    only erases the rows with the same "identify" name, and *resetDB* will drop and recreate
    the tables.
 
+   The rows of *batch_size* dumps are written with multi-row insert statements,
+   and all the pending rows are written at each *commit_freq* generations and
+   at the close. With the *pop_bins* parameter, the population is written as
+   *pop_bins* rows on the population bins table, each one with the count and
+   the scores of a group of individuals of consecutive ranks, instead of one
+   row per individual. For many GA runs on the same database, the *pool_size*
+   parameter makes the adapters with the same host, port, user and database
+   share a :class:`DBConnectionPool`. The pooled adapters only hold a
+   connection while writing: it's taken from the pool on each write of the
+   pending rows, which is committed then, and returned right after:
+
+      >>> dbadapter = DBMySQLAdapter("user", "password", batch_size=50, pop_bins=10, pool_size=4)
+
    :param user: mysql username (must have permission to create, drop, insert, etc.. on tables
    :param passwd: the user password on MySQL server
    :param host: the hostname, default is "localhost"
@@ -630,11 +1520,22 @@ class DBMySQLAdapter(DBBaseAdapter):
    :param resetIdentify: if True, the identify with the same name will be overwrite with new data
    :param frequency: the generational dump frequency
    :param commit_freq: the commit frequency
+   :param batch_size: the number of dumps written by each multi-row insert
+   :param pop_bins: the number of population bins rows of each dump, None writes
+                    one row per individual on the population table
+   :param pool_size: the size of the shared connection pool, None uses a
+                     connection of the adapter
+   :param pool_timeout: the max time in seconds waiting for a connection of the pool
+
+   .. versionchanged:: 0.6
+      The multi-row inserts and the *batch_size*, *pop_bins*, *pool_size* and *pool_timeout* parameters.
    """
 
    def __init__(self, user, passwd, host=Consts.CDefMySQLDBHost, port=Consts.CDefMySQLDBPort,
                 db=Consts.CDefMySQLDBName, identify=None, resetDB=False, resetIdentify=True,
-                frequency=Consts.CDefMySQLStatsGenFreq, commit_freq=Consts.CDefMySQLStatsCommitFreq):
+                frequency=Consts.CDefMySQLStatsGenFreq, commit_freq=Consts.CDefMySQLStatsCommitFreq,
+                batch_size=Consts.CDefMySQLBatchSize, pop_bins=None, pool_size=None,
+                pool_timeout=Consts.CDefDBPoolTimeout):
       """ The creator of the DBSQLite Class """
 
       super(DBMySQLAdapter, self).__init__(frequency, identify)
@@ -651,6 +1552,14 @@ class DBMySQLAdapter(DBBaseAdapter):
       self.typeDict = {types.FloatType: "DOUBLE(14,6)"}
       self.cursorPool = None
       self.commitFreq = commit_freq
+      self.batchSize = max(1, batch_size)
+      self.popBins = pop_bins
+      self.poolSize = pool_size
+      self.poolTimeout = pool_timeout
+      self.pool = None
+      self.pendingDumps = 0
+      self.pendingStats = []
+      self.pendingPop = []
 
    def __repr__(self):
       """ The string representation of adapter """
@@ -658,6 +1567,17 @@ class DBMySQLAdapter(DBBaseAdapter):
             self.host, self.user, self.db)
       return ret
 
+   def connect(self):
+      """ Returns a new connection to the database
+
+      .. versionadded:: 0.6
+         The *connect* method.
+      """
+      logging.debug("Opening database, host=%s", self.host)
+      return self.mysqldbmod.connect(host=self.host, user=self.user,
+                                     passwd=self.passwd, db=self.db,
+                                     port=self.port)
+
    def open(self, ga_engine):
       """ Open the database connection
 
@@ -670,18 +1590,33 @@ class DBMySQLAdapter(DBBaseAdapter):
          logging.debug("Loading MySQLdb module...")
          self.mysqldbmod = Util.importSpecial("MySQLdb")
 
-      logging.debug("Opening database, host=%s", self.host)
-      self.connection = self.mysqldbmod.connect(host=self.host, user=self.user,
-                                                passwd=self.passwd, db=self.db,
-                                                port=self.port)
-      temp_stats = Statistics.Statistics()
-      self.createStructure(temp_stats)
+      self.pendingDumps = 0
+      self.pendingStats = []
+      self.pendingPop = []
 
-      if self.resetDB:
-         self.resetStructure(Statistics.Statistics())
+      if self.poolSize is None:
+         self.connection = self.connect()
+      else:
+         key = (self.host, self.port, self.user, self.db)
+         self.pool = getConnectionPool(key, self.connect, self.poolSize)
+         self.connection = self.pool.acquire(self.poolTimeout)
 
-      if self.resetIdentify:
-         self.resetTableIdentify()
+      try:
+         temp_stats = Statistics.Statistics()
+         self.createStructure(temp_stats)
+
+         if self.resetDB:
+            self.resetStructure(Statistics.Statistics())
+
+         if self.resetIdentify:
+            self.resetTableIdentify()
+      except:
+         if self.pool is not None:
+            self.releaseConnection(discard=True)
+         raise
+
+      if self.pool is not None:
+         self.releaseConnection()
 
    def commitAndClose(self):
       """ Commit changes on database and closes connection """
@@ -689,17 +1624,81 @@ class DBMySQLAdapter(DBBaseAdapter):
       self.close()
 
    def close(self):
-      """ Close the database connection """
+      """ Close the database connection, the pooled adapters have no connection to close """
       logging.debug("Closing database.")
+      if self.pool is None:
+         if self.cursorPool:
+            self.cursorPool.close()
+            self.cursorPool = None
+         self.connection.close()
+         self.connection = None
+
+   def releaseConnection(self, discard=False):
+      """ Returns the connection to the pool
+
+      :param discard: if True, the connection is closed by the pool instead
+
+      .. versionadded:: 0.6
+         The *releaseConnection* method.
+      """
       if self.cursorPool:
          self.cursorPool.close()
          self.cursorPool = None
-      self.connection.close()
+      connection, self.connection = self.connection, None
+      self.pool.release(connection, discard)
 
    def commit(self):
-      """ Commit changes to database """
+      """ Writes the pending rows and commit changes to database, the
+      pooled adapters take a connection from the pool to do it """
       logging.debug("Commiting changes to database.")
-      self.connection.commit()
+      if self.connection is not None:
+         self.flush()
+         self.connection.commit()
+         return
+
+      self.connection = self.pool.acquire(self.poolTimeout)
+      try:
+         self.flush()
+         self.connection.commit()
+      except:
+         self.releaseConnection(discard=True)
+         raise
+      self.releaseConnection()
+
+   def flush(self):
+      """ Writes the pending rows with multi-row insert statements
+
+      .. versionadded:: 0.6
+         The *flush* method.
+      """
+      if self.popBins is None:
+         pop_table = Consts.CDefMySQLDBTablePop
+      else:
+         pop_table = Consts.CDefMySQLDBTablePopBins
+      self.insertRows(Consts.CDefMySQLDBTable, self.pendingStats)
+      self.insertRows(pop_table, self.pendingPop)
+      self.pendingDumps = 0
+      self.pendingStats = []
+      self.pendingPop = []
+
+   def insertRows(self, table, rows):
+      """ Inserts the rows on the table, up to :attr:`Consts.CDefMySQLInsertRows`
+      rows by statement
+
+      :param table: the table name
+      :param rows: the list of row tuples
+
+      .. versionadded:: 0.6
+         The *insertRows* method.
+      """
+      if not rows:
+         return
+      c = self.getCursor()
+      values = "(%s)" % ", ".join(["%s"] * len(rows[0]))
+      for start in xrange(0, len(rows), Consts.CDefMySQLInsertRows):
+         chunk = rows[start:start + Consts.CDefMySQLInsertRows]
+         pstmt = "insert into %s values %s" % (table, ", ".join([values] * len(chunk)))
+         c.execute(pstmt, tuple(value for row in chunk for value in row))
 
    def getCursor(self):
       """ Return a cursor from the pool
@@ -732,17 +1731,25 @@ class DBMySQLAdapter(DBBaseAdapter):
               individual INTEGER, fitness DOUBLE(14,6), raw DOUBLE(14,6))""" % (Consts.CDefMySQLDBTablePop)
       logging.debug("Creating table %s: %s.", Consts.CDefMySQLDBTablePop, pstmt)
       c.execute(pstmt)
+
+      if self.popBins is not None:
+         pstmt = """create table if not exists %s(identify VARCHAR(80), generation INTEGER,
+                 bin INTEGER, individuals INTEGER, rawMin DOUBLE(14,6), rawMax DOUBLE(14,6),
+                 rawAve DOUBLE(14,6), fitAve DOUBLE(14,6))""" % (Consts.CDefMySQLDBTablePopBins)
+         logging.debug("Creating table %s: %s.", Consts.CDefMySQLDBTablePopBins, pstmt)
+         c.execute(pstmt)
       self.commit()
 
    def resetTableIdentify(self):
       """ Delete all records on the table with the same Identify """
       c = self.getCursor()
-      stmt = "delete from %s where identify = '%s'" % (Consts.CDefMySQLDBTable, self.getIdentify())
-      stmt2 = "delete from %s where identify = '%s'" % (Consts.CDefMySQLDBTablePop, self.getIdentify())
+      tables = [Consts.CDefMySQLDBTable, Consts.CDefMySQLDBTablePop]
+      if self.popBins is not None:
+         tables.append(Consts.CDefMySQLDBTablePopBins)
 
       logging.debug("Erasing data from the tables with the identify = %s", self.getIdentify())
-      c.execute(stmt)
-      c.execute(stmt2)
+      for table in tables:
+         c.execute("delete from %s where identify = %%s" % (table,), (self.getIdentify(),))
 
       self.commit()
 
@@ -756,9 +1763,32 @@ class DBMySQLAdapter(DBBaseAdapter):
       c = self.getCursor()
       c.execute("drop table if exists %s" % (Consts.CDefMySQLDBTable,))
       c.execute("drop table if exists %s" % (Consts.CDefMySQLDBTablePop,))
+      c.execute("drop table if exists %s" % (Consts.CDefMySQLDBTablePopBins,))
       self.commit()
       self.createStructure(stats)
 
+   def populationBins(self, population):
+      """ Returns the population bins rows, the individuals are sorted by
+      the raw score and split in *pop_bins* groups of the same size
+
+      :param population: the population, or a list of :class:`DBIndividualScores`
+      :rtype: the list of (bin, individuals, rawMin, rawMax, rawAve, fitAve) tuples
+
+      .. versionadded:: 0.6
+         The *populationBins* method.
+      """
+      scores = sorted((ind.score, ind.fitness) for ind in population)
+      size = len(scores)
+      bins = min(self.popBins, size)
+      rows = []
+      for b in xrange(bins):
+         group = scores[b * size // bins:(b + 1) * size // bins]
+         count = float(len(group))
+         rows.append((b, len(group), group[0][0], group[-1][0],
+                      sum(score for score, fitness in group) / count,
+                      sum(fitness for score, fitness in group) / count))
+      return rows
+
    def insert(self, ga_engine):
       """ Inserts the statistics data to database
 
@@ -770,21 +1800,254 @@ class DBMySQLAdapter(DBBaseAdapter):
       stats = ga_engine.getStatistics()
       population = ga_engine.getPopulation()
       generation = ga_engine.getCurrentGeneration()
+      identify = self.getIdentify()
 
-      c = self.getCursor()
-      pstmt = "insert into " + Consts.CDefMySQLDBTable + " values (%s, %s, "
-      for i in xrange(len(stats)):
-         pstmt += "%s, "
-      pstmt = pstmt[:-2] + ")"
-      c.execute(pstmt, (self.getIdentify(), generation) + stats.asTuple())
+      self.pendingStats.append((identify, generation) + stats.asTuple())
+      if self.popBins is None:
+         for i in xrange(len(population)):
+            ind = population[i]
+            self.pendingPop.append((identify, generation, i, ind.fitness, ind.score))
+      else:
+         for row in self.populationBins(population):
+            self.pendingPop.append((identify, generation) + row)
 
-      pstmt = "insert into " + Consts.CDefMySQLDBTablePop + " values(%s, %s, %s, %s, %s)"
+      self.pendingDumps += 1
+      if (generation % self.commitFreq == 0) or (self.pool is not None and self.pendingDumps >= self.batchSize):
+         self.commit()
+      elif self.pendingDumps >= self.batchSize:
+         self.flush()
 
-      tups = []
-      for i in xrange(len(population)):
-         ind = population[i]
-         tups.append((self.getIdentify(), generation, i, ind.fitness, ind.score))
+class DBEngineSnapshot(object):
+   """ DBEngineSnapshot Class - A copy of the data of the GA Engine used by
+   the DB Adapters, taken at the statistics dump
 
-      c.executemany(pstmt, tups)
-      if (generation % self.commitFreq == 0):
-         self.commit()
+   It has the same methods of the GA Engine read by the adapters:
+   :meth:`getStatistics`, :meth:`getCurrentGeneration`, :meth:`getGenerations`,
+   :meth:`getMinimax` and :meth:`getPopulation`, where the population is a
+   list of :class:`DBIndividualScores` with the *score* and *fitness* of each
+   individual.
+
+   :param ga_engine: the GA Engine
+   :param dump: if False, only the settings of the engine are copied, with
+                empty statistics and population, as used to open the adapters
+
+   .. versionadded:: 0.6
+      The :class:`DBEngineSnapshot` class.
+   """
+
+   __slots__ = ["statistics", "currentGeneration", "generations", "minimax", "population"]
+
+   def __init__(self, ga_engine, dump=True):
+      """ The class constructor """
+      self.currentGeneration = ga_engine.getCurrentGeneration()
+      self.generations = ga_engine.getGenerations()
+      self.minimax = ga_engine.getMinimax()
+      if dump:
+         self.statistics = ga_engine.getStatistics().clone()
+         self.population = [DBIndividualScores(ind.score, ind.fitness) for ind in ga_engine.getPopulation()]
+      else:
+         self.statistics = Statistics.Statistics()
+         self.population = []
+
+   def getStatistics(self):
+      """ Returns the statistics of the dumped generation """
+      return self.statistics
+
+   def getCurrentGeneration(self):
+      """ Returns the dumped generation """
+      return self.currentGeneration
+
+   def getGenerations(self):
+      """ Returns the number of generations of the evolution """
+      return self.generations
+
+   def getMinimax(self):
+      """ Returns the minimax mode of the evolution """
+      return self.minimax
+
+   def getPopulation(self):
+      """ Returns the scores of the population """
+      return self.population
+
+DBIndividualScores = namedtuple("DBIndividualScores", ["score", "fitness"])
+
+class DBAsyncAdapter(DBBaseAdapter):
+   """ DBAsyncAdapter Class - Runs another DB Adapter on a writer thread
+
+   Inheritance diagram for :class:`DBAdapters.DBAsyncAdapter`:
+
+   .. inheritance-diagram:: DBAdapters.DBAsyncAdapter
+
+   The statistics and the scores of the population are copied on each dump
+   (see :class:`DBEngineSnapshot`) and put on a bounded queue, the writer
+   thread takes the copies from the queue and writes them with the wrapped
+   adapter, many at once with the :meth:`DBBaseAdapter.insertBatch` method.
+   All the methods of the wrapped adapter (open, insert and commitAndClose)
+   are called on the writer thread, so adapters like the :class:`DBSQLite`,
+   whose connection can't be shared between threads, can be used.
+
+   Example:
+      >>> adapter = DBAdapters.DBAsyncAdapter(DBAdapters.DBSQLite(identify="run_01"))
+      >>> ga_engine.setDBAdapter(adapter)
+
+   When the queue is full, the evolution waits for the writer (the
+   back-pressure); if *block* is False, the new dump is discarded instead
+   and counted on :meth:`getDropped`. The :meth:`commitAndClose` waits for
+   all the queued dumps to be written. An exception raised by the wrapped
+   adapter is raised again on the next dump or on the close; after it, the
+   dumps are discarded and the wrapped adapter is only closed.
+
+   :param adapter: the DB Adapter instance to run on the writer thread
+   :param queue_size: the max number of dumps waiting on the queue
+   :param batch_size: the max number of dumps written at once
+   :param block: if True, the dump waits when the queue is full
+
+   .. versionadded:: 0.6
+      The :class:`DBAsyncAdapter` class.
+   """
+
+   def __init__(self, adapter, queue_size=Consts.CDefDBAsyncQueueSize,
+                batch_size=Consts.CDefDBAsyncBatchSize, block=True):
+      """ The creator of the DBAsyncAdapter Class """
+      if not isinstance(adapter, DBBaseAdapter):
+         Util.raiseException("The adapter must be a DBBaseAdapter subclass instance", TypeError)
+
+      super(DBAsyncAdapter, self).__init__(adapter.getStatsGenFreq(), adapter.getIdentify())
+      self.adapter = adapter
+      self.queueSize = queue_size
+      self.batchSize = batch_size
+      self.block = block
+      self.queue = None
+      self.writer = None
+      self.error = None
+      self.failed = False
+      self.dropped = 0
+
+   def __repr__(self):
+      """ The string representation of adapter """
+      ret = "DBAsyncAdapter DB Adapter [adapter=%s, queue size=%d]" % (self.adapter, self.queueSize)
+      return ret
+
+   def setIdentify(self, identify):
+      """ Sets the identify of the wrapped adapter
+
+      :param identify: the id string
+      """
+      self.adapter.setIdentify(identify)
+
+   def getIdentify(self):
+      """ Return the identify of the wrapped adapter
+
+      :rtype: identify string
+      """
+      return self.adapter.getIdentify()
+
+   def getStatsGenFreq(self):
+      """ Returns the frequency of statistical dump of the wrapped adapter
+
+      :rtype: the generation interval of statistical dump
+      """
+      return self.adapter.getStatsGenFreq()
+
+   def setStatsGenFreq(self, statsGenFreq):
+      """ Set the frequency of statistical dump of the wrapped adapter
+
+      :param statsGenFreq: the generation interval of statistical dump
+      """
+      self.adapter.setStatsGenFreq(statsGenFreq)
+
+   def getDropped(self):
+      """ Returns the number of dumps discarded because the queue was full
+
+      :rtype: the number of discarded dumps
+      """
+      return self.dropped
+
+   def open(self, ga_engine):
+      """ Starts the writer thread, which opens the wrapped adapter
+
+      :param ga_engine: the GA Engine
+      """
+      self.queue = Queue.Queue(self.queueSize)
+      self.error = None
+      self.failed = False
+      self.dropped = 0
+      self.writer = threading.Thread(target=self.__writerLoop, args=(DBEngineSnapshot(ga_engine, False),),
+                                     name="DBAsyncAdapter writer")
+      self.writer.daemon = True
+      logging.debug("Starting the writer thread of %s", self.adapter)
+      self.writer.start()
+
+   def __writerFailed(self):
+      """ Keeps the exception being handled, to be raised again by the
+      evolution thread; only the first failure is kept """
+      if self.failed:
+         logging.warning("The DB Adapter writer thread failed again: %s", sys.exc_info()[1])
+         return
+      self.failed = True
+      self.error = sys.exc_info()
+
+   def __writerLoop(self, snapshot):
+      """ The writer thread, writes the dumps of the queue until the close """
+      try:
+         try:
+            self.adapter.open(snapshot)
+         except Exception:
+            self.__writerFailed()
+
+         closing = False
+         while not closing:
+            batch = [self.queue.get()]
+            while len(batch) < self.batchSize:
+               try:
+                  batch.append(self.queue.get_nowait())
+               except Queue.Empty:
+                  break
+
+            if batch[-1] is None:
+               closing = True
+               batch.pop()
+
+            # After a failure, the dumps are discarded so the evolution never waits
+            if batch and not self.failed:
+               try:
+                  self.adapter.insertBatch(batch)
+               except Exception:
+                  self.__writerFailed()
+      finally:
+         try:
+            self.adapter.commitAndClose()
+         except Exception:
+            self.__writerFailed()
+
+   def __raiseWriterError(self):
+      """ Raises again the exception of the writer thread """
+      if self.error is not None:
+         expt_type, expt, trace = self.error
+         self.error = None
+         logging.critical("The DB Adapter writer thread failed: %s", expt)
+         raise expt_type, expt, trace
+
+   def insert(self, ga_engine):
+      """ Copies the statistics and puts them on the writer queue
+
+      :param ga_engine: the GA Engine
+      """
+      self.__raiseWriterError()
+      try:
+         self.queue.put(DBEngineSnapshot(ga_engine), self.block)
+      except Queue.Full:
+         self.dropped += 1
+         logging.warning("The DB Adapter queue is full, discarding the statistics of the generation %d",
+                         ga_engine.getCurrentGeneration())
+
+   def commitAndClose(self):
+      """ Waits for the writer thread to write all the queued dumps and to
+      close the wrapped adapter """
+      if self.writer is None:
+         return
+      logging.debug("Waiting for the writer thread of %s", self.adapter)
+      self.queue.put(None)
+      self.writer.join()
+      self.writer = None
+      self.__raiseWriterError()
@@ -0,0 +1,296 @@
+"""
+:mod:`G2DArray` -- the 2D array chromosomes
+================================================================
+
+This is the 2D Array representation, the genes are stored on a single
+numpy *ndarray* instead of a list of lists, so the genetic operators of
+this chromosome work on the whole array at once (masks, blocks and
+vectorized mutations) and the copy of a genome is a single buffer copy.
+These chromosomes are intended for large grids, like a 512x512 layout,
+where the :class:`G2DList.G2DList` and :class:`G2DBinaryString.G2DBinaryString`
+chromosomes spend most of the time indexing python lists.
+
+The :class:`G2DArray` carries integers or reals, the data type is defined by
+the initializator, and the :class:`G2DBinaryArray` carries the 0 and 1 bits.
+Both chromosome classes extend the :class:`GenomeBase.GenomeBase`.
+
+.. note:: These chromosomes require numpy.
+
+Default Parameters
+-------------------------------------------------------------
+
+*Initializator*
+
+   :func:`Initializators.G2DArrayInitializatorInteger`
+
+   The Integer Initializator for G2DArray, the
+   :func:`Initializators.G2DBinaryArrayInitializator` for G2DBinaryArray
+
+*Mutator*
+
+   :func:`Mutators.G2DArrayMutatorSwap`
+
+   The Swap Mutator for G2DArray, the :func:`Mutators.G2DBinaryArrayMutatorFlip`
+   for G2DBinaryArray
+
+*Crossover*
+
+   :func:`Crossovers.G2DArrayCrossoverUniform`
+
+   The Uniform Crossover for G2DArray and G2DBinaryArray
+
+.. versionadded:: 0.6
+   Added the module :mod:`G2DArray`
+
+Class
+-------------------------------------------------------------
+
+
+"""
+
+from GenomeBase import GenomeBase
+import Consts
+import Util
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class G2DArray(GenomeBase):
+    """ G2DArray Class - The 2D Array chromosome representation
+
+    Inheritance diagram for :class:`G2DArray.G2DArray`:
+
+    .. inheritance-diagram:: G2DArray.G2DArray
+
+    **Examples**
+
+       The instantiation
+          >>> genome = G2DArray.G2DArray(512, 512)
+
+       Compare
+          >>> genome2 = genome1.clone()
+          >>> genome2 == genome1
+          True
+
+       Get/set and the internal array
+          >>> genome.setItem(1, 2, 3)
+          >>> genome.getItem(1, 2)
+          3
+          >>> genome[1, 2]
+          3
+          >>> genome.getInternalArray()[:, 2].sum()
+          (...)
+
+    :param height: the number of rows
+    :param width: the number of columns
+
+    """
+
+    __slots__ = ["height", "width", "genomeArray"]
+
+    def __init__(self, height, width, cloning=False):
+        """ The initializator of G2DArray representation,
+        height and width must be specified """
+        if numpy is None:
+            Util.raiseException("The %s chromosome requires numpy !" % (self.__class__.__name__,), ImportError)
+
+        super(G2DArray, self).__init__()
+        self.height = height
+        self.width = width
+        self.genomeArray = None
+
+        if not cloning:
+            self.genomeArray = numpy.zeros((height, width), dtype=self.arrayType())
+            self.setDefaultOperators()
+
+    def arrayType(self):
+        """ Returns the data type of the array allocated by the constructor,
+        the initializators may replace the array with one of other type """
+        return numpy.int64
+
+    def setDefaultOperators(self):
+        """ Sets the default initializator, mutator and crossover """
+        self.initializator.set(Consts.CDefG2DArrayInit)
+        self.mutator.set(Consts.CDefG2DArrayMutator)
+        self.crossover.set(Consts.CDefG2DArrayCrossover)
+
+    def __eq__(self, other):
+        """ Compares one chromosome with another """
+        cond1 = (self.height == other.height)
+        cond2 = (self.width == other.width)
+        return True if cond1 and cond2 and numpy.array_equal(self.genomeArray, other.genomeArray) else False
+
+    def getHash(self):
+        """ Returns a hash of the array contents
+
+        :rtype: the hash of the genome
+        """
+        return hash((self.genomeArray.shape, self.genomeArray.tostring()))
+
+    def getItem(self, x, y):
+        """ Return the specified gene of the array
+
+        Example:
+           >>> genome.getItem(3, 1)
+           666
+
+        :param x: the x index, the row
+        :param y: the y index, the column
+        :rtype: the item at x,y position
+
+        """
+        return self.genomeArray[x, y]
+
+    def setItem(self, x, y, value):
+        """ Set the specified gene of the array
+
+        Example:
+           >>> genome.setItem(3, 1, 666)
+
+        :param x: the x index, the row
+        :param y: the y index, the column
+        :param value: the value
+
+        """
+        if self.changeLog is not None:
+            self.changeLog.append(((x, y), self.genomeArray[x, y], value))
+        self.genomeArray[x, y] = value
+
+    def __getitem__(self, key):
+        """ Return the specified row, or the gene when the key is a (x, y) tuple """
+        return self.genomeArray[key]
+
+    def __iter__(self):
+        """ Iterator support to the rows of the array """
+        return iter(self.genomeArray)
+
+    def __len__(self):
+        """ Return the number of rows of the array """
+        return self.height
+
+    def getHeight(self):
+        """ Return the height (lines) of the array """
+        return self.height
+
+    def getWidth(self):
+        """ Return the width (columns) of the array """
+        return self.width
+
+    def getSize(self):
+        """ Returns a tuple (height, widht)
+
+        Example:
+           >>> genome.getSize()
+           (3, 2)
+
+        """
+        return self.getHeight(), self.getWidth()
+
+    def __repr__(self):
+        """ Return a string representation of Genome """
+        ret = GenomeBase.__repr__(self)
+        ret += "- %s\n" % (self.__class__.__name__,)
+        ret += "\tArray size:\t %s\n" % (self.getSize(),)
+        ret += "\tArray type:\t %s\n" % (self.genomeArray.dtype,)
+        ret += "\tArray:\n"
+        ret += "\t\t\t" + str(self.genomeArray).replace("\n", "\n\t\t\t")
+        ret += "\n\n"
+        return ret
+
+    def resumeString(self):
+        """ Returns a resumed string representation of the Genome """
+        return str(self.genomeArray)
+
+    def clearArray(self):
+        """ Set all genes of the Genome to zero """
+        self.genomeArray = numpy.zeros((self.height, self.width), dtype=self.genomeArray.dtype)
+        self.invalidateChangeLog()
+
+    def getInternalArray(self):
+        """ Returns the internal array of the genome
+
+        :rtype: the internal ndarray
+        """
+        return self.genomeArray
+
+    def setInternalArray(self, array):
+        """ Assigns an array to the internal array of the chromosome
+
+        :param array: the array to assign, with the (height, width) shape
+        """
+        array = numpy.ascontiguousarray(array)
+        if array.shape != (self.height, self.width):
+            Util.raiseException("The array shape %s must be %s" % (array.shape, (self.height, self.width)), ValueError)
+        self.genomeArray = array
+        self.invalidateChangeLog()
+
+    def copy(self, g):
+        """ Copy genome to 'g'
+
+        Example:
+           >>> genome_origin.copy(genome_destination)
+
+        :param g: the destination G2DArray instance
+
+        """
+        GenomeBase.copy(self, g)
+        g.height = self.height
+        g.width = self.width
+        g.genomeArray = self.genomeArray.copy()
+
+    def clone(self):
+        """ Return a new instace copy of the genome
+
+        :rtype: the G2DArray clone instance
+
+        """
+        newcopy = self.__class__(self.height, self.width, True)
+        self.copy(newcopy)
+        return newcopy
+
+
+class G2DBinaryArray(G2DArray):
+    """ G2DBinaryArray Class - The 2D Binary Array chromosome, the bits are
+    stored on an uint8 array
+
+    Inheritance diagram for :class:`G2DArray.G2DBinaryArray`:
+
+    .. inheritance-diagram:: G2DArray.G2DBinaryArray
+
+    Example:
+       >>> genome = G2DArray.G2DBinaryArray(512, 512)
+
+    :param height: the number of rows
+    :param width: the number of columns
+
+    """
+
+    __slots__ = []
+
+    def arrayType(self):
+        """ Returns the data type of the array, uint8 """
+        return numpy.uint8
+
+    def setDefaultOperators(self):
+        """ Sets the default initializator, mutator and crossover """
+        self.initializator.set(Consts.CDefG2DBinaryArrayInit)
+        self.mutator.set(Consts.CDefG2DBinaryArrayMutator)
+        self.crossover.set(Consts.CDefG2DBinaryArrayCrossover)
+
+    def setItem(self, x, y, value):
+        """ Set the specified gene of the array
+
+        Example:
+           >>> genome.setItem(3, 1, 0)
+
+        :param x: the x index, the row
+        :param y: the y index, the column
+        :param value: the value (integers 0 or 1)
+
+        """
+        if value not in (0, 1):
+            Util.raiseException("The item value must be 0 or 1 in the G2DBinaryArray chromosome", ValueError)
+        G2DArray.setItem(self, x, y, value)
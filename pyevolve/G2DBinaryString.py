@@ -82,6 +82,13 @@ class G2DBinaryString(GenomeBase):
         cond3 = (self.width == other.width)
         return True if cond1 and cond2 and cond3 else False
 
+    def getHash(self):
+        """ Returns a hash of the binary string contents
+
+        :rtype: the hash of the genome
+        """
+        return hash(tuple([tuple(line) for line in self.genomeString]))
+
     def getItem(self, x, y):
         """ Return the specified gene of List
 
@@ -109,6 +116,8 @@ class G2DBinaryString(GenomeBase):
         """
         if value not in [0, 1]:
             Util.raiseException("The item value must be 0 or 1 in the G2DBinaryString chromosome", ValueError)
+        if self.changeLog is not None:
+            self.changeLog.append(((x, y), self.genomeString[x][y], value))
         self.genomeString[x][y] = value
 
     def __getitem__(self, key):
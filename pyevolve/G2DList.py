@@ -112,6 +112,13 @@ class G2DList(GenomeBase):
         cond3 = (self.width == other.width)
         return True if cond1 and cond2 and cond3 else False
 
+    def getHash(self):
+        """ Returns a hash of the list contents
+
+        :rtype: the hash of the genome
+        """
+        return hash(tuple([tuple(line) for line in self.genomeList]))
+
     def getItem(self, x, y):
         """ Return the specified gene of List
 
@@ -139,6 +146,8 @@ class G2DList(GenomeBase):
         :param value: the value
 
         """
+        if self.changeLog is not None:
+            self.changeLog.append(((x, y), self.genomeList[x][y], value))
         self.genomeList[x][y] = value
 
     def __getitem__(self, key):
@@ -7,11 +7,33 @@ In this module, there are the :class:`GAllele.GAlleles` class (which is the
 class that holds the allele types) and all the
 allele types to use with the supported chromosomes.
 
+The alleles are compiled into flat lookup tables (:class:`GAllele.GAllelesTable`),
+used by the allele operators to draw the random alleles of many positions
+at once.
+
 """
 import random
+import weakref
 import Consts
 import Util
 
+try:
+   import numpy
+except ImportError:
+   numpy = None
+
+def _watchAllele(owner, allele):
+   """ Registers the :class:`GAlleles` *owner* to be told of the changes of
+   the *allele*, the alleles without the *owners* set are ignored """
+   owners = getattr(allele, "owners", None)
+   if owners is not None:
+      owners.add(owner)
+
+def _allelesChanged(allele):
+   """ Marks the compiled tables of the :class:`GAlleles` with the *allele* as outdated """
+   for owner in getattr(allele, "owners", ()):
+      owner.table = None
+
 class GAlleles(object):
    """ GAlleles Class - The set of alleles
 
@@ -34,6 +56,40 @@ class GAlleles(object):
       if allele_list is not None:
          self.allele_list.extend(allele_list)
       self.homogeneous = homogeneous
+      self.table = None
+      for allele in self.allele_list:
+         _watchAllele(self, allele)
+
+   def __getstate__(self):
+      """ The compiled table isn't pickled, it's compiled again when needed """
+      state = self.__dict__.copy()
+      state["table"] = None
+      return state
+
+   def __setstate__(self, state):
+      """ Restores the state and watches the changes of the alleles again """
+      self.__dict__.update(state)
+      for allele in self.allele_list:
+         _watchAllele(self, allele)
+
+   def getTable(self):
+      """ Returns the alleles compiled into a :class:`GAllelesTable`, the
+      table is compiled on the first call and again when the alleles change
+
+      .. note:: the changes made directly on the internal lists of the alleles
+                (like the *options* of the :class:`GAlleleList`) aren't
+                detected, use the methods of the alleles to change them.
+
+      :rtype: the :class:`GAllelesTable` instance
+
+      .. versionadded:: 0.6
+         The *getTable* method.
+      """
+      table = self.table
+      if table is None or table.homogeneous != self.homogeneous:
+         table = GAllelesTable(self)
+         self.table = table
+      return table
 
    def __iadd__(self, allele):
       """ To add more alleles using the += operator
@@ -51,6 +107,8 @@ class GAlleles(object):
 
       """
       self.allele_list.append(allele)
+      _watchAllele(self, allele)
+      self.table = None
 
    def __getslice__(self, a, b):
       """ Returns the slice part of alleles list """
@@ -74,6 +132,8 @@ class GAlleles(object):
       if self.homogeneous:
          self.allele_list[0] = value
       self.allele_list[index] = value
+      _watchAllele(self, value)
+      self.table = None
 
    def __iter__(self):
       """ Return the list iterator """
@@ -122,10 +182,23 @@ class GAlleleList(object):
       self.options = []
       if options is not None:
          self.options.extend(options)
+      self.owners = weakref.WeakSet()
+
+   def __getstate__(self):
+      """ The watching GAlleles aren't pickled, they watch the allele again when loaded """
+      state = self.__dict__.copy()
+      del state["owners"]
+      return state
+
+   def __setstate__(self, state):
+      """ Restores the state of the allele """
+      self.__dict__.update(state)
+      self.owners = weakref.WeakSet()
 
    def clear(self):
       """ Removes all the allele options from the list """
       del self.options[:]
+      _allelesChanged(self)
 
    def getRandomAllele(self):
       """ Returns one random choice from the options list """
@@ -138,6 +211,7 @@ class GAlleleList(object):
 
       """
       self.options.append(option)
+      _allelesChanged(self)
 
    def __getslice__(self, a, b):
       """ Returns the slice part of options """
@@ -150,6 +224,7 @@ class GAlleleList(object):
    def __setitem__(self, index, value):
       """ Sets the index option of the list """
       self.options[index] = value
+      _allelesChanged(self)
 
    def __iter__(self):
       """ Return the list iterator """
@@ -166,6 +241,7 @@ class GAlleleList(object):
 
       """
       self.options.remove(option)
+      _allelesChanged(self)
 
    def __repr__(self):
       """ Return a string representation of the allele """
@@ -195,12 +271,25 @@ class GAlleleRange(object):
       self.real = real
       self.minimum = None
       self.maximum = None
+      self.owners = weakref.WeakSet()
       self.__processMinMax()
 
+   def __getstate__(self):
+      """ The watching GAlleles aren't pickled, they watch the allele again when loaded """
+      state = self.__dict__.copy()
+      del state["owners"]
+      return state
+
+   def __setstate__(self, state):
+      """ Restores the state of the allele """
+      self.__dict__.update(state)
+      self.owners = weakref.WeakSet()
+
    def __processMinMax(self):
       """ Process the mininum and maximum of the Allele """
       self.minimum = min([x for x, y in self.beginEnd])
       self.maximum = max([y for x, y in self.beginEnd])
+      _allelesChanged(self)
 
    def add(self, begin, end):
       """ Add a new range
@@ -245,6 +334,7 @@ class GAlleleRange(object):
       del self.beginEnd[:]
       self.minimum = None
       self.maximum = None
+      _allelesChanged(self)
 
    def getRandomAllele(self):
       """ Returns one random choice between the range """
@@ -263,6 +353,7 @@ class GAlleleRange(object):
 
       """
       self.real = flag
+      _allelesChanged(self)
 
    def getReal(self):
       """ Returns True if the range is real or False if it is integer """
@@ -282,3 +373,123 @@ class GAlleleRange(object):
          ret += "\t\t\t Range from [%s] to [%s]\n" % (beg, end)
       ret += "\n"
       return ret
+
+class GAllelesTable(object):
+   """ GAllelesTable Class - The alleles compiled into flat lookup tables
+
+   The options of all the :class:`GAlleleList` alleles are put on a single
+   array, indexed by the offset and the count of options of each position,
+   and the ranges of all the :class:`GAlleleRange` alleles on the arrays of
+   begins and ends, indexed by the offset and the count of ranges of each
+   position. This way, the random alleles of many positions (of one genome or
+   of the whole population) are drawn with a single vectorized draw, with the
+   same distribution of the *getRandomAllele* methods. The other allele types
+   use their *getRandomAllele* method.
+
+   The tables are built by the :meth:`GAlleles.getTable` method.
+
+   Example:
+      >>> table = alleles.getTable()
+      >>> table.sample([0, 1, 1, 5])
+      [4, 12.5, 10.2, 'a']
+
+   :param alleles: the :class:`GAlleles` instance
+
+   .. versionadded:: 0.6
+      The *GAllelesTable* class.
+   """
+
+   LIST, INTEGER, REAL, OTHER = range(4)
+
+   def __init__(self, alleles):
+      """ The constructor of GAllelesTable class """
+      self.homogeneous = alleles.homogeneous
+      allele_list = alleles.allele_list[:1] if self.homogeneous else alleles.allele_list
+      self.size = len(allele_list)
+      self.samplers = [allele.getRandomAllele for allele in allele_list]
+
+      kinds = []
+      option_offset, option_count, options = [], [], []
+      range_offset, range_count, begins, ends = [], [], [], []
+
+      for allele in allele_list:
+         option_offset.append(len(options))
+         range_offset.append(len(begins))
+         if isinstance(allele, GAlleleList) and len(allele) > 0:
+            kinds.append(self.LIST)
+            options.extend(allele.options)
+         elif isinstance(allele, GAlleleRange) and len(allele) > 0:
+            kinds.append(self.REAL if allele.getReal() else self.INTEGER)
+            begins.extend([begin for begin, end in allele])
+            ends.extend([end for begin, end in allele])
+         else:
+            kinds.append(self.OTHER)
+         option_count.append(len(options) - option_offset[-1])
+         range_count.append(len(begins) - range_offset[-1])
+
+      if numpy is None:
+         return
+
+      self.kinds = numpy.array(kinds, dtype=numpy.int8)
+      self.optionOffset = numpy.array(option_offset, dtype=numpy.int64)
+      self.optionCount = numpy.array(option_count, dtype=numpy.int64)
+      self.options = numpy.empty(len(options), dtype=object)
+      for i, option in enumerate(options):
+         self.options[i] = option
+      self.rangeOffset = numpy.array(range_offset, dtype=numpy.int64)
+      self.rangeCount = numpy.array(range_count, dtype=numpy.int64)
+      self.begins = numpy.array(begins, dtype=float)
+      self.ends = numpy.array(ends, dtype=float)
+
+   def sample(self, positions):
+      """ Draws a random allele for each one of the positions, the draws are
+      vectorized when there are at least :attr:`Consts.CDefAlleleTableMinDraws`
+      positions and numpy is available
+
+      :param positions: the sequence of gene positions, a position can be repeated
+      :rtype: the list of random alleles
+      """
+      vectorized = numpy is not None and len(positions) >= Consts.CDefAlleleTableMinDraws
+      if self.homogeneous:
+         if not vectorized:
+            sampler = self.samplers[0]
+            return [sampler() for pos in positions]
+         positions = numpy.zeros(len(positions), dtype=numpy.int64)
+      else:
+         if not vectorized:
+            samplers = self.samplers
+            return [samplers[pos]() for pos in positions]
+         positions = numpy.asarray(positions, dtype=numpy.int64)
+         if positions.max() >= self.size or positions.min() < 0:
+            Util.raiseException("The alleles don't have all the positions of the chromosome. " +
+                                "You may consider use the 'homogeneous' parameter of the GAlleles class.", IndexError)
+
+      rng = Util.numpyRandomState()
+      kinds = self.kinds[positions]
+      choice = rng.random_sample(len(positions))
+      values = numpy.empty(len(positions), dtype=object)
+
+      selected = kinds == self.LIST
+      if selected.any():
+         which = positions[selected]
+         index = self.optionOffset[which] + (choice[selected] * self.optionCount[which]).astype(numpy.int64)
+         values[selected] = self.options[index]
+
+      for kind in (self.INTEGER, self.REAL):
+         selected = kinds == kind
+         if not selected.any():
+            continue
+         which = positions[selected]
+         index = self.rangeOffset[which] + (choice[selected] * self.rangeCount[which]).astype(numpy.int64)
+         begins = self.begins[index]
+         ends = self.ends[index]
+         if kind == self.INTEGER:
+            drawn = begins + numpy.floor(rng.random_sample(len(which)) * (ends - begins + 1))
+            values[selected] = drawn.astype(numpy.int64).tolist()
+         else:
+            values[selected] = (begins + rng.random_sample(len(which)) * (ends - begins)).tolist()
+
+      for i in numpy.flatnonzero(kinds == self.OTHER).tolist():
+         values[i] = self.samplers[positions[i]]()
+
+      return values.tolist()
@@ -35,7 +35,9 @@ Class
 import Consts
 import Util
 from FunctionSlot import FunctionSlot
+from GenomeBase import GTreeBase
 from Statistics import Statistics
+import Network
 from math import sqrt as math_sqrt
 import logging
 
@@ -72,15 +74,25 @@ def key_fitness_score(individual):
    return individual.fitness
 
 
-def multiprocessing_eval(ind):
+# The genome used to decode the individuals on the worker processes
+_codecTemplate = None
+
+def multiprocessing_init(template):
+   """ Internal used by the multiprocessing (the worker initializer) """
+   global _codecTemplate
+   _codecTemplate = template
+
+def multiprocessing_eval(data):
    """ Internal used by the multiprocessing """
+   ind = Network.decodeGenome(data, _codecTemplate)
    ind.evaluate()
    return ind.score
 
-def multiprocessing_eval_full(ind):
+def multiprocessing_eval_full(data):
    """ Internal used by the multiprocessing (full copy)"""
+   ind = Network.decodeGenome(data, _codecTemplate)
    ind.evaluate()
-   return ind
+   return Network.encodeGenome(ind)
 
 
 class GPopulation(object):
@@ -263,6 +275,11 @@ class GPopulation(object):
 
       self.stats["rawVar"] = tmpvar
 
+      if isinstance(self.oneSelfGenome, GTreeBase):
+         sizes = [len(ind) for ind in self.internalPop]
+         self.stats["sizeAve"] = sum(sizes) / float(len_pop)
+         self.stats["sizeMax"] = float(max(sizes))
+
       self.statted = True
 
    def bestFitness(self, index=0):
@@ -361,17 +378,48 @@ class GPopulation(object):
          if individual.compare(self.internalPop[i]) == 0:
             return True
 
+   def __initializeDiverse(self, **args):
+      """ Initializes the individuals rejecting the duplicates, they are
+      detected using the genome hashes (see :meth:`GenomeBase.GenomeBase.getHash`)
+      or the *compare* method when the genome doesn't support hashing """
+      max_attempt = self.oneSelfGenome.getParam("init_max_attempt", Consts.CDefPopInitMaxAttempt)
+      has_compare = hasattr(self.oneSelfGenome, "compare")
+      hashes = set()
+      duplicates = 0
+
+      for i in xrange(len(self.internalPop)):
+         curr = self.internalPop[i]
+         for attempt in xrange(max_attempt):
+            curr.initialize(**args)
+            curr_hash = curr.getHash()
+            if curr_hash is None:
+               if not (has_compare and self.__findIndividual(curr, i)):
+                  break
+            elif curr_hash not in hashes:
+               break
+         else:
+            duplicates += 1
+         hashes.add(curr_hash)
+
+      if duplicates > 0:
+         logging.debug("The population was initialized with %d duplicated individuals.", duplicates)
+
    def initialize(self, **args):
       """ Initialize all individuals of population,
-      this calls the initialize() of individuals """
+      this calls the initialize() of individuals
+
+      When the genome has a single initializator with a population-level
+      version (the *batch* attribute of the function, like in the
+      :func:`Initializators.GTreeGPInitializator`), this version is used
+      to initialize all the individuals at once.
+      """
       logging.debug("Initializing the population")
 
-      if self.oneSelfGenome.getParam("full_diversity", True) and hasattr(self.oneSelfGenome, "compare"):
-         for i in xrange(len(self.internalPop)):
-            curr = self.internalPop[i]
-            curr.initialize(**args)
-            while self.__findIndividual(curr, i):
-               curr.initialize(**args)
+      initializators = self.oneSelfGenome.initializator
+      if len(initializators) == 1 and hasattr(initializators[0], "batch"):
+         initializators[0].batch(self, **args)
+      elif self.oneSelfGenome.getParam("full_diversity", True):
+         self.__initializeDiverse(**args)
       else:
          for gen in self.internalPop:
             gen.initialize(**args)
@@ -386,21 +434,25 @@ class GPopulation(object):
       # We have multiprocessing
       if self.multiProcessing[0] and MULTI_PROCESSING:
          logging.debug("Evaluating the population using the multiprocessing method")
-         proc_pool = Pool(processes=self.multiProcessing[2])
+         proc_pool = Pool(processes=self.multiProcessing[2], initializer=multiprocessing_init,
+                          initargs=(self.oneSelfGenome,))
+         # The individuals are sent with the genome codec, the workers share the template
+         encoded = [Network.encodeGenome(ind) for ind in self.internalPop]
 
          # Multiprocessing full_copy parameter
          if self.multiProcessing[1]:
-            results = proc_pool.map(multiprocessing_eval_full, self.internalPop)
+            results = proc_pool.map(multiprocessing_eval_full, encoded)
             proc_pool.close()
             proc_pool.join()
             for i in xrange(len(self.internalPop)):
-               self.internalPop[i] = results[i]
+               self.internalPop[i] = Network.decodeGenome(results[i], self.oneSelfGenome)
          else:
-            results = proc_pool.map(multiprocessing_eval, self.internalPop)
+            results = proc_pool.map(multiprocessing_eval, encoded)
             proc_pool.close()
             proc_pool.join()
             for individual, score in zip(self.internalPop, results):
                individual.score = score
+               individual.invalidateChangeLog()
       else:
          for ind in self.internalPop:
             ind.evaluate(**args)
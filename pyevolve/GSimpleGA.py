@@ -36,6 +36,16 @@ Default Parameters
 
    Maximize the evaluation function
 
+*Duplicated Offspring*
+
+   >>> Consts.duplicateOffspringType["keep"]
+
+   The duplicated offspring are kept and evaluated
+
+*Batch Mode*
+
+   Default is **False**
+
 *DB Adapter*
 
    Default is **None**
@@ -54,6 +64,10 @@ Default Parameters
 
    The Rank Selection method
 
+*Local Search*
+
+   Default is **None**, see the :mod:`LocalSearch` module
+
 Class
 -------------------------------------------------------------
 
@@ -228,6 +242,8 @@ class GSimpleGA(object):
         self.setPopulationSize(Consts.CDefGAPopulationSize)
         self.minimax = Consts.minimaxType["maximize"]
         self.elitism = True
+        self.duplicateOffspring = Consts.duplicateOffspringType["keep"]
+        self.batchMode = False
 
         # Adapters
         self.dbAdapter = None
@@ -242,8 +258,9 @@ class GSimpleGA(object):
         self.selector = FunctionSlot("Selector")
         self.stepCallback = FunctionSlot("Generation Step Callback")
         self.terminationCriteria = FunctionSlot("Termination Criteria")
+        self.localSearch = FunctionSlot("Local Search")
         self.selector.set(Consts.CDefGASelector)
-        self.allSlots = (self.selector, self.stepCallback, self.terminationCriteria)
+        self.allSlots = (self.selector, self.stepCallback, self.terminationCriteria, self.localSearch)
 
         self.internalParams = {}
 
@@ -367,6 +384,8 @@ class GSimpleGA(object):
     def __repr__(self):
         """ The string representation of the GA Engine """
         minimax_type = Consts.minimaxType.keys()[Consts.minimaxType.values().index(self.minimax)]
+        dup_types = Consts.duplicateOffspringType
+        dup_type = dup_types.keys()[dup_types.values().index(self.duplicateOffspring)]
         ret = "- GSimpleGA\n"
         ret += "\tGP Mode:\t\t %s\n" % self.getGPMode()
         ret += "\tPopulation Size:\t %d\n" % self.internalPop.popSize
@@ -377,6 +396,8 @@ class GSimpleGA(object):
         ret += "\tMinimax Type:\t\t %s\n" % minimax_type.capitalize()
         ret += "\tElitism:\t\t %s\n" % self.elitism
         ret += "\tElitism Replacement:\t %d\n" % self.nElitismReplacement
+        ret += "\tDuplicated Offspring:\t %s\n" % dup_type.capitalize()
+        ret += "\tBatch Mode:\t\t %s\n" % self.batchMode
         ret += "\tDB Adapter:\t\t %s\n" % self.dbAdapter
         for slot in self.allSlots:
             ret += "\t" + slot.__repr__()
@@ -551,6 +572,50 @@ class GSimpleGA(object):
             Util.raiseException("Elitism option must be True or False", TypeError)
         self.elitism = flag
 
+    def setDuplicateOffspring(self, dtype):
+        """ Sets how the duplicated offspring are handled, use Consts.duplicateOffspringType
+
+        The duplicates are detected using the genome hashes (see
+        :meth:`GenomeBase.GenomeBase.getHash`), an offspring is a duplicate when
+        it's equal to an individual of the current population or to another
+        offspring of the same generation. When rejecting, the pair of offspring
+        is created again up to the *duplicate_max_attempt* engine parameter.
+
+        :param dtype: the duplicated offspring mode, from Consts.duplicateOffspringType
+
+        .. versionadded:: 0.6
+           The *setDuplicateOffspring* method.
+        """
+        if dtype not in Consts.duplicateOffspringType.values():
+            Util.raiseException("Duplicated offspring mode must be keep, reject or penalize", TypeError)
+        self.duplicateOffspring = dtype
+
+    def setBatchMode(self, flag=True):
+        """ Sets the batch mode, True or False
+
+        In the batch mode, when the genome has a single mutator with a
+        population-level version (the *batch* attribute of the function, like
+        in the :func:`Mutators.G1DListMutatorRealGaussian`), the offspring are
+        created without mutation and then the whole offspring population is
+        mutated by this version in a single call.
+
+        The same applies to the crossover (like in the
+        :func:`Crossovers.G1DListCrossoverSinglePoint`): all the parents are
+        selected first and the children are written by a single call into a
+        buffer of new genomes cloned from the population template.
+
+        The batch mode isn't used when the duplicated offspring are rejected
+        or penalized.
+
+        :param flag: True or False
+
+        .. versionadded:: 0.6
+           The *setBatchMode* method.
+        """
+        if type(flag) != BooleanType:
+            Util.raiseException("Batch mode option must be True or False", TypeError)
+        self.batchMode = flag
+
     def getDBAdapter(self):
         """ Gets the DB Adapter of the GA Engine
 
@@ -632,6 +697,106 @@ class GSimpleGA(object):
         """
         return self.internalPop.getStatistics()
 
+    def __getBatchOperator(self, slot):
+        """ Returns the population-level version of the operator of the
+        *slot* used on the batch mode, or None """
+        if not self.batchMode or self.duplicateOffspring != Consts.duplicateOffspringType["keep"]:
+            return None
+        if len(slot) == 1 and hasattr(slot[0], "batch"):
+            return slot[0].batch
+        return None
+
+    def __offspringBuffer(self, count):
+        """ Returns *count* new genomes to be overwritten by the batched crossover """
+        return [self.internalPop.oneSelfGenome.clone() for i in xrange(count)]
+
+    def __createPairsBatch(self, crossover, npairs, mutate=True):
+        """ Selects the parents of *npairs* pairs and creates the offspring
+        with the batched *crossover*, mutated when *mutate* is True """
+        index = dict((id(ind), i) for i, ind in enumerate(self.internalPop))
+        moms = []
+        dads = []
+        for i in xrange(npairs):
+            moms.append(index[id(self.select(popID=self.currentGeneration))])
+            dads.append(index[id(self.select(popID=self.currentGeneration))])
+
+        offspring = crossover(self.internalPop.internalPop, moms, dads, self.__offspringBuffer(2 * npairs),
+                              pcross=self.pCrossover, ga_engine=self)
+        for ind in offspring:
+            ind.invalidateChangeLog()
+        if mutate:
+            for ind in offspring:
+                ind.mutate(pmut=self.pMutation, ga_engine=self)
+        return offspring
+
+    def __createPair(self, crossover_empty, mutate=True):
+        """ Selects two parents and creates a pair of offspring, mutated when *mutate* is True """
+        genomeMom = self.select(popID=self.currentGeneration)
+        genomeDad = self.select(popID=self.currentGeneration)
+
+        if not crossover_empty and (self.pCrossover >= 1.0 or Util.randomFlipCoin(self.pCrossover)):
+            for it in genomeMom.crossover.applyFunctions(mom=genomeMom, dad=genomeDad, count=2):
+                (sister, brother) = it
+            sister.invalidateChangeLog()
+            brother.invalidateChangeLog()
+        else:
+            sister = genomeMom.clone()
+            brother = genomeDad.clone()
+
+        if mutate:
+            sister.mutate(pmut=self.pMutation, ga_engine=self)
+            brother.mutate(pmut=self.pMutation, ga_engine=self)
+        return [sister, brother]
+
+    def __createSingle(self, mutate=True):
+        """ Selects two parents and creates a single offspring, used on odd population sizes """
+        genomeMom = self.select(popID=self.currentGeneration)
+        genomeDad = self.select(popID=self.currentGeneration)
+
+        if Util.randomFlipCoin(self.pCrossover):
+            for it in genomeMom.crossover.applyFunctions(mom=genomeMom, dad=genomeDad, count=1):
+                (sister, brother) = it
+            sister.invalidateChangeLog()
+        else:
+            sister = random.choice([genomeMom, genomeDad])
+            sister = sister.clone()
+            if mutate:
+                sister.mutate(pmut=self.pMutation, ga_engine=self)
+        return [sister]
+
+    def __createOffspring(self, create, hashes, penalized):
+        """ Creates the offspring using the *create* function, handling the
+        duplicates according to the duplicated offspring mode
+
+        :param create: the function which creates a list of offspring
+        :param hashes: the set with the hashes of the individuals seen in this generation,
+                       or None to keep the duplicates
+        :param penalized: the list where the penalized duplicates are appended
+        :rtype: the list of offspring to be evaluated
+        """
+        if hashes is None:
+            return create()
+
+        if self.duplicateOffspring == Consts.duplicateOffspringType["reject"]:
+            max_attempt = self.getParam("duplicate_max_attempt", Consts.CDefGADuplicateMaxAttempt)
+            for attempt in xrange(max_attempt):
+                offspring = create()
+                offspring_hashes = [ind.getHash() for ind in offspring]
+                if hashes.isdisjoint(offspring_hashes) and len(set(offspring_hashes)) == len(offspring_hashes):
+                    break
+            hashes.update(offspring_hashes)
+            return offspring
+
+        offspring = []
+        for ind in create():
+            ind_hash = ind.getHash()
+            if ind_hash in hashes:
+                penalized.append(ind)
+            else:
+                hashes.add(ind_hash)
+                offspring.append(ind)
+        return offspring
+
     def step(self):
         """ Just do one step in evolution, one generation """
         newPop = GPopulation(self.internalPop)
@@ -645,44 +810,53 @@ class GSimpleGA(object):
 
         crossover_empty = self.select(popID=self.currentGeneration).crossover.isEmpty()
 
-        for i in xrange(0, size_iterate, 2):
-            genomeMom = self.select(popID=self.currentGeneration)
-            genomeDad = self.select(popID=self.currentGeneration)
-
-            if not crossover_empty and self.pCrossover >= 1.0:
-                for it in genomeMom.crossover.applyFunctions(mom=genomeMom, dad=genomeDad, count=2):
-                    (sister, brother) = it
-            else:
-                if not crossover_empty and Util.randomFlipCoin(self.pCrossover):
-                    for it in genomeMom.crossover.applyFunctions(mom=genomeMom, dad=genomeDad, count=2):
-                        (sister, brother) = it
-                else:
-                    sister = genomeMom.clone()
-                    brother = genomeDad.clone()
-
-            sister.mutate(pmut=self.pMutation, ga_engine=self)
-            brother.mutate(pmut=self.pMutation, ga_engine=self)
-
-            newPop.internalPop.append(sister)
-            newPop.internalPop.append(brother)
+        hashes = None
+        penalized = []
+        if self.duplicateOffspring != Consts.duplicateOffspringType["keep"]:
+            hashes = set([ind.getHash() for ind in self.internalPop])
+            if None in hashes:
+                logging.debug("The genome doesn't support hashing, the duplicated offspring will be kept.")
+                hashes = None
+
+        genome = self.internalPop.oneSelfGenome
+        batch_mutator = self.__getBatchOperator(genome.mutator)
+        batch_crossover = None if crossover_empty else self.__getBatchOperator(genome.crossover)
+        mutate = batch_mutator is None
+
+        if batch_crossover is not None:
+            newPop.internalPop.extend(self.__createPairsBatch(batch_crossover, size_iterate // 2, mutate))
+        else:
+            create_pair = lambda: self.__createPair(crossover_empty, mutate)
+            for i in xrange(0, size_iterate, 2):
+                newPop.internalPop.extend(self.__createOffspring(create_pair, hashes, penalized))
 
         if len(self.internalPop) % 2 != 0:
-            genomeMom = self.select(popID=self.currentGeneration)
-            genomeDad = self.select(popID=self.currentGeneration)
+            create_single = lambda: self.__createSingle(mutate)
+            newPop.internalPop.extend(self.__createOffspring(create_single, hashes, penalized))
 
-            if Util.randomFlipCoin(self.pCrossover):
-                for it in genomeMom.crossover.applyFunctions(mom=genomeMom, dad=genomeDad, count=1):
-                    (sister, brother) = it
-            else:
-                sister = random.choice([genomeMom, genomeDad])
-                sister = sister.clone()
-                sister.mutate(pmut=self.pMutation, ga_engine=self)
+        if batch_mutator is not None:
+            mutations = batch_mutator(newPop.internalPop, pmut=self.pMutation, ga_engine=self)
+            logging.debug("The offspring population was mutated with %d mutations.", sum(mutations))
 
-            newPop.internalPop.append(sister)
+        if not self.localSearch.isEmpty():
+            logging.debug("Applying the local search to the new created population.")
+            for ind in newPop.internalPop:
+                for it in self.localSearch.applyFunctions(ind, ga_engine=self):
+                    if it:
+                        ind.invalidateChangeLog()
 
         logging.debug("Evaluating the new created population.")
         newPop.evaluate()
 
+        if len(penalized) > 0:
+            logging.debug("Penalizing %d duplicated offspring.", len(penalized))
+            worst_score = self.internalPop.worstRaw().score
+            for ind in penalized:
+                ind.score = worst_score
+                ind.invalidateChangeLog()
+            newPop.internalPop.extend(penalized)
+            newPop.clearFlags()
+
         if self.elitism:
             logging.debug("Doing elitism.")
             if self.getMinimax() == Consts.minimaxType["maximize"]:
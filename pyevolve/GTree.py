@@ -34,6 +34,8 @@ Classes
 -------------------------------------------------------------
 """
 import random
+import math
+from collections import OrderedDict
 from GenomeBase import GenomeBase, GTreeBase, GTreeNodeBase
 import Consts
 import Util
@@ -71,6 +73,14 @@ class GTree(GTreeBase):
         ret += GTreeBase.__repr__(self)
         return ret
 
+    def getHash(self):
+        """ Returns a hash of the tree, computed from the data and the
+        number of childs of the nodes
+
+        :rtype: the hash of the tree
+        """
+        return hash(tuple([(node.node_data, len(node.childs)) for node in self.nodes_list]))
+
     def copy(self, g):
         """ Copy the contents to the destination g
 
@@ -239,12 +249,13 @@ class GTreeNodeGP(GTreeNodeBase):
     :param parent: the node parent
 
     """
-    __slots__ = ["node_type", "node_data"]
+    __slots__ = ["node_type", "node_data", "node_hash"]
 
     def __init__(self, data, node_type=0, parent=None):
         super(GTreeNodeGP, self).__init__(parent)
         self.node_type = node_type
         self.node_data = data
+        self.node_hash = None
 
     def __repr__(self):
         str_repr = GTreeNodeBase.__repr__(self)
@@ -270,6 +281,7 @@ class GTreeNodeGP(GTreeNodeBase):
         :param data: the internal data
         """
         self.node_data = data
+        self.invalidateHash()
 
     def getData(self):
         """Gets the node internal data
@@ -284,6 +296,7 @@ class GTreeNodeGP(GTreeNodeBase):
         :param node_type: the node type is type of Consts.nodeType
         """
         self.node_type = node_type
+        self.invalidateHash()
 
     def getType(self):
         """Get the node type
@@ -302,6 +315,74 @@ class GTreeNodeGP(GTreeNodeBase):
         self.addChild(node)
         return node
 
+    def addChild(self, child):
+        """ Adds a child to the node
+
+        :param child: the node to be added
+        """
+        GTreeNodeBase.addChild(self, child)
+        self.invalidateHash()
+
+    def replaceChild(self, older, newer):
+        """ Replaces a child of the node
+
+        :param older: the child to be replaces
+        :param newer: the new child which replaces the older
+        """
+        GTreeNodeBase.replaceChild(self, older, newer)
+        self.invalidateHash()
+
+    def getHash(self):
+        """ Returns the structural hash of the subtree rooted at this node,
+        computed from the type and data of the nodes and from the order
+        of the childs. Two subtrees with the same structure will have the
+        same hash.
+
+        The hash is cached on the nodes and it's only computed again for
+        the subtrees changed after the last call.
+
+        :rtype: the hash of the subtree
+
+        .. versionadded:: 0.6
+           The *getHash* method.
+        """
+        if self.node_hash is not None:
+            return self.node_hash
+
+        node_stack = [self]
+        while len(node_stack) > 0:
+            node = node_stack[-1]
+            pending = [c for c in node.childs if c.node_hash is None]
+            if len(pending) > 0:
+                node_stack.extend(pending)
+                continue
+            node_stack.pop()
+            node.node_hash = hash((node.node_type, node.node_data,
+                                   tuple([c.node_hash for c in node.childs])))
+
+        return self.node_hash
+
+    def getSignature(self):
+        """ Returns the signature of the node, a tuple with the type and
+        data of the node and the hashes of its childs (see :meth:`getHash`).
+        Two subtrees with the same hash but a different signature aren't
+        the same subtree.
+
+        :rtype: the tuple with the signature of the node
+
+        .. versionadded:: 0.6
+           The *getSignature* method.
+        """
+        return (self.node_type, self.node_data, tuple([c.getHash() for c in self.childs]))
+
+    def invalidateHash(self):
+        """ Invalidates the cached hash of this node and of all
+        its ancestors, this is called every time the node changes """
+        node = self
+        while node is not None and node.node_hash is not None:
+            node.node_hash = None
+            node = node.parent
+
     def swapNodeData(self, node):
         """Swaps the node data and type with another node
 
@@ -322,6 +403,7 @@ class GTreeNodeGP(GTreeNodeBase):
         GTreeNodeBase.copy(self, g)
         g.node_data = self.node_data
         g.node_type = self.node_type
+        g.node_hash = self.node_hash
 
     def clone(self):
         """ Return a new copy of the node
@@ -448,22 +530,31 @@ class GTreeGP(GTreeBase):
 
         :rtype: a S-Expression representing the tree
         """
-        str_buff = ""
+        str_buff = []
         if start_node is None:
             start_node = self.getRoot()
-            str_buff += "%s " % start_node.getData()
+            str_buff.append("%s " % start_node.getData())
+
+        # The stack holds the nodes to expand and the strings to write
+        node_stack = [start_node]
+        write, push, pop = str_buff.append, node_stack.append, node_stack.pop
+        while node_stack:
+            item = pop()
+            if isinstance(item, basestring):
+                write(item)
+                continue
 
-        is_leaf = start_node.isLeaf()
-        if not is_leaf:
-            str_buff += "( "
+            childs = item.childs
+            if not childs:
+                continue
 
-        for child_node in start_node.getChilds():
-            str_buff += "%s " % child_node.getData()
-            str_buff += self.getSExpression(child_node)
+            write("( ")
+            push(" )")
+            for child_node in reversed(childs):
+                push(child_node)
+                push("%s " % child_node.node_data)
 
-        if not is_leaf:
-            str_buff += " )"
-        return str_buff
+        return "".join(str_buff)
 
     def getPreOrderExpression(self, start_node=None):
         """ Return the pre order expression string of the Tree, used
@@ -474,29 +565,157 @@ class GTreeGP(GTreeBase):
         if start_node is None:
             start_node = self.getRoot()
 
-        str_buff = start_node.getData()
+        str_buff = []
 
-        if not start_node.isLeaf():
-            all_childs = start_node.getChilds()
-            str_buff += "(" + self.getPreOrderExpression(all_childs[0])
+        # The stack holds the nodes to expand and the strings to write
+        node_stack = [start_node]
+        write, push, pop = str_buff.append, node_stack.append, node_stack.pop
+        while node_stack:
+            item = pop()
+            if isinstance(item, basestring):
+                write(item)
+                continue
 
-            for index in xrange(1, len(all_childs)):
-                child = all_childs[index]
-                str_buff += ", " + self.getPreOrderExpression(child)
-            str_buff += ")"
+            write(item.node_data)
+            childs = item.childs
+            if not childs:
+                continue
 
-        return str_buff
+            push(")")
+            for index in xrange(len(childs) - 1, 0, -1):
+                push(childs[index])
+                push(", ")
+            push(childs[0])
+            push("(")
 
-    def getCompiledCode(self):
+        return "".join(str_buff)
+
+    def getCompiledCode(self, simplify=False, functions=None):
         """ Get the compiled code for the Tree expression
         After getting the compiled code object, you just need to evaluate it using
         the :func:`eval` native Python method.
 
+        :param simplify: if True, the expression is compiled from the simplified
+                         tree (see :func:`simplifyGTreeGP`), the genome is not changed
+        :param functions: the functions used by the simplification, if *None*
+                          the functions will be looked up on *__main__*
         :rtype: compiled python code
         """
-        expr = self.getPreOrderExpression()
+        if simplify:
+            expr = self.getPreOrderExpression(simplifyGTreeGP(self.getRoot(), functions))
+        else:
+            expr = self.getPreOrderExpression()
         return compile(expr, "<string>", "eval")
 
+    def getHash(self):
+        """ Returns the structural hash of the tree, see
+        :meth:`GTreeNodeGP.getHash`
+
+        :rtype: the hash of the tree
+        """
+        return self.getRoot().getHash()
+
+    def evaluateDataset(self, dataset, cache=None, functions=None, simplify=False, dataset_key=None):
+        """ Evaluates the tree expression over all the rows of a dataset
+        at once, instead of calling :func:`eval` row by row.
+
+        The *dataset* is a dict which maps each terminal variable name to
+        a sequence (list or numpy array) with the values of that variable
+        on every row; terminals not found on the dataset (like constants)
+        are evaluated and broadcast to all rows.
+
+        Non-terminals decorated with *vectorized=True* (see :func:`gpdec`)
+        receive the vectors of the childs and must return the output
+        vector, the other ones are applied row by row.
+
+        When a :class:`GTreeGPSubtreeCache` is used, the output of each
+        non-terminal subtree is stored using the subtree structural hash,
+        so common subtrees shared by the individuals of the population
+        are evaluated only once for the same dataset. The outputs are
+        kept while the cache is used with the same dataset object or, when
+        the *dataset_key* is used, with the same key; if you change the
+        values of the dataset in place, you must use another key or clear
+        the cache.
+
+        Example:
+           >>> cache = GTreeGPSubtreeCache()
+           >>> output = genome.evaluateDataset({"a": a_values, "b": b_values}, cache)
+
+        :param dataset: the dict with the values of the terminals
+        :param cache: the :class:`GTreeGPSubtreeCache` instance or None
+        :param functions: a dict with the non-terminal functions, if *None*
+                          the functions will be looked up on *__main__*
+        :param simplify: if True, the simplified tree is evaluated
+                         (see :func:`simplifyGTreeGP`)
+        :param dataset_key: the key (like a version) which identifies the
+                            dataset on the cache, if *None* the dataset
+                            object is used
+        :rtype: the output vector of the tree
+
+        .. note:: the vectors returned can be shared with the cache, so you
+                  must not change them in place.
+        """
+        if functions is None:
+            import __main__ as main_module
+            functions = main_module.__dict__
+
+        if len(dataset) <= 0:
+            Util.raiseException("The dataset must have at least one terminal", ValueError)
+        rows = len(dataset.itervalues().next())
+
+        if cache is not None:
+            cache.bind(dataset, dataset_key)
+
+        root = self.getRoot()
+        if simplify:
+            root = simplifyGTreeGP(root, functions)
+
+        terminal_type = Consts.nodeType["TERMINAL"]
+        results = []
+        node_stack = [(root, False)]
+
+        while len(node_stack) > 0:
+            node, expanded = node_stack.pop()
+
+            if node.node_type == terminal_type:
+                data = node.node_data
+                if data in dataset:
+                    results.append(dataset[data])
+                else:
+                    results.append([eval(data, {}, functions)] * rows)
+                continue
+
+            if not expanded:
+                if cache is not None:
+                    output = cache.get(node.getHash(), node)
+                    if output is not None:
+                        results.append(output)
+                        continue
+                node_stack.append((node, True))
+                node_stack.extend([(c, False) for c in reversed(node.childs)])
+                continue
+
+            nargs = len(node.childs)
+            if nargs > 0:
+                args = results[-nargs:]
+                del results[-nargs:]
+            else:
+                args = []
+
+            func = functions[node.node_data]
+            if getattr(func, "vectorized", False):
+                output = func(*args)
+            elif nargs > 0:
+                output = map(func, *args)
+            else:
+                output = [func() for i in xrange(rows)]
+
+            if cache is not None:
+                cache.put(node.getHash(), output, node)
+            results.append(output)
+
+        return results[0]
+
     def copy(self, g):
         """ Copy the contents to the destination g
 
@@ -618,6 +837,143 @@ class GTreeGP(GTreeBase):
         graph.write(filename, prog='dot', format="raw")
 
 
+class GTreeGPSubtreeCache(object):
+    """ GTreeGPSubtreeCache Class - A bounded cache for the outputs of
+    GP subtrees, used by :meth:`GTreeGP.evaluateDataset`
+
+    The outputs are indexed by the subtree structural hash, with the
+    signature of the subtree root (see :meth:`GTreeNodeGP.getSignature`)
+    checked on each hit, so a hash collision is a miss, and the least
+    recently used ones are discarded when the cache reaches the maximum
+    number of entries or the maximum memory size. The memory used by an
+    output is estimated as 8 bytes per item (or by the *nbytes* attribute
+    of numpy arrays).
+
+    The cache is bound to a dataset, when a different dataset (or dataset
+    key) is used all the entries are discarded.
+
+    Example:
+       >>> cache = GTreeGPSubtreeCache(max_entries=10000)
+       >>> output = genome.evaluateDataset(dataset, cache)
+       >>> print cache.getStats()
+
+    :param max_entries: the maximum number of subtree outputs
+    :param max_bytes: the maximum (estimated) memory in bytes
+
+    """
+
+    def __init__(self, max_entries=None, max_bytes=None):
+        if max_entries is None:
+            max_entries = Consts.CDefGPCacheMaxEntries
+        if max_bytes is None:
+            max_bytes = Consts.CDefGPCacheMaxBytes
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.used_bytes = 0
+        self.dataset = None
+        self.dataset_key = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __repr__(self):
+        """ Return a string representation of the cache """
+        ret = "- GTreeGPSubtreeCache\n"
+        ret += "\tEntries:\t\t%d/%d\n" % (len(self.entries), self.max_entries)
+        ret += "\tMemory:\t\t\t%d/%d bytes\n" % (self.used_bytes, self.max_bytes)
+        ret += "\tHits/Misses:\t\t%d/%d\n" % (self.hits, self.misses)
+        return ret
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def bind(self, dataset, key=None):
+        """ Binds the cache to a dataset, if the dataset is not the
+        same used before, the cache is cleared. A reference to the
+        dataset is kept, so its id can't be reused by another one.
+
+        :param dataset: the dataset
+        :param key: the key which identifies the dataset, if *None*
+                    the dataset object is compared
+        """
+        if key is None:
+            same = dataset is self.dataset and self.dataset_key is None
+        else:
+            same = key == self.dataset_key
+        if not same:
+            self.clear()
+        self.dataset = dataset
+        self.dataset_key = key
+
+    def get(self, key, node=None):
+        """ Returns the output cached for the subtree hash
+
+        :param key: the subtree hash
+        :param node: the root node of the subtree, if used, its signature
+                     must be the same of the subtree cached
+        :rtype: the output or None if the key is not on the cache
+        """
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            self.misses += 1
+            return None
+        if node is not None and entry[2] != node.getSignature():
+            self.entries[key] = entry
+            self.misses += 1
+            return None
+        self.entries[key] = entry
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, output, node=None):
+        """ Adds the output of a subtree to the cache, discarding the
+        least recently used outputs when the cache is full
+
+        :param key: the subtree hash
+        :param output: the output vector of the subtree
+        :param node: the root node of the subtree, its signature is
+                     checked by :meth:`get`
+        """
+        size = getattr(output, "nbytes", None)
+        if size is None:
+            size = len(output) * 8
+        if size > self.max_bytes or self.max_entries <= 0:
+            return
+
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.used_bytes -= old[1]
+
+        while len(self.entries) > 0 and \
+                (len(self.entries) >= self.max_entries or self.used_bytes + size > self.max_bytes):
+            old = self.entries.popitem(last=False)[1]
+            self.used_bytes -= old[1]
+            self.evictions += 1
+
+        signature = node.getSignature() if node is not None else None
+        self.entries[key] = (output, size, signature)
+        self.used_bytes += size
+
+    def clear(self):
+        """ Removes all the entries of the cache """
+        self.entries.clear()
+        self.used_bytes = 0
+
+    def getStats(self):
+        """ Returns the cache counters
+
+        :rtype: a dict with the hits, misses, evictions, entries and bytes
+        """
+        return {"hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "entries": len(self.entries),
+                "bytes": self.used_bytes}
+
+
 #################################
 #    Tree GP Utility Functions  #
 #################################
@@ -625,7 +981,15 @@ class GTreeGP(GTreeBase):
 def gpdec(**kwds):
     """ This is a decorator to use with genetic programming non-terminals
 
-    It currently accepts the attributes: shape, color and representation.
+    It currently accepts the attributes: shape, color and representation,
+    used by the graph plotting, *vectorized*, used by the
+    :meth:`GTreeGP.evaluateDataset` method, and the algebraic properties
+    *pure*, *commutative*, *identity*, *zero* and *equal_args*, used by
+    :func:`simplifyGTreeGP`.
+
+    Example:
+       >>> @gpdec(pure=True, commutative=True, identity=1, zero=0)
+       >>> def gp_mul(a, b): return a * b
     """
     def decorate(f):
         for k in kwds:
@@ -647,10 +1011,182 @@ def checkTerminal(terminal):
         return terminal
 
 
+def getTerminalConstant(terminal):
+    """ Returns the numeric value of a constant terminal, like the ones
+    created by the ephemeral constants, or None if the terminal is not
+    a number
+
+    :param terminal: the terminal string
+    :rtype: the int/float value or None
+    """
+    for conv in (int, float):
+        try:
+            value = conv(terminal)
+        except (ValueError, TypeError):
+            continue
+        if isinstance(value, float) and (math.isinf(value) or math.isnan(value)):
+            return None
+        return value
+    return None
+
+
+def _isSameSubtree(node_a, node_b):
+    """ Structural equality of two GTreeNodeGP subtrees """
+    if node_a.getHash() != node_b.getHash():
+        return False
+    node_stack = [(node_a, node_b)]
+    while len(node_stack) > 0:
+        a, b = node_stack.pop()
+        if a.compare(b) != 0 or len(a.childs) != len(b.childs):
+            return False
+        node_stack.extend(zip(a.childs, b.childs))
+    return True
+
+
+def simplifyGTreeGP(root_node, functions=None):
+    """ Returns a simplified copy of a GP tree, the original tree is not
+    changed. The simplification uses the algebraic properties declared on
+    the non-terminal functions with the :func:`gpdec` decorator:
+
+    *pure*
+       the function has no side effects and its output only depends on
+       the arguments, the other properties are only used on pure functions.
+       Subtrees made only of constants are folded into a constant.
+
+    *commutative*
+       the order of the two arguments doesn't matter, they are ordered
+       by their structural hash and the *identity* and *zero* are checked
+       on both sides.
+
+    *identity*
+       the value *e* where f(x, e) == x, ie. 0 for add, 1 for mul
+
+    *zero*
+       the value *z* where f(x, z) == z, ie. 0 for mul
+
+    *equal_args*
+       the value of f(x, x), ie. 0 for sub
+
+    The *identity*, *zero* and *equal_args* properties are only used on
+    functions with two arguments. Subtrees are only discarded when they
+    are made only of pure functions.
+
+    Example:
+       >>> @gpdec(pure=True, equal_args=0, identity=0)
+       >>> def gp_sub(a, b): return a - b
+       >>> root = simplifyGTreeGP(genome.getRoot())
+       >>> expr = genome.getPreOrderExpression(root)
+
+    :param root_node: the root node of the tree
+    :param functions: a dict with the non-terminal functions, if *None*
+                      the functions will be looked up on *__main__*
+    :rtype: the root node of the simplified copy
+
+    .. versionadded:: 0.6
+       The *simplifyGTreeGP* function.
+    """
+    if functions is None:
+        import __main__ as main_module
+        functions = main_module.__dict__
+
+    terminal_type = Consts.nodeType["TERMINAL"]
+    nonterminal_type = Consts.nodeType["NONTERMINAL"]
+    no_value = object()
+
+    def constant(value):
+        if isinstance(value, bool) or not isinstance(value, (int, long, float)):
+            return None
+        if isinstance(value, float) and (math.isinf(value) or math.isnan(value)):
+            return None
+        return (GTreeNodeGP(repr(value), terminal_type), value, True)
+
+    # Each result is a tuple (new node, constant value, pure subtree)
+    results = []
+    node_stack = [(root_node, False)]
+
+    while len(node_stack) > 0:
+        node, expanded = node_stack.pop()
+
+        if node.node_type == terminal_type:
+            value = getTerminalConstant(node.node_data)
+            results.append((GTreeNodeGP(node.node_data, terminal_type),
+                            no_value if value is None else value, True))
+            continue
+
+        if not expanded:
+            node_stack.append((node, True))
+            node_stack.extend([(c, False) for c in reversed(node.childs)])
+            continue
+
+        nargs = len(node.childs)
+        if nargs > 0:
+            childs = results[-nargs:]
+            del results[-nargs:]
+        else:
+            childs = []
+
+        func = functions.get(node.node_data)
+        pure = getattr(func, "pure", False)
+        result = None
+
+        if pure and nargs > 0 and all(c[1] is not no_value for c in childs):
+            try:
+                result = constant(func(*[c[1] for c in childs]))
+            except Exception:
+                result = None
+
+        if result is None and pure and nargs == 2:
+            if getattr(func, "commutative", False) and childs[0][0].getHash() > childs[1][0].getHash():
+                childs.reverse()
+            result = _simplifyBinary(func, childs, no_value, constant)
+
+        if result is None:
+            new_node = GTreeNodeGP(node.node_data, nonterminal_type)
+            for child in childs:
+                child[0].setParent(new_node)
+                new_node.addChild(child[0])
+            result = (new_node, no_value, pure and all(c[2] for c in childs))
+
+        results.append(result)
+
+    new_root = results[0][0]
+    new_root.setParent(None)
+    return new_root
+
+
+def _simplifyBinary(func, childs, no_value, constant):
+    """ Applies the identity, zero and equal_args rules of a pure binary
+    function, returns None when no rule can be applied """
+    left, right = childs
+    commutative = getattr(func, "commutative", False)
+
+    if hasattr(func, "identity"):
+        identity = func.identity
+        if right[1] is not no_value and right[1] == identity:
+            return left
+        if commutative and left[1] is not no_value and left[1] == identity:
+            return right
+
+    if hasattr(func, "zero"):
+        zero = func.zero
+        if right[1] is not no_value and right[1] == zero and left[2]:
+            return constant(zero)
+        if commutative and left[1] is not no_value and left[1] == zero and right[2]:
+            return constant(zero)
+
+    if hasattr(func, "equal_args") and left[2] and right[2]:
+        if _isSameSubtree(left[0], right[0]):
+            return constant(func.equal_args)
+
+    return None
+
+
 def buildGTreeGPGrow(ga_engine, depth, max_depth):
     """ Creates a new random GTreeGP root node with subtrees using
     the "Grow" method.
 
+    The tree is built iteratively, in pre-order.
+
     :param ga_engine: the GA Core
     :param depth: the initial depth
     :max_depth: the maximum depth of the tree
@@ -663,36 +1199,49 @@ def buildGTreeGPGrow(ga_engine, depth, max_depth):
     gp_function_set = ga_engine.getParam("gp_function_set")
     assert gp_function_set is not None
 
-    if depth == max_depth:
-        random_terminal = checkTerminal(random.choice(gp_terminals))
-        n = GTreeNodeGP(random_terminal, Consts.nodeType["TERMINAL"])
-        return n
-    else:
-        # Do not generate degenerative trees
-        if depth == 0:
-            random_node = random.choice(gp_function_set.keys())
-        else:
-            fchoice = random.choice([gp_function_set.keys(), gp_terminals])
-            random_node = random.choice(fchoice)
+    function_names = gp_function_set.keys()
+    function_choices = [function_names, gp_terminals]
+    terminals_set = set(gp_terminals)
+    terminal_type = Consts.nodeType["TERMINAL"]
+    nonterminal_type = Consts.nodeType["NONTERMINAL"]
 
-        if random_node in gp_terminals:
-            n = GTreeNodeGP(checkTerminal(random_node), Consts.nodeType["TERMINAL"])
+    root = None
+    node_stack = [(None, depth)]
+
+    while len(node_stack) > 0:
+        parent, node_depth = node_stack.pop()
+
+        if node_depth == max_depth:
+            random_terminal = checkTerminal(random.choice(gp_terminals))
+            n = GTreeNodeGP(random_terminal, terminal_type, parent)
         else:
-            n = GTreeNodeGP(random_node, Consts.nodeType["NONTERMINAL"])
+            # Do not generate degenerative trees
+            if node_depth == 0:
+                random_node = random.choice(function_names)
+            else:
+                fchoice = random.choice(function_choices)
+                random_node = random.choice(fchoice)
 
-    if n.getType() == Consts.nodeType["NONTERMINAL"]:
-        for i in xrange(gp_function_set[n.getData()]):
-            child = buildGTreeGPGrow(ga_engine, depth + 1, max_depth)
-            child.setParent(n)
-            n.addChild(child)
+            if random_node in terminals_set:
+                n = GTreeNodeGP(checkTerminal(random_node), terminal_type, parent)
+            else:
+                n = GTreeNodeGP(random_node, nonterminal_type, parent)
+                node_stack.extend([(n, node_depth + 1)] * gp_function_set[random_node])
 
-    return n
+        if parent is None:
+            root = n
+        else:
+            parent.childs.append(n)
+
+    return root
 
 
 def buildGTreeGPFull(ga_engine, depth, max_depth):
     """ Creates a new random GTreeGP root node with subtrees using
     the "Full" method.
 
+    The tree is built iteratively, in pre-order.
+
     :param ga_engine: the GA Core
     :param depth: the initial depth
     :max_depth: the maximum depth of the tree
@@ -704,18 +1253,27 @@ def buildGTreeGPFull(ga_engine, depth, max_depth):
     gp_function_set = ga_engine.getParam("gp_function_set")
     assert gp_function_set is not None
 
-    if depth == max_depth:
-        random_terminal = checkTerminal(random.choice(gp_terminals))
-        n = GTreeNodeGP(random_terminal, Consts.nodeType["TERMINAL"])
-        return n
-    else:
-        random_oper = random.choice(gp_function_set.keys())
-        n = GTreeNodeGP(random_oper, Consts.nodeType["NONTERMINAL"])
+    function_names = gp_function_set.keys()
+    terminal_type = Consts.nodeType["TERMINAL"]
+    nonterminal_type = Consts.nodeType["NONTERMINAL"]
 
-    if n.getType() == Consts.nodeType["NONTERMINAL"]:
-        for i in xrange(gp_function_set[n.getData()]):
-            child = buildGTreeGPFull(ga_engine, depth + 1, max_depth)
-            child.setParent(n)
-            n.addChild(child)
+    root = None
+    node_stack = [(None, depth)]
 
-    return n
+    while len(node_stack) > 0:
+        parent, node_depth = node_stack.pop()
+
+        if node_depth == max_depth:
+            random_terminal = checkTerminal(random.choice(gp_terminals))
+            n = GTreeNodeGP(random_terminal, terminal_type, parent)
+        else:
+            random_oper = random.choice(function_names)
+            n = GTreeNodeGP(random_oper, nonterminal_type, parent)
+            node_stack.extend([(n, node_depth + 1)] * gp_function_set[random_oper])
+
+        if parent is None:
+            root = n
+        else:
+            parent.childs.append(n)
+
+    return root
@@ -7,6 +7,29 @@ This module have the class which every representation extends,
 if you are planning to create a new representation, you must
 take a inside look into this module.
 
+**Incremental evaluation**
+
+When the genome has a *deltaEvaluator* function set, the changes made to the
+genes after each evaluation are recorded on the genome change log, a list of
+*(position, old value, new value)* tuples, and the next evaluation calls the
+delta evaluator instead of the evaluator. The delta evaluator receives the
+genome, still holding the score of the last evaluation, and must return the
+difference of the score caused by the changes of the log. This way, when the
+score of the genome can be updated from the changed genes (like on the TSP
+or the N-Queens problems), the mutated offspring don't need to be evaluated
+from scratch.
+
+Example:
+   >>> def onemax_delta(genome, **args):
+   ...    return sum(new - old for position, old, new in genome.changeLog)
+   >>> genome.deltaEvaluator.set(onemax_delta)
+
+The genes changes are logged by the *__setitem__* of the 1D genomes and by
+the *setItem* of the 2D genomes, so the built-in mutators of these genomes
+support the change log. When the genes are changed in other ways (like by
+the crossovers or by a mutator which doesn't log its changes), the change
+log is invalidated and the next evaluation uses the evaluator.
+
 """
 from random import choice as rand_choice
 import inspect
@@ -16,7 +39,8 @@ import Util
 
 class GenomeBase(object):
    """ GenomeBase Class - The base of all chromosome representation """
-   __slots__ = ["evaluator", "initializator", "mutator", "crossover", "internalParams", "score", "fitness"]
+   __slots__ = ["evaluator", "initializator", "mutator", "crossover", "internalParams", "score", "fitness",
+                "deltaEvaluator", "changeLog"]
 
    def __init__(self):
       """Genome Constructor"""
@@ -24,10 +48,12 @@ class GenomeBase(object):
       self.initializator = FunctionSlot("Initializator")
       self.mutator = FunctionSlot("Mutator")
       self.crossover = FunctionSlot("Crossover")
+      self.deltaEvaluator = FunctionSlot("Delta Evaluator")
 
       self.internalParams = {}
       self.score = 0.0
       self.fitness = 0.0
+      self.changeLog = None
 
    def getRawScore(self):
       """ Get the Raw Score of the genome
@@ -48,7 +74,7 @@ class GenomeBase(object):
    def __repr__(self):
       """String representation of Genome"""
       allSlots = [self.evaluator, self.initializator, self.mutator,
-                  self.crossover]
+                  self.crossover, self.deltaEvaluator]
 
       ret = "- GenomeBase\n"
       ret += "\tScore:\t\t\t %.6f\n" % (self.score,)
@@ -91,20 +117,77 @@ class GenomeBase(object):
       """
       return self.internalParams.get(key, nvl)
 
+   def getHash(self):
+      """ Returns a hash of the contents of the genome, used to detect
+      duplicated individuals, like on the population initialization with
+      the *full_diversity* parameter. Two genomes with the same contents
+      must have the same hash.
+
+      :rtype: the hash, or None if the genome doesn't support hashing
+
+      .. note:: If you are planning to create a new chromosome representation, you
+                should implement this method on your class.
+      """
+      return None
+
    def resetStats(self):
       """ Clear score and fitness of genome """
       self.score = 0.0
       self.fitness = 0.0
 
+   def logChange(self, position, old, new):
+      """ Records a change of a gene on the change log, used by the
+      incremental evaluation. The change is only recorded when the
+      change log is valid.
+
+      :param position: the position of the gene
+      :param old: the old value of the gene
+      :param new: the new value of the gene
+
+      .. versionadded:: 0.6
+         The *logChange* method
+      """
+      if self.changeLog is not None:
+         self.changeLog.append((position, old, new))
+
+   def invalidateChangeLog(self):
+      """ Invalidates the change log, used when the genes were changed
+      without logging the changes. The next evaluation will use the
+      evaluator instead of the delta evaluator.
+
+      .. versionadded:: 0.6
+         The *invalidateChangeLog* method
+      """
+      self.changeLog = None
+
    def evaluate(self, **args):
-      """ Called to evaluate genome
+      """ Called to evaluate genome, using the delta evaluator when it's
+      set and the change log is valid
 
       :param args: this parameters will be passes to the evaluator
 
+      .. versionchanged:: 0.6
+         The incremental evaluation with the *deltaEvaluator*.
       """
+      if self.deltaEvaluator.isEmpty():
+         self.resetStats()
+         for it in self.evaluator.applyFunctions(self, **args):
+            self.score += it
+         return
+
+      if self.changeLog is None:
+         score = 0.0
+         for it in self.evaluator.applyFunctions(self, **args):
+            score += it
+      else:
+         score = self.score
+         if self.changeLog:
+            for it in self.deltaEvaluator.applyFunctions(self, **args):
+               score += it
+
       self.resetStats()
-      for it in self.evaluator.applyFunctions(self, **args):
-         self.score += it
+      self.score = score
+      self.changeLog = []
 
    def initialize(self, **args):
       """ Called to initialize genome
@@ -114,6 +197,7 @@ class GenomeBase(object):
       """
       for it in self.initializator.applyFunctions(self, **args):
          pass
+      self.invalidateChangeLog()
 
    def mutate(self, **args):
       """ Called to mutate the genome
@@ -122,9 +206,14 @@ class GenomeBase(object):
       :rtype: the number of mutations returned by mutation operator
 
       """
+      logged = len(self.changeLog) if self.changeLog is not None else 0
       nmuts = 0
       for it in self.mutator.applyFunctions(self, **args):
          nmuts += it
+
+      # The mutator changed the genes without logging the changes
+      if nmuts > 0 and self.changeLog is not None and len(self.changeLog) == logged:
+         self.invalidateChangeLog()
       return nmuts
 
    def copy(self, g):
@@ -143,6 +232,8 @@ class GenomeBase(object):
       g.mutator = self.mutator
       g.crossover = self.crossover
       g.internalParams = self.internalParams
+      g.deltaEvaluator = self.deltaEvaluator
+      g.changeLog = None if self.changeLog is None else self.changeLog[:]
 
    def clone(self):
       """ Clone this GenomeBase
@@ -176,6 +267,7 @@ class G1DBase(GenomeBase):
    def __iadd__(self, item):
       """ To add more items using the += operator """
       self.genomeList.append(item)
+      self.invalidateChangeLog()
       return self
 
    def __eq__(self, other):
@@ -188,12 +280,28 @@ class G1DBase(GenomeBase):
       """ Used on: *value in genome* """
       return value in self.genomeList
 
+   def getHash(self):
+      """ Returns a hash of the list contents
+
+      :rtype: the hash of the genome
+      """
+      return hash(tuple(self.genomeList))
+
    def __getslice__(self, a, b):
       """ Return the sliced part of chromosome """
       return self.genomeList[a:b]
 
    def __setslice__(self, a, b, val):
       """ Sets the slice part of chromosome """
+      if self.changeLog is not None:
+         old = self.genomeList[a:b]
+         if len(old) != len(val):
+            self.invalidateChangeLog()
+         else:
+            start = max(a, 0)
+            for i in xrange(len(old)):
+               if old[i] != val[i]:
+                  self.changeLog.append((start + i, old[i], val[i]))
       self.genomeList[a:b] = val
 
    def __getitem__(self, key):
@@ -202,6 +310,11 @@ class G1DBase(GenomeBase):
 
    def __setitem__(self, key, value):
       """ Set the specified value for an gene of List """
+      if self.changeLog is not None:
+         if type(key) is slice:
+            self.invalidateChangeLog()
+         else:
+            self.changeLog.append((key % len(self.genomeList), self.genomeList[key], value))
       self.genomeList[key] = value
 
    def __iter__(self):
@@ -233,6 +346,7 @@ class G1DBase(GenomeBase):
 
       """
       self.genomeList.append(value)
+      self.invalidateChangeLog()
 
    def remove(self, value):
       """ Removes an item from the list
@@ -244,10 +358,12 @@ class G1DBase(GenomeBase):
 
       """
       self.genomeList.remove(value)
+      self.invalidateChangeLog()
 
    def clearList(self):
       """ Remove all genes from Genome """
       del self.genomeList[:]
+      self.invalidateChangeLog()
 
    def copy(self, g):
       """ Copy genome to 'g'
@@ -275,6 +391,7 @@ class G1DBase(GenomeBase):
       :param lst: the list to assign the internal list of the chromosome
       """
       self.genomeList = lst
+      self.invalidateChangeLog()
 
 class GTreeNodeBase(object):
    """ GTreeNodeBase Class - The base class for the node tree genomes
@@ -443,10 +560,12 @@ class GTreeBase(GenomeBase):
 
       :rtype: the depth of the node, the depth of root node is 0
       """
-      if node == self.getRoot():
-         return 0
-      else:
-         return 1 + self.getNodeDepth(node.getParent())
+      root = self.getRoot()
+      depth = 0
+      while node is not root:
+         node = node.getParent()
+         depth += 1
+      return depth
 
    def getNodeHeight(self, node):
       """ Returns the height of a node
@@ -456,12 +575,13 @@ class GTreeBase(GenomeBase):
       :rtype: the height of the node
       """
       height = 0
-      if len(node) <= 0:
-         return 0
-      for child in node.getChilds():
-         h_inner = self.getNodeHeight(child) + 1
-         if h_inner > height:
-            height = h_inner
+      node_stack = [(node, 0)]
+      while len(node_stack) > 0:
+         tmp, tmp_height = node_stack.pop()
+         if tmp_height > height:
+            height = tmp_height
+         tmp_height += 1
+         node_stack.extend([(child, tmp_height) for child in tmp.childs])
       return height
 
    def getHeight(self):
@@ -478,11 +598,14 @@ class GTreeBase(GenomeBase):
 
       :rtype: the number of nodes
       """
-      count = 1
       if start_node is None:
          start_node = self.getRoot()
-      for i in start_node.getChilds():
-         count += self.getNodesCount(i)
+      count = 0
+      node_stack = [start_node]
+      while len(node_stack) > 0:
+         tmp = node_stack.pop()
+         count += 1
+         node_stack.extend(tmp.childs)
       return count
 
    def getTraversalString(self, start_node=None, spc=0):
@@ -491,15 +614,17 @@ class GTreeBase(GenomeBase):
 
       :rtype: a string representing the tree
       """
-      str_buff = ""
+      str_buff = []
       if start_node is None:
          start_node = self.getRoot()
-         str_buff += "%s\n" % start_node
-      spaces = spc + 2
-      for child_node in start_node.getChilds():
-         str_buff += "%s%s\n" % (" " * spaces, child_node)
-         str_buff += self.getTraversalString(child_node, spaces)
-      return str_buff
+         str_buff.append("%s\n" % start_node)
+
+      node_stack = [(child, spc + 2) for child in reversed(start_node.getChilds())]
+      while len(node_stack) > 0:
+         child_node, spaces = node_stack.pop()
+         str_buff.append("%s%s\n" % (" " * spaces, child_node))
+         node_stack.extend([(child, spaces + 2) for child in reversed(child_node.getChilds())])
+      return "".join(str_buff)
 
    def traversal(self, callback, start_node=None):
       """ Traversal the tree, this method will call the
@@ -586,10 +711,21 @@ class GTreeBase(GenomeBase):
          g.setRoot(newnode)
       else:
          newnode.setParent(node_parent)
-         node_parent.replaceChild(node, newnode)
+         # The shape of the tree is not changing here, so we bypass
+         # any subclass hook (i.e. GP subtree hash invalidation)
+         GTreeNodeBase.replaceChild(node_parent, node, newnode)
 
-      for ci in xrange(len(newnode)):
-         GTreeBase.copy(self, g, newnode.getChild(ci), newnode)
+      # The clone of a node still points to the original childs,
+      # they are replaced by their clones in place
+      node_stack = [newnode]
+      while len(node_stack) > 0:
+         parent = node_stack.pop()
+         childs = parent.childs
+         for ci in xrange(len(childs)):
+            child = childs[ci].clone()
+            child.parent = parent
+            childs[ci] = child
+            node_stack.append(child)
 
       return newnode
 
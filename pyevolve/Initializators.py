@@ -16,7 +16,9 @@ choosing random data.
 
 from random import randint as rand_randint, uniform as rand_uniform, choice as rand_choice
 import GTree
+import Consts
 import Util
+import logging
 
 
 #############################
@@ -62,7 +64,51 @@ def G1DListInitializatorAllele(genome, **args):
     if allele is None:
         Util.raiseException("to use the G1DListInitializatorAllele, you must specify the 'allele' parameter")
 
-    genome.genomeList = [allele[i].getRandomAllele() for i in xrange(genome.getListSize())]
+    genome.genomeList = allele.getTable().sample(range(genome.getListSize()))
+
+
+def G1DListInitializatorAlleleBatch(population, **args):
+    """ The population-level version of the :func:`G1DListInitializatorAllele`,
+    the alleles of the whole population are drawn at once from the compiled
+    alleles table. When the *full_diversity* genome parameter is True (the
+    default), the duplicated individuals are initialized again, up to
+    *init_max_attempt* times.
+
+    .. versionadded:: 0.6
+       The *G1DListInitializatorAlleleBatch* function.
+    """
+    genome = population.oneSelfGenome
+    allele = genome.getParam("allele", None)
+    if allele is None:
+        Util.raiseException("to use the G1DListInitializatorAllele, you must specify the 'allele' parameter")
+
+    table = allele.getTable()
+    size = genome.getListSize()
+    individuals = list(population)
+    values = table.sample(range(size) * len(individuals))
+    for i, individual in enumerate(individuals):
+        individual.setInternalList(values[i * size:(i + 1) * size])
+
+    if not genome.getParam("full_diversity", True):
+        return
+
+    max_attempt = genome.getParam("init_max_attempt", Consts.CDefPopInitMaxAttempt)
+    hashes = set()
+    duplicates = 0
+    for individual in individuals:
+        attempt = 0
+        while individual.getHash() in hashes and attempt < max_attempt:
+            individual.setInternalList(table.sample(range(size)))
+            attempt += 1
+        if individual.getHash() in hashes:
+            duplicates += 1
+        hashes.add(individual.getHash())
+
+    if duplicates > 0:
+        logging.debug("The population was initialized with %d duplicated individuals.", duplicates)
+
+
+G1DListInitializatorAllele.batch = G1DListInitializatorAlleleBatch
 
 
 def G1DListInitializatorInteger(genome, **args):
@@ -140,12 +186,51 @@ def G2DListInitializatorAllele(genome, **args):
     if not allele.homogeneous:
         Util.raiseException("to use the G2DListInitializatorAllele, the 'allele' must be homogeneous")
 
-    genome.clearList()
+    width = genome.getWidth()
+    values = allele.getTable().sample(range(genome.getHeight() * width))
+    genome.genomeList = [values[i:i + width] for i in xrange(0, len(values), width)]
+
+
+##############################
+##     2D Array (ndarray)   ##
+##############################
+
+def G2DArrayInitializatorInteger(genome, **args):
+    """ Integer initialization function of G2DArray, the genes are drawn at once
+
+    This initializator accepts the *rangemin* and *rangemax* genome parameters.
+
+    .. versionadded:: 0.6
+       The *G2DArrayInitializatorInteger* function
+    """
+    rng = Util.numpyRandomState()
+    genome.setInternalArray(rng.randint(genome.getParam("rangemin", 0),
+                                        genome.getParam("rangemax", 100) + 1,
+                                        genome.getSize()))
+
+
+def G2DArrayInitializatorReal(genome, **args):
+    """ Real initialization function of G2DArray, the genes are drawn at once
+
+    This initializator accepts the *rangemin* and *rangemax* genome parameters.
+
+    .. versionadded:: 0.6
+       The *G2DArrayInitializatorReal* function
+    """
+    rng = Util.numpyRandomState()
+    genome.setInternalArray(rng.uniform(genome.getParam("rangemin", 0),
+                                        genome.getParam("rangemax", 100),
+                                        genome.getSize()))
 
-    for i in xrange(genome.getHeight()):
-        for j in xrange(genome.getWidth()):
-            random_allele = allele[0].getRandomAllele()
-            genome.setItem(i, j, random_allele)
+
+def G2DBinaryArrayInitializator(genome, **args):
+    """ Initialization function of G2DBinaryArray, the bits are drawn at once
+
+    .. versionadded:: 0.6
+       The *G2DBinaryArrayInitializator* function
+    """
+    rng = Util.numpyRandomState()
+    genome.setInternalArray(rng.randint(0, 2, genome.getSize()).astype(genome.arrayType()))
 
 
 ####################
@@ -272,3 +357,74 @@ def GTreeGPInitializator(genome, **args):
     genome.setRoot(root)
     genome.processNodes()
     assert genome.getHeight() <= max_depth
+
+
+def GTreeGPInitializatorBatch(population, **args):
+    """ The population-level version of the :func:`GTreeGPInitializator`, it's
+    used by the :meth:`GPopulation.GPopulation.initialize` to build all the trees
+    of the population at once. It accepts the same parameters plus:
+
+    *min_depth*
+       The min depth used by the "ramped" method, the default is 2
+
+    *full_diversity*
+       When True (default), the duplicated trees are detected using their
+       structural hashes and built again
+
+    *init_max_attempt*
+       The max number of attempts to build a tree which is not a duplicate,
+       after that the duplicate is accepted
+
+    With the "ramped" method, this is the ramped half-and-half method: the
+    max depth of the trees is ramped from *min_depth* to *max_depth* and, for
+    each depth, half of the trees are built using the "full" method and half
+    using the "grow" method. When a duplicate is found on the "ramped" method,
+    the next attempt uses a deeper tree.
+
+    .. versionadded:: 0.6
+       The *GTreeGPInitializatorBatch* function.
+    """
+    genome = population.oneSelfGenome
+    max_depth = genome.getParam("max_depth", 5)
+    method = genome.getParam("method", "grow")
+    full_diversity = genome.getParam("full_diversity", True)
+    max_attempt = genome.getParam("init_max_attempt", Consts.CDefPopInitMaxAttempt)
+    ga_engine = args["ga_engine"]
+
+    if method == "grow":
+        builders, depths = [GTree.buildGTreeGPGrow], [max_depth]
+    elif method == "full":
+        builders, depths = [GTree.buildGTreeGPFull], [max_depth]
+    elif method == "ramped":
+        min_depth = min(genome.getParam("min_depth", Consts.CDefGTreeGPInitMinDepth), max_depth)
+        builders, depths = [GTree.buildGTreeGPFull, GTree.buildGTreeGPGrow], range(min_depth, max_depth + 1)
+    else:
+        Util.raiseException("Unknown tree initialization method [%s] !" % method)
+
+    hashes = set()
+    duplicates = 0
+
+    for i, individual in enumerate(population):
+        depth_index = i % len(depths)
+        builder = builders[(i // len(depths)) % len(builders)]
+
+        for attempt in xrange(max_attempt):
+            root = builder(ga_engine, 0, depths[depth_index])
+            if not full_diversity or root.getHash() not in hashes:
+                break
+            depth_index = min(depth_index + 1, len(depths) - 1)
+        else:
+            duplicates += 1
+
+        if full_diversity:
+            hashes.add(root.getHash())
+
+        individual.setRoot(root)
+        individual.processNodes()
+        assert individual.getHeight() <= max_depth
+
+    if duplicates > 0:
+        logging.debug("The GP population was initialized with %d duplicated trees.", duplicates)
+
+
+GTreeGPInitializator.batch = GTreeGPInitializatorBatch
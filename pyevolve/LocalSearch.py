@@ -0,0 +1,295 @@
+"""
+
+:mod:`LocalSearch` -- local search methods module
+=====================================================================
+
+In this module we have the local search (local improvement) operators, used
+to build memetic algorithms. They are set on the *localSearch* function slot
+of the GA Engine (:class:`GSimpleGA.GSimpleGA`) and applied to each new
+individual after the mutation, before the evaluation.
+
+The permutation operators (2-opt and Or-opt) are for TSP-like problems, where
+the :class:`G1DList.G1DList` genome is a tour over the cities 0 to n-1. They
+accept the following genome parameters:
+
+   *distances*
+      The distance matrix, required, a list of lists (or a numpy array) where
+      distances[i][j] is the distance between the cities i and j, or a
+      dictionary where distances[i, j] is the distance
+
+   *ls_neighbors*
+      The number of nearest neighbors considered for each city, the default
+      is :attr:`Consts.CDefLocalSearchNeighbors`
+
+   *ls_max_moves*
+      The max number of improving moves applied to each individual, the
+      default is None, which means until a local optimum is found
+
+Example:
+   >>> genome.setParams(distances=matrix)
+   >>> ga_engine.localSearch.set(LocalSearch.G1DListLocalSearch2Opt)
+
+The operators use precomputed nearest neighbor lists, don't-look bits and
+the evaluation of the cost difference of each move in O(1). The neighbor
+lists are kept on the *ls_cache* genome parameter, shared by the clones of
+the genome, and computed again when another distance matrix is set; when
+the matrix is changed in place, call :func:`resetCache`.
+
+"""
+
+from collections import deque
+import heapq
+import Consts
+import Util
+
+try:
+   import numpy
+except ImportError:
+   numpy = None
+
+class _TSPData(object):
+   """ The distance matrix as a list of lists and the neighbor lists of the
+   TSP operators, kept on the *ls_cache* genome parameter """
+   __slots__ = ["distances", "neighbors_count", "size", "matrix", "neighbors"]
+
+   def __init__(self, distances, neighbors_count, size, matrix, neighbors):
+      self.distances = distances
+      self.neighbors_count = neighbors_count
+      self.size = size
+      self.matrix = matrix
+      self.neighbors = neighbors
+
+   def __repr__(self):
+      return "<LocalSearch data of %d cities>" % (self.size,)
+
+def resetCache(genome):
+   """ Removes the neighbor lists computed from the *distances* genome
+   parameter, they are computed again on the next local search. Call it
+   after changing the distance matrix in place.
+
+   :param genome: the genome, or any of its clones
+
+   .. versionadded:: 0.6
+      The *resetCache* function
+   """
+   genome.setParams(ls_cache=None)
+
+def nearestNeighbors(distances, k):
+   """ Returns the lists of the *k* nearest neighbors of each city
+
+   Example:
+      >>> neighbors = LocalSearch.nearestNeighbors([[0, 1, 2], [1, 0, 3], [2, 3, 0]], 1)
+      >>> neighbors
+      [[1], [0], [0]]
+
+   :param distances: the distance matrix, a list of lists
+   :param k: the number of neighbors of each city
+   :rtype: the list with the neighbors of each city, sorted by distance
+
+   .. versionadded:: 0.6
+      The *nearestNeighbors* function
+   """
+   n = len(distances)
+   k = min(k, n - 1)
+   neighbors = []
+   if numpy is not None and k > 0:
+      matrix = numpy.array(distances, dtype=float)
+      numpy.fill_diagonal(matrix, numpy.inf)
+      nearest = numpy.argpartition(matrix, k - 1, axis=1)[:, :k]
+      for i in xrange(n):
+         row = matrix[i]
+         neighbors.append(sorted(nearest[i].tolist(), key=row.item))
+      return neighbors
+
+   for i in xrange(n):
+      row = distances[i]
+      neighbors.append(heapq.nsmallest(k, (j for j in xrange(n) if j != i), key=row.__getitem__))
+   return neighbors
+
+def _tspData(genome):
+   """ Returns the distance matrix as a list of lists and the neighbor lists,
+   they are cached on the genome parameters for the distance matrix used """
+   distances = genome.getParam("distances")
+   if distances is None:
+      Util.raiseException("You must specify the distances genome parameter !", ValueError)
+
+   n = len(genome)
+   k = genome.getParam("ls_neighbors", Consts.CDefLocalSearchNeighbors)
+   cached = genome.getParam("ls_cache")
+   if cached is not None and cached.distances is distances and cached.neighbors_count == k and cached.size == n:
+      return cached.matrix, cached.neighbors
+
+   if isinstance(distances, dict):
+      matrix = [[distances[i, j] for j in xrange(n)] for i in xrange(n)]
+   elif hasattr(distances, "tolist"):
+      matrix = distances.tolist()
+   else:
+      matrix = distances
+
+   neighbors = nearestNeighbors(matrix, k)
+   genome.setParams(ls_cache=_TSPData(distances, k, n, matrix, neighbors))
+   return matrix, neighbors
+
+def _tourIndex(tour):
+   """ Returns the position of each city on the tour """
+   pos = [0] * len(tour)
+   for i, city in enumerate(tour):
+      pos[city] = i
+   return pos
+
+def _reverse(tour, pos, i, j):
+   """ Reverses the tour from the position i to j going forward, wrapping
+   around the end. The shorter of the segment and its complement is
+   reversed, which gives the same cyclic tour """
+   n = len(tour)
+   length = (j - i) % n + 1
+   if length * 2 > n:
+      i, j = (j + 1) % n, (i - 1) % n
+      length = n - length
+   for k in xrange(length // 2):
+      a, b = tour[i], tour[j]
+      tour[i], tour[j] = b, a
+      pos[b], pos[a] = i, j
+      i = (i + 1) % n
+      j = (j - 1) % n
+
+def G1DListLocalSearch2Opt(genome, **args):
+   """ The 2-opt local search for G1DList tours
+
+   Two edges of the tour are replaced by other two, reversing the tour between
+   them, while the tour length is reduced. Only the moves which create an edge
+   to one of the nearest neighbors of a city are tried.
+
+   :rtype: the number of improving moves
+
+   .. versionadded:: 0.6
+      The *G1DListLocalSearch2Opt* function
+   """
+   dist, neighbors = _tspData(genome)
+   tour = genome.genomeList
+   n = len(tour)
+   if n < 4:
+      return 0
+
+   max_moves = genome.getParam("ls_max_moves", None)
+   pos = _tourIndex(tour)
+   queue = deque(tour)
+   queued = [True] * n
+   moves = 0
+
+   while queue:
+      a = queue.popleft()
+      queued[a] = False
+
+      for forward in (True, False):
+         i = pos[a]
+         a_next = tour[(i + 1) % n] if forward else tour[i - 1]
+         d_next = dist[a][a_next]
+         move = None
+         for c in neighbors[a]:
+            d_ac = dist[a][c]
+            if d_ac >= d_next:
+               break
+            j = pos[c]
+            c_next = tour[(j + 1) % n] if forward else tour[j - 1]
+            if c == a_next or c_next == a:
+               continue
+            if d_ac + dist[a_next][c_next] - d_next - dist[c][c_next] < -1e-10:
+               move = c
+               break
+         if move is None:
+            continue
+
+         if forward:
+            _reverse(tour, pos, (i + 1) % n, j)
+         else:
+            _reverse(tour, pos, j, (i - 1) % n)
+         moves += 1
+         for city in (a, a_next, c, c_next):
+            if not queued[city]:
+               queued[city] = True
+               queue.append(city)
+         break
+
+      if max_moves is not None and moves >= max_moves:
+         break
+
+   return moves
+
+def G1DListLocalSearchOrOpt(genome, **args):
+   """ The Or-opt local search for G1DList tours
+
+   Segments of one to three cities are moved to another place of the tour,
+   possibly reversed, while the tour length is reduced. Only the places next
+   to one of the nearest neighbors of the segment ends are tried.
+
+   :rtype: the number of improving moves
+
+   .. versionadded:: 0.6
+      The *G1DListLocalSearchOrOpt* function
+   """
+   dist, neighbors = _tspData(genome)
+   tour = genome.genomeList
+   n = len(tour)
+   if n < 5:
+      return 0
+
+   max_moves = genome.getParam("ls_max_moves", None)
+   pos = _tourIndex(tour)
+   queue = deque(tour)
+   queued = [True] * n
+   moves = 0
+
+   while queue:
+      s1 = queue.popleft()
+      queued[s1] = False
+
+      for length in (1, 2, 3):
+         start = pos[s1]
+         s2 = tour[(start + length - 1) % n]
+         prev = tour[start - 1]
+         nxt = tour[(start + length) % n]
+         removal_gain = dist[prev][s1] + dist[s2][nxt] - dist[prev][nxt]
+         if removal_gain <= 1e-10:
+            continue
+
+         best = None
+         for end in (s1, s2):
+            for c in neighbors[end]:
+               if dist[end][c] >= removal_gain:
+                  break
+               if (pos[c] - start) % n < length or c == prev:
+                  continue
+               d = tour[(pos[c] + 1) % n]
+               d_cd = dist[c][d]
+               delta = dist[c][s1] + dist[s2][d] - d_cd - removal_gain
+               if delta < -1e-10 and (best is None or delta < best[0]):
+                  best = (delta, c, d, False)
+               delta = dist[c][s2] + dist[s1][d] - d_cd - removal_gain
+               if delta < -1e-10 and (best is None or delta < best[0]):
+                  best = (delta, c, d, True)
+         if best is None:
+            continue
+
+         delta, c, d, reverse = best
+         rotated = tour[start:] + tour[:start]
+         segment = rotated[:length]
+         rest = rotated[length:]
+         if reverse:
+            segment.reverse()
+         k = (pos[c] - start) % n - length + 1
+         tour[:] = rest[:k] + segment + rest[k:]
+         for i, city in enumerate(tour):
+            pos[city] = i
+
+         moves += 1
+         for city in (prev, nxt, c, d, s1, s2):
+            if not queued[city]:
+               queued[city] = True
+               queue.append(city)
+         break
+
+      if max_moves is not None and moves >= max_moves:
+         break
+
+   return moves
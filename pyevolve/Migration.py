@@ -39,6 +39,7 @@ class MigrationScheme(object):
       self.nIndividuals = Consts.CDefMigrationNIndividuals
       self.nReplacement = Consts.CDefGenMigrationReplacement
       self.networkCompression = 9
+      self.genomeCodec = True
 
    def isReady(self):
       """ Returns true if is time to migrate """
@@ -60,6 +61,28 @@ class MigrationScheme(object):
       """
       self.networkCompression = level
 
+   def getGenomeCodec(self):
+      """ Returns True if the individuals are sent with the genome codec
+
+      .. versionadded:: 0.6
+         The *getGenomeCodec* method.
+      """
+      return self.genomeCodec
+
+   def setGenomeCodec(self, flag):
+      """ Sets the use of the genome codec (see :func:`Network.encodeGenome`),
+      which sends only the genes and the scores of the individuals, the
+      received individuals share the function slots and the parameters of
+      the local population genome. When False, the whole individuals are
+      pickled. All the islands must use the same option.
+
+      :param flag: True (default) or False
+
+      .. versionadded:: 0.6
+         The *setGenomeCodec* method.
+      """
+      self.genomeCodec = flag
+
    def getNumReplacement(self):
       """ Return the number of individuals that will be
       replaced in the migration process """
@@ -238,6 +261,8 @@ class WANMigration(MigrationScheme):
       pool = self.selectPool(self.getNumIndividuals())
 
       for individual in pool:
+         if self.genomeCodec:
+            individual = Network.encodeGenome(individual)
          # (code, group name, individual)
          networkObject = (Consts.CDefNetworkIndividual, self.getGroupName(), individual)
          networkData = Network.pickleAndCompress(networkObject, self.getCompressionLevel())
@@ -253,10 +278,17 @@ class WANMigration(MigrationScheme):
          # (code, group name, individual)
          pool.append(networkObject)
 
-      # No individuals received
-      if len(pool) <= 0:
-         return
+      self.replaceWorst([networkObject[2] for networkObject in pool])
+
+   def replaceWorst(self, pool):
+      """ Replaces the worst individuals of the population with individuals
+      randomly chosen from the received pool
+
+      :param pool: the list of received individuals, encoded or not
 
+      .. versionadded:: 0.6
+         The *replaceWorst* method.
+      """
       population = self.GAEngine.getPopulation()
 
       for i in xrange(self.getNumReplacement()):
@@ -265,8 +297,99 @@ class WANMigration(MigrationScheme):
          choice = rand_choice(pool)
          pool.remove(choice)
 
+         individual = choice
+         if isinstance(individual, str):
+            individual = Network.decodeGenome(individual, population.oneSelfGenome)
          # replace the worst
-         population[len(population) - 1 - i] = choice[2]
+         population[len(population) - 1 - i] = individual
+
+
+class TCPMigration(WANMigration):
+   """ This is the Migration class for distributed GA over TCP
+
+   The individuals are sent over persistent TCP connections to the
+   neighbors on the topology graph, by a single
+   :class:`Network.TCPThreadTransport` thread. All the individuals which
+   migrate on an exchange are sent on a single frame, so there is no
+   size limit of the UDP datagrams. The exchange never waits for the
+   neighbors: the queues of the transport are bounded and, when a neighbor
+   is slower than the island, the oldest frames waiting to be sent to it
+   are discarded, so some individuals can be lost (see
+   :meth:`Network.TCPThreadTransport.getDropped`).
+
+   Example:
+      >>> mig = TCPMigration("192.168.0.1", 10000, "group1")
+      >>> graph = Util.Graph()
+      >>> graph.addEdge(("192.168.0.1", 10000), ("192.168.0.2", 10000))
+      >>> mig.setTopology(graph)
+      >>> ga_engine.setMigrationAdapter(mig)
+
+   The port 0 binds any free port, the port bound is on the
+   :meth:`getMyself`, which is the node of the island on the topology.
+
+   :param host: the source hostname
+   :param port: the source port number
+   :param group_name: the group name
+   :param pool_size: the max number of received frames waiting for the exchange
+   :param queue_size: the max number of frames waiting to be sent to each neighbor
+
+   .. versionadded:: 0.6
+      The :class:`TCPMigration` class.
+   """
+
+   def __init__(self, host, port, group_name, pool_size=Consts.CDefTCPPoolSize,
+                queue_size=Consts.CDefTCPQueueSize):
+      MigrationScheme.__init__(self)
+      self.transport = Network.TCPThreadTransport(host, port, pool_size, queue_size)
+      self.setMyself(host, self.transport.getPort())
+      self.setGroupName(group_name)
+      self.topologyGraph = None
+
+   def getMyself(self):
+      """ Returns the (host, port) of the island """
+      return self.myself
+
+   def start(self):
+      """ Opens the connections to the neighbors and initializes the migration scheme """
+      if self.topologyGraph is None:
+         Util.raiseException("You must add a topology graph to the migration scheme !")
+
+      self.transport.setTargets(self.topologyGraph.getNeighbors(self.myself))
+      self.transport.start()
+
+   def stop(self):
+      """ Stops the migration engine """
+      self.transport.shutdown()
+      self.transport.join(Consts.CDefTCPReconnectDelay + 3)
+
+      if self.transport.isAlive():
+         logging.warning("warning: transport thread not joined !")
+
+   def exchange(self):
+      """ This is the main method, is where the individuals
+      are exchanged """
+
+      if not self.isReady():
+         return
+
+      # Client section --------------------------------------
+      pool = self.selectPool(self.getNumIndividuals())
+      if self.genomeCodec:
+         pool = [Network.encodeGenome(individual) for individual in pool]
+      # (code, group name, individuals)
+      networkObject = (Consts.CDefNetworkIndividual, self.getGroupName(), pool)
+      self.transport.send(Network.pickleAndCompress(networkObject, self.getCompressionLevel()))
+
+      # Server section --------------------------------------
+      pool = []
+      while self.transport.isReady():
+         # (IP source, data)
+         networkData = self.transport.popPool()
+         code, group_name, individuals = Network.unpickleAndDecompress(networkData[1])
+         if code == Consts.CDefNetworkIndividual and group_name == self.getGroupName():
+            pool.extend(individuals)
+
+      self.replaceWorst(pool)
 
 
 class MPIMigration(MigrationScheme):
@@ -13,6 +13,84 @@ from random import choice as rand_choice
 import Consts
 import GTree
 
+try:
+   import numpy
+except ImportError:
+   numpy = None
+
+def _distinctPositions(rng, total, count):
+   """ Draws *count* distinct positions from 0 to *total* - 1, sorted """
+   if count * 4 > total:
+      return numpy.sort(rng.permutation(total)[:count])
+
+   positions = numpy.unique(rng.randint(0, total, count))
+   while len(positions) < count:
+      extra = rng.randint(0, total, count - len(positions))
+      positions = numpy.unique(numpy.concatenate((positions, extra)))
+   return positions
+
+def _batchMutationPositions(genomes, pmut, rng):
+   """ Draws the genes to mutate on a batch of genomes, used by the batched
+   mutators. The total number of mutations is drawn from a binomial over
+   all the genes of the batch and then the distinct positions are drawn
+   uniformly, which is the same as flipping a coin for each gene.
+
+   :param genomes: the list of genomes
+   :param pmut: the mutation rate
+   :param rng: the numpy random generator
+   :rtype: the arrays of genome indexes, gene indexes and mutation counts of each genome
+   """
+   lengths = numpy.array([len(genome) for genome in genomes], dtype=numpy.int64)
+   ends = numpy.cumsum(lengths)
+   total_genes = int(ends[-1]) if len(ends) > 0 else 0
+   if total_genes <= 0:
+      empty = numpy.zeros(0, dtype=numpy.int64)
+      return empty, empty, numpy.zeros(len(genomes), dtype=numpy.int64)
+
+   nmuts = rng.binomial(total_genes, min(pmut, 1.0))
+   positions = _distinctPositions(rng, total_genes, nmuts)
+
+   which = numpy.searchsorted(ends, positions, side="right")
+   genes = positions - (ends - lengths)[which]
+   return which, genes, numpy.bincount(which, minlength=len(genomes))
+
+def _boundedRealMutation(genomes, which, genes, new_values):
+   """ Mutates the genes *genes* of the genomes *which* with the bounded real
+   mutators, the bounds and the bound handling are read from the first genome.
+
+   :param new_values: called as new_values(values, lower, upper), returns the
+                      array of mutated values, it's called again with the values
+                      out of the bounds on the resample bound handling mode
+   """
+   first = genomes[0]
+   lower, upper = Util.realGeneBounds(first)
+   lower = lower[genes]
+   upper = upper[genes]
+   which = which.tolist()
+   genes = genes.tolist()
+
+   values = numpy.array([genomes[i][gene] for i, gene in zip(which, genes)], dtype=float)
+   mutated = Util.boundValues(new_values(values, lower, upper), lower, upper,
+                              first.getParam("bound_handling", Consts.CDefBoundHandling),
+                              lambda mask: new_values(values[mask], lower[mask], upper[mask]))
+   for i, gene, value in zip(which, genes, mutated.tolist()):
+      genomes[i][gene] = value
+
+def _polynomialValues(values, lower, upper, eta, u):
+   """ The bounded polynomial mutation of Deb on numpy arrays, *u* are the
+   uniform random numbers of each value """
+   width = upper - lower
+   width_safe = numpy.where(width > 0, width, 1.0)
+   power = eta + 1.0
+   low = numpy.clip(1.0 - (values - lower) / width_safe, 0.0, 1.0)
+   high = numpy.clip(1.0 - (upper - values) / width_safe, 0.0, 1.0)
+
+   left = u <= 0.5
+   val = numpy.where(left, 2.0 * u + (1.0 - 2.0 * u) * low ** power,
+                     2.0 * (1.0 - u) + 2.0 * (u - 0.5) * high ** power)
+   delta = numpy.where(left, val ** (1.0 / power) - 1.0, 1.0 - val ** (1.0 / power))
+   return values + delta * width
+
 #############################
 ##     1D Binary String    ##
 #############################
@@ -27,10 +105,9 @@ def G1DBinaryStringMutatorSwap(genome, **args):
 
    if mutations < 1.0:
       mutations = 0
-      for it in xrange(stringLength):
-         if Util.randomFlipCoin(args["pmut"]):
-            Util.listSwapElement(genome, it, rand_randint(0, stringLength - 1))
-            mutations += 1
+      for it in Util.randomFlipCoinPositions(args["pmut"], stringLength):
+         Util.listSwapElement(genome, it, rand_randint(0, stringLength - 1))
+         mutations += 1
 
    else:
       for it in xrange(int(round(mutations))):
@@ -48,13 +125,12 @@ def G1DBinaryStringMutatorFlip(genome, **args):
 
    if mutations < 1.0:
       mutations = 0
-      for it in xrange(stringLength):
-         if Util.randomFlipCoin(args["pmut"]):
-            if genome[it] == 0:
-               genome[it] = 1
-            else:
-               genome[it] = 0
-            mutations += 1
+      for it in Util.randomFlipCoinPositions(args["pmut"], stringLength):
+         if genome[it] == 0:
+            genome[it] = 1
+         else:
+            genome[it] = 0
+         mutations += 1
 
    else:
       for it in xrange(int(round(mutations))):
@@ -66,6 +142,32 @@ def G1DBinaryStringMutatorFlip(genome, **args):
 
    return int(mutations)
 
+def G1DBinaryStringMutatorFlipBatch(genomes, **args):
+   """ The batched version of the :func:`G1DBinaryStringMutatorFlip`, mutates
+   all the *genomes* at once, drawing the mutated positions as arrays. It
+   falls back to the per genome mutator when numpy isn't available.
+
+   :rtype: the list with the number of mutations of each genome
+
+   .. versionadded:: 0.6
+      The *G1DBinaryStringMutatorFlipBatch* function
+   """
+   rng = Util.numpyRandomState()
+   if rng is None or args["pmut"] <= 0.0:
+      return [G1DBinaryStringMutatorFlip(genome, **args) for genome in genomes]
+
+   which, genes, counts = _batchMutationPositions(genomes, args["pmut"], rng)
+   for i, gene in zip(which.tolist(), genes.tolist()):
+      genome = genomes[i]
+      if genome[gene] == 0:
+         genome[gene] = 1
+      else:
+         genome[gene] = 0
+
+   return counts.tolist()
+
+G1DBinaryStringMutatorFlip.batch = G1DBinaryStringMutatorFlipBatch
+
 ####################
 ##     1D List    ##
 ####################
@@ -83,10 +185,9 @@ def G1DListMutatorSwap(genome, **args):
 
    if mutations < 1.0:
       mutations = 0
-      for it in xrange(listSize):
-         if Util.randomFlipCoin(args["pmut"]):
-            Util.listSwapElement(genome, it, rand_randint(0, listSize - 1))
-            mutations += 1
+      for it in Util.randomFlipCoinPositions(args["pmut"], listSize):
+         Util.listSwapElement(genome, it, rand_randint(0, listSize - 1))
+         mutations += 1
    else:
       for it in xrange(int(round(mutations))):
          Util.listSwapElement(genome, rand_randint(0, listSize - 1), rand_randint(0, listSize - 1))
@@ -134,11 +235,10 @@ def G1DListMutatorIntegerRange(genome, **args):
 
    if mutations < 1.0:
       mutations = 0
-      for it in xrange(listSize):
-         if Util.randomFlipCoin(args["pmut"]):
-            genome[it] = rand_randint(genome.getParam("rangemin", Consts.CDefRangeMin),
-                                      genome.getParam("rangemax", Consts.CDefRangeMax))
-            mutations += 1
+      for it in Util.randomFlipCoinPositions(args["pmut"], listSize):
+         genome[it] = rand_randint(genome.getParam("rangemin", Consts.CDefRangeMin),
+                                   genome.getParam("rangemax", Consts.CDefRangeMax))
+         mutations += 1
 
    else:
       for it in xrange(int(round(mutations))):
@@ -148,6 +248,33 @@ def G1DListMutatorIntegerRange(genome, **args):
 
    return int(mutations)
 
+def G1DListMutatorIntegerRangeBatch(genomes, **args):
+   """ The batched version of the :func:`G1DListMutatorIntegerRange`, mutates
+   all the *genomes* at once, drawing the mutated positions and the new values
+   as arrays. The parameters are read from the first genome. It falls back to
+   the per genome mutator when numpy isn't available.
+
+   :rtype: the list with the number of mutations of each genome
+
+   .. versionadded:: 0.6
+      The *G1DListMutatorIntegerRangeBatch* function
+   """
+   rng = Util.numpyRandomState()
+   if rng is None or args["pmut"] <= 0.0 or len(genomes) == 0:
+      return [G1DListMutatorIntegerRange(genome, **args) for genome in genomes]
+
+   range_min = genomes[0].getParam("rangemin", Consts.CDefRangeMin)
+   range_max = genomes[0].getParam("rangemax", Consts.CDefRangeMax)
+
+   which, genes, counts = _batchMutationPositions(genomes, args["pmut"], rng)
+   values = rng.randint(range_min, range_max + 1, len(genes))
+   for i, gene, value in zip(which.tolist(), genes.tolist(), values.tolist()):
+      genomes[i][gene] = value
+
+   return counts.tolist()
+
+G1DListMutatorIntegerRange.batch = G1DListMutatorIntegerRangeBatch
+
 
 def G1DListMutatorRealRange(genome, **args):
    """ Simple real range mutator for G1DList
@@ -162,11 +289,10 @@ def G1DListMutatorRealRange(genome, **args):
 
    if mutations < 1.0:
       mutations = 0
-      for it in xrange(listSize):
-         if Util.randomFlipCoin(args["pmut"]):
-            genome[it] = rand_uniform(genome.getParam("rangemin", Consts.CDefRangeMin),
-                                      genome.getParam("rangemax", Consts.CDefRangeMax))
-            mutations += 1
+      for it in Util.randomFlipCoinPositions(args["pmut"], listSize):
+         genome[it] = rand_uniform(genome.getParam("rangemin", Consts.CDefRangeMin),
+                                   genome.getParam("rangemax", Consts.CDefRangeMax))
+         mutations += 1
 
    else:
       for it in xrange(int(round(mutations))):
@@ -198,15 +324,14 @@ def G1DListMutatorIntegerGaussianGradient(genome, **args):
 
    if mutations < 1.0:
       mutations = 0
-      for it in xrange(listSize):
-         if Util.randomFlipCoin(args["pmut"]):
-            final_value = int(genome[it] * abs(rand_gauss(mu, sigma)))
+      for it in Util.randomFlipCoinPositions(args["pmut"], listSize):
+         final_value = int(genome[it] * abs(rand_gauss(mu, sigma)))
 
-            final_value = min(final_value, genome.getParam("rangemax", Consts.CDefRangeMax))
-            final_value = max(final_value, genome.getParam("rangemin", Consts.CDefRangeMin))
+         final_value = min(final_value, genome.getParam("rangemax", Consts.CDefRangeMax))
+         final_value = max(final_value, genome.getParam("rangemin", Consts.CDefRangeMin))
 
-            genome[it] = final_value
-            mutations += 1
+         genome[it] = final_value
+         mutations += 1
    else:
       for it in xrange(int(round(mutations))):
          which_gene = rand_randint(0, listSize - 1)
@@ -243,15 +368,14 @@ def G1DListMutatorIntegerGaussian(genome, **args):
 
    if mutations < 1.0:
       mutations = 0
-      for it in xrange(listSize):
-         if Util.randomFlipCoin(args["pmut"]):
-            final_value = genome[it] + int(rand_gauss(mu, sigma))
+      for it in Util.randomFlipCoinPositions(args["pmut"], listSize):
+         final_value = genome[it] + int(rand_gauss(mu, sigma))
 
-            final_value = min(final_value, genome.getParam("rangemax", Consts.CDefRangeMax))
-            final_value = max(final_value, genome.getParam("rangemin", Consts.CDefRangeMin))
+         final_value = min(final_value, genome.getParam("rangemax", Consts.CDefRangeMax))
+         final_value = max(final_value, genome.getParam("rangemin", Consts.CDefRangeMin))
 
-            genome[it] = final_value
-            mutations += 1
+         genome[it] = final_value
+         mutations += 1
    else:
       for it in xrange(int(round(mutations))):
          which_gene = rand_randint(0, listSize - 1)
@@ -289,15 +413,14 @@ def G1DListMutatorRealGaussian(genome, **args):
 
    if mutations < 1.0:
       mutations = 0
-      for it in xrange(listSize):
-         if Util.randomFlipCoin(args["pmut"]):
-            final_value = genome[it] + rand_gauss(mu, sigma)
+      for it in Util.randomFlipCoinPositions(args["pmut"], listSize):
+         final_value = genome[it] + rand_gauss(mu, sigma)
 
-            final_value = min(final_value, genome.getParam("rangemax", Consts.CDefRangeMax))
-            final_value = max(final_value, genome.getParam("rangemin", Consts.CDefRangeMin))
+         final_value = min(final_value, genome.getParam("rangemax", Consts.CDefRangeMax))
+         final_value = max(final_value, genome.getParam("rangemin", Consts.CDefRangeMin))
 
-            genome[it] = final_value
-            mutations += 1
+         genome[it] = final_value
+         mutations += 1
    else:
       for it in xrange(int(round(mutations))):
          which_gene = rand_randint(0, listSize - 1)
@@ -310,6 +433,149 @@ def G1DListMutatorRealGaussian(genome, **args):
 
    return int(mutations)
 
+def G1DListMutatorRealGaussianBatch(genomes, **args):
+   """ The batched version of the :func:`G1DListMutatorRealGaussian`, mutates
+   all the *genomes* at once, drawing the mutated positions and the gaussian
+   noise as arrays. The parameters are read from the first genome. It falls
+   back to the per genome mutator when numpy isn't available.
+
+   :rtype: the list with the number of mutations of each genome
+
+   .. versionadded:: 0.6
+      The *G1DListMutatorRealGaussianBatch* function
+   """
+   rng = Util.numpyRandomState()
+   if rng is None or args["pmut"] <= 0.0 or len(genomes) == 0:
+      return [G1DListMutatorRealGaussian(genome, **args) for genome in genomes]
+
+   mu = genomes[0].getParam("gauss_mu")
+   sigma = genomes[0].getParam("gauss_sigma")
+
+   if mu is None:
+      mu = Consts.CDefG1DListMutRealMU
+
+   if sigma is None:
+      sigma = Consts.CDefG1DListMutRealSIGMA
+
+   range_min = genomes[0].getParam("rangemin", Consts.CDefRangeMin)
+   range_max = genomes[0].getParam("rangemax", Consts.CDefRangeMax)
+
+   which, genes, counts = _batchMutationPositions(genomes, args["pmut"], rng)
+   noise = rng.normal(mu, sigma, len(genes))
+   for i, gene, value in zip(which.tolist(), genes.tolist(), noise.tolist()):
+      genome = genomes[i]
+      genome[gene] = max(min(genome[gene] + value, range_max), range_min)
+
+   return counts.tolist()
+
+G1DListMutatorRealGaussian.batch = G1DListMutatorRealGaussianBatch
+
+def _gaussianBounded(genomes, which, genes, rng):
+   """ Adds the gaussian noise to the genes *genes* of the genomes *which* """
+   mu = genomes[0].getParam("gauss_mu")
+   sigma = genomes[0].getParam("gauss_sigma")
+
+   if mu is None:
+      mu = Consts.CDefG1DListMutRealMU
+
+   if sigma is None:
+      sigma = Consts.CDefG1DListMutRealSIGMA
+
+   _boundedRealMutation(genomes, which, genes,
+                        lambda values, lower, upper: values + rng.normal(mu, sigma, len(values)))
+
+def G1DListMutatorRealGaussianBounded(genome, **args):
+   """ The mutator of G1DList, Gaussian Mutator with bound handling, the
+   mutated genes and the noise are drawn at once with numpy
+
+   Accepts the *rangemin* and *rangemax* genome parameters, numbers or
+   sequences with the bound of each gene, the *gauss_mu* and *gauss_sigma*
+   parameters and the *bound_handling* parameter, one of the
+   :attr:`Consts.boundHandlingType` (default is :attr:`Consts.CDefBoundHandling`).
+   On the resample mode, the noise of the genes out of the bounds is drawn again.
+
+   .. versionadded:: 0.6
+      The *G1DListMutatorRealGaussianBounded* function
+   """
+   if numpy is None:
+      Util.raiseException("The G1DListMutatorRealGaussianBounded mutator requires numpy !", ImportError)
+   if args["pmut"] <= 0.0:
+      return 0
+   rng = Util.numpyRandomState()
+   positions = _distinctPositions(rng, len(genome), rng.binomial(len(genome), min(args["pmut"], 1.0)))
+   if len(positions) > 0:
+      _gaussianBounded([genome], numpy.zeros(len(positions), dtype=numpy.int64), positions, rng)
+   return len(positions)
+
+def G1DListMutatorRealGaussianBoundedBatch(genomes, **args):
+   """ The batched version of the :func:`G1DListMutatorRealGaussianBounded`,
+   mutates all the *genomes* at once. The parameters are read from the first genome.
+
+   :rtype: the list with the number of mutations of each genome
+
+   .. versionadded:: 0.6
+      The *G1DListMutatorRealGaussianBoundedBatch* function
+   """
+   rng = Util.numpyRandomState()
+   if rng is None or args["pmut"] <= 0.0 or len(genomes) == 0:
+      return [G1DListMutatorRealGaussianBounded(genome, **args) for genome in genomes]
+
+   which, genes, counts = _batchMutationPositions(genomes, args["pmut"], rng)
+   if len(genes) > 0:
+      _gaussianBounded(genomes, which, genes, rng)
+   return counts.tolist()
+
+G1DListMutatorRealGaussianBounded.batch = G1DListMutatorRealGaussianBoundedBatch
+
+def _polynomialBounded(genomes, which, genes, rng):
+   """ Applies the polynomial mutation to the genes *genes* of the genomes *which* """
+   eta = genomes[0].getParam("poly_eta", Consts.CDefG1DListPolyEtam)
+   _boundedRealMutation(genomes, which, genes,
+                        lambda values, lower, upper: _polynomialValues(values, lower, upper, eta,
+                                                                       rng.random_sample(len(values))))
+
+def G1DListMutatorRealPolynomial(genome, **args):
+   """ The mutator of G1DList, the bounded Polynomial Mutation of Deb (used
+   in the NSGA-II), the mutated genes are drawn at once with numpy
+
+   Accepts the *rangemin* and *rangemax* genome parameters, numbers or
+   sequences with the bound of each gene, the *poly_eta* parameter, the
+   distribution index (default is :attr:`Consts.CDefG1DListPolyEtam`), and the
+   *bound_handling* parameter, one of the :attr:`Consts.boundHandlingType`.
+
+   .. versionadded:: 0.6
+      The *G1DListMutatorRealPolynomial* function
+   """
+   if numpy is None:
+      Util.raiseException("The G1DListMutatorRealPolynomial mutator requires numpy !", ImportError)
+   if args["pmut"] <= 0.0:
+      return 0
+   rng = Util.numpyRandomState()
+   positions = _distinctPositions(rng, len(genome), rng.binomial(len(genome), min(args["pmut"], 1.0)))
+   if len(positions) > 0:
+      _polynomialBounded([genome], numpy.zeros(len(positions), dtype=numpy.int64), positions, rng)
+   return len(positions)
+
+def G1DListMutatorRealPolynomialBatch(genomes, **args):
+   """ The batched version of the :func:`G1DListMutatorRealPolynomial`,
+   mutates all the *genomes* at once. The parameters are read from the first genome.
+
+   :rtype: the list with the number of mutations of each genome
+
+   .. versionadded:: 0.6
+      The *G1DListMutatorRealPolynomialBatch* function
+   """
+   rng = Util.numpyRandomState()
+   if rng is None or args["pmut"] <= 0.0 or len(genomes) == 0:
+      return [G1DListMutatorRealPolynomial(genome, **args) for genome in genomes]
+
+   which, genes, counts = _batchMutationPositions(genomes, args["pmut"], rng)
+   if len(genes) > 0:
+      _polynomialBounded(genomes, which, genes, rng)
+   return counts.tolist()
+
+G1DListMutatorRealPolynomial.batch = G1DListMutatorRealPolynomialBatch
+
 def G1DListMutatorRealGaussianGradient(genome, **args):
    """ The mutator of G1DList, Gaussian Gradient Mutator
 
@@ -337,15 +603,14 @@ def G1DListMutatorRealGaussianGradient(genome, **args):
 
    if mutations < 1.0:
       mutations = 0
-      for it in xrange(listSize):
-         if Util.randomFlipCoin(args["pmut"]):
-            final_value = genome[it] * abs(rand_gauss(mu, sigma))
+      for it in Util.randomFlipCoinPositions(args["pmut"], listSize):
+         final_value = genome[it] * abs(rand_gauss(mu, sigma))
 
-            final_value = min(final_value, genome.getParam("rangemax", Consts.CDefRangeMax))
-            final_value = max(final_value, genome.getParam("rangemin", Consts.CDefRangeMin))
+         final_value = min(final_value, genome.getParam("rangemax", Consts.CDefRangeMax))
+         final_value = max(final_value, genome.getParam("rangemin", Consts.CDefRangeMin))
 
-            genome[it] = final_value
-            mutations += 1
+         genome[it] = final_value
+         mutations += 1
    else:
       for it in xrange(int(round(mutations))):
          which_gene = rand_randint(0, listSize - 1)
@@ -371,14 +636,13 @@ def G1DListMutatorIntegerBinary(genome, **args):
 
    if mutations < 1.0:
       mutations = 0
-      for it in xrange(listSize):
-         if Util.randomFlipCoin(args["pmut"]):
-            if genome[it] == 0:
-               genome[it] = 1
-            elif genome[it] == 1:
-               genome[it] = 0
+      for it in Util.randomFlipCoinPositions(args["pmut"], listSize):
+         if genome[it] == 0:
+            genome[it] = 1
+         elif genome[it] == 1:
+            genome[it] = 0
 
-            mutations += 1
+         mutations += 1
    else:
       for it in xrange(int(round(mutations))):
          which_gene = rand_randint(0, listSize - 1)
@@ -395,6 +659,8 @@ def G1DListMutatorAllele(genome, **args):
    To use this mutator, you must specify the *allele* genome parameter with the
    :class:`GAllele.GAlleles` instance.
 
+   .. versionchanged:: 0.6
+      The new alleles are drawn at once from the compiled alleles table.
    """
    if args["pmut"] <= 0.0:
       return 0
@@ -406,20 +672,45 @@ def G1DListMutatorAllele(genome, **args):
       Util.raiseException("to use the G1DListMutatorAllele, you must specify the 'allele' parameter", TypeError)
 
    if mutations < 1.0:
-      mutations = 0
-      for it in xrange(listSize):
-         if Util.randomFlipCoin(args["pmut"]):
-            new_val = allele[it].getRandomAllele()
-            genome[it] = new_val
-            mutations += 1
+      positions = Util.randomFlipCoinPositions(args["pmut"], listSize)
+      mutations = len(positions)
    else:
-      for it in xrange(int(round(mutations))):
-         which_gene = rand_randint(0, listSize - 1)
-         new_val = allele[which_gene].getRandomAllele()
-         genome[which_gene] = new_val
+      positions = [rand_randint(0, listSize - 1) for it in xrange(int(round(mutations)))]
+
+   for which_gene, new_val in zip(positions, allele.getTable().sample(positions)):
+      genome[which_gene] = new_val
 
    return int(mutations)
 
+def G1DListMutatorAlleleBatch(genomes, **args):
+   """ The batched version of the :func:`G1DListMutatorAllele`, mutates all
+   the *genomes* at once, drawing the mutated positions and the new alleles
+   of the whole population with a single draw from the compiled alleles
+   table. The *allele* parameter is read from the first genome. It falls
+   back to the per genome mutator when numpy isn't available.
+
+   :rtype: the list with the number of mutations of each genome
+
+   .. versionadded:: 0.6
+      The *G1DListMutatorAlleleBatch* function
+   """
+   rng = Util.numpyRandomState()
+   if rng is None or args["pmut"] <= 0.0 or len(genomes) == 0:
+      return [G1DListMutatorAllele(genome, **args) for genome in genomes]
+
+   allele = genomes[0].getParam("allele", None)
+   if allele is None:
+      Util.raiseException("to use the G1DListMutatorAllele, you must specify the 'allele' parameter", TypeError)
+
+   which, genes, counts = _batchMutationPositions(genomes, args["pmut"], rng)
+   genes = genes.tolist()
+   for i, gene, value in zip(which.tolist(), genes, allele.getTable().sample(genes)):
+      genomes[i][gene] = value
+
+   return counts.tolist()
+
+G1DListMutatorAllele.batch = G1DListMutatorAlleleBatch
+
 def G1DListMutatorAlleleGaussian(genome, **arguments):
     """An allele-based mutator based on G1DListMutatorRealGaussian.
 
@@ -445,15 +736,14 @@ def G1DListMutatorAlleleGaussian(genome, **arguments):
 
     if mutations < 1.0:
         mutations = 0
-        for it in xrange(listSize):
-            if Util.randomFlipCoin(arguments["pmut"]):
-                final_value = genome[it] + rand_gauss(mu, sigma)
-                assert len(allele[it].beginEnd) == 1, "only single ranges are supported"
-                rangemin, rangemax = allele[it].beginEnd[0]
-                final_value = min(final_value, rangemax)
-                final_value = max(final_value, rangemin)
-                genome[it] = final_value
-                mutations += 1
+        for it in Util.randomFlipCoinPositions(arguments["pmut"], listSize):
+            final_value = genome[it] + rand_gauss(mu, sigma)
+            assert len(allele[it].beginEnd) == 1, "only single ranges are supported"
+            rangemin, rangemax = allele[it].beginEnd[0]
+            final_value = min(final_value, rangemax)
+            final_value = max(final_value, rangemin)
+            genome[it] = final_value
+            mutations += 1
     else:
         for it in xrange(int(round(mutations))):
             which_gene = rand_randint(0, listSize - 1)
@@ -486,12 +776,11 @@ def G2DListMutatorSwap(genome, **args):
 
    if mutations < 1.0:
       mutations = 0
-      for i in xrange(height):
-         for j in xrange(width):
-            if Util.randomFlipCoin(args["pmut"]):
-               index_b = (rand_randint(0, height - 1), rand_randint(0, width - 1))
-               Util.list2DSwapElement(genome.genomeList, (i, j), index_b)
-               mutations += 1
+      for it in Util.randomFlipCoinPositions(args["pmut"], height * width):
+         i, j = divmod(it, width)
+         index_b = (rand_randint(0, height - 1), rand_randint(0, width - 1))
+         Util.list2DSwapElement(genome.genomeList, (i, j), index_b)
+         mutations += 1
    else:
       for it in xrange(int(round(mutations))):
          index_a = (rand_randint(0, height - 1), rand_randint(0, width - 1))
@@ -518,12 +807,11 @@ def G2DListMutatorIntegerRange(genome, **args):
 
    if mutations < 1.0:
       mutations = 0
-      for i in xrange(genome.getHeight()):
-         for j in xrange(genome.getWidth()):
-            if Util.randomFlipCoin(args["pmut"]):
-               random_int = rand_randint(range_min, range_max)
-               genome.setItem(i, j, random_int)
-               mutations += 1
+      for it in Util.randomFlipCoinPositions(args["pmut"], genome.getHeight() * genome.getWidth()):
+         i, j = divmod(it, genome.getWidth())
+         random_int = rand_randint(range_min, range_max)
+         genome.setItem(i, j, random_int)
+         mutations += 1
 
    else:
       for it in xrange(int(round(mutations))):
@@ -558,16 +846,15 @@ def G2DListMutatorIntegerGaussianGradient(genome, **args):
    if mutations < 1.0:
       mutations = 0
 
-      for i in xrange(genome.getHeight()):
-         for j in xrange(genome.getWidth()):
-            if Util.randomFlipCoin(args["pmut"]):
-               final_value = int(genome[i][j] * abs(rand_gauss(mu, sigma)))
+      for it in Util.randomFlipCoinPositions(args["pmut"], genome.getHeight() * genome.getWidth()):
+         i, j = divmod(it, genome.getWidth())
+         final_value = int(genome[i][j] * abs(rand_gauss(mu, sigma)))
 
-               final_value = min(final_value, genome.getParam("rangemax", Consts.CDefRangeMax))
-               final_value = max(final_value, genome.getParam("rangemin", Consts.CDefRangeMin))
+         final_value = min(final_value, genome.getParam("rangemax", Consts.CDefRangeMax))
+         final_value = max(final_value, genome.getParam("rangemin", Consts.CDefRangeMin))
 
-               genome.setItem(i, j, final_value)
-               mutations += 1
+         genome.setItem(i, j, final_value)
+         mutations += 1
    else:
 
       for it in xrange(int(round(mutations))):
@@ -610,16 +897,15 @@ def G2DListMutatorIntegerGaussian(genome, **args):
    if mutations < 1.0:
       mutations = 0
 
-      for i in xrange(genome.getHeight()):
-         for j in xrange(genome.getWidth()):
-            if Util.randomFlipCoin(args["pmut"]):
-               final_value = genome[i][j] + int(rand_gauss(mu, sigma))
+      for it in Util.randomFlipCoinPositions(args["pmut"], genome.getHeight() * genome.getWidth()):
+         i, j = divmod(it, genome.getWidth())
+         final_value = genome[i][j] + int(rand_gauss(mu, sigma))
 
-               final_value = min(final_value, genome.getParam("rangemax", Consts.CDefRangeMax))
-               final_value = max(final_value, genome.getParam("rangemin", Consts.CDefRangeMin))
+         final_value = min(final_value, genome.getParam("rangemax", Consts.CDefRangeMax))
+         final_value = max(final_value, genome.getParam("rangemin", Consts.CDefRangeMin))
 
-               genome.setItem(i, j, final_value)
-               mutations += 1
+         genome.setItem(i, j, final_value)
+         mutations += 1
    else:
 
       for it in xrange(int(round(mutations))):
@@ -658,21 +944,14 @@ def G2DListMutatorAllele(genome, **args):
       Util.raiseException("to use the G2DListMutatorAllele, the 'allele' must be homogeneous")
 
    if mutations < 1.0:
-      mutations = 0
-
-      for i in xrange(genome.getHeight()):
-         for j in xrange(genome.getWidth()):
-            if Util.randomFlipCoin(args["pmut"]):
-               new_val = allele[0].getRandomAllele()
-               genome.setItem(i, j, new_val)
-               mutations += 1
+      positions = Util.randomFlipCoinPositions(args["pmut"], genome.getHeight() * genome.getWidth())
+      mutations = len(positions)
    else:
-      for it in xrange(int(round(mutations))):
-         which_x = rand_randint(0, genome.getHeight() - 1)
-         which_y = rand_randint(0, genome.getWidth() - 1)
+      positions = [rand_randint(0, listSize) for it in xrange(int(round(mutations)))]
 
-         new_val = allele[0].getRandomAllele()
-         genome.setItem(which_x, which_y, new_val)
+   for it, new_val in zip(positions, allele.getTable().sample(positions)):
+      i, j = divmod(it, genome.getWidth())
+      genome.setItem(i, j, new_val)
 
    return int(mutations)
 
@@ -704,16 +983,15 @@ def G2DListMutatorRealGaussian(genome, **args):
    if mutations < 1.0:
       mutations = 0
 
-      for i in xrange(genome.getHeight()):
-         for j in xrange(genome.getWidth()):
-            if Util.randomFlipCoin(args["pmut"]):
-               final_value = genome[i][j] + rand_gauss(mu, sigma)
+      for it in Util.randomFlipCoinPositions(args["pmut"], genome.getHeight() * genome.getWidth()):
+         i, j = divmod(it, genome.getWidth())
+         final_value = genome[i][j] + rand_gauss(mu, sigma)
 
-               final_value = min(final_value, genome.getParam("rangemax", Consts.CDefRangeMax))
-               final_value = max(final_value, genome.getParam("rangemin", Consts.CDefRangeMin))
+         final_value = min(final_value, genome.getParam("rangemax", Consts.CDefRangeMax))
+         final_value = max(final_value, genome.getParam("rangemin", Consts.CDefRangeMin))
 
-               genome.setItem(i, j, final_value)
-               mutations += 1
+         genome.setItem(i, j, final_value)
+         mutations += 1
    else:
 
       for it in xrange(int(round(mutations))):
@@ -751,16 +1029,15 @@ def G2DListMutatorRealGaussianGradient(genome, **args):
    if mutations < 1.0:
       mutations = 0
 
-      for i in xrange(genome.getHeight()):
-         for j in xrange(genome.getWidth()):
-            if Util.randomFlipCoin(args["pmut"]):
-               final_value = genome[i][j] * abs(rand_gauss(mu, sigma))
+      for it in Util.randomFlipCoinPositions(args["pmut"], genome.getHeight() * genome.getWidth()):
+         i, j = divmod(it, genome.getWidth())
+         final_value = genome[i][j] * abs(rand_gauss(mu, sigma))
 
-               final_value = min(final_value, genome.getParam("rangemax", Consts.CDefRangeMax))
-               final_value = max(final_value, genome.getParam("rangemin", Consts.CDefRangeMin))
+         final_value = min(final_value, genome.getParam("rangemax", Consts.CDefRangeMax))
+         final_value = max(final_value, genome.getParam("rangemin", Consts.CDefRangeMin))
 
-               genome.setItem(i, j, final_value)
-               mutations += 1
+         genome.setItem(i, j, final_value)
+         mutations += 1
    else:
 
       for it in xrange(int(round(mutations))):
@@ -796,12 +1073,11 @@ def G2DBinaryStringMutatorSwap(genome, **args):
 
    if mutations < 1.0:
       mutations = 0
-      for i in xrange(height):
-         for j in xrange(width):
-            if Util.randomFlipCoin(args["pmut"]):
-               index_b = (rand_randint(0, height - 1), rand_randint(0, width - 1))
-               Util.list2DSwapElement(genome.genomeString, (i, j), index_b)
-               mutations += 1
+      for it in Util.randomFlipCoinPositions(args["pmut"], height * width):
+         i, j = divmod(it, width)
+         index_b = (rand_randint(0, height - 1), rand_randint(0, width - 1))
+         Util.list2DSwapElement(genome.genomeString, (i, j), index_b)
+         mutations += 1
    else:
       for it in xrange(int(round(mutations))):
          index_a = (rand_randint(0, height - 1), rand_randint(0, width - 1))
@@ -827,14 +1103,13 @@ def G2DBinaryStringMutatorFlip(genome, **args):
    if mutations < 1.0:
       mutations = 0
 
-      for i in xrange(genome.getHeight()):
-         for j in xrange(genome.getWidth()):
-            if Util.randomFlipCoin(args["pmut"]):
-               if genome[i][j] == 0:
-                  genome.setItem(i, j, 1)
-               else:
-                  genome.setItem(i, j, 0)
-               mutations += 1
+      for it in Util.randomFlipCoinPositions(args["pmut"], genome.getHeight() * genome.getWidth()):
+         i, j = divmod(it, genome.getWidth())
+         if genome[i][j] == 0:
+            genome.setItem(i, j, 1)
+         else:
+            genome.setItem(i, j, 0)
+         mutations += 1
    else:
 
       for it in xrange(int(round(mutations))):
@@ -848,6 +1123,158 @@ def G2DBinaryStringMutatorFlip(genome, **args):
 
    return int(mutations)
 
+##############################
+##     2D Array (ndarray)   ##
+##############################
+
+def _arrayMutationPositions(genome, pmut, rng):
+   """ Draws the positions of the mutated genes of a 2D array genome, the
+   same as flipping a coin for each gene
+
+   :rtype: the flat view of the genome array and the flat positions
+   """
+   size = genome.genomeArray.size
+   nmuts = rng.binomial(size, min(pmut, 1.0))
+   return genome.genomeArray.flat, _distinctPositions(rng, size, nmuts)
+
+def _logArrayChanges(genome, positions, old, new):
+   """ Records the changes of a vectorized mutation on the genome change log """
+   if genome.changeLog is None or len(positions) == 0:
+      return
+   rows, cols = numpy.divmod(positions, genome.getWidth())
+   genome.changeLog.extend(zip(zip(rows.tolist(), cols.tolist()), old.tolist(), new.tolist()))
+
+def G2DArrayMutatorSwap(genome, **args):
+   """ The mutator of G2DArray, Swap Mutator, each gene is swapped with a random
+   gene with the *pmut* probability
+
+   .. note:: this mutator is :term:`Data Type Independent`
+
+   .. versionadded:: 0.6
+      The *G2DArrayMutatorSwap* function
+   """
+   if args["pmut"] <= 0.0:
+      return 0
+   rng = Util.numpyRandomState()
+   flat, positions = _arrayMutationPositions(genome, args["pmut"], rng)
+   partners = rng.randint(0, genome.genomeArray.size, len(positions))
+
+   # The swaps are done in sequence, a gene may be swapped more than once
+   width = genome.getWidth()
+   for a, b in zip(positions.tolist(), partners.tolist()):
+      value_a, value_b = flat[a], flat[b]
+      if genome.changeLog is not None:
+         genome.changeLog.append((divmod(a, width), value_a, value_b))
+         genome.changeLog.append((divmod(b, width), value_b, value_a))
+      flat[a], flat[b] = value_b, value_a
+
+   return len(positions)
+
+def G2DArrayMutatorIntegerRange(genome, **args):
+   """ Simple integer range mutator for G2DArray
+
+   Accepts the *rangemin* and *rangemax* genome parameters, both optional.
+
+   .. versionadded:: 0.6
+      The *G2DArrayMutatorIntegerRange* function
+   """
+   if args["pmut"] <= 0.0:
+      return 0
+   rng = Util.numpyRandomState()
+   flat, positions = _arrayMutationPositions(genome, args["pmut"], rng)
+
+   range_min = genome.getParam("rangemin", Consts.CDefRangeMin)
+   range_max = genome.getParam("rangemax", Consts.CDefRangeMax)
+   values = rng.randint(range_min, range_max + 1, len(positions))
+
+   _logArrayChanges(genome, positions, flat[positions], values)
+   flat[positions] = values
+   return len(positions)
+
+def G2DArrayMutatorIntegerGaussian(genome, **args):
+   """ A gaussian mutator for G2DArray of Integers
+
+   Accepts the *rangemin* and *rangemax* genome parameters, both optional. Also
+   accepts the parameter *gauss_mu* and the *gauss_sigma* which respectively
+   represents the mean and the std. dev. of the random distribution.
+
+   .. versionadded:: 0.6
+      The *G2DArrayMutatorIntegerGaussian* function
+   """
+   if args["pmut"] <= 0.0:
+      return 0
+   rng = Util.numpyRandomState()
+   flat, positions = _arrayMutationPositions(genome, args["pmut"], rng)
+
+   mu = genome.getParam("gauss_mu")
+   sigma = genome.getParam("gauss_sigma")
+
+   if mu is None:
+      mu = Consts.CDefG2DListMutIntMU
+
+   if sigma is None:
+      sigma = Consts.CDefG2DListMutIntSIGMA
+
+   old = flat[positions]
+   values = old + rng.normal(mu, sigma, len(positions)).astype(numpy.int64)
+   values = numpy.clip(values, genome.getParam("rangemin", Consts.CDefRangeMin),
+                       genome.getParam("rangemax", Consts.CDefRangeMax))
+
+   _logArrayChanges(genome, positions, old, values)
+   flat[positions] = values
+   return len(positions)
+
+def G2DArrayMutatorRealGaussian(genome, **args):
+   """ A gaussian mutator for G2DArray of Real
+
+   Accepts the *rangemin* and *rangemax* genome parameters, both optional. Also
+   accepts the parameter *gauss_mu* and the *gauss_sigma* which respectively
+   represents the mean and the std. dev. of the random distribution.
+
+   .. versionadded:: 0.6
+      The *G2DArrayMutatorRealGaussian* function
+   """
+   if args["pmut"] <= 0.0:
+      return 0
+   rng = Util.numpyRandomState()
+   flat, positions = _arrayMutationPositions(genome, args["pmut"], rng)
+
+   mu = genome.getParam("gauss_mu")
+   sigma = genome.getParam("gauss_sigma")
+
+   if mu is None:
+      mu = Consts.CDefG2DListMutRealMU
+
+   if sigma is None:
+      sigma = Consts.CDefG2DListMutRealSIGMA
+
+   old = flat[positions]
+   values = numpy.clip(old + rng.normal(mu, sigma, len(positions)),
+                       genome.getParam("rangemin", Consts.CDefRangeMin),
+                       genome.getParam("rangemax", Consts.CDefRangeMax))
+
+   _logArrayChanges(genome, positions, old, values)
+   flat[positions] = values
+   return len(positions)
+
+def G2DBinaryArrayMutatorFlip(genome, **args):
+   """ A flip mutator for G2DBinaryArray
+
+   .. versionadded:: 0.6
+      The *G2DBinaryArrayMutatorFlip* function
+   """
+   if args["pmut"] <= 0.0:
+      return 0
+   rng = Util.numpyRandomState()
+   flat, positions = _arrayMutationPositions(genome, args["pmut"], rng)
+
+   old = flat[positions]
+   values = 1 - old
+
+   _logArrayChanges(genome, positions, old, values)
+   flat[positions] = values
+   return len(positions)
+
 #################
 ##     Tree    ##
 #################
@@ -864,12 +1291,11 @@ def GTreeMutatorSwap(genome, **args):
 
    if mutations < 1.0:
       mutations = 0
-      for i in xrange(len(genome)):
-         if Util.randomFlipCoin(args["pmut"]):
-            mutations += 1
-            nodeOne = genome.getRandomNode()
-            nodeTwo = genome.getRandomNode()
-            nodeOne.swapNodeData(nodeTwo)
+      for i in Util.randomFlipCoinPositions(args["pmut"], len(genome)):
+         mutations += 1
+         nodeOne = genome.getRandomNode()
+         nodeTwo = genome.getRandomNode()
+         nodeOne.swapNodeData(nodeTwo)
    else:
       for it in xrange(int(round(mutations))):
          nodeOne = genome.getRandomNode()
@@ -897,12 +1323,11 @@ def GTreeMutatorIntegerRange(genome, **args):
 
    if mutations < 1.0:
       mutations = 0
-      for i in xrange(len(genome)):
-         if Util.randomFlipCoin(args["pmut"]):
-            mutations += 1
-            rand_node = genome.getRandomNode()
-            random_int = rand_randint(range_min, range_max)
-            rand_node.setData(random_int)
+      for i in Util.randomFlipCoinPositions(args["pmut"], len(genome)):
+         mutations += 1
+         rand_node = genome.getRandomNode()
+         random_int = rand_randint(range_min, range_max)
+         rand_node.setData(random_int)
 
    else:
       for it in xrange(int(round(mutations))):
@@ -931,12 +1356,11 @@ def GTreeMutatorRealRange(genome, **args):
 
    if mutations < 1.0:
       mutations = 0
-      for i in xrange(len(genome)):
-         if Util.randomFlipCoin(args["pmut"]):
-            mutations += 1
-            rand_node = genome.getRandomNode()
-            random_real = rand_uniform(range_min, range_max)
-            rand_node.setData(random_real)
+      for i in Util.randomFlipCoinPositions(args["pmut"], len(genome)):
+         mutations += 1
+         rand_node = genome.getRandomNode()
+         random_real = rand_uniform(range_min, range_max)
+         rand_node.setData(random_real)
 
    else:
       for it in xrange(int(round(mutations))):
@@ -965,14 +1389,13 @@ def GTreeMutatorIntegerGaussian(genome, **args):
 
    if mutations < 1.0:
       mutations = 0
-      for i in xrange(len(genome)):
-         if Util.randomFlipCoin(args["pmut"]):
-            mutations += 1
-            rand_node = genome.getRandomNode()
-            final_value = rand_node.getData() + int(rand_gauss(mu, sigma))
-            final_value = min(final_value, genome.getParam("rangemax", Consts.CDefRangeMax))
-            final_value = max(final_value, genome.getParam("rangemin", Consts.CDefRangeMin))
-            rand_node.setData(final_value)
+      for i in Util.randomFlipCoinPositions(args["pmut"], len(genome)):
+         mutations += 1
+         rand_node = genome.getRandomNode()
+         final_value = rand_node.getData() + int(rand_gauss(mu, sigma))
+         final_value = min(final_value, genome.getParam("rangemax", Consts.CDefRangeMax))
+         final_value = max(final_value, genome.getParam("rangemin", Consts.CDefRangeMin))
+         rand_node.setData(final_value)
    else:
       for it in xrange(int(round(mutations))):
          rand_node = genome.getRandomNode()
@@ -1002,14 +1425,13 @@ def GTreeMutatorRealGaussian(genome, **args):
 
    if mutations < 1.0:
       mutations = 0
-      for i in xrange(len(genome)):
-         if Util.randomFlipCoin(args["pmut"]):
-            mutations += 1
-            rand_node = genome.getRandomNode()
-            final_value = rand_node.getData() + rand_gauss(mu, sigma)
-            final_value = min(final_value, genome.getParam("rangemax", Consts.CDefRangeMax))
-            final_value = max(final_value, genome.getParam("rangemin", Consts.CDefRangeMin))
-            rand_node.setData(final_value)
+      for i in Util.randomFlipCoinPositions(args["pmut"], len(genome)):
+         mutations += 1
+         rand_node = genome.getRandomNode()
+         final_value = rand_node.getData() + rand_gauss(mu, sigma)
+         final_value = min(final_value, genome.getParam("rangemax", Consts.CDefRangeMax))
+         final_value = max(final_value, genome.getParam("rangemin", Consts.CDefRangeMin))
+         rand_node.setData(final_value)
    else:
       for it in xrange(int(round(mutations))):
          rand_node = genome.getRandomNode()
@@ -1045,25 +1467,24 @@ def GTreeGPMutatorOperation(genome, **args):
 
    if mutations < 1.0:
       mutations = 0
-      for i in xrange(len(genome)):
-         if Util.randomFlipCoin(args["pmut"]):
-            mutations += 1
-            rand_node = genome.getRandomNode()
-            assert rand_node is not None
-            if rand_node.getType() == Consts.nodeType["TERMINAL"]:
-               term_operator = rand_choice(gp_terminals)
-            else:
-               op_len = gp_function_set[rand_node.getData()]
-               fun_candidates = []
-               for o, l in gp_function_set.items():
-                  if l == op_len:
-                     fun_candidates.append(o)
-
-               if len(fun_candidates) <= 0:
-                  continue
-
-               term_operator = rand_choice(fun_candidates)
-            rand_node.setData(term_operator)
+      for i in Util.randomFlipCoinPositions(args["pmut"], len(genome)):
+         mutations += 1
+         rand_node = genome.getRandomNode()
+         assert rand_node is not None
+         if rand_node.getType() == Consts.nodeType["TERMINAL"]:
+            term_operator = rand_choice(gp_terminals)
+         else:
+            op_len = gp_function_set[rand_node.getData()]
+            fun_candidates = []
+            for o, l in gp_function_set.items():
+               if l == op_len:
+                  fun_candidates.append(o)
+
+            if len(fun_candidates) <= 0:
+               continue
+
+            term_operator = rand_choice(fun_candidates)
+         rand_node.setData(term_operator)
    else:
       for it in xrange(int(round(mutations))):
          rand_node = genome.getRandomNode()
@@ -1091,6 +1512,10 @@ def GTreeGPMutatorSubtree(genome, **args):
 
    This mutator will recreate random subtree of the tree using the grow algorithm.
 
+   Accepts the *max_nodes* and *tarpeian_prob* parameters (see
+   :func:`Crossovers.GTreeGPCrossoverSinglePoint`), the new subtrees
+   which break these limits are discarded before being grafted.
+
    .. versionadded:: 0.6
       The *GTreeGPMutatorSubtree* function
    """
@@ -1099,6 +1524,8 @@ def GTreeGPMutatorSubtree(genome, **args):
       return 0
    ga_engine = args["ga_engine"]
    max_depth = genome.getParam("max_depth", None)
+   max_nodes = genome.getParam("max_nodes", None)
+   tarpeian_prob = genome.getParam("tarpeian_prob", 0.0)
    mutations = 0
 
    if max_depth is None:
@@ -1110,25 +1537,30 @@ def GTreeGPMutatorSubtree(genome, **args):
    branch_list = genome.nodes_branch
    elements = len(branch_list)
 
-   for i in xrange(elements):
-
+   for i in Util.randomFlipCoinPositions(args["pmut"], elements):
       node = branch_list[i]
       assert node is not None
 
-      if Util.randomFlipCoin(args["pmut"]):
-         depth = genome.getNodeDepth(node)
-         mutations += 1
+      depth = genome.getNodeDepth(node)
+      root_subtree = GTree.buildGTreeGPGrow(ga_engine, 0, max_depth - depth)
 
-         root_subtree = GTree.buildGTreeGPGrow(ga_engine, 0, max_depth - depth)
-         node_parent = node.getParent()
+      if max_nodes is not None or tarpeian_prob > 0.0:
+         new_size = len(genome) - genome.getNodesCount(node) + genome.getNodesCount(root_subtree)
+         if max_nodes is not None and new_size > max_nodes:
+            continue
+         if tarpeian_prob > 0.0 and new_size > len(genome) and Util.randomFlipCoin(tarpeian_prob):
+            continue
 
-         if node_parent is None:
-            genome.setRoot(root_subtree)
-            genome.processNodes()
-            return mutations
-         else:
-            root_subtree.setParent(node_parent)
-            node_parent.replaceChild(node, root_subtree)
+      mutations += 1
+      node_parent = node.getParent()
+
+      if node_parent is None:
+         genome.setRoot(root_subtree)
          genome.processNodes()
+         return mutations
+      else:
+         root_subtree.setParent(node_parent)
+         node_parent.replaceChild(node, root_subtree)
+      genome.processNodes()
 
    return int(mutations)
@@ -16,6 +16,13 @@ import time
 import sys
 import Util
 import cPickle
+import struct
+import array
+import select
+import errno
+from collections import deque
+import string
+import binascii
 
 try:
     import zlib
@@ -25,6 +32,13 @@ except ImportError:
 
 import Consts
 import logging
+from GenomeBase import GenomeBase
+import G1DList
+import G1DBinaryString
+import G2DList
+import G2DBinaryString
+import G2DArray
+import GTree
 
 def getMachineIP():
    """ Return all the IPs from current machine.
@@ -135,18 +149,25 @@ class UDPThreadUnicastClient(threading.Thread):
    :param host: the hostname to bind the socket on sender (this is not the target host)
    :param port: the sender port (this is not the target port)
    :param pool_size: the size of send pool
-   :param timeout: the time interval to check if the client have data to send
+   :param timeout: the time to wait the thread after the shutdown, the thread
+                   sleeps until there is data to send or the shutdown
 
+   .. versionchanged:: 0.6
+      The thread waits on a condition instead of checking the pool at each
+      *timeout* seconds, when the pool is full the oldest data is discarded,
+      and the data is sent in the order it was added.
    """
    def __init__(self, host, port, pool_size=10, timeout=0.5):
       super(UDPThreadUnicastClient, self).__init__()
       self.host = host
       self.port = port
       self.target = []
-      self.sendPool = []
+      self.sendPool = deque(maxlen=pool_size)
       self.poolSize = pool_size
-      self.sendPoolLock = threading.Lock()
+      self.sendPoolLock = threading.Condition()
       self.timeout = timeout
+      self.sent = 0
+      self.dropped = 0
 
       self.doshutdown = False
 
@@ -183,23 +204,44 @@ class UDPThreadUnicastClient(threading.Thread):
          ret = True if len(self.sendPool) >= 1 else False
       return ret
 
+   def getSent(self):
+      """ Returns the number of data sent
+
+      .. versionadded:: 0.6
+         The *getSent* method.
+      """
+      with self.sendPoolLock:
+         return self.sent
+
+   def getDropped(self):
+      """ Returns the number of data discarded because the pool was full
+
+      .. versionadded:: 0.6
+         The *getDropped* method.
+      """
+      with self.sendPoolLock:
+         return self.dropped
+
    def shutdown(self):
-      """  Shutdown the server thread, when called, this method will stop
-      the thread on the next socket timeout """
-      self.doshutdown = True
+      """  Shutdown the client thread, when called, the thread sends the
+      data on the pool and stops """
+      with self.sendPoolLock:
+         self.doshutdown = True
+         self.sendPoolLock.notify()
 
    def addData(self, data):
-      """ Set the data to send
+      """ Set the data to send, when the pool is full the oldest data
+      on the pool is discarded
 
       :param data: the data to send
 
       """
-      if self.poolLength() >= self.poolSize:
-         logging.warning('the send pool is full, consider increasing the pool size or decreasing the timeout !')
-         return
-
       with self.sendPoolLock:
+         if len(self.sendPool) >= self.poolSize:
+            logging.warning('the send pool is full, the oldest data was discarded, consider increasing the pool size !')
+            self.dropped += 1
          self.sendPool.append(data)
+         self.sendPoolLock.notify()
 
    def setTargetHost(self, host, port):
       """ Set the host/port of the target, the destination
@@ -241,14 +283,21 @@ class UDPThreadUnicastClient(threading.Thread):
          Util.raiseException('You must set the target(s) before send data', ValueError)
 
       while True:
-         if self.doshutdown:
-             break
-
-         while self.isReady():
-            data = self.popPool()
+         with self.sendPoolLock:
+            # The wait without timeout blocks the thread until the notify
+            while len(self.sendPool) <= 0 and not self.doshutdown:
+               self.sendPoolLock.wait()
+            pending = list(self.sendPool)
+            self.sendPool.clear()
+            stop = self.doshutdown
+
+         for data in pending:
             self.send(data)
+         with self.sendPoolLock:
+            self.sent += len(pending)
 
-         time.sleep(self.timeout)
+         if stop:
+            break
 
       self.close()
 
@@ -266,18 +315,23 @@ class UDPThreadServer(threading.Thread):
    :param host: the host to bind the server
    :param port: the server port to bind
    :param poolSize: the size of the server pool
-   :param timeout: the socket timeout
+   :param timeout: the time to wait the thread after the shutdown, the
+                   thread sleeps on *select* until a datagram arrives or
+                   the shutdown
 
    .. note:: this thread implements a pool to keep the received data,
              the *poolSize* parameter specifies how much individuals
              we must keep on the pool until the *popPool* method
-             is called; when the pool is full, the sever will
-             discard the received individuals.
+             is called; when the pool is full, the oldest received
+             individuals are discarded, see :meth:`getDropped`.
 
+   .. versionchanged:: 0.6
+      The thread waits on *select*, woken by the datagrams or by the
+      shutdown, instead of the socket timeout.
    """
    def __init__(self, host, port, poolSize=10, timeout=3):
       super(UDPThreadServer, self).__init__()
-      self.recvPool = []
+      self.recvPool = deque(maxlen=poolSize)
       self.recvPoolLock = threading.Lock()
       self.bufferSize = 4096
       self.host = host
@@ -285,15 +339,26 @@ class UDPThreadServer(threading.Thread):
       self.timeout = timeout
       self.doshutdown = False
       self.poolSize = poolSize
+      self.received = 0
+      self.dropped = 0
 
       self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
       self.sock.bind((host, port))
-      self.sock.settimeout(self.timeout)
+      self.sock.setblocking(0)
+
+      # The shutdown sends a datagram to this socket to wake the select
+      self.waker = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+      self.waker.bind(("127.0.0.1", 0))
+      self.waker.setblocking(0)
 
    def shutdown(self):
-      """  Shutdown the server thread, when called, this method will stop
-      the thread on the next socket timeout """
+      """  Shutdown the server thread, when called, this method will
+      wake and stop the thread """
       self.doshutdown = True
+      try:
+         self.waker.sendto("\0", self.waker.getsockname())
+      except socket.error:
+         logging.debug("The server thread was already closed.")
 
    def isReady(self):
       """ Returns True when there is data on the pool or False when not
@@ -325,9 +390,43 @@ class UDPThreadServer(threading.Thread):
          ret = self.recvPool.pop()
       return ret
 
+   def addPool(self, data):
+      """ Adds the received data to the pool, when the pool is full the
+      oldest data on the pool is discarded
+
+      :param data: the tuple (sender ip, data)
+
+      .. versionadded:: 0.6
+         The *addPool* method.
+      """
+      with self.recvPoolLock:
+         if len(self.recvPool) >= self.poolSize:
+            self.dropped += 1
+         self.recvPool.append(data)
+         self.received += 1
+
+   def getReceived(self):
+      """ Returns the number of data received, including the discarded
+
+      .. versionadded:: 0.6
+         The *getReceived* method.
+      """
+      with self.recvPoolLock:
+         return self.received
+
+   def getDropped(self):
+      """ Returns the number of data discarded because the pool was full
+
+      .. versionadded:: 0.6
+         The *getDropped* method.
+      """
+      with self.recvPoolLock:
+         return self.dropped
+
    def close(self):
       """ Closes the internal socket """
       self.sock.close()
+      self.waker.close()
 
    def setBufferSize(self, size):
       """ Sets the receive buffer size
@@ -346,17 +445,21 @@ class UDPThreadServer(threading.Thread):
       return self.bufferSize
 
    def getData(self):
-      """ Calls the socket *recvfrom* method and waits for the data,
-      when the data is received, the method will return a tuple
-      with the IP of the sender and the data received. When a timeout
-      exception occurs, the method return None.
+      """ Calls the socket *recvfrom* method and returns the data,
+      the method will return a tuple with the IP of the sender and
+      the data received. When there is no data waiting on the socket,
+      the method returns None.
 
-      :rtype: tuple (sender ip, data) or None when timeout exception
+      :rtype: tuple (sender ip, data) or None when there is no data
 
+      .. versionchanged:: 0.6
+         The socket is non-blocking, the *run* method waits on *select*.
       """
       try:
          data, sender = self.sock.recvfrom(self.bufferSize)
-      except socket.timeout:
+      except socket.error, expt:
+         if expt.args[0] not in (errno.EAGAIN, errno.EWOULDBLOCK):
+            logging.debug("Error receiving the datagram: %s", expt)
          return None
       return (sender[0], data)
 
@@ -365,23 +468,382 @@ class UDPThreadServer(threading.Thread):
       is the main of the thread, when called, it will enter in loop
       to wait data or shutdown when needed.
       """
-      while True:
-         # Get the data
-         data = self.getData()
-         # Shutdown called
-         if self.doshutdown:
-             break
-         # The pool is full
-         if self.poolLength() >= self.poolSize:
+      while not self.doshutdown:
+         try:
+            readable = select.select([self.sock, self.waker], [], [])[0]
+         except select.error, expt:
+            if expt.args[0] == errno.EINTR:
+               continue
+            raise
+
+         if self.sock not in readable:
             continue
-         # There is no data received
-         if data is None:
-             continue
-         # It's a packet from myself
-         if data[0] == self.host:
-            continue
-         with self.recvPoolLock:
-            self.recvPool.append(data)
+
+         # Reads all the datagrams waiting on the socket
+         while not self.doshutdown:
+            data = self.getData()
+            # There is no data received
+            if data is None:
+               break
+            # It's a packet from myself
+            if data[0] == self.host:
+               continue
+            self.addPool(data)
+
+      self.close()
+
+_frameHeader = struct.Struct("<I")
+
+class _TCPPeer(object):
+   """ The state of the connection to a target of the :class:`TCPThreadTransport` """
+   __slots__ = ["address", "sock", "connecting", "queue", "buffer", "offset", "retryAt"]
+
+   def __init__(self, address, queue_size):
+      self.address = address
+      self.sock = None
+      self.connecting = False
+      self.queue = deque(maxlen=queue_size)
+      self.buffer = None
+      self.offset = 0
+      self.retryAt = 0
+
+class TCPThreadTransport(threading.Thread):
+   """ The TCP transport thread class.
+
+   This class is a thread to send and receive frames (strings) over
+   persistent TCP connections, it is used by the :class:`Migration.TCPMigration`.
+   A single thread waits on *select* for all the connections: the listening
+   socket, the connections accepted from the other islands and the
+   connections to the targets, which are opened on the start and opened
+   again when they fail.
+
+   Each frame is written with its length (32 bits) before the data, so the
+   frames have no size limit besides the *max_frame* parameter, unlike the
+   UDP datagrams.
+
+   Example:
+      >>> transport = TCPThreadTransport("192.168.0.2", 10000)
+      >>> transport.setTargets([("192.168.0.3", 10000)])
+      >>> transport.start()
+      >>> transport.send("data")
+      >>> if transport.isReady():
+      ...    sender, data = transport.popPool()
+      >>> transport.shutdown()
+
+   The queues are bounded, which gives the back-pressure: when the received
+   pool has *pool_size* frames, the thread stops reading the connections
+   until the :meth:`popPool` is called, so the TCP buffers of the senders
+   fill up; when the queue of a target has *queue_size* frames waiting, the
+   oldest frame is discarded, see :meth:`getDropped`.
+
+   :param host: the host to bind the server
+   :param port: the server port to bind, 0 binds any free port, see :meth:`getPort`
+   :param pool_size: the max number of received frames kept on the pool
+   :param queue_size: the max number of frames waiting to be sent to each target
+   :param max_frame: the max size of a frame, the connections sending bigger frames are closed
+
+   .. versionadded:: 0.6
+      The :class:`TCPThreadTransport` class.
+   """
+   def __init__(self, host, port, pool_size=Consts.CDefTCPPoolSize, queue_size=Consts.CDefTCPQueueSize,
+                max_frame=Consts.CDefTCPMaxFrameSize):
+      super(TCPThreadTransport, self).__init__()
+      self.host = host
+      self.poolSize = pool_size
+      self.queueSize = queue_size
+      self.maxFrame = max_frame
+      self.reconnectDelay = Consts.CDefTCPReconnectDelay
+      self.lock = threading.Lock()
+      self.recvPool = deque()
+      self.peers = []
+      self.incoming = {}
+      self.received = 0
+      self.sent = 0
+      self.dropped = 0
+      self.doshutdown = False
+
+      self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+      self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+      self.listener.bind((host, port))
+      self.listener.listen(16)
+      self.listener.setblocking(0)
+      self.port = self.listener.getsockname()[1]
+
+      # The send and the shutdown send a datagram to this socket to wake the select
+      self.waker = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+      self.waker.bind(("127.0.0.1", 0))
+      self.waker.setblocking(0)
+
+   def getPort(self):
+      """ Returns the port of the server
+
+      :rtype: integer
+      """
+      return self.port
+
+   def setTargets(self, address_list):
+      """ Sets the targets, the destinations of the frames, this method
+      must be called before the start of the thread
+
+      :param address_list: a list with tuples (ip, port)
+      """
+      if self.isAlive():
+         Util.raiseException("The targets must be set before the start of the transport thread")
+      self.peers = [_TCPPeer(tuple(address), self.queueSize) for address in address_list]
+
+   def getTargets(self):
+      """ Returns the list of the targets
+
+      :rtype: a list with tuples (ip, port)
+      """
+      with self.lock:
+         return [peer.address for peer in self.peers]
+
+   def isConnected(self, address):
+      """ Returns True when the connection to the target is open
+
+      :param address: the target (ip, port)
+      :rtype: boolean
+      """
+      with self.lock:
+         for peer in self.peers:
+            if peer.address == tuple(address):
+               return peer.sock is not None and not peer.connecting
+      return False
+
+   def wake(self):
+      """ Wakes the thread, to send the new frames or to stop """
+      try:
+         self.waker.sendto("\0", self.waker.getsockname())
+      except socket.error:
+         logging.debug("The transport thread was already closed.")
+
+   def send(self, data):
+      """ Sends the frame to all the targets, the frame is put on the queue
+      of each target and the method returns immediately
+
+      :param data: the frame, a string
+      """
+      if len(data) > self.maxFrame:
+         Util.raiseException("The frame size %d is greater than the max frame size %d" % (len(data), self.maxFrame),
+                             ValueError)
+
+      frame = _frameHeader.pack(len(data)) + data
+      with self.lock:
+         for peer in self.peers:
+            if len(peer.queue) >= self.queueSize:
+               logging.warning("the send queue of %s is full, the oldest frame was discarded !", peer.address)
+               self.dropped += 1
+            peer.queue.append(frame)
+      self.wake()
+
+   def isReady(self):
+      """ Returns True when there is data on the pool or False when not
+
+      :rtype: boolean
+      """
+      with self.lock:
+         return len(self.recvPool) >= 1
+
+   def poolLength(self):
+      """ Returns the size of the pool
+
+      :rtype: integer
+      """
+      with self.lock:
+         return len(self.recvPool)
+
+   def popPool(self):
+      """ Returns the oldest frame received on the pool
+
+      :rtype: tuple (sender ip, data)
+      """
+      with self.lock:
+         ret = self.recvPool.popleft()
+         resume = len(self.recvPool) == self.poolSize - 1
+      if resume:
+         self.wake()
+      return ret
+
+   def getReceived(self):
+      """ Returns the number of frames received """
+      with self.lock:
+         return self.received
+
+   def getSent(self):
+      """ Returns the number of frames sent, to each target """
+      with self.lock:
+         return self.sent
+
+   def getDropped(self):
+      """ Returns the number of frames discarded because a send queue was full """
+      with self.lock:
+         return self.dropped
+
+   def shutdown(self):
+      """ Shutdown the transport thread, when called, this method will
+      wake and stop the thread, the frames not sent are discarded """
+      self.doshutdown = True
+      self.wake()
+
+   def close(self):
+      """ Closes all the sockets """
+      for peer in self.peers:
+         if peer.sock is not None:
+            peer.sock.close()
+            peer.sock = None
+      for sock in self.incoming.keys():
+         sock.close()
+      self.incoming.clear()
+      self.listener.close()
+      self.waker.close()
+
+   def __connect(self, peer, now):
+      """ Starts the non-blocking connection to the target """
+      sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+      sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+      sock.setblocking(0)
+      error = sock.connect_ex(peer.address)
+      if error in (0, errno.EINPROGRESS, errno.EWOULDBLOCK):
+         peer.sock = sock
+         peer.connecting = error != 0
+      else:
+         sock.close()
+         peer.retryAt = now + self.reconnectDelay
+
+   def __disconnect(self, peer):
+      """ Closes the connection to the target, it will be opened again
+      after the reconnect delay, the frame being written is sent again """
+      logging.debug("Closing the connection to %s.", peer.address)
+      peer.sock.close()
+      peer.sock = None
+      peer.connecting = False
+      peer.offset = 0
+      peer.retryAt = time.time() + self.reconnectDelay
+
+   def __write(self, peer):
+      """ Writes the frames of the queue to the target """
+      while True:
+         if peer.buffer is None:
+            with self.lock:
+               if len(peer.queue) <= 0:
+                  return
+               peer.buffer = peer.queue.popleft()
+               peer.offset = 0
+         try:
+            written = peer.sock.send(peer.buffer[peer.offset:peer.offset + Consts.CDefTCPChunkSize])
+         except socket.error, expt:
+            if expt.args[0] not in (errno.EAGAIN, errno.EWOULDBLOCK):
+               self.__disconnect(peer)
+            return
+         peer.offset += written
+         if peer.offset < len(peer.buffer):
+            return
+         peer.buffer = None
+         with self.lock:
+            self.sent += 1
+
+   def __read(self, sock):
+      """ Reads the data of an accepted connection and puts the complete
+      frames on the pool """
+      sender, buff = self.incoming[sock]
+      try:
+         data = sock.recv(Consts.CDefTCPChunkSize)
+      except socket.error, expt:
+         if expt.args[0] in (errno.EAGAIN, errno.EWOULDBLOCK):
+            return
+         data = ""
+      if not data:
+         sock.close()
+         del self.incoming[sock]
+         return
+
+      buff.extend(data)
+      frames = []
+      while len(buff) >= _frameHeader.size:
+         size, = _frameHeader.unpack_from(buff)
+         if size > self.maxFrame:
+            logging.warning("The frame of %s has %d bytes, more than the max frame size, closing the connection !",
+                            sender, size)
+            sock.close()
+            del self.incoming[sock]
+            break
+         if len(buff) < _frameHeader.size + size:
+            break
+         frames.append((sender, str(buff[_frameHeader.size:_frameHeader.size + size])))
+         del buff[:_frameHeader.size + size]
+
+      if frames:
+         with self.lock:
+            self.recvPool.extend(frames)
+            self.received += len(frames)
+
+   def run(self):
+      """ Called when the thread is started by the user. This method
+      is the main of the thread, it waits on *select* for the connections,
+      the new frames and the shutdown.
+      """
+      while not self.doshutdown:
+         now = time.time()
+         timeout = None
+         rlist = [self.listener, self.waker]
+         wlist = []
+         with self.lock:
+            peers = self.peers[:]
+            if len(self.recvPool) < self.poolSize:
+               rlist.extend(self.incoming.keys())
+
+         writers = {}
+         for peer in peers:
+            if peer.sock is None:
+               if now >= peer.retryAt:
+                  self.__connect(peer, now)
+               if peer.sock is None:
+                  wait = peer.retryAt - now
+                  timeout = wait if timeout is None else min(timeout, wait)
+                  continue
+            with self.lock:
+               pending = peer.buffer is not None or len(peer.queue) > 0
+            if peer.connecting or pending:
+               wlist.append(peer.sock)
+               writers[peer.sock] = peer
+
+         try:
+            readable, writable, failed = select.select(rlist, wlist, wlist, timeout)
+         except select.error, expt:
+            if expt.args[0] == errno.EINTR:
+               continue
+            raise
+
+         if self.waker in readable:
+            try:
+               while self.waker.recv(64):
+                  pass
+            except socket.error:
+               pass
+
+         if self.listener in readable:
+            try:
+               sock, address = self.listener.accept()
+               sock.setblocking(0)
+               self.incoming[sock] = (address[0], bytearray())
+            except socket.error, expt:
+               logging.debug("Error accepting the connection: %s", expt)
+
+         for sock in readable:
+            if sock in self.incoming:
+               self.__read(sock)
+
+         for sock in set(writable) | set(failed):
+            peer = writers[sock]
+            if peer.sock is not sock:
+               continue
+            if peer.connecting:
+               if sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) != 0:
+                  self.__disconnect(peer)
+                  continue
+               peer.connecting = False
+            self.__write(peer)
 
       self.close()
 
@@ -392,8 +854,11 @@ def pickleAndCompress(obj, level=9):
    :param level: the compression level, 9 is the best
                     and -1 is to not compress
 
+   .. versionchanged:: 0.6
+      The object is pickled with the highest protocol, the genomes with
+      *__slots__* can't be pickled with the protocol 0.
    """
-   pickled = cPickle.dumps(obj)
+   pickled = cPickle.dumps(obj, cPickle.HIGHEST_PROTOCOL)
    if level < 0:
        return pickled
    else:
@@ -415,6 +880,321 @@ def unpickleAndDecompress(obj_dump, decompress=True):
       obj_decompress = obj_dump
    return cPickle.loads(obj_decompress)
 
+# The genome codecs, by the genome class and by the type tag
+_genomeCodecs = {}
+_genomeCodecTags = {}
+
+_codecHeader = struct.Struct("<cBdd")
+_numbersHeader = struct.Struct("<cBI")
+_codecCompressed = 1
+
+# The array typecodes with 1, 2, 4 and 8 bytes signed integers on this platform
+_intTypecodes = {}
+for _typecode in "lihb":
+   _intTypecodes[array.array(_typecode).itemsize] = _typecode
+
+# The translation tables of the bytes 0 and 1 to the digits "0" and "1"
+_bitDigits = string.maketrans("\x00\x01", "01")
+_bitValues = string.maketrans("01", "\x00\x01")
+
+def _toLittleEndian(values):
+   """ Returns the bytes of the array in the little-endian order """
+   if sys.byteorder == "big":
+      values = array.array(values.typecode, values)
+      values.byteswap()
+   return values.tostring()
+
+def _fromLittleEndian(typecode, data):
+   """ Returns the array from the bytes in the little-endian order """
+   values = array.array(typecode)
+   values.fromstring(data)
+   if sys.byteorder == "big":
+      values.byteswap()
+   return values
+
+def packNumbers(values):
+   """ Packs a list of numbers on a string, the lists of integers with the
+   smallest integer type which holds all the values and the lists of reals
+   as 64 bits reals. The lists of other values, or of integers and reals,
+   are pickled, so the types of the values are kept.
+
+   Example:
+      >>> data = Network.packNumbers([1, 2, 300])
+      >>> len(data)
+      12
+
+   :param values: the list of values
+   :rtype: the string with the packed values
+
+   .. versionadded:: 0.6
+      The *packNumbers* function
+   """
+   kinds = set(type(value) for value in values)
+   if kinds <= set([int, long]):
+      low, high = (min(values), max(values)) if values else (0, 0)
+      for width in (1, 2, 4, 8):
+         limit = 1 << (8 * width - 1)
+         if -limit <= low and high < limit and width in _intTypecodes:
+            data = _toLittleEndian(array.array(_intTypecodes[width], values))
+            return _numbersHeader.pack("i", width, len(values)) + data
+   if kinds == set([float]):
+      data = _toLittleEndian(array.array("d", values))
+      return _numbersHeader.pack("d", 8, len(values)) + data
+
+   data = cPickle.dumps(list(values), cPickle.HIGHEST_PROTOCOL)
+   return _numbersHeader.pack("p", 0, len(data)) + data
+
+def unpackNumbers(data, offset=0):
+   """ Unpacks a list packed by the :func:`packNumbers`
+
+   :param data: the string with the packed values
+   :param offset: the position of the list on the string
+   :rtype: a tuple with the list and the position after the list
+
+   .. versionadded:: 0.6
+      The *unpackNumbers* function
+   """
+   kind, width, count = _numbersHeader.unpack_from(data, offset)
+   offset += _numbersHeader.size
+   if kind == "p":
+      return cPickle.loads(data[offset:offset + count]), offset + count
+   typecode = "d" if kind == "d" else _intTypecodes[width]
+   end = offset + count * width
+   return _fromLittleEndian(typecode, data[offset:end]).tolist(), end
+
+def _packBits(bits):
+   """ Packs a list of 0 and 1 on a string, eight bits by byte, the bits
+   are converted to a long integer, so the packing runs in C """
+   count = len(bits)
+   if count == 0:
+      return struct.pack("<I", 0)
+   digits = array.array("B", bits).tostring().translate(_bitDigits)
+   packed = binascii.unhexlify("%0*x" % (((count + 7) // 8) * 2, long(digits[::-1], 2)))
+   return struct.pack("<I", count) + packed[::-1]
+
+def _unpackBits(data, offset=0):
+   """ Unpacks the bits packed by *_packBits*, returns the list and
+   the position after the bits """
+   count, = struct.unpack_from("<I", data, offset)
+   offset += 4
+   end = offset + (count + 7) // 8
+   if count == 0:
+      return [], end
+   value = long(binascii.hexlify(data[offset:end][::-1]), 16)
+   digits = bin(value)[2:].zfill(count)[::-1][:count]
+   return array.array("B", digits.translate(_bitValues)).tolist(), end
+
+def _encodeG1DList(genome):
+   return packNumbers(genome.genomeList)
+
+def _decodeG1DList(template, data):
+   genome = template.clone()
+   genome.genomeList = unpackNumbers(data)[0]
+   genome.genomeSize = len(genome.genomeList)
+   return genome
+
+def _encodeG1DBinaryString(genome):
+   return _packBits(genome.genomeList)
+
+def _decodeG1DBinaryString(template, data):
+   genome = template.clone()
+   genome.genomeList = _unpackBits(data)[0]
+   genome.genomeSize = genome.stringLength = len(genome.genomeList)
+   return genome
+
+def _encodeG2DList(genome):
+   values = [value for row in genome.genomeList for value in row]
+   return struct.pack("<II", genome.height, genome.width) + packNumbers(values)
+
+def _decodeG2DList(template, data):
+   genome = template.clone()
+   genome.height, genome.width = struct.unpack_from("<II", data)
+   values = unpackNumbers(data, 8)[0]
+   genome.genomeList = [values[i:i + genome.width] for i in xrange(0, len(values), genome.width)]
+   return genome
+
+def _encodeG2DBinaryString(genome):
+   bits = [bit for row in genome.genomeString for bit in row]
+   return struct.pack("<II", genome.height, genome.width) + _packBits(bits)
+
+def _decodeG2DBinaryString(template, data):
+   genome = template.clone()
+   genome.height, genome.width = struct.unpack_from("<II", data)
+   bits = _unpackBits(data, 8)[0]
+   genome.genomeString = [bits[i:i + genome.width] for i in xrange(0, len(bits), genome.width)]
+   return genome
+
+def _encodeG2DArray(genome):
+   genes = genome.genomeArray
+   dtype = genes.dtype.newbyteorder("<")
+   return struct.pack("<II8p", genome.height, genome.width, dtype.str) + genes.astype(dtype).tostring()
+
+def _decodeG2DArray(template, data):
+   numpy = Util.importSpecial("numpy")
+   genome = template.clone()
+   genome.height, genome.width, dtype = struct.unpack_from("<II8p", data)
+   genome.genomeArray = numpy.fromstring(data[16:], dtype=dtype).astype(dtype[1:]).reshape(genome.height, genome.width)
+   return genome
+
+def _encodeTree(genome):
+   """ The prefix encoding of the trees, the table of the distinct node
+   data and, in the pre-order, the index of the data, the type (GP only)
+   and the number of childs of each node """
+   symbols = {}
+   indexes, types, childs = [], [], []
+   gp = isinstance(genome, GTree.GTreeGP)
+   node_stack = [genome.getRoot()]
+   while node_stack:
+      node = node_stack.pop()
+      indexes.append(symbols.setdefault(node.node_data, len(symbols)))
+      if gp:
+         types.append(node.node_type)
+      childs.append(len(node.childs))
+      node_stack.extend(reversed(node.childs))
+
+   table = [None] * len(symbols)
+   for data, index in symbols.iteritems():
+      table[index] = data
+   return packNumbers(table) + packNumbers(indexes) + packNumbers(types) + packNumbers(childs)
+
+def _decodeTree(template, data):
+   gp = isinstance(template, GTree.GTreeGP)
+   table, offset = unpackNumbers(data)
+   indexes, offset = unpackNumbers(data, offset)
+   types, offset = unpackNumbers(data, offset)
+   childs, offset = unpackNumbers(data, offset)
+
+   root = None
+   height = 0
+   node_stack = []
+   for i, index in enumerate(indexes):
+      if gp:
+         node = GTree.GTreeNodeGP(table[index], types[i])
+      else:
+         node = GTree.GTreeNode(table[index])
+      if node_stack:
+         parent = node_stack[-1]
+         node.parent = parent[0]
+         parent[0].childs.append(node)
+         parent[1] -= 1
+         depth = parent[2] + 1
+         if parent[1] == 0:
+            node_stack.pop()
+      else:
+         root = node
+         depth = 0
+      if childs[i] > 0:
+         node_stack.append([node, childs[i], depth])
+      elif depth > height:
+         height = depth
+
+   genome = GTree.GTreeGP(cloning=True) if gp else GTree.GTree()
+   GenomeBase.copy(template, genome)
+   genome.setRoot(root)
+   genome.processNodes(True)
+   genome.tree_height = height
+   return genome
+
+def _encodePickle(genome):
+   return cPickle.dumps(genome, cPickle.HIGHEST_PROTOCOL)
+
+def _decodePickle(template, data):
+   return cPickle.loads(data)
+
+def registerGenomeCodec(genome_class, tag, encode, decode):
+   """ Registers the codec of a genome class, used by the :func:`encodeGenome`
+   and :func:`decodeGenome` functions
+
+   Example:
+      >>> Network.registerGenomeCodec(MyGenome, "M", encode_my_genome, decode_my_genome)
+
+   :param genome_class: the genome class, the subclasses must be registered too
+   :param tag: the type tag, a single character
+   :param encode: the function which receives the genome and returns the string with the genes
+   :param decode: the function which receives the template genome and the string with the
+                  genes, and returns the new genome
+
+   .. versionadded:: 0.6
+      The *registerGenomeCodec* function
+   """
+   if len(tag) != 1:
+      Util.raiseException("The codec tag must be a single character", ValueError)
+   registered = _genomeCodecTags.get(tag)
+   if registered is not None and registered[0] is not genome_class:
+      Util.raiseException("The codec tag '%s' is used by the %s class" % (tag, registered[0].__name__), ValueError)
+   _genomeCodecs[genome_class] = (tag, encode, decode)
+   _genomeCodecTags[tag] = (genome_class, encode, decode)
+
+def encodeGenome(genome, level=-1):
+   """ Encodes the genome on a compact string, with the type tag of the
+   genome, the raw score, the fitness and the genes. The function slots
+   and the parameters of the genome aren't encoded, they are shared by
+   reference with the template genome on the :func:`decodeGenome`. The
+   genomes without a registered codec (see :func:`registerGenomeCodec`)
+   are pickled.
+
+   Example:
+      >>> data = Network.encodeGenome(genome)
+      >>> clone = Network.decodeGenome(data, ga_engine.getPopulation().oneSelfGenome)
+
+   :param genome: the genome
+   :param level: the zlib compression level of the genes, -1 is to not compress
+   :rtype: the encoded string
+
+   .. versionadded:: 0.6
+      The *encodeGenome* function
+   """
+   tag, encode, decode = _genomeCodecs.get(type(genome), ("P", _encodePickle, _decodePickle))
+   data = encode(genome)
+   flags = 0
+   if level >= 0:
+      if not ZLIB_SUPPORT:
+         Util.raiseException('zlib not found !', ImportError)
+      data = zlib.compress(data, level)
+      flags |= _codecCompressed
+   return _codecHeader.pack(tag, flags, genome.score, genome.fitness) + data
+
+def decodeGenome(data, template):
+   """ Decodes a genome encoded by the :func:`encodeGenome`
+
+   :param data: the encoded string
+   :param template: a genome of the same class, usually the
+                    :attr:`GPopulation.GPopulation.oneSelfGenome`, the new
+                    genome shares the function slots and the parameters of
+                    the template
+   :rtype: the new genome
+
+   .. versionadded:: 0.6
+      The *decodeGenome* function
+   """
+   tag, flags, score, fitness = _codecHeader.unpack_from(data)
+   if tag == "P":
+      decode = _decodePickle
+   elif tag in _genomeCodecTags:
+      decode = _genomeCodecTags[tag][2]
+   else:
+      Util.raiseException("Unknown genome codec tag '%s'" % (tag,), ValueError)
+
+   data = data[_codecHeader.size:]
+   if flags & _codecCompressed:
+      if not ZLIB_SUPPORT:
+         Util.raiseException('zlib not found !', ImportError)
+      data = zlib.decompress(data)
+   genome = decode(template, data)
+   genome.score = score
+   genome.fitness = fitness
+   genome.invalidateChangeLog()
+   return genome
+
+registerGenomeCodec(G1DList.G1DList, "L", _encodeG1DList, _decodeG1DList)
+registerGenomeCodec(G1DBinaryString.G1DBinaryString, "B", _encodeG1DBinaryString, _decodeG1DBinaryString)
+registerGenomeCodec(G2DList.G2DList, "M", _encodeG2DList, _decodeG2DList)
+registerGenomeCodec(G2DBinaryString.G2DBinaryString, "S", _encodeG2DBinaryString, _decodeG2DBinaryString)
+registerGenomeCodec(G2DArray.G2DArray, "A", _encodeG2DArray, _decodeG2DArray)
+registerGenomeCodec(G2DArray.G2DBinaryArray, "Y", _encodeG2DArray, _decodeG2DArray)
+registerGenomeCodec(GTree.GTree, "T", _encodeTree, _decodeTree)
+registerGenomeCodec(GTree.GTreeGP, "G", _encodeTree, _decodeTree)
+
 if __name__ == "__main__":
    arg = sys.argv[1]
    myself = getMachineIP()
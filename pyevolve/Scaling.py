@@ -128,3 +128,29 @@ def SaturatedScaling(pop):
    for i in xrange(len(pop)):
       score = pop[i].score
       pop[i].fitness = 1.0 - math.exp(score)
+
+def ParsimonyPressureScaling(pop):
+   """ Parsimony Pressure scaling scheme, used to control the bloat. This
+   scheme doesn't replace the main scaling scheme, it must be added after
+   it to penalize the fitness by the size of the individuals:
+
+   Example:
+      >>> pop = ga_engine.getPopulation()
+      >>> pop.scaleMethod.add(Scaling.ParsimonyPressureScaling)
+      >>> pop.setParams(parsimony_coefficient=0.01)
+
+   The fitness is decreased (or increased, when minimizing) by
+   the **parsimony_coefficient** population parameter times the size of
+   the individual (the number of nodes for trees). The raw scores are
+   not changed.
+
+   .. versionadded: 0.6
+      The `ParsimonyPressureScaling` function.
+   """
+   coefficient = pop.getParam("parsimony_coefficient", Consts.CDefScaleParsimonyCoefficient)
+   if pop.minimax == Consts.minimaxType["maximize"]:
+      for i in xrange(len(pop)):
+         pop[i].fitness = max(pop[i].fitness - coefficient * len(pop[i]), 0.0)
+   else:
+      for i in xrange(len(pop)):
+         pop[i].fitness += coefficient * len(pop[i])
@@ -26,6 +26,12 @@ class Statistics(object):
     **rawTot, fitTot**
        The total (sum) of raw scores and the fitness scores
 
+    **sizeAve, sizeMax**
+       Average and maximum size (number of nodes) of the tree genomes,
+       they are kept as 0.0 for the other genomes. They are kept apart of
+       the other statistics, so they aren't on the :meth:`items` and
+       :meth:`asTuple` dumped by the DB adapters
+
     Example:
        >>> stats = ga_engine.getStatistics()
        >>> st["rawMax"]
@@ -47,6 +53,11 @@ class Statistics(object):
             "fitAve": 0.0
         }
 
+        self.sizeDict = {
+            "sizeAve": 0.0,
+            "sizeMax": 0.0
+        }
+
         self.descriptions = {
             "rawMax": "Maximum raw score",
             "rawMin": "Minimum raw score",
@@ -56,15 +67,22 @@ class Statistics(object):
             "fitMax": "Maximum fitness",
             "fitMin": "Minimum fitness",
             "fitAve": "Fitness average",
+            "sizeAve": "Average size of the trees",
+            "sizeMax": "Maximum size of the trees",
         }
 
     def __getitem__(self, key):
         """ Return the specific statistic by key """
+        if key in self.sizeDict:
+            return self.sizeDict[key]
         return self.internalDict[key]
 
     def __setitem__(self, key, value):
         """ Set the statistic """
-        self.internalDict[key] = value
+        if key in self.sizeDict:
+            self.sizeDict[key] = value
+        else:
+            self.internalDict[key] = value
 
     def __len__(self):
         """ Return the length of internal stats dictionary """
@@ -75,6 +93,9 @@ class Statistics(object):
         strBuff = "- Statistics\n"
         for k, v in self.internalDict.items():
             strBuff += "\t%-45s = %.2f\n" % (self.descriptions.get(k, k), v)
+        if self.sizeDict["sizeMax"] > 0:
+            for k, v in self.sizeDict.items():
+                strBuff += "\t%-45s = %.2f\n" % (self.descriptions.get(k, k), v)
         return strBuff
 
     def asTuple(self):
@@ -85,6 +106,8 @@ class Statistics(object):
         """ Set all statistics to zero """
         for k in self.internalDict.keys():
             self.internalDict[k] = 0
+        for k in self.sizeDict.keys():
+            self.sizeDict[k] = 0.0
 
     def items(self):
         """ Return a tuple (name, value) for all stored statistics """
@@ -103,4 +126,5 @@ class Statistics(object):
 
         """
         obj.internalDict = self.internalDict.copy()
+        obj.sizeDict = self.sizeDict.copy()
         obj.descriptions = self.descriptions.copy()
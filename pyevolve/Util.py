@@ -9,10 +9,17 @@ use, like list item swap, random utilities and etc.
 """
 
 from random import random as rand_random
+from random import getrandbits as rand_getrandbits
 from math import sqrt as math_sqrt
+from math import log as math_log
 import logging
 import Consts
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 def randomFlipCoin(p):
     """Returns True with the *p* probability. If *p* is 1, the
@@ -35,6 +42,41 @@ def randomFlipCoin(p):
     return rand_random() <= p
 
 
+def randomFlipCoinPositions(p, size):
+    """Returns the positions, between 0 and *size* - 1, which would get
+    True from :func:`randomFlipCoin` with the *p* probability if it was
+    called for each position. The positions are drawn by geometric skips,
+    so the work is proportional to the number of positions returned and
+    not to *size*.
+
+    Example:
+       >>> Util.randomFlipCoinPositions(0.5, 10)
+       [0, 4, 5, 7]
+
+    :param p: probability, between 0.0 and 1.0
+    :param size: the number of positions
+    :rtype: the sorted list of positions
+
+    .. versionadded:: 0.6
+       The *randomFlipCoinPositions* function
+    """
+    if p <= 0.0:
+        return []
+    if p >= 1.0:
+        return range(size)
+
+    log_q = math_log(1.0 - p)
+    positions = []
+    pos = -1
+    while True:
+        # the number of failures before the next success is geometric
+        pos += int(math_log(1.0 - rand_random()) / log_q) + 1
+        if pos >= size:
+            break
+        positions.append(pos)
+    return positions
+
+
 def listSwapElement(lst, indexa, indexb):
     """ Swaps elements A and B in a list.
 
@@ -152,6 +194,97 @@ def importSpecial(name):
     return imp_mod
 
 
+def numpyRandomState():
+    """ Returns a new numpy random generator, seeded from the python
+    *random* module, this way the seed of the GA Engine is also used by
+    the operators drawing their random numbers with numpy.
+
+    :rtype: the numpy RandomState instance, or None if numpy isn't available
+
+    .. versionadded:: 0.6
+       The *numpyRandomState* function
+    """
+    if numpy is None:
+        return None
+    return numpy.random.RandomState(rand_getrandbits(32))
+
+
+def boundValues(values, lower, upper, mode, resample=None):
+    """ Puts the values of a numpy array back into the [*lower*, *upper*]
+    bounds, using one of the :attr:`Consts.boundHandlingType` modes:
+
+       *clip*
+          The values out of the bounds are set to the nearest bound
+
+       *reflect*
+          The values out of the bounds are reflected back by the bounds,
+          like a mirror
+
+       *resample*
+          The values out of the bounds are drawn again by the *resample*
+          function, up to :attr:`Consts.CDefBoundResampleMaxAttempt` times,
+          and then clipped
+
+    Example:
+       >>> Util.boundValues(numpy.array([-1.0, 0.5, 1.2]), 0.0, 1.0, Consts.boundHandlingType["reflect"])
+       array([ 1. ,  0.5,  0.8])
+
+    :param values: the numpy array of values, it may be changed
+    :param lower: the lower bound, a number or an array with the shape of *values*
+    :param upper: the upper bound, a number or an array with the shape of *values*
+    :param mode: the bound handling mode
+    :param resample: called as resample(mask) on the *resample* mode, returns
+                     the new values of the positions where the mask is True
+    :rtype: the array of values inside the bounds
+
+    .. versionadded:: 0.6
+       The *boundValues* function
+    """
+    if mode == Consts.boundHandlingType["reflect"]:
+        width = numpy.broadcast_to(numpy.subtract(upper, lower), values.shape)
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            shifted = numpy.mod(values - lower, 2.0 * width)
+            reflected = lower + width - numpy.abs(shifted - width)
+        values = numpy.where(width > 0, reflected, values)
+    elif mode == Consts.boundHandlingType["resample"] and resample is not None:
+        for attempt in xrange(Consts.CDefBoundResampleMaxAttempt):
+            outside = (values < lower) | (values > upper)
+            if not outside.any():
+                break
+            values[outside] = resample(outside)
+    elif mode not in Consts.boundHandlingType.values():
+        raiseException("Unknown bound handling mode [%s] !" % (mode,), ValueError)
+
+    return numpy.clip(values, lower, upper)
+
+
+def realGeneBounds(genome):
+    """ Returns the *rangemin* and *rangemax* genome parameters as numpy
+    arrays with the bounds of each gene, the parameters may be a number,
+    the same bound for all the genes, or a sequence with one bound per gene
+
+    Example:
+       >>> genome.setParams(rangemin=0.0, rangemax=[1.0, 2.0, 3.0])
+       >>> lower, upper = Util.realGeneBounds(genome)
+
+    :param genome: the one dimensional genome
+    :rtype: a tuple with the lower and upper bounds arrays
+
+    .. versionadded:: 0.6
+       The *realGeneBounds* function
+    """
+    size = len(genome)
+    lower = numpy.empty(size, dtype=float)
+    upper = numpy.empty(size, dtype=float)
+    try:
+        lower[:] = genome.getParam("rangemin", Consts.CDefRangeMin)
+        upper[:] = genome.getParam("rangemax", Consts.CDefRangeMax)
+    except ValueError:
+        raiseException("The rangemin and rangemax parameters must be numbers or sequences of %d bounds" % (size,),
+                       ValueError)
+    return lower, upper
+
+
 class ErrorAccumulator(object):
     """ An accumulator for the Root Mean Square Error (RMSE) and the
     Mean Square Error (MSE)
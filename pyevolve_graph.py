@@ -4,6 +4,170 @@
 # It requires matplotlib v.0.98.5.0+
 from optparse import OptionParser
 from optparse import OptionGroup
+import math
+
+# The aggregation of each statistic on the buckets of generations, the
+# extremes are kept so the envelope of the plots is the same of the full run
+STATS_AGGREGATES = [("rawMax", "max"), ("rawMin", "min"), ("rawAve", "avg"), ("rawDev", "avg"),
+                    ("fitMax", "max"), ("fitMin", "min"), ("fitAve", "avg")]
+
+def bucket_size(first, last, points):
+   """ Returns the size of the buckets to have at most *points* buckets between *first* and *last* """
+   return max(1, int(math.ceil((last - first + 1) / float(points))))
+
+def is_binary_log(filename):
+   """ Returns True if the file is a binary log of the DBBinaryLog adapter """
+   from pyevolve import Consts
+   handle = open(filename, "rb")
+   try:
+      return handle.read(len(Consts.CDefBinaryLogMagic)) == Consts.CDefBinaryLogMagic
+   finally:
+      handle.close()
+
+def sqlite_where(identify, genrange, lindrange=None):
+   """ Returns the where clause and the parameters of the queries """
+   where = "identify = ?"
+   params = [identify]
+   if genrange:
+      where += " and generation between ? and ?"
+      params += genrange
+   if lindrange:
+      where += " and individual between ? and ?"
+      params += lindrange
+   return where, params
+
+def load_stats_sqlite(conn, identify, genrange, points):
+   """ Loads the statistics of the *identify* as a dict of series (lists),
+   aggregated by SQLite on at most *points* buckets of generations
+
+   :rtype: the number of generations and the series, or None
+   """
+   where, params = sqlite_where(identify, genrange)
+   query = "select min(generation), max(generation), count(distinct generation) from statistics where " + where
+   first, last, generations = conn.execute(query, params).fetchone()
+   if first is None:
+      return None
+
+   names = ["generation"] + [name for name, func in STATS_AGGREGATES]
+   columns = ", ".join("%s(%s)" % (func, name) for name, func in STATS_AGGREGATES)
+   query = """select min(generation), %s from statistics
+              where %s group by (generation - ?) / ? order by 1""" % (columns, where)
+
+   series = dict((name, []) for name in names)
+   for row in conn.execute(query, params + [first, bucket_size(first, last, points)]):
+      for name, value in zip(names, row):
+         series[name].append(value)
+   return generations, series
+
+def load_population_sqlite(conn, identify, genrange, lindrange, column, points):
+   """ Loads the *column* (raw or fitness) of the population table as a
+   matrix of generations by individuals, the averages on at most *points*
+   buckets of generations and of individuals. The columns are the buckets
+   of individuals found on the table (like the individuals sampled by the
+   DBSQLite *pop_sample*), the buckets missing on a generation are NaN.
+
+   :rtype: the number of generations and the matrix (list of rows), or None
+   """
+   where, params = sqlite_where(identify, genrange, lindrange)
+   query = """select min(generation), max(generation), min(individual), max(individual),
+              count(distinct generation) from population where """ + where
+   bounds = conn.execute(query, params).fetchone()
+   if bounds[0] is None:
+      return None
+
+   query = """select (generation - ?) / ?, (individual - ?) / ?, avg(%s) from population
+              where %s group by 1, 2 order by 1, 2""" % (column, where)
+   bucket_params = [bounds[0], bucket_size(bounds[0], bounds[1], points),
+                    bounds[2], bucket_size(bounds[2], bounds[3], points)]
+
+   rows = []
+   current = None
+   for gen_bucket, ind_bucket, value in conn.execute(query, bucket_params + params):
+      if gen_bucket != current:
+         rows.append({})
+         current = gen_bucket
+      rows[-1][ind_bucket] = value
+
+   columns = sorted(set(ind_bucket for row in rows for ind_bucket in row))
+   pop = [[row.get(ind_bucket, float("nan")) for ind_bucket in columns] for row in rows]
+   return bounds[4], pop
+
+def binary_log_buckets(numpy, values, points):
+   """ Returns the start of each bucket of the sorted *values* and the
+   number of values of each bucket, for the reduceat of numpy """
+   buckets = (values - values[0]) // bucket_size(values[0], values[-1], points)
+   starts = numpy.concatenate(([0], numpy.flatnonzero(numpy.diff(buckets)) + 1))
+   return starts, numpy.diff(numpy.append(starts, len(values)))
+
+def load_binary_log(filename, genrange):
+   """ Loads the records of a binary log, the file is memory-mapped and the
+   records are sliced (not copied). The generations increase along a run,
+   when other runs were appended to the log, only the last one is loaded """
+   import numpy
+   from pyevolve import DBAdapters
+   header, records = DBAdapters.readBinaryLog(filename)
+   if len(records) == 0:
+      return header, records
+
+   restarts = numpy.flatnonzero(numpy.diff(records["generation"]) < 0)
+   if len(restarts) > 0:
+      records = records[restarts[-1] + 1:]
+   if genrange:
+      generation = records["generation"]
+      records = records[numpy.searchsorted(generation, genrange[0], "left"):
+                        numpy.searchsorted(generation, genrange[1], "right")]
+   return header, records
+
+def binary_log_generations(numpy, generation):
+   """ Returns the number of distinct generations of the sorted *generation* """
+   return int(numpy.count_nonzero(numpy.diff(generation))) + 1
+
+def load_stats_binary_log(filename, genrange, points):
+   """ Loads the statistics of a binary log as a dict of series (lists),
+   aggregated on at most *points* buckets of generations
+
+   :rtype: the number of generations and the series, or None
+   """
+   import numpy
+   header, records = load_binary_log(filename, genrange)
+   if len(records) == 0:
+      return None
+
+   generation = records["generation"]
+   starts, counts = binary_log_buckets(numpy, generation, points)
+   series = {"generation": generation[starts].tolist()}
+   for name, func in STATS_AGGREGATES:
+      values = records[name]
+      if func == "max":
+         series[name] = numpy.maximum.reduceat(values, starts).tolist()
+      elif func == "min":
+         series[name] = numpy.minimum.reduceat(values, starts).tolist()
+      else:
+         series[name] = (numpy.add.reduceat(values, starts) / counts).tolist()
+   return binary_log_generations(numpy, generation), series
+
+def load_population_binary_log(filename, genrange, lindrange, column, points):
+   """ Loads the *column* (raw or fitness) scores of a binary log as a matrix
+   of generations by individuals, the averages on at most *points* buckets
+   of generations and of individuals
+
+   :rtype: the number of generations and the matrix (list of rows), or None
+   """
+   import numpy
+   header, records = load_binary_log(filename, genrange)
+   if not header["scores"] or len(records) == 0:
+      return None
+
+   matrix = records[column]
+   if lindrange:
+      matrix = matrix[:, lindrange[0]:lindrange[1] + 1]
+
+   generation = records["generation"]
+   starts, counts = binary_log_buckets(numpy, generation, points)
+   matrix = numpy.add.reduceat(matrix, starts, axis=0) / counts[:, None]
+
+   starts, counts = binary_log_buckets(numpy, numpy.arange(matrix.shape[1]), points)
+   return binary_log_generations(numpy, generation), (numpy.add.reduceat(matrix, starts, axis=1) / counts).tolist()
 
 def graph_pop_heatmap_raw(pop, minimize, colormap="jet", filesave=None):
    pylab.imshow(pop, aspect="auto", interpolation="gaussian", cmap=matplotlib.cm.__dict__[colormap])
@@ -35,15 +199,9 @@ def graph_pop_heatmap_fitness(pop, minimize, colormap="jet", filesave=None):
 
 
 def graph_diff_raw(pop, minimize, filesave=None):
-   x = []
-
-   diff_raw_y = []
-   diff_fit_y = []
-
-   for it in pop:
-      x.append(it["generation"])
-      diff_raw_y.append(it["rawMax"] - it["rawMin"])
-      diff_fit_y.append(it["fitMax"] - it["fitMin"])
+   x = pop["generation"]
+   diff_raw_y = [vmax - vmin for vmax, vmin in zip(pop["rawMax"], pop["rawMin"])]
+   diff_fit_y = [vmax - vmin for vmax, vmin in zip(pop["fitMax"], pop["fitMin"])]
 
    pylab.figure()
    pylab.subplot(211)
@@ -95,18 +253,11 @@ def graph_diff_raw(pop, minimize, filesave=None):
       pylab.show()
 
 def graph_maxmin_raw(pop, minimize, filesave=None):
-   x = []
-   max_y = []
-   min_y = []
-   std_dev_y = []
-   avg_y = []
-
-   for it in pop:
-      x.append(it["generation"])
-      max_y.append(it["rawMax"])
-      min_y.append(it["rawMin"])
-      std_dev_y.append(it["rawDev"])
-      avg_y.append(it["rawAve"])
+   x = pop["generation"]
+   max_y = pop["rawMax"]
+   min_y = pop["rawMin"]
+   std_dev_y = pop["rawDev"]
+   avg_y = pop["rawAve"]
 
    pylab.figure()
 
@@ -166,16 +317,10 @@ def graph_maxmin_raw(pop, minimize, filesave=None):
 
 
 def graph_maxmin_fitness(pop, minimize, filesave=None):
-   x = []
-   max_y = []
-   min_y = []
-   avg_y = []
-
-   for it in pop:
-      x.append(it["generation"])
-      max_y.append(it["fitMax"])
-      min_y.append(it["fitMin"])
-      avg_y.append(it["fitAve"])
+   x = pop["generation"]
+   max_y = pop["fitMax"]
+   min_y = pop["fitMin"]
+   avg_y = pop["fitAve"]
 
    pylab.figure()
    pylab.plot(x, max_y, "g", label="Max fitness")
@@ -212,19 +357,10 @@ def graph_maxmin_fitness(pop, minimize, filesave=None):
       pylab.show()
 
 def graph_errorbars_raw(pop, minimize, filesave=None):
-   x = []
-   y = []
-   yerr_max = []
-   yerr_min = []
-
-   for it in pop:
-      x.append(it["generation"])
-      y.append(it["rawAve"])
-      ymax = it["rawMax"] - it["rawAve"]
-      ymin = it["rawAve"] - it["rawMin"]
-      
-      yerr_max.append(ymax)
-      yerr_min.append(ymin)
+   x = pop["generation"]
+   y = pop["rawAve"]
+   yerr_max = [vmax - vave for vmax, vave in zip(pop["rawMax"], y)]
+   yerr_min = [vave - vmin for vave, vmin in zip(y, pop["rawMin"])]
 
    pylab.figure()
    pylab.errorbar(x, y, [yerr_min, yerr_max], ecolor="g")
@@ -240,19 +376,10 @@ def graph_errorbars_raw(pop, minimize, filesave=None):
       pylab.show()
 
 def graph_errorbars_fitness(pop, minimize, filesave=None):
-   x = []
-   y = []
-   yerr_max = []
-   yerr_min = []
-
-   for it in pop:
-      x.append(it["generation"])
-      y.append(it["fitAve"])
-      ymax = it["fitMax"] - it["fitAve"]
-      ymin = it["fitAve"] - it["fitMin"]
-      
-      yerr_max.append(ymax)
-      yerr_min.append(ymin)
+   x = pop["generation"]
+   y = pop["fitAve"]
+   yerr_max = [vmax - vave for vmax, vave in zip(pop["fitMax"], y)]
+   yerr_min = [vave - vmin for vave, vmin in zip(y, pop["fitMin"])]
 
    pylab.figure()
    pylab.errorbar(x, y, [yerr_min, yerr_max], ecolor="g")
@@ -275,15 +402,9 @@ def graph_compare_raw(pop, minimize, id_list, filesave=None):
    pylab.figure()
    
    for it_out in pop:
-      x = []
-      max_y = []
-      min_y = []
-
-      for it in it_out:
-         x.append(it["generation"])
-         max_y.append(it["rawMax"])
-         min_y.append(it["rawMin"])
-
+      x = it_out["generation"]
+      max_y = it_out["rawMax"]
+      min_y = it_out["rawMin"]
 
       if minimize:
          pylab.plot(x, max_y, colors_list[index], linewidth=0.05)
@@ -315,14 +436,9 @@ def graph_compare_fitness(pop, minimize, id_list, filesave=None):
    pylab.figure()
    
    for it_out in pop:
-      x = []
-      max_y = []
-      min_y = []
-
-      for it in it_out:
-         x.append(it["generation"])
-         max_y.append(it["fitMax"])
-         min_y.append(it["fitMin"])
+      x = it_out["generation"]
+      max_y = it_out["fitMax"]
+      min_y = it_out["fitMin"]
 
       if minimize:
          pylab.plot(x, max_y, colors_list[index], linewidth=0.05)
@@ -359,7 +475,7 @@ if __name__ == "__main__":
    parser = OptionParser()
 
    parser.add_option("-f", "--file", dest="dbfile",
-                  help="Database file to read (default is 'pyevolve.db').", metavar="FILENAME", default="pyevolve.db")
+                  help="Database file or binary log file (of the DBBinaryLog adapter) to read (default is 'pyevolve.db').", metavar="FILENAME", default="pyevolve.db")
 
    parser.add_option("-i", "--identify", dest="identify",
                   help="The identify of evolution.", metavar="IDENTIFY")
@@ -384,6 +500,10 @@ if __name__ == "__main__":
                   help="""Sets the Color Map for the graph types 8 and 9. Some options are: summer, bone, gray, hot, jet, cooper, spectral. The default is 'jet'.""",
                   metavar="COLORMAP", default="jet")
 
+   parser.add_option("-p", "--points", dest="points", type="int",
+                  help="""The max number of points of each graph, the generations (and the individuals of the heat maps) are aggregated in buckets to fit on this number (min/max/mean of each bucket). Default is 1000.""",
+                  metavar="POINTS", default=1000)
+
    parser.add_option("-m", "--minimize", action="store_true",
                   help="Sets the 'Minimize' mode, default is the Maximize mode. This option makes sense if you are minimizing your evaluation function.", dest="minimize")
 
@@ -435,7 +555,6 @@ if __name__ == "__main__":
    from matplotlib.font_manager import FontProperties
    import matplotlib.cm
    import sqlite3
-   import math
    import os
 
    print "Loading database and creating graph..."
@@ -443,59 +562,27 @@ if __name__ == "__main__":
    identify_list = options.identify.split(",")
    identify_list = map(str.strip, identify_list)
 
+   genrange = map(int, options.genrange.split(":")) if options.genrange else None
+   lindrange = map(int, options.lindrange.split(":")) if options.lindrange else None
+   binary_log = is_binary_log(options.dbfile)
+   if not binary_log:
+      conn = sqlite3.connect(options.dbfile)
+
    pop = None
 
    if options.pop_heatmap_raw or options.pop_heatmap_fitness:
-      conn = sqlite3.connect(options.dbfile)
-      conn.row_factory = sqlite3.Row
-      c = conn.cursor()
-
-      if options.genrange:
-         genrange = options.genrange.split(":")
-         ret = c.execute("select distinct generation from population where identify = ? and generation between ? and ?", (options.identify, genrange[0], genrange[1]))
+      column = "raw" if options.pop_heatmap_raw else "fitness"
+      if binary_log:
+         loaded = load_population_binary_log(options.dbfile, genrange, lindrange, column, options.points)
       else:
-         ret = c.execute("select distinct generation from population where identify = ?", (options.identify,))
+         loaded = load_population_sqlite(conn, options.identify, genrange, lindrange, column, options.points)
 
-      generations = ret.fetchall()
-      if len(generations) <= 0:
+      if not loaded:
          print "No generation data found for the identify '%s' !" % (options.identify,)
          exit()
 
-      pop = []
-      for gen in generations:
-         pop_tmp = []
-
-         if options.lindrange:
-            individual_range = options.lindrange.split(":")
-            ret = c.execute("""
-                         select *  from population
-                         where identify = ?
-                         and generation = ?
-                         and individual between ? and ?
-                         """, (options.identify, gen[0], individual_range[0], individual_range[1]))
-         else:
-            ret = c.execute("""
-                         select *  from population
-                         where identify = ?
-                         and generation = ?
-                         """, (options.identify, gen[0]))
-
-         ret_fetch = ret.fetchall()
-         for it in ret_fetch:
-            if options.pop_heatmap_raw:
-               pop_tmp.append(it["raw"])
-            else:
-               pop_tmp.append(it["fitness"])
-         pop.append(pop_tmp)
-
-      ret.close()
-      conn.close()
-
-      if len(pop) <= 0:
-         print "No statistic data found for the identify '%s' !" % (options.identify,)
-         exit()
-
-      print "%d generations found !" % (len(pop),)
+      generations, pop = loaded
+      print "%d generations found !" % (generations,)
 
       popGraph = True
 
@@ -504,47 +591,30 @@ if __name__ == "__main__":
       if options.compare_raw or options.compare_fitness:
          parser.error("You can't use this graph type with only one identify !")
 
-      conn = sqlite3.connect(options.dbfile)
-      conn.row_factory = sqlite3.Row
-      c = conn.cursor()
-
-      if options.genrange:
-         genrange = options.genrange.split(":")
-         ret = c.execute("select * from statistics where identify = ? and generation between ? and ?", (options.identify, genrange[0], genrange[1]))
+      if binary_log:
+         loaded = load_stats_binary_log(options.dbfile, genrange, options.points)
       else:
-         ret = c.execute("select * from statistics where identify = ?", (options.identify,))
+         loaded = load_stats_sqlite(conn, options.identify, genrange, options.points)
 
-      pop = ret.fetchall()
-
-      ret.close()
-      conn.close()
-
-      if len(pop) <= 0:
+      if not loaded:
          print "No statistic data found for the identify '%s' !" % (options.identify,)
          exit()
 
-      print "%d generations found !" % (len(pop),)
+      generations, pop = loaded
+      print "%d generations found !" % (generations,)
    
    elif len(identify_list) > 1 and not popGraph:
       pop = []
       if (not options.compare_raw) and (not options.compare_fitness):
          parser.error("You can't use many ids with this graph type !")
 
-      conn = sqlite3.connect(options.dbfile)
-      conn.row_factory = sqlite3.Row
-      c = conn.cursor()
+      if binary_log:
+         parser.error("The binary log files have only one identify !")
+
       for item in identify_list:
-         if options.genrange:
-            genrange = options.genrange.split(":")
-            ret = c.execute("select * from statistics where identify = ? and generation between ? and ?", (item, genrange[0], genrange[1]))
-         else:
-            ret = c.execute("select * from statistics where identify = ?", (item,))
-         fetchall = ret.fetchall()
-         if len(fetchall) > 0:
-            pop.append(fetchall)
-
-      ret.close()
-      conn.close()
+         loaded = load_stats_sqlite(conn, item, genrange, options.points)
+         if loaded:
+            pop.append(loaded[1])
 
       if len(pop) <= 0:
          print "No statistic data found for the identify list '%s' !" % (options.identify,)
@@ -552,6 +622,9 @@ if __name__ == "__main__":
 
       print "%d identify found !" % (len(pop),)
 
+   if not binary_log:
+      conn.close()
+
    if options.errorbars_raw:
       if options.outfile: graph_errorbars_raw(pop, options.minimize, options.outfile + "." + options.extension)
       else: graph_errorbars_raw(pop, options.minimize)
@@ -0,0 +1,146 @@
+import pickle
+import unittest
+
+from mock import patch
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from pyevolve import Consts, GAllele, GPopulation, Initializators, Mutators
+from pyevolve.G1DList import G1DList
+
+
+class CustomAllele(object):
+    def getRandomAllele(self):
+        return "custom"
+
+
+class GAllelesTableTestCase(unittest.TestCase):
+    def setUp(self):
+        self.alleles = GAllele.GAlleles()
+        self.alleles.add(GAllele.GAlleleList(["a", "b", ("c", 1)]))
+        int_range = GAllele.GAlleleRange(0, 0)
+        int_range.add(10, 12)
+        self.alleles.add(int_range)
+        self.alleles.add(GAllele.GAlleleRange(-1.0, 1.0, real=True))
+        self.alleles.add(CustomAllele())
+
+    def assertValidSample(self, values, positions):
+        self.assertEqual(len(values), len(positions))
+        for pos, value in zip(positions, values):
+            if pos == 0:
+                self.assertTrue(value in ["a", "b", ("c", 1)])
+            elif pos == 1:
+                self.assertTrue(type(value) == int and value in [0, 10, 11, 12])
+            elif pos == 2:
+                self.assertTrue(type(value) == float and -1.0 <= value <= 1.0)
+            else:
+                self.assertEqual(value, "custom")
+
+    def test_vectorized_sample(self):
+        positions = [0, 1, 2, 3] * 500
+        values = self.alleles.getTable().sample(positions)
+        self.assertValidSample(values, positions)
+        # The ranges are chosen with the same probability, like in the getRandomAllele
+        zeros = values[1::4].count(0)
+        self.assertTrue(200 < zeros < 300)
+        self.assertEqual(set(values[0::4]), set(["a", "b", ("c", 1)]))
+
+    @patch('pyevolve.GAllele.numpy', None)
+    def test_sample_without_numpy(self):
+        table = GAllele.GAllelesTable(self.alleles)
+        positions = [0, 1, 2, 3] * 50
+        self.assertValidSample(table.sample(positions), positions)
+
+    def test_small_sample(self):
+        positions = [3, 2, 1, 0]
+        self.assertValidSample(self.alleles.getTable().sample(positions), positions)
+
+    def test_table_is_compiled_again_on_changes(self):
+        table = self.alleles.getTable()
+        self.assertTrue(self.alleles.getTable() is table)
+        self.alleles[0].add("d")
+        new_table = self.alleles.getTable()
+        self.assertFalse(new_table is table)
+        self.assertTrue("d" in new_table.sample([0] * 200))
+
+    def test_table_of_other_alleles_is_kept(self):
+        table = self.alleles.getTable()
+        shared = GAllele.GAlleleRange(0, 5)
+        other = GAllele.GAlleles([shared])
+        other.add(GAllele.GAlleleList(["x"]))
+        other[1].add("y")
+        self.assertTrue(self.alleles.getTable() is table)
+        self.alleles.add(shared)
+        table = self.alleles.getTable()
+        other_table = other.getTable()
+        shared.add(10, 12)
+        self.assertFalse(self.alleles.getTable() is table)
+        self.assertFalse(other.getTable() is other_table)
+
+    def test_homogeneous(self):
+        alleles = GAllele.GAlleles(homogeneous=True)
+        alleles.add(GAllele.GAlleleRange(5, 6))
+        values = alleles.getTable().sample(range(1000))
+        self.assertEqual(set(values), set([5, 6]))
+
+    def test_missing_position(self):
+        self.assertRaises(IndexError, self.alleles.getTable().sample, [4] * 100)
+
+    def test_pickle(self):
+        self.alleles.getTable()
+        alleles = pickle.loads(pickle.dumps(self.alleles))
+        self.assertTrue(alleles.table is None)
+        self.assertValidSample(alleles.getTable().sample([0, 1, 2, 3]), [0, 1, 2, 3])
+        table = alleles.getTable()
+        alleles[0].add("d")
+        self.assertFalse(alleles.getTable() is table)
+
+
+class AlleleOperatorsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.alleles = GAllele.GAlleles([GAllele.GAlleleRange(0, 1000) for i in xrange(50)])
+        self.genome = G1DList(50)
+        self.genome.setParams(allele=self.alleles)
+        self.genome.initializator.set(Initializators.G1DListInitializatorAllele)
+
+    def test_initializator_batch(self):
+        population = GPopulation.GPopulation(self.genome)
+        population.setPopulationSize(30)
+        population.create(minimax=Consts.minimaxType["maximize"])
+        population.initialize()
+        hashes = set()
+        for individual in population:
+            self.assertEqual(len(individual), 50)
+            self.assertTrue(all(0 <= value <= 1000 for value in individual))
+            hashes.add(individual.getHash())
+        self.assertEqual(len(hashes), 30)
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_mutator_batch(self):
+        genomes = []
+        for i in xrange(20):
+            genome = self.genome.clone()
+            genome.setInternalList([-1] * 50)
+            genomes.append(genome)
+        counts = Mutators.G1DListMutatorAlleleBatch(genomes, pmut=0.1)
+        for genome, count in zip(genomes, counts):
+            mutated = [value for value in genome if value != -1]
+            self.assertEqual(len(mutated), count)
+            self.assertTrue(all(0 <= value <= 1000 for value in mutated))
+
+    @patch("pyevolve.Util.numpyRandomState", lambda: None)
+    def test_mutator_batch_without_numpy(self):
+        genomes = []
+        for i in xrange(20):
+            genome = self.genome.clone()
+            genome.setInternalList([-1] * 50)
+            genomes.append(genome)
+        counts = Mutators.G1DListMutatorAlleleBatch(genomes, pmut=0.1)
+        self.assertEqual(len(counts), 20)
+        for genome, count in zip(genomes, counts):
+            mutated = [value for value in genome if value != -1]
+            self.assertTrue(len(mutated) <= count)
+            self.assertTrue(all(0 <= value <= 1000 for value in mutated))
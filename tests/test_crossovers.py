@@ -1,15 +1,22 @@
 from itertools import cycle
+import random
 import unittest
 
 from mock import patch
 from nose.tools import nottest
 
-from pyevolve import Crossovers
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from pyevolve import Crossovers, Consts, GSimpleGA
 from pyevolve.G1DBinaryString import G1DBinaryString
 from pyevolve.G1DList import G1DList
+from pyevolve.G2DArray import G2DArray, G2DBinaryArray
 from pyevolve.G2DBinaryString import G2DBinaryString
 from pyevolve.G2DList import G2DList
-from pyevolve.GTree import GTree, GTreeNode
+from pyevolve.GTree import GTree, GTreeNode, GTreeGP, GTreeNodeGP
 
 
 class CrossoverTestCase(unittest.TestCase):
@@ -205,6 +212,46 @@ class G1DListCrossoversTestCase(CrossoverTestCase):
         )
 
 
+class G1DListPermutationCrossoversTestCase(CrossoverTestCase):
+    def setUp(self):
+        self.mom = G1DList(9)
+        self.mom.genomeList = [1, 2, 3, 4, 5, 6, 7, 8, 9]
+        self.dad = G1DList(9)
+        self.dad.genomeList = [9, 3, 7, 8, 2, 6, 5, 1, 4]
+
+    @patch('pyevolve.Crossovers.rand_randint')
+    def test_pmx_crossover(self, rand_mock):
+        rand_mock.side_effect = cycle([3, 5])
+        self.assertCrossoverResultsEqual(
+            Crossovers.G1DListCrossoverPMX,
+            [9, 3, 7, 4, 5, 6, 2, 1, 8],
+            [1, 5, 3, 8, 2, 6, 7, 4, 9],
+            crossover_extra_kwargs={'count': 2}
+        )
+
+    def test_cycle_crossover(self):
+        self.mom.genomeList = [1, 2, 3, 4, 5, 6, 7, 8]
+        self.dad.genomeList = [8, 5, 2, 1, 3, 6, 4, 7]
+        self.assertCrossoverResultsEqual(
+            Crossovers.G1DListCrossoverCycle,
+            [1, 5, 2, 4, 3, 6, 7, 8],
+            [8, 2, 3, 1, 5, 6, 4, 7],
+            crossover_extra_kwargs={'count': 2}
+        )
+
+    def test_permutations_are_kept(self):
+        genes = range(50)
+        for crossover in (Crossovers.G1DListCrossoverOX, Crossovers.G1DListCrossoverEdge,
+                          Crossovers.G1DListCrossoverCutCrossfill, Crossovers.G1DListCrossoverPMX,
+                          Crossovers.G1DListCrossoverCycle):
+            for i in xrange(20):
+                self.mom.genomeList = random.sample(genes, 50)
+                self.dad.genomeList = random.sample(genes, 50)
+                sister, brother = crossover(None, mom=self.mom, dad=self.dad, count=2)
+                self.assertEqual(sorted(sister.genomeList), genes)
+                self.assertEqual(sorted(brother.genomeList), genes)
+
+
 class G2DListCrossoversTestCase(CrossoverTestCase):
     def setUp(self):
         self.mom = G2DList(3, 3)
@@ -254,6 +301,73 @@ class G2DListCrossoversTestCase(CrossoverTestCase):
         )
 
 
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class G2DArrayCrossoversTestCase(CrossoverTestCase):
+    def setUp(self):
+        self.mom = G2DArray(3, 3)
+        self.mom.setInternalArray([[1, 2, 3], [4, 5, 6], [7, 8, 9]])
+        self.dad = G2DArray(3, 3)
+        self.dad.setInternalArray([[1, 4, 7], [2, 5, 8], [3, 6, 9]])
+
+    def assertCrossoverResultsEqual(self, crossover, expected_sister, expected_brother, crossover_extra_kwargs=None):
+        kwargs = {'mom': self.mom, 'dad': self.dad}
+        kwargs.update(crossover_extra_kwargs or {})
+        sister, brother = crossover(None, **kwargs)
+        self.assertEqual(sister.genomeArray.tolist(), expected_sister)
+        self.assertEqual(brother.genomeArray.tolist() if brother else None, expected_brother)
+
+    @patch('pyevolve.Crossovers.rand_randint')
+    def test_svp_crossover(self, rand_mock):
+        rand_mock.return_value = 1
+        self.assertCrossoverResultsEqual(
+            Crossovers.G2DArrayCrossoverSingleVPoint,
+            [[1, 4, 7], [4, 5, 8], [7, 6, 9]],
+            None,
+            crossover_extra_kwargs={'count': 1}
+        )
+        self.assertCrossoverResultsEqual(
+            Crossovers.G2DArrayCrossoverSingleVPoint,
+            [[1, 4, 7], [4, 5, 8], [7, 6, 9]],
+            [[1, 2, 3], [2, 5, 6], [3, 8, 9]],
+            crossover_extra_kwargs={'count': 2}
+        )
+
+    @patch('pyevolve.Crossovers.rand_randint')
+    def test_shp_crossover(self, rand_mock):
+        rand_mock.return_value = 1
+        self.assertCrossoverResultsEqual(
+            Crossovers.G2DArrayCrossoverSingleHPoint,
+            [[1, 2, 3], [2, 5, 8], [3, 6, 9]],
+            [[1, 4, 7], [4, 5, 6], [7, 8, 9]],
+            crossover_extra_kwargs={'count': 2}
+        )
+
+    @patch('pyevolve.Crossovers.rand_randint')
+    def test_block_crossover(self, rand_mock):
+        rand_mock.side_effect = [0, 2, 1, 3]
+        self.assertCrossoverResultsEqual(
+            Crossovers.G2DArrayCrossoverBlock,
+            [[1, 4, 7], [4, 5, 8], [7, 8, 9]],
+            [[1, 2, 3], [2, 5, 6], [3, 6, 9]],
+            crossover_extra_kwargs={'count': 2}
+        )
+
+    def test_uniform_crossover(self):
+        sister, brother = Crossovers.G2DArrayCrossoverUniform(None, mom=self.mom, dad=self.dad, count=2)
+        mom, dad = self.mom.genomeArray, self.dad.genomeArray
+        self.assertTrue(((sister.genomeArray == mom) | (sister.genomeArray == dad)).all())
+        self.assertEqual((sister.genomeArray + brother.genomeArray).tolist(), (mom + dad).tolist())
+        self.assertEqual(self.mom.genomeArray.tolist(), [[1, 2, 3], [4, 5, 6], [7, 8, 9]])
+
+    def test_binary_array_crossover(self):
+        mom = G2DBinaryArray(4, 4)
+        dad = G2DBinaryArray(4, 4)
+        dad.setInternalArray([[1] * 4] * 4)
+        sister, brother = Crossovers.G2DArrayCrossoverSingleVPoint(None, mom=mom, dad=dad, count=2)
+        self.assertTrue(isinstance(sister, G2DBinaryArray))
+        self.assertEqual((sister.genomeArray + brother.genomeArray).tolist(), [[1] * 4] * 4)
+
+
 class G2DBinaryStringCrossoversTestCase(CrossoverTestCase):
     def setUp(self):
         self.mom = G2DBinaryString(3, 3)
@@ -390,3 +504,208 @@ class GTreeCrossoversTestCase(CrossoverTestCase):
             assertion_name='assetTreesEqual',
             crossover_extra_kwargs={'count': 2}
         )
+
+
+class GTreeGPCrossoversTestCase(CrossoverTestCase):
+    def setUp(self):
+        terminal, nonterminal = Consts.nodeType["TERMINAL"], Consts.nodeType["NONTERMINAL"]
+        # add(a, mul(a, b))
+        mom_root = GTreeNodeGP("add", nonterminal)
+        mom_root.addChild(GTreeNodeGP("a", terminal, mom_root))
+        mom_mul = GTreeNodeGP("mul", nonterminal, mom_root)
+        mom_mul.addChild(GTreeNodeGP("a", terminal, mom_mul))
+        mom_mul.addChild(GTreeNodeGP("b", terminal, mom_mul))
+        mom_root.addChild(mom_mul)
+        self.mom = GTreeGP(mom_root)
+        self.mom.processNodes()
+        # sub(add(a, b), mul(b, b))
+        dad_root = GTreeNodeGP("sub", nonterminal)
+        for data in ("add", "mul"):
+            child = GTreeNodeGP(data, nonterminal, dad_root)
+            child.addChild(GTreeNodeGP("b", terminal, child))
+            child.addChild(GTreeNodeGP("b", terminal, child))
+            dad_root.addChild(child)
+        self.dad = GTreeGP(dad_root)
+        self.dad.processNodes()
+
+    def test_single_point_crossover_keeps_depth(self):
+        self.mom.setParams(max_depth=2)
+        for i in xrange(20):
+            sister, brother = Crossovers.GTreeGPCrossoverSinglePoint(None, mom=self.mom, dad=self.dad, count=2)
+            self.assertTrue(sister.getHeight() <= 2)
+            self.assertTrue(brother.getHeight() <= 2)
+            self.assertEqual(len(sister) + len(brother), len(self.mom) + len(self.dad))
+
+    def test_single_point_crossover_max_nodes(self):
+        # No crossover point can keep both offspring under 5 nodes
+        self.mom.setParams(max_depth=4, max_nodes=5)
+        for i in xrange(20):
+            sister, brother = Crossovers.GTreeGPCrossoverSinglePoint(None, mom=self.mom, dad=self.dad, count=2)
+            self.assertEqual(sister.getPreOrderExpression(), self.mom.getPreOrderExpression())
+            self.assertEqual(brother.getPreOrderExpression(), self.dad.getPreOrderExpression())
+            self.assertFalse(sister.getRoot() is self.mom.getRoot())
+        # Nor the sister alone under 3 nodes
+        self.mom.setParams(max_nodes=2)
+        sister, brother = Crossovers.GTreeGPCrossoverSinglePoint(None, mom=self.mom, dad=self.dad, count=1)
+        self.assertEqual(sister.getPreOrderExpression(), self.mom.getPreOrderExpression())
+        self.assertEqual(brother, None)
+
+
+class BatchCrossoversTestCase(unittest.TestCase):
+    def setUp(self):
+        self.population = []
+        for i in xrange(4):
+            genome = G1DList(6)
+            genome.genomeList = [i * 10 + j for j in xrange(6)]
+            self.population.append(genome)
+        self.moms = [0, 1, 2, 3]
+        self.dads = [1, 2, 3, 0]
+
+    def buffer(self, size):
+        return [G1DList(6) for i in xrange(size)]
+
+    def test_single_point_batch(self):
+        offspring = self.buffer(8)
+        Crossovers.G1DListCrossoverSinglePointBatch(self.population, self.moms, self.dads, offspring)
+        for i, (mom, dad) in enumerate(zip(self.moms, self.dads)):
+            sister, brother = offspring[2 * i], offspring[2 * i + 1]
+            mom_genes, dad_genes = self.population[mom].genomeList, self.population[dad].genomeList
+            cut = [j for j in xrange(6) if sister[j] == dad_genes[j]][0]
+            self.assertTrue(1 <= cut <= 5)
+            self.assertEqual(sister.genomeList, mom_genes[:cut] + dad_genes[cut:])
+            self.assertEqual(brother.genomeList, dad_genes[:cut] + mom_genes[cut:])
+
+    @patch("pyevolve.Util.numpyRandomState", lambda: None)
+    def test_single_point_batch_without_numpy(self):
+        self.test_single_point_batch()
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_batch_writes_into_the_buffer(self):
+        offspring = self.buffer(8)
+        buff = list(offspring)
+        Crossovers.G1DListCrossoverSinglePointBatch(self.population, self.moms, self.dads, offspring)
+        self.assertTrue(all(child is buff_child for child, buff_child in zip(offspring, buff)))
+
+    def test_two_point_and_uniform_batch(self):
+        for crossover in (Crossovers.G1DListCrossoverTwoPointBatch, Crossovers.G1DListCrossoverUniformBatch):
+            offspring = self.buffer(8)
+            crossover(self.population, self.moms, self.dads, offspring)
+            for i, (mom, dad) in enumerate(zip(self.moms, self.dads)):
+                mom_genes, dad_genes = self.population[mom].genomeList, self.population[dad].genomeList
+                for j in xrange(6):
+                    self.assertEqual(set([offspring[2 * i][j], offspring[2 * i + 1][j]]),
+                                     set([mom_genes[j], dad_genes[j]]))
+
+    def test_batch_without_crossover_copies_parents(self):
+        offspring = self.buffer(8)
+        Crossovers.G1DListCrossoverUniformBatch(self.population, self.moms, self.dads, offspring, pcross=0.0)
+        for i, (mom, dad) in enumerate(zip(self.moms, self.dads)):
+            self.assertEqual(offspring[2 * i].genomeList, self.population[mom].genomeList)
+            self.assertEqual(offspring[2 * i + 1].genomeList, self.population[dad].genomeList)
+            self.assertFalse(offspring[2 * i].genomeList is self.population[mom].genomeList)
+
+    def test_cut_batch_without_crossover_copies_parents(self):
+        offspring = self.buffer(8)
+        Crossovers.G1DListCrossoverTwoPointBatch(self.population, self.moms, self.dads, offspring, pcross=0.0)
+        for i, (mom, dad) in enumerate(zip(self.moms, self.dads)):
+            self.assertEqual(offspring[2 * i].genomeList, self.population[mom].genomeList)
+            self.assertEqual(offspring[2 * i + 1].genomeList, self.population[dad].genomeList)
+
+    def test_uniform_batch_with_objects(self):
+        for genome in self.population:
+            genome.genomeList = [str(gene) for gene in genome.genomeList]
+        self.test_two_point_and_uniform_batch()
+
+    def test_2d_vertical_point_batch(self):
+        mom = G2DBinaryString(3, 4)
+        mom.genomeString = [[0] * 4 for i in xrange(3)]
+        dad = G2DBinaryString(3, 4)
+        dad.genomeString = [[1] * 4 for i in xrange(3)]
+        offspring = [G2DBinaryString(3, 4) for i in xrange(2)]
+        Crossovers.G2DBinaryStringXSingleVPointBatch([mom, dad], [0], [1], offspring)
+        sister = offspring[0].genomeString
+        cut = sister[0].index(1)
+        for row in sister:
+            self.assertEqual(row, [0] * cut + [1] * (4 - cut))
+        for row in offspring[1].genomeString:
+            self.assertEqual(row, [1] * cut + [0] * (4 - cut))
+
+    def test_engine_batch_mode(self):
+        genome = G1DList(10)
+        genome.evaluator.set(lambda chromosome: sum(chromosome))
+        ga = GSimpleGA.GSimpleGA(genome)
+        ga.setBatchMode(True)
+        ga.setPopulationSize(20)
+        ga.setGenerations(5)
+        ga.evolve()
+        self.assertEqual(len(ga.getPopulation()), 20)
+
+    def test_engine_batch_mode_keeps_previous_generations(self):
+        genome = G1DList(10)
+        genome.evaluator.set(lambda chromosome: sum(chromosome))
+        ga = GSimpleGA.GSimpleGA(genome)
+        ga.setBatchMode(True)
+        ga.setPopulationSize(20)
+        ga.setGenerations(5)
+        archive = []
+        ga.stepCallback.set(lambda engine: archive.extend((ind, ind.genomeList[:]) for ind in engine.getPopulation()))
+        ga.evolve()
+        for ind, genes in archive:
+            self.assertEqual(ind.genomeList, genes)
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class RealSBXBoundedTestCase(unittest.TestCase):
+    def setUp(self):
+        self.population = []
+        for i in xrange(8):
+            genome = G1DList(40)
+            genome.genomeList = [random.uniform(-1.0, 1.0) for j in xrange(40)]
+            genome.setParams(rangemin=-1.0, rangemax=1.0)
+            self.population.append(genome)
+        self.moms = [0, 2, 4, 6]
+        self.dads = [1, 3, 5, 7]
+
+    def assertInBounds(self, genome):
+        self.assertTrue(all(-1.0 <= gene <= 1.0 for gene in genome))
+
+    def test_sbx_crossover(self):
+        mom, dad = self.population[0], self.population[1]
+        mom_genes, dad_genes = mom.genomeList[:], dad.genomeList[:]
+        for mode in Consts.boundHandlingType.values():
+            mom.setParams(bound_handling=mode, sbx_eta=2)
+            sister, brother = Crossovers.G1DListCrossoverRealSBXBounded(None, mom=mom, dad=dad, count=2)
+            self.assertInBounds(sister)
+            self.assertInBounds(brother)
+        self.assertEqual(mom.genomeList, mom_genes)
+        self.assertEqual(dad.genomeList, dad_genes)
+
+    def test_sbx_crossover_large_eta(self):
+        # A large distribution index creates children next to the parents
+        mom, dad = self.population[0], self.population[1]
+        mom.setParams(sbx_eta=1.0e6)
+        sister, brother = Crossovers.G1DListCrossoverRealSBXBounded(None, mom=mom, dad=dad, count=2)
+        for j in xrange(40):
+            self.assertAlmostEqual(min(sister[j], brother[j]), min(mom[j], dad[j]), 3)
+            self.assertAlmostEqual(max(sister[j], brother[j]), max(mom[j], dad[j]), 3)
+
+    def test_sbx_crossover_equal_genes(self):
+        mom = self.population[0]
+        sister, brother = Crossovers.G1DListCrossoverRealSBXBounded(None, mom=mom, dad=mom.clone(), count=1)
+        self.assertEqual(sister.genomeList, mom.genomeList)
+        self.assertTrue(brother is None)
+
+    def test_sbx_batch(self):
+        offspring = [G1DList(40) for i in xrange(8)]
+        Crossovers.G1DListCrossoverRealSBXBoundedBatch(self.population, self.moms, self.dads, offspring)
+        for i, (mom, dad) in enumerate(zip(self.moms, self.dads)):
+            self.assertInBounds(offspring[2 * i])
+            self.assertInBounds(offspring[2 * i + 1])
+            self.assertNotEqual(offspring[2 * i].genomeList, self.population[mom].genomeList)
+
+    def test_sbx_batch_without_crossover_copies_parents(self):
+        offspring = [G1DList(40) for i in xrange(8)]
+        Crossovers.G1DListCrossoverRealSBXBoundedBatch(self.population, self.moms, self.dads, offspring, pcross=0.0)
+        for i, (mom, dad) in enumerate(zip(self.moms, self.dads)):
+            self.assertEqual(offspring[2 * i].genomeList, self.population[mom].genomeList)
+            self.assertEqual(offspring[2 * i + 1].genomeList, self.population[dad].genomeList)
@@ -0,0 +1,618 @@
+import BaseHTTPServer
+import cgi
+import copy
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import unittest
+from SimpleXMLRPCServer import SimpleXMLRPCServer
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from pyevolve import Consts, DBAdapters, GSimpleGA, GTree, Statistics
+from pyevolve.G1DList import G1DList
+from pyevolve.G2DList import G2DList
+
+
+class RecorderAdapter(DBAdapters.DBBaseAdapter):
+    def __init__(self, frequency=1, fail_at=None, gate=None):
+        super(RecorderAdapter, self).__init__(frequency, "recorder")
+        self.generations = []
+        self.batches = []
+        self.threads = set()
+        self.closed = False
+        self.failAt = fail_at
+        self.gate = gate
+
+    def open(self, ga_engine):
+        self.threads.add(threading.current_thread().name)
+
+    def insert(self, ga_engine):
+        if self.gate is not None:
+            self.gate.wait()
+        if ga_engine.getCurrentGeneration() == self.failAt:
+            raise IOError("write failed")
+        self.threads.add(threading.current_thread().name)
+        self.generations.append(ga_engine.getCurrentGeneration())
+
+    def insertBatch(self, ga_engines):
+        self.batches.append(len(ga_engines))
+        super(RecorderAdapter, self).insertBatch(ga_engines)
+
+    def commitAndClose(self):
+        self.closed = True
+
+
+class DBAsyncAdapterTestCase(unittest.TestCase):
+    def setUp(self):
+        genome = G1DList(10)
+        genome.setParams(rangemin=0, rangemax=10)
+        genome.evaluator.set(lambda chromosome: sum(chromosome))
+        self.ga = GSimpleGA.GSimpleGA(genome)
+        self.ga.setPopulationSize(10)
+        self.ga.setGenerations(30)
+
+    def test_writes_every_dump_on_the_writer_thread(self):
+        recorder = RecorderAdapter()
+        self.ga.setDBAdapter(DBAdapters.DBAsyncAdapter(recorder))
+        self.ga.evolve()
+        self.assertEqual(recorder.generations, range(30))
+        self.assertTrue(recorder.closed)
+        self.assertEqual(recorder.threads, set(["DBAsyncAdapter writer"]))
+
+    def test_snapshot_copies_the_statistics(self):
+        self.ga.initialize()
+        self.ga.internalPop.evaluate()
+        self.ga.internalPop.statistics()
+        snapshot = DBAdapters.DBEngineSnapshot(self.ga)
+        raw_max = snapshot.getStatistics()["rawMax"]
+        self.ga.getStatistics()["rawMax"] = -1
+        self.assertEqual(snapshot.getStatistics()["rawMax"], raw_max)
+        self.assertEqual(len(snapshot.getPopulation()), 10)
+        self.assertEqual(snapshot.getPopulation()[0].score, self.ga.getPopulation()[0].score)
+
+    def test_full_queue_without_block_drops(self):
+        gate = threading.Event()
+        recorder = RecorderAdapter(gate=gate)
+        adapter = DBAdapters.DBAsyncAdapter(recorder, queue_size=2, batch_size=1, block=False)
+        self.ga.setDBAdapter(adapter)
+        self.ga.setGenerations(10)
+        self.ga.stepCallback.set(lambda ga_engine: gate.set() if ga_engine.getCurrentGeneration() == 9 else False)
+        self.ga.evolve()
+        self.assertTrue(adapter.getDropped() > 0)
+        self.assertEqual(len(recorder.generations) + adapter.getDropped(), 10)
+        self.assertTrue(recorder.closed)
+
+    def test_writer_error_is_raised(self):
+        recorder = RecorderAdapter(fail_at=3)
+        adapter = DBAdapters.DBAsyncAdapter(recorder, batch_size=1)
+        self.ga.setDBAdapter(adapter)
+        self.assertRaises(IOError, self.ga.evolve)
+        # The adapter stays failed, the next dumps aren't written
+        for generation in (3, 4, 5):
+            self.ga.currentGeneration = generation
+            adapter.insert(self.ga)
+        adapter.commitAndClose()
+        self.assertEqual(recorder.generations, [0, 1, 2])
+        self.assertTrue(recorder.closed)
+
+    def test_sqlite(self):
+        directory = tempfile.mkdtemp()
+        try:
+            dbname = os.path.join(directory, "stats.db")
+            self.ga.setDBAdapter(DBAdapters.DBAsyncAdapter(DBAdapters.DBSQLite(dbname=dbname, identify="async")))
+            self.ga.evolve()
+            connection = sqlite3.connect(dbname)
+            rows = connection.execute("select count(*) from %s where identify = 'async'" % Consts.CDefSQLiteDBTable)
+            self.assertEqual(rows.fetchone()[0], 30)
+            rows = connection.execute("select count(*) from %s" % Consts.CDefSQLiteDBTablePop)
+            self.assertEqual(rows.fetchone()[0], 300)
+            connection.close()
+        finally:
+            shutil.rmtree(directory)
+
+
+class DBSQLiteTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.dbname = os.path.join(self.directory, "stats.db")
+        genome = G1DList(10)
+        genome.setParams(rangemin=0, rangemax=10)
+        genome.evaluator.set(lambda chromosome: sum(chromosome))
+        self.ga = GSimpleGA.GSimpleGA(genome)
+        self.ga.setPopulationSize(20)
+        self.ga.setGenerations(10)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def query(self, statement):
+        connection = sqlite3.connect(self.dbname)
+        try:
+            return connection.execute(statement).fetchall()
+        finally:
+            connection.close()
+
+    def test_batched_transactions(self):
+        adapter = DBAdapters.DBSQLite(dbname=self.dbname, identify="run", resetDB=True, commit_freq=4)
+        self.ga.setDBAdapter(adapter)
+        self.ga.setGenerations(6)
+        self.ga.evolve()
+        self.assertEqual(self.query("select generation from %s" % Consts.CDefSQLiteDBTable),
+                         [(generation,) for generation in xrange(6)])
+        self.assertEqual(self.query("select count(*) from %s" % Consts.CDefSQLiteDBTablePop), [(120,)])
+        indexes = self.query("select name from sqlite_master where type = 'index'")
+        self.assertEqual(sorted(indexes), [("%s_identify_generation" % Consts.CDefSQLiteDBTablePop,),
+                                           ("%s_identify_generation" % Consts.CDefSQLiteDBTable,)])
+
+    def test_rows_committed_on_commit_freq(self):
+        adapter = DBAdapters.DBSQLite(dbname=self.dbname, identify="run", resetDB=True, commit_freq=4)
+        adapter.open(self.ga)
+        self.ga.initialize()
+        self.ga.internalPop.evaluate()
+        for generation in xrange(4):
+            self.ga.currentGeneration = generation
+            adapter.insert(self.ga)
+        self.assertEqual(self.query("select count(*) from %s" % Consts.CDefSQLiteDBTable), [(1,)])
+        self.assertEqual(adapter.connection.execute("select count(*) from %s" % Consts.CDefSQLiteDBTable).fetchall(),
+                         [(4,)])
+        adapter.commitAndClose()
+        self.assertEqual(self.query("select count(*) from %s" % Consts.CDefSQLiteDBTable), [(4,)])
+
+    def test_wal_and_population_sample(self):
+        adapter = DBAdapters.DBSQLite(dbname=self.dbname, identify="run", resetDB=True, wal=True, pop_sample=5)
+        self.ga.setDBAdapter(adapter)
+        self.ga.evolve()
+        self.assertEqual(self.query("PRAGMA journal_mode"), [("wal",)])
+        rows = self.query("select individual from %s where generation = 3" % Consts.CDefSQLiteDBTablePop)
+        self.assertEqual(rows, [(0,), (5,), (10,), (14,), (19,)])
+
+    def test_existing_statistics_table(self):
+        columns = ["rawMax", "rawMin", "rawAve", "rawDev", "rawVar", "fitMax", "fitMin", "fitAve"]
+        connection = sqlite3.connect(self.dbname)
+        connection.execute("create table %s(identify text, generation integer, %s)" %
+                           (Consts.CDefSQLiteDBTable, ", ".join("%s real" % column for column in columns)))
+        connection.commit()
+        connection.close()
+        self.ga.setDBAdapter(DBAdapters.DBSQLite(dbname=self.dbname, identify="run"))
+        self.ga.setGenerations(3)
+        self.ga.evolve()
+        self.assertEqual(self.query("select count(*) from %s" % Consts.CDefSQLiteDBTable), [(3,)])
+
+    def test_population_sample(self):
+        adapter = DBAdapters.DBSQLite(pop_sample=0)
+        self.assertEqual(adapter.populationSample(10), [])
+        adapter.popSample = 1
+        self.assertEqual(adapter.populationSample(10), [0])
+        adapter.popSample = 3
+        self.assertEqual(adapter.populationSample(10), [0, 5, 9])
+        adapter.popSample = 20
+        self.assertEqual(adapter.populationSample(10), range(10))
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class DBBinaryLogTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, "stats.blog")
+        genome = G1DList(10)
+        genome.setParams(rangemin=0, rangemax=10)
+        genome.evaluator.set(lambda chromosome: sum(chromosome))
+        self.ga = GSimpleGA.GSimpleGA(genome)
+        self.ga.setPopulationSize(20)
+        self.ga.setGenerations(10)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_statistics_records(self):
+        raw_max = []
+        self.ga.stepCallback.set(lambda ga_engine: raw_max.append(ga_engine.getStatistics()["rawMax"]))
+        self.ga.setDBAdapter(DBAdapters.DBBinaryLog(filename=self.filename, identify="run"))
+        self.ga.evolve()
+        header, records = DBAdapters.readBinaryLog(self.filename)
+        self.assertEqual(header["identify"], "run")
+        self.assertFalse(header["scores"])
+        self.assertEqual(header["header"] % 64, 0)
+        self.assertEqual(records["generation"].tolist(), range(10))
+        self.assertEqual(records["rawMax"].tolist(), raw_max)
+        self.assertFalse("raw" in records.dtype.names)
+
+    def test_score_vectors_and_append(self):
+        self.ga.setDBAdapter(DBAdapters.DBBinaryLog(filename=self.filename, scores=True))
+        self.ga.evolve()
+        ga = GSimpleGA.GSimpleGA(self.ga.internalPop.oneSelfGenome)
+        ga.setPopulationSize(20)
+        ga.setGenerations(5)
+        ga.setDBAdapter(DBAdapters.DBBinaryLog(filename=self.filename, scores=True, reset=False))
+        ga.evolve()
+        header, records = DBAdapters.readBinaryLog(self.filename)
+        self.assertEqual(header["population"], 20)
+        self.assertEqual(len(records), 15)
+        self.assertEqual(records["generation"].tolist(), range(10) + range(5))
+        self.assertEqual(records["raw"].shape, (15, 20))
+        self.assertEqual(records["fitness"].shape, (15, 20))
+        self.assertEqual(records["raw"].max(axis=1).tolist(), records["rawMax"].tolist())
+
+    def test_incomplete_record_is_ignored(self):
+        self.ga.setDBAdapter(DBAdapters.DBBinaryLog(filename=self.filename, scores=True))
+        self.ga.evolve()
+        with open(self.filename, "ab") as handle:
+            handle.write("\0" * 10)
+        header, records = DBAdapters.readBinaryLog(self.filename)
+        self.assertEqual(len(records), 10)
+
+    def test_append_after_incomplete_record(self):
+        self.ga.setDBAdapter(DBAdapters.DBBinaryLog(filename=self.filename))
+        self.ga.evolve()
+        with open(self.filename, "ab") as handle:
+            handle.write("\0" * 10)
+        ga = GSimpleGA.GSimpleGA(self.ga.internalPop.oneSelfGenome)
+        ga.setPopulationSize(20)
+        ga.setGenerations(5)
+        ga.setDBAdapter(DBAdapters.DBBinaryLog(filename=self.filename, reset=False))
+        ga.evolve()
+        header, records = DBAdapters.readBinaryLog(self.filename)
+        self.assertEqual(records["generation"].tolist(), range(10) + range(5))
+
+    def test_append_with_other_layout(self):
+        self.ga.setDBAdapter(DBAdapters.DBBinaryLog(filename=self.filename))
+        self.ga.evolve()
+        adapter = DBAdapters.DBBinaryLog(filename=self.filename, reset=False, scores=True)
+        self.assertRaises(ValueError, adapter.open, self.ga)
+
+
+def evolve(adapter, generations):
+    genome = G1DList(10)
+    genome.setParams(rangemin=0, rangemax=10)
+    genome.evaluator.set(lambda chromosome: sum(chromosome))
+    ga = GSimpleGA.GSimpleGA(genome)
+    ga.setPopulationSize(10)
+    ga.setGenerations(generations)
+    ga.setDBAdapter(adapter)
+    ga.evolve()
+
+
+class StubHTTPHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def handle(self):
+        self.server.connections += 1
+        BaseHTTPServer.BaseHTTPRequestHandler.handle(self)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        status = 200
+        if self.server.failures > 0:
+            self.server.failures -= 1
+            status = 500
+        else:
+            self.server.requests.append(cgi.parse_qs(body))
+        self.send_response(status)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write("ok")
+
+    def do_GET(self):
+        self.server.requests.append(cgi.parse_qs(self.path.split("?", 1)[1]))
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write("ok")
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServerTestCase(unittest.TestCase):
+    def startServer(self, server):
+        self.server = server
+        self.thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01})
+        self.thread.daemon = True
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class DBURLPostTestCase(StubServerTestCase):
+    def setUp(self):
+        server = BaseHTTPServer.HTTPServer(("127.0.0.1", 0), StubHTTPHandler)
+        server.connections = 0
+        server.failures = 0
+        server.requests = []
+        self.startServer(server)
+        self.url = "http://127.0.0.1:%d/stats" % server.server_address[1]
+
+    def test_batches_on_a_persistent_connection(self):
+        adapter = DBAdapters.DBURLPost(self.url, identify="run", frequency=1, batch_size=3)
+        evolve(adapter, 7)
+        generations = [request["generation"] for request in self.server.requests]
+        self.assertEqual(generations, [["0", "1", "2"], ["3", "4", "5"], ["6"]])
+        self.assertEqual(self.server.requests[0]["identify"], ["run"] * 3)
+        self.assertEqual(len(self.server.requests[0]["rawMax"]), 3)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_failed_requests_are_retried(self):
+        self.server.failures = 2
+        adapter = DBAdapters.DBURLPost(self.url, frequency=1, batch_size=2)
+        evolve(adapter, 6)
+        generations = sum([request["generation"] for request in self.server.requests], [])
+        self.assertEqual(generations, [str(generation) for generation in xrange(6)])
+        self.assertEqual(adapter.getPending(), 0)
+
+    def test_bounded_retry_buffer(self):
+        self.server.failures = 100
+        adapter = DBAdapters.DBURLPost(self.url, frequency=1, retry_size=3)
+        evolve(adapter, 5)
+        self.assertEqual(adapter.getDiscarded(), 2)
+        self.assertEqual(adapter.getPending(), 3)
+        self.assertEqual(self.server.requests, [])
+
+    def test_get_keeps_the_url_query(self):
+        adapter = DBAdapters.DBURLPost(self.url + "?key=abc", frequency=1, post=False, batch_size=2)
+        evolve(adapter, 2)
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(self.server.requests[0]["key"], ["abc"])
+        self.assertEqual(self.server.requests[0]["generation"], ["0", "1"])
+
+    def test_unreachable_server(self):
+        adapter = DBAdapters.DBURLPost("http://127.0.0.1:1/stats", frequency=1, retry_size=10)
+        evolve(adapter, 3)
+        self.assertEqual(adapter.getPending(), 3)
+
+
+class DBXMLRPCTestCase(StubServerTestCase):
+    def setUp(self):
+        server = SimpleXMLRPCServer(("127.0.0.1", 0), logRequests=False, allow_none=True)
+        self.received = []
+        self.calls = []
+        server.register_function(self.insert, "insert")
+        server.register_multicall_functions()
+        self.startServer(server)
+        self.url = "http://127.0.0.1:%d/" % server.server_address[1]
+
+    def insert(self, record):
+        if record["generation"] == 2:
+            raise ValueError("refused")
+        self.received.append(record)
+
+    def test_multicall_batches(self):
+        adapter = DBAdapters.DBXMLRPC(self.url, identify="run", frequency=1, batch_size=4)
+        evolve(adapter, 10)
+        self.assertEqual([record["generation"] for record in self.received], [0, 1] + range(3, 10))
+        self.assertEqual(self.received[0]["identify"], "run")
+        self.assertEqual(adapter.getPending(), 0)
+
+    def test_single_calls(self):
+        adapter = DBAdapters.DBXMLRPC(self.url, frequency=2)
+        evolve(adapter, 5)
+        self.assertEqual([record["generation"] for record in self.received], [0, 4, 5])
+        self.assertEqual(adapter.getPending(), 0)
+
+    def test_multicall_not_supported(self):
+        self.server.funcs.pop("system.multicall")
+        adapter = DBAdapters.DBXMLRPC(self.url, frequency=1, batch_size=3)
+        evolve(adapter, 4)
+        self.assertEqual([record["generation"] for record in self.received], [0, 1, 3])
+        self.assertEqual(adapter.getPending(), 0)
+
+
+class DBConnectionPoolTestCase(unittest.TestCase):
+    def test_connections_are_reused(self):
+        pool = DBAdapters.DBConnectionPool(lambda: sqlite3.connect(":memory:"), 2)
+        first = pool.acquire()
+        pool.release(first)
+        self.assertIs(pool.acquire(), first)
+        second = pool.acquire()
+        self.assertIsNot(second, first)
+        self.assertEqual(pool.getOpened(), 2)
+        pool.release(first)
+        pool.release(second, discard=True)
+        self.assertEqual(pool.getOpened(), 1)
+        pool.closeAll()
+        self.assertEqual((pool.getOpened(), pool.getIdle()), (0, 0))
+
+    def test_acquire_waits_for_release(self):
+        pool = DBAdapters.DBConnectionPool(object, 1)
+        connection = pool.acquire()
+        acquired = []
+        waiter = threading.Thread(target=lambda: acquired.append(pool.acquire()))
+        waiter.start()
+        waiter.join(0.1)
+        self.assertEqual(acquired, [])
+        pool.release(connection)
+        waiter.join(5)
+        self.assertEqual(acquired, [connection])
+        self.assertEqual(pool.getOpened(), 1)
+
+    def test_acquire_timeout(self):
+        pool = DBAdapters.DBConnectionPool(object, 1)
+        pool.acquire()
+        self.assertRaises(RuntimeError, pool.acquire, 0.05)
+        self.assertEqual(pool.getOpened(), 1)
+
+    def test_shared_pool(self):
+        key = ("shared", id(self))
+        pool = DBAdapters.getConnectionPool(key, object, 3)
+        self.assertIs(DBAdapters.getConnectionPool(key, object), pool)
+        self.assertEqual(pool.getSize(), 3)
+        self.assertRaises(ValueError, DBAdapters.DBConnectionPool, object, 0)
+
+
+class FakeMySQLCursor(object):
+    def __init__(self, connection):
+        self.connection = connection
+
+    def execute(self, stmt, args=None):
+        self.connection.statements.append((" ".join(stmt.split()), args))
+
+    def close(self):
+        pass
+
+
+class FakeMySQLConnection(object):
+    def __init__(self):
+        self.statements = []
+        self.commits = 0
+        self.closed = False
+
+    def cursor(self):
+        return FakeMySQLCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def close(self):
+        self.closed = True
+
+
+class FakeMySQLdb(object):
+    def __init__(self):
+        self.connections = []
+
+    def connect(self, **args):
+        self.connections.append(FakeMySQLConnection())
+        return self.connections[-1]
+
+
+class DBMySQLAdapterTestCase(unittest.TestCase):
+    def setUp(self):
+        self.mysqldb = FakeMySQLdb()
+
+    def adapter(self, **args):
+        adapter = DBAdapters.DBMySQLAdapter("user", "passwd", identify="run", **args)
+        adapter.mysqldbmod = self.mysqldb
+        return adapter
+
+    def inserts(self, connection, table):
+        return [args for stmt, args in connection.statements if stmt.startswith("insert into %s " % table)]
+
+    def test_multi_row_inserts(self):
+        evolve(self.adapter(batch_size=4), 10)
+        connection = self.mysqldb.connections[0]
+        stats = self.inserts(connection, Consts.CDefMySQLDBTable)
+        columns = 2 + len(Statistics.Statistics())
+        self.assertEqual([len(args) // columns for args in stats], [1, 4, 4, 1])
+        generations = []
+        for args in stats:
+            generations.extend(args[i + 1] for i in xrange(0, len(args), columns))
+        self.assertEqual(generations, range(10))
+        population = self.inserts(connection, Consts.CDefMySQLDBTablePop)
+        self.assertEqual(sum(len(args) for args in population), 10 * 10 * 5)
+        self.assertTrue(connection.closed)
+
+    def test_population_bins(self):
+        evolve(self.adapter(pop_bins=3), 2)
+        connection = self.mysqldb.connections[0]
+        self.assertEqual(self.inserts(connection, Consts.CDefMySQLDBTablePop), [])
+        bins = self.inserts(connection, Consts.CDefMySQLDBTablePopBins)
+        rows = [args[i:i + 8] for args in bins for i in xrange(0, len(args), 8)]
+        self.assertEqual(len(rows), 2 * 3)
+        self.assertEqual([row[3] for row in rows], [3, 3, 4] * 2)
+        for identify, generation, b, individuals, raw_min, raw_max, raw_ave, fit_ave in rows:
+            self.assertTrue(raw_min <= raw_ave <= raw_max)
+
+    def test_population_bins_rows(self):
+        adapter = self.adapter(pop_bins=2)
+        population = [DBAdapters.DBIndividualScores(score, score * 2.0) for score in (4, 1, 3, 2, 5)]
+        self.assertEqual(adapter.populationBins(population),
+                         [(0, 2, 1, 2, 1.5, 3.0), (1, 3, 3, 5, 4.0, 8.0)])
+        adapter = self.adapter(pop_bins=10)
+        self.assertEqual(len(adapter.populationBins(population)), 5)
+
+    def test_pooled_connection(self):
+        evolve(self.adapter(pool_size=2, db="pooled_%d" % id(self)), 3)
+        evolve(self.adapter(pool_size=2, db="pooled_%d" % id(self)), 3)
+        self.assertEqual(len(self.mysqldb.connections), 1)
+        self.assertFalse(self.mysqldb.connections[0].closed)
+
+    def test_pooled_connection_held_while_writing(self):
+        adapter = self.adapter(pool_size=1, db="writing_%d" % id(self))
+        adapter.open(None)
+        self.assertEqual(adapter.connection, None)
+        self.assertEqual(adapter.pool.getIdle(), 1)
+        adapter.pendingStats.append(("run", 0))
+        adapter.commitAndClose()
+        connection = self.mysqldb.connections[0]
+        self.assertEqual(self.inserts(connection, Consts.CDefMySQLDBTable), [("run", 0)])
+        self.assertEqual(adapter.pool.getIdle(), 1)
+
+
+class DBPopulationSnapshotTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, "population.psnap")
+        self.populations = {}
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def record(self, ga_engine):
+        population = ga_engine.getPopulation()
+        self.populations[ga_engine.getCurrentGeneration()] = ([ind.score for ind in population],
+                                                              [copy.deepcopy(ind.genomeList) for ind in population])
+
+    def evolve(self, genome, adapter, generations=10):
+        ga = GSimpleGA.GSimpleGA(genome)
+        ga.setPopulationSize(12)
+        ga.setGenerations(generations)
+        ga.stepCallback.set(self.record)
+        ga.setDBAdapter(adapter)
+        ga.evolve()
+        return ga
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_random_access(self):
+        genome = G1DList(8)
+        genome.setParams(rangemin=0, rangemax=100)
+        genome.evaluator.set(lambda chromosome: sum(chromosome))
+        self.evolve(genome, DBAdapters.DBPopulationSnapshot(filename=self.filename, identify="run", frequency=3))
+        header, index = DBAdapters.readPopulationSnapshotIndex(self.filename)
+        self.assertEqual(header["identify"], "run")
+        self.assertEqual([generation for generation, position in index], [0, 3, 6, 9, 10])
+
+        snapshot = DBAdapters.readPopulationSnapshot(self.filename, 6, index)
+        scores, genes = self.populations[6]
+        self.assertEqual(snapshot["generation"], 6)
+        self.assertEqual(snapshot["raw"].tolist(), scores)
+        self.assertEqual(snapshot["genes"].tolist(), genes)
+        self.assertEqual(snapshot["genes"].shape, (12, 8))
+        self.assertRaises(KeyError, DBAdapters.readPopulationSnapshot, self.filename, 5)
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_2d_genomes_and_append(self):
+        genome = G2DList(3, 4)
+        genome.setParams(rangemin=0, rangemax=9)
+        genome.evaluator.set(lambda chromosome: sum(sum(row) for row in chromosome.genomeList))
+        self.evolve(genome, DBAdapters.DBPopulationSnapshot(filename=self.filename, frequency=5))
+        adapter = DBAdapters.DBPopulationSnapshot(filename=self.filename, frequency=5, reset=False)
+        ga = self.evolve(genome.clone(), adapter, 3)
+        header, index = DBAdapters.readPopulationSnapshotIndex(self.filename)
+        self.assertEqual([generation for generation, position in index], [0, 5, 0, 3])
+        snapshot = DBAdapters.readPopulationSnapshot(self.filename, 3)
+        self.assertEqual(snapshot["genes"].shape, (12, 3, 4))
+        self.assertEqual(snapshot["genes"].tolist(), [ind.genomeList for ind in ga.getPopulation()])
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_interrupted_run(self):
+        genome = G1DList(8)
+        genome.evaluator.set(lambda chromosome: sum(chromosome))
+        self.evolve(genome, DBAdapters.DBPopulationSnapshot(filename=self.filename, frequency=1), 4)
+        header, index = DBAdapters.readPopulationSnapshotIndex(self.filename)
+        with open(self.filename, "r+b") as fHandle:
+            fHandle.truncate(index[-1][1] + 10)
+        header, scanned = DBAdapters.readPopulationSnapshotIndex(self.filename)
+        self.assertEqual(scanned, index[:-1])
+        snapshot = DBAdapters.readPopulationSnapshot(self.filename, 2)
+        self.assertEqual(snapshot["genes"].tolist(), self.populations[2][1])
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_tree_genomes(self):
+        self.assertRaises(TypeError, DBAdapters._populationGenes, [GTree.GTree()])
@@ -0,0 +1,285 @@
+from unittest import TestCase
+
+from pyevolve import Consts, GSimpleGA, Scaling
+from pyevolve.GTree import GTreeGP, GTreeNodeGP, GTreeGPSubtreeCache, gpdec, simplifyGTreeGP
+
+TERMINAL = Consts.nodeType["TERMINAL"]
+NONTERMINAL = Consts.nodeType["NONTERMINAL"]
+
+
+def add(a, b):
+    return a + b
+
+
+@gpdec(vectorized=True)
+def mul(a, b):
+    return [x * y for x, y in zip(a, b)]
+
+
+def buildTree(expr):
+    """ Builds a GTreeGP from a nested tuple like ("add", "a", "b") """
+    def build(item, parent):
+        if isinstance(item, tuple):
+            node = GTreeNodeGP(item[0], NONTERMINAL, parent)
+            for child in item[1:]:
+                node.addChild(build(child, node))
+        else:
+            node = GTreeNodeGP(item, TERMINAL, parent)
+        return node
+    tree = GTreeGP(build(expr, None))
+    tree.processNodes()
+    return tree
+
+
+class GTreeGPHashTestCase(TestCase):
+    def test_equal_structures_have_equal_hashes(self):
+        tree_a = buildTree(("add", ("mul", "a", "b"), "c"))
+        tree_b = buildTree(("add", ("mul", "a", "b"), "c"))
+        self.assertEqual(tree_a.getHash(), tree_b.getHash())
+        self.assertNotEqual(tree_a.getHash(), buildTree(("add", "c", ("mul", "a", "b"))).getHash())
+
+    def test_hash_is_invalidated_on_changes(self):
+        tree = buildTree(("add", ("mul", "a", "b"), "c"))
+        old_hash = tree.getHash()
+        leaf = tree.getRoot().getChild(0).getChild(1)
+        leaf.setData("c")
+        self.assertEqual(tree.getRoot().node_hash, None)
+        self.assertEqual(tree.getHash(), buildTree(("add", ("mul", "a", "c"), "c")).getHash())
+        leaf.setData("b")
+        self.assertEqual(tree.getHash(), old_hash)
+
+    def test_clone_keeps_hash(self):
+        tree = buildTree(("add", ("mul", "a", "b"), "c"))
+        tree_hash = tree.getHash()
+        clone = tree.clone()
+        self.assertEqual(clone.getRoot().node_hash, tree_hash)
+        self.assertEqual(clone.getHash(), tree_hash)
+
+    def test_replace_child_invalidates_hash(self):
+        tree = buildTree(("add", "a", "b"))
+        old_hash = tree.getHash()
+        root = tree.getRoot()
+        new_node = GTreeNodeGP("c", TERMINAL, root)
+        root.replaceChild(root.getChild(1), new_node)
+        self.assertNotEqual(tree.getHash(), old_hash)
+        self.assertEqual(tree.getHash(), buildTree(("add", "a", "c")).getHash())
+
+
+class GTreeGPEvaluateDatasetTestCase(TestCase):
+    def setUp(self):
+        self.functions = {"add": add, "mul": mul}
+        self.dataset = {"a": [1.0, 2.0, 3.0], "b": [4.0, 5.0, 6.0]}
+
+    def test_same_output_as_eval(self):
+        tree = buildTree(("add", ("mul", "a", "b"), ("add", "a", "2.5")))
+        output = tree.evaluateDataset(self.dataset, functions=self.functions)
+        code = tree.getCompiledCode()
+        scalar = {"add": add, "mul": lambda x, y: x * y}
+        expected = [eval(code, dict(scalar, a=a, b=b))
+                    for a, b in zip(self.dataset["a"], self.dataset["b"])]
+        self.assertEqual(output, expected)
+
+    def test_cache_reuses_common_subtrees(self):
+        cache = GTreeGPSubtreeCache()
+        tree_a = buildTree(("add", ("mul", "a", "b"), "a"))
+        tree_b = buildTree(("mul", ("mul", "a", "b"), "b"))
+        tree_a.evaluateDataset(self.dataset, cache, self.functions)
+        self.assertEqual(cache.hits, 0)
+        output = tree_b.evaluateDataset(self.dataset, cache, self.functions)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(output, [16.0, 50.0, 108.0])
+
+    def test_cache_is_cleared_for_new_dataset(self):
+        cache = GTreeGPSubtreeCache()
+        tree = buildTree(("add", "a", "b"))
+        tree.evaluateDataset(self.dataset, cache, self.functions)
+        self.assertEqual(len(cache), 1)
+        output = tree.evaluateDataset({"a": [1.0], "b": [1.0]}, cache, self.functions)
+        self.assertEqual(output, [2.0])
+        self.assertEqual(cache.hits, 0)
+
+    def test_cache_with_temporary_datasets(self):
+        cache = GTreeGPSubtreeCache()
+        tree = buildTree(("add", "a", "b"))
+        outputs = [tree.evaluateDataset({"a": [float(i)], "b": [float(i)]}, cache, self.functions)
+                   for i in (1, 2, 3)]
+        self.assertEqual(outputs, [[2.0], [4.0], [6.0]])
+
+    def test_cache_dataset_key(self):
+        cache = GTreeGPSubtreeCache()
+        tree = buildTree(("add", "a", "b"))
+        dataset = {"a": [1.0], "b": [1.0]}
+        self.assertEqual(tree.evaluateDataset(dataset, cache, self.functions, dataset_key=1), [2.0])
+        dataset["a"] = [2.0]
+        self.assertEqual(tree.evaluateDataset(dataset, cache, self.functions, dataset_key=1), [2.0])
+        self.assertEqual(tree.evaluateDataset(dataset, cache, self.functions, dataset_key=2), [3.0])
+
+    def test_cache_hash_collision(self):
+        cache = GTreeGPSubtreeCache()
+        tree_a = buildTree(("add", "a", "b"))
+        tree_b = buildTree(("mul", "a", "b"))
+        tree_a.evaluateDataset(self.dataset, cache, self.functions)
+        tree_b.getRoot().node_hash = tree_a.getRoot().getHash()
+        output = tree_b.evaluateDataset(self.dataset, cache, self.functions)
+        self.assertEqual(output, [4.0, 10.0, 18.0])
+        self.assertEqual(cache.hits, 0)
+
+        tree_c = buildTree(("add", "a", "a"))
+        tree_c.getRoot().node_hash = tree_a.getRoot().getHash()
+        output = tree_c.evaluateDataset(self.dataset, cache, self.functions)
+        self.assertEqual(output, [2.0, 4.0, 6.0])
+        self.assertEqual(cache.hits, 0)
+
+    def test_cache_bounds(self):
+        cache = GTreeGPSubtreeCache(max_entries=2)
+        for i in xrange(5):
+            cache.put(i, [float(i)])
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.evictions, 3)
+        self.assertEqual(cache.get(4), [4.0])
+        self.assertEqual(cache.get(0), None)
+
+        cache = GTreeGPSubtreeCache(max_bytes=16)
+        cache.put(1, [1.0])
+        cache.put(2, [1.0])
+        cache.put(3, [1.0])
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.used_bytes, 16)
+
+
+class GTreeGPPopulationTestCase(TestCase):
+    def setUp(self):
+        genome = GTreeGP()
+        genome.setParams(max_depth=3)
+        genome.evaluator.set(lambda chromosome: 10.0)
+        self.ga = GSimpleGA.GSimpleGA(genome)
+        self.ga.setParams(gp_terminals=["a", "b"], gp_function_set={"add": 2, "mul": 2})
+        self.ga.setPopulationSize(10)
+        self.ga.initialize()
+        self.pop = self.ga.getPopulation()
+        self.pop.evaluate()
+
+    def test_batch_initialization_is_duplicate_free(self):
+        genome = GTreeGP()
+        genome.setParams(max_depth=4, method="ramped")
+        ga = GSimpleGA.GSimpleGA(genome)
+        ga.setParams(gp_terminals=["a", "b"], gp_function_set={"add": 2, "mul": 2})
+        ga.setPopulationSize(100)
+        ga.initialize()
+        pop = ga.getPopulation()
+        self.assertEqual(len(set(ind.getPreOrderExpression() for ind in pop)), 100)
+        heights = set(ind.getHeight() for ind in pop)
+        self.assertTrue(max(heights) <= 4)
+        self.assertTrue(len(heights) > 1)
+
+    def test_size_statistics(self):
+        sizes = [len(ind) for ind in self.pop]
+        stats = self.pop.getStatistics()
+        self.assertEqual(stats["sizeMax"], max(sizes))
+        self.assertAlmostEqual(stats["sizeAve"], sum(sizes) / float(len(sizes)))
+        self.assertEqual(len(stats.asTuple()), 8)
+        self.assertFalse("sizeMax" in dict(stats.items()))
+
+    def test_parsimony_pressure_scaling(self):
+        self.pop.scaleMethod.add(Scaling.ParsimonyPressureScaling)
+        self.pop.setParams(parsimony_coefficient=0.1)
+        self.pop.scale()
+        for ind in self.pop:
+            self.assertAlmostEqual(ind.fitness, 10.0 - 0.1 * len(ind))
+            self.assertEqual(ind.score, 10.0)
+
+
+@gpdec(pure=True, commutative=True, identity=0)
+def s_add(a, b):
+    return a + b
+
+
+@gpdec(pure=True, identity=0, equal_args=0)
+def s_sub(a, b):
+    return a - b
+
+
+@gpdec(pure=True, commutative=True, identity=1, zero=0)
+def s_mul(a, b):
+    return a * b
+
+
+def s_rand(a, b):
+    return a
+
+
+class GTreeGPSimplifyTestCase(TestCase):
+    def setUp(self):
+        self.functions = {"s_add": s_add, "s_sub": s_sub, "s_mul": s_mul, "s_rand": s_rand}
+
+    def simplified(self, expr):
+        tree = buildTree(expr)
+        return tree.getPreOrderExpression(simplifyGTreeGP(tree.getRoot(), self.functions))
+
+    def test_identity(self):
+        self.assertEqual(self.simplified(("s_mul", "x", "1")), "x")
+        self.assertEqual(self.simplified(("s_mul", "1.0", "x")), "x")
+        self.assertEqual(self.simplified(("s_sub", "x", "0")), "x")
+        # sub is not commutative
+        self.assertEqual(self.simplified(("s_sub", "0", "x")), "s_sub(0, x)")
+
+    def test_zero_and_equal_args(self):
+        self.assertEqual(self.simplified(("s_mul", ("s_add", "x", "y"), "0")), "0")
+        self.assertEqual(self.simplified(("s_add", "x", ("s_sub", "y", "y"))), "x")
+        self.assertEqual(self.simplified(("s_sub", ("s_mul", "x", "y"), ("s_mul", "y", "x"))), "0")
+
+    def test_constant_folding(self):
+        # the arguments of commutative functions are sorted by hash
+        self.assertTrue(self.simplified(("s_add", "x", ("s_mul", "2", ("s_add", "1.5", "0.5")))) in
+                        ("s_add(4.0, x)", "s_add(x, 4.0)"))
+
+    def test_impure_functions(self):
+        self.assertEqual(self.simplified(("s_rand", "1", "2")), "s_rand(1, 2)")
+        self.assertTrue(self.simplified(("s_mul", ("s_rand", "x", "y"), "0")) in
+                        ("s_mul(s_rand(x, y), 0)", "s_mul(0, s_rand(x, y))"))
+
+    def test_genome_is_not_changed(self):
+        tree = buildTree(("s_add", "x", ("s_sub", "y", "y")))
+        expression = tree.getPreOrderExpression()
+        code = tree.getCompiledCode(simplify=True, functions=self.functions)
+        self.assertEqual(eval(code, dict(self.functions, x=3)), 3)
+        self.assertEqual(tree.getPreOrderExpression(), expression)
+        self.assertEqual(len(tree), 5)
+
+    def test_evaluate_dataset(self):
+        tree = buildTree(("s_mul", ("s_add", "x", ("s_sub", "y", "y")), "1"))
+        dataset = {"x": [1, 2, 3], "y": [4, 5, 6]}
+        self.assertEqual(tree.evaluateDataset(dataset, functions=self.functions, simplify=True), [1, 2, 3])
+
+
+class GTreeGPDeepTreeTestCase(TestCase):
+    def setUp(self):
+        # neg(neg(...neg(a)...)), deeper than the recursion limit
+        self.depth = 5000
+        root = GTreeNodeGP("neg", NONTERMINAL)
+        node = root
+        for i in xrange(self.depth - 1):
+            child = GTreeNodeGP("neg", NONTERMINAL, node)
+            node.addChild(child)
+            node = child
+        self.leaf = GTreeNodeGP("a", TERMINAL, node)
+        node.addChild(self.leaf)
+        self.tree = GTreeGP(root)
+        self.tree.processNodes()
+
+    def test_height_depth_and_count(self):
+        self.assertEqual(self.tree.getHeight(), self.depth)
+        self.assertEqual(self.tree.getNodeDepth(self.leaf), self.depth)
+        self.assertEqual(self.tree.getNodesCount(), self.depth + 1)
+
+    def test_clone_and_expressions(self):
+        clone = self.tree.clone()
+        expression = self.tree.getPreOrderExpression()
+        self.assertEqual(expression, "neg(" * self.depth + "a" + ")" * self.depth)
+        self.assertEqual(clone.getPreOrderExpression(), expression)
+        self.assertEqual(self.tree.getSExpression(), "neg " + "( neg " * (self.depth - 1) + "( a " + " )" * self.depth)
+
+    def test_unicode_expressions(self):
+        tree = buildTree((u"add", u"x", u"y"))
+        self.assertEqual(tree.getSExpression(), buildTree(("add", "x", "y")).getSExpression())
+        self.assertEqual(tree.getPreOrderExpression(), "add(x, y)")
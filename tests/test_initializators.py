@@ -1,8 +1,14 @@
 import unittest
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from pyevolve.G1DBinaryString import G1DBinaryString
 from pyevolve import Initializators
 from pyevolve.G1DList import G1DList
+from pyevolve.G2DArray import G2DArray, G2DBinaryArray
 from pyevolve.G2DList import G2DList
 from pyevolve.GTree import GTree
 
@@ -34,6 +40,33 @@ class InitializatorsTestCase(unittest.TestCase):
             for gen in gen_row:
                 self.assertTrue(type(gen) == float)
 
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_2d_array_integer_initializator(self):
+        genome = G2DArray(4, 5)
+        genome.setParams(rangemin=10, rangemax=12)
+        Initializators.G2DArrayInitializatorInteger(genome)
+        self.assertEqual(genome.genomeArray.shape, (4, 5))
+        self.assertEqual(genome.genomeArray.dtype.kind, 'i')
+        self.assertTrue(((genome.genomeArray >= 10) & (genome.genomeArray <= 12)).all())
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_2d_array_real_initializator(self):
+        genome = G2DArray(4, 5)
+        Initializators.G2DArrayInitializatorReal(genome)
+        self.assertEqual(genome.genomeArray.dtype.kind, 'f')
+        clone = genome.clone()
+        self.assertEqual(clone, genome)
+        self.assertEqual(clone.getHash(), genome.getHash())
+        clone.setItem(0, 0, -1.0)
+        self.assertNotEqual(clone, genome)
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_2d_binary_array_initializator(self):
+        genome = G2DBinaryArray(4, 5)
+        Initializators.G2DBinaryArrayInitializator(genome)
+        self.assertTrue(set(genome.genomeArray.ravel().tolist()) <= set([0, 1]))
+        self.assertRaises(ValueError, genome.setItem, 0, 0, 2)
+
     def test_tree_integer_initializator(self):
         genome = GTree()
         genome.setParams(max_depth=3)
@@ -0,0 +1,107 @@
+import random
+from math import sqrt
+from unittest import TestCase
+
+from mock import patch
+
+from pyevolve import Consts
+from pyevolve import G1DList
+from pyevolve import GSimpleGA
+from pyevolve import LocalSearch
+
+
+def tour_length(matrix, tour):
+    return sum(matrix[tour[i - 1]][tour[i]] for i in xrange(len(tour)))
+
+
+class LocalSearchTestCase(TestCase):
+    def setUp(self):
+        random.seed(42)
+        self.cities = 60
+        coords = [(random.random(), random.random()) for i in xrange(self.cities)]
+        self.matrix = [[sqrt((x1 - x2) ** 2 + (y1 - y2) ** 2) for (x2, y2) in coords]
+                       for (x1, y1) in coords]
+
+    def random_genome(self, distances=None):
+        genome = G1DList.G1DList(self.cities)
+        tour = range(self.cities)
+        random.shuffle(tour)
+        genome.setInternalList(tour)
+        genome.setParams(distances=self.matrix if distances is None else distances)
+        return genome
+
+    def assert_improves(self, local_search, distances=None):
+        for i in xrange(5):
+            genome = self.random_genome(distances)
+            before = tour_length(self.matrix, genome.genomeList)
+            moves = local_search(genome)
+            after = tour_length(self.matrix, genome.genomeList)
+            self.assertEqual(sorted(genome.genomeList), range(self.cities))
+            self.assertTrue(moves > 0)
+            self.assertTrue(after < before)
+
+    def test_nearestNeighbors(self):
+        neighbors = LocalSearch.nearestNeighbors(self.matrix, 5)
+        for i, row in enumerate(self.matrix):
+            expected = sorted((j for j in xrange(self.cities) if j != i), key=row.__getitem__)[:5]
+            self.assertEqual(neighbors[i], expected)
+
+    @patch('pyevolve.LocalSearch.numpy', None)
+    def test_nearestNeighbors_without_numpy(self):
+        self.test_nearestNeighbors()
+
+    def test_2opt(self):
+        self.assert_improves(LocalSearch.G1DListLocalSearch2Opt)
+
+    def test_oropt(self):
+        self.assert_improves(LocalSearch.G1DListLocalSearchOrOpt)
+
+    def test_dict_distances(self):
+        distances = dict(((i, j), self.matrix[i][j])
+                         for i in xrange(self.cities) for j in xrange(self.cities))
+        self.assert_improves(LocalSearch.G1DListLocalSearch2Opt, distances)
+
+    def test_2opt_local_optimum(self):
+        genome = self.random_genome()
+        genome.setParams(ls_neighbors=self.cities)
+        LocalSearch.G1DListLocalSearch2Opt(genome)
+        self.assertEqual(LocalSearch.G1DListLocalSearch2Opt(genome), 0)
+
+    def test_max_moves(self):
+        genome = self.random_genome()
+        genome.setParams(ls_max_moves=3)
+        self.assertEqual(LocalSearch.G1DListLocalSearch2Opt(genome), 3)
+
+    def test_cache_on_genome_params(self):
+        genome = self.random_genome()
+        LocalSearch.G1DListLocalSearch2Opt(genome)
+        cache = genome.getParam("ls_cache")
+        self.assertTrue(cache.distances is self.matrix)
+        clone = genome.clone()
+        LocalSearch.G1DListLocalSearch2Opt(clone)
+        self.assertTrue(clone.getParam("ls_cache") is cache)
+
+        other = self.random_genome()
+        self.assertEqual(other.getParam("ls_cache"), None)
+        LocalSearch.resetCache(genome)
+        self.assertEqual(genome.getParam("ls_cache"), None)
+
+    def test_missing_distances(self):
+        genome = G1DList.G1DList(self.cities)
+        genome.setInternalList(range(self.cities))
+        with self.assertRaises(ValueError):
+            LocalSearch.G1DListLocalSearch2Opt(genome)
+
+    def test_engine_local_search(self):
+        genome = self.random_genome()
+        genome.evaluator.set(lambda chromosome: tour_length(self.matrix, chromosome.genomeList))
+        genome.initializator.set(lambda chromosome, **args: random.shuffle(chromosome.genomeList))
+        ga = GSimpleGA.GSimpleGA(genome)
+        ga.setMinimax(Consts.minimaxType["minimize"])
+        ga.setPopulationSize(10)
+        ga.setGenerations(2)
+        ga.localSearch.set(LocalSearch.G1DListLocalSearch2Opt)
+        ga.evolve()
+        best = ga.bestIndividual()
+        self.assertEqual(sorted(best.genomeList), range(self.cities))
+        self.assertEqual(LocalSearch.G1DListLocalSearch2Opt(best), 0)
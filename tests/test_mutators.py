@@ -2,9 +2,16 @@ import unittest
 
 from mock import patch
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from pyevolve.G1DBinaryString import G1DBinaryString
-from pyevolve import Mutators, Consts
+from pyevolve import Mutators, Consts, GSimpleGA
 from pyevolve.G1DList import G1DList
+from pyevolve.G2DArray import G2DArray, G2DBinaryArray
+from pyevolve.GTree import GTreeGP
 
 
 class G1DBinaryStringMutatorsTestCase(unittest.TestCase):
@@ -14,9 +21,9 @@ class G1DBinaryStringMutatorsTestCase(unittest.TestCase):
         self.genome.append(0)
         self.genome.append(0)
 
-    @patch('pyevolve.Util.randomFlipCoin')
-    def test_swap_mutator_small_pmut(self, coin_flip_mock):
-        coin_flip_mock.return_value = 0
+    @patch('pyevolve.Util.randomFlipCoinPositions')
+    def test_swap_mutator_small_pmut(self, positions_mock):
+        positions_mock.return_value = []
         expected_result = [1, 0, 0]
         Mutators.G1DBinaryStringMutatorSwap(self.genome, pmut=0.1)
         self.assertEqual(self.genome.genomeList, expected_result)
@@ -29,9 +36,9 @@ class G1DBinaryStringMutatorsTestCase(unittest.TestCase):
         self.assertEqual(self.genome.genomeList, expected_result)
 
 
-    @patch('pyevolve.Util.randomFlipCoin')
-    def test_flip_mutator_small_pmut(self, coin_flip_mock):
-        coin_flip_mock.return_value = 1
+    @patch('pyevolve.Util.randomFlipCoinPositions')
+    def test_flip_mutator_small_pmut(self, positions_mock):
+        positions_mock.return_value = [0, 1, 2]
         expected_result = [0, 1, 1]
         Mutators.G1DBinaryStringMutatorFlip(self.genome, pmut=0.1)
         self.assertEqual(self.genome.genomeList, expected_result)
@@ -58,10 +65,10 @@ class G1DListMutatorsTestCase(unittest.TestCase):
         Mutators.G1DListMutatorSIM(self.genome, pmut=0.5)
         self.assertEqual(self.genome.genomeList, expected_result)
 
-    @patch('pyevolve.Util.randomFlipCoin')
+    @patch('pyevolve.Util.randomFlipCoinPositions')
     @patch('pyevolve.Mutators.rand_randint')
-    def test_range_mutator_small_pmut(self, rand_mock, coin_flip_mock):
-        coin_flip_mock.return_value = 1
+    def test_range_mutator_small_pmut(self, rand_mock, positions_mock):
+        positions_mock.return_value = [0, 1, 2]
         rand_mock.side_effect = [0, 2, 4]
         expected_result = [0, 2, 4]
         Mutators.G1DListMutatorIntegerRange(self.genome, pmut=0.1)
@@ -74,10 +81,10 @@ class G1DListMutatorsTestCase(unittest.TestCase):
         Mutators.G1DListMutatorIntegerRange(self.genome, pmut=0.5)
         self.assertEqual(self.genome.genomeList, expected_result)
 
-    @patch('pyevolve.Util.randomFlipCoin')
+    @patch('pyevolve.Util.randomFlipCoinPositions')
     @patch('pyevolve.Mutators.rand_uniform')
-    def test_real_range_mutator_small_pmut(self, rand_mock, coin_flip_mock):
-        coin_flip_mock.return_value = 1
+    def test_real_range_mutator_small_pmut(self, rand_mock, positions_mock):
+        positions_mock.return_value = [0, 1, 2]
         rand_mock.side_effect = [0, 2, 4]
         expected_result = [0, 2, 4]
         Mutators.G1DListMutatorRealRange(self.genome, pmut=0.1)
@@ -92,10 +99,10 @@ class G1DListMutatorsTestCase(unittest.TestCase):
         Mutators.G1DListMutatorRealRange(self.genome, pmut=0.5)
         self.assertEqual(self.genome.genomeList, expected_result)
 
-    @patch('pyevolve.Util.randomFlipCoin')
+    @patch('pyevolve.Util.randomFlipCoinPositions')
     @patch('pyevolve.Mutators.rand_gauss')
-    def test_integer_gauss_grad_mutator_small_pmut(self, rand_mock, coin_flip_mock):
-        coin_flip_mock.return_value = 1
+    def test_integer_gauss_grad_mutator_small_pmut(self, rand_mock, positions_mock):
+        positions_mock.return_value = [0, 1, 2]
         rand_mock.side_effect = [0, 2, 4]
         expected_result = [0, 4, 12]
         Mutators.G1DListMutatorIntegerGaussianGradient(self.genome, pmut=0.1)
@@ -110,10 +117,10 @@ class G1DListMutatorsTestCase(unittest.TestCase):
         Mutators.G1DListMutatorIntegerGaussianGradient(self.genome, pmut=0.5)
         self.assertEqual(self.genome.genomeList, expected_result)
 
-    @patch('pyevolve.Util.randomFlipCoin')
+    @patch('pyevolve.Util.randomFlipCoinPositions')
     @patch('pyevolve.Mutators.rand_gauss')
-    def test_integer_gauss_mutator_small_pmut(self, rand_mock, coin_flip_mock):
-        coin_flip_mock.return_value = 1
+    def test_integer_gauss_mutator_small_pmut(self, rand_mock, positions_mock):
+        positions_mock.return_value = [0, 1, 2]
         rand_mock.side_effect = [0, 2, 4]
         expected_result = [1, 4, 7]
         Mutators.G1DListMutatorIntegerGaussian(self.genome, pmut=0.1)
@@ -128,10 +135,10 @@ class G1DListMutatorsTestCase(unittest.TestCase):
         Mutators.G1DListMutatorRealGaussian(self.genome, pmut=0.5)
         self.assertEqual(self.genome.genomeList, expected_result)
 
-    @patch('pyevolve.Util.randomFlipCoin')
+    @patch('pyevolve.Util.randomFlipCoinPositions')
     @patch('pyevolve.Mutators.rand_gauss')
-    def test_real_gauss_mutator_small_pmut(self, rand_mock, coin_flip_mock):
-        coin_flip_mock.return_value = 1
+    def test_real_gauss_mutator_small_pmut(self, rand_mock, positions_mock):
+        positions_mock.return_value = [0, 1, 2]
         rand_mock.side_effect = [0, 2, 4]
         expected_result = [1, 4, 7]
         Mutators.G1DListMutatorRealGaussian(self.genome, pmut=0.1)
@@ -146,10 +153,10 @@ class G1DListMutatorsTestCase(unittest.TestCase):
         Mutators.G1DListMutatorRealGaussian(self.genome, pmut=0.5)
         self.assertEqual(self.genome.genomeList, expected_result)
 
-    @patch('pyevolve.Util.randomFlipCoin')
+    @patch('pyevolve.Util.randomFlipCoinPositions')
     @patch('pyevolve.Mutators.rand_gauss')
-    def test_real_gauss_grad_mutator_small_pmut(self, rand_mock, coin_flip_mock):
-        coin_flip_mock.return_value = 1
+    def test_real_gauss_grad_mutator_small_pmut(self, rand_mock, positions_mock):
+        positions_mock.return_value = [0, 1, 2]
         rand_mock.side_effect = [0, 2, 4]
         expected_result = [0, 4, 12]
         Mutators.G1DListMutatorRealGaussianGradient(self.genome, pmut=0.1)
@@ -164,9 +171,9 @@ class G1DListMutatorsTestCase(unittest.TestCase):
         Mutators.G1DListMutatorRealGaussianGradient(self.genome, pmut=0.5)
         self.assertEqual(self.genome.genomeList, expected_result)
 
-    @patch('pyevolve.Util.randomFlipCoin')
-    def test_binary_mutator_small_pmut(self, coin_flip_mock):
-        coin_flip_mock.return_value = 1
+    @patch('pyevolve.Util.randomFlipCoinPositions')
+    def test_binary_mutator_small_pmut(self, positions_mock):
+        positions_mock.return_value = [0, 1, 2]
         expected_result = [0, 2, 3]
         Mutators.G1DListMutatorIntegerBinary(self.genome, pmut=0.1)
         self.assertEqual(self.genome.genomeList, expected_result)
@@ -177,3 +184,197 @@ class G1DListMutatorsTestCase(unittest.TestCase):
         expected_result = [1, 2, 3]
         Mutators.G1DListMutatorIntegerBinary(self.genome, pmut=0.5)
         self.assertEqual(self.genome.genomeList, expected_result)
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class G2DArrayMutatorsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.genome = G2DArray(20, 30)
+        self.genome.setInternalArray([[i * 30 + j for j in xrange(30)] for i in xrange(20)])
+
+    def test_swap_mutator(self):
+        mutations = Mutators.G2DArrayMutatorSwap(self.genome, pmut=0.1)
+        self.assertTrue(mutations > 0)
+        self.assertEqual(sorted(self.genome.genomeArray.ravel().tolist()), range(600))
+
+    def test_integer_range_mutator(self):
+        self.genome.setParams(rangemin=1000, rangemax=1001)
+        mutations = Mutators.G2DArrayMutatorIntegerRange(self.genome, pmut=0.2)
+        changed = self.genome.genomeArray >= 1000
+        self.assertEqual(changed.sum(), mutations)
+        self.assertTrue((self.genome.genomeArray[changed] <= 1001).all())
+
+    def test_real_gaussian_mutator(self):
+        genome = G2DArray(20, 30)
+        genome.setInternalArray([[0.5] * 30] * 20)
+        genome.setParams(rangemin=0.0, rangemax=1.0, gauss_sigma=10.0)
+        mutations = Mutators.G2DArrayMutatorRealGaussian(genome, pmut=1.0)
+        self.assertEqual(mutations, 600)
+        self.assertTrue(((genome.genomeArray >= 0.0) & (genome.genomeArray <= 1.0)).all())
+
+    def test_flip_mutator(self):
+        genome = G2DBinaryArray(20, 30)
+        self.assertEqual(Mutators.G2DBinaryArrayMutatorFlip(genome, pmut=1.0), 600)
+        self.assertTrue((genome.genomeArray == 1).all())
+        self.assertEqual(Mutators.G2DBinaryArrayMutatorFlip(genome, pmut=0.0), 0)
+
+    def test_mutators_log_changes(self):
+        self.genome.changeLog = []
+        before = self.genome.genomeArray.copy()
+        self.genome.setParams(rangemin=1000, rangemax=2000)
+        mutations = Mutators.G2DArrayMutatorIntegerRange(self.genome, pmut=0.05)
+        self.assertEqual(len(self.genome.changeLog), mutations)
+        for (i, j), old, new in self.genome.changeLog:
+            self.assertEqual(before[i, j], old)
+            self.assertEqual(self.genome.genomeArray[i, j], new)
+
+
+class GTreeGPMutatorsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.genome = GTreeGP()
+        self.genome.setParams(max_depth=3)
+        self.ga = GSimpleGA.GSimpleGA(self.genome)
+        self.ga.setParams(gp_terminals=["a", "b"], gp_function_set={"add": 2, "mul": 2})
+        self.genome.initialize(ga_engine=self.ga)
+
+    def test_subtree_mutator(self):
+        for i in xrange(20):
+            Mutators.GTreeGPMutatorSubtree(self.genome, pmut=1.0, ga_engine=self.ga)
+            self.assertTrue(self.genome.getHeight() <= 3)
+
+    def test_subtree_mutator_max_nodes(self):
+        # Every new subtree has at least 3 nodes
+        self.genome.setParams(max_nodes=2)
+        expression = self.genome.getPreOrderExpression()
+        mutations = Mutators.GTreeGPMutatorSubtree(self.genome, pmut=1.0, ga_engine=self.ga)
+        self.assertEqual(mutations, 0)
+        self.assertEqual(self.genome.getPreOrderExpression(), expression)
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class BoundedRealMutatorsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.genomes = []
+        for i in xrange(20):
+            genome = G1DList(50)
+            genome.genomeList = [0.9] * 50
+            genome.setParams(rangemin=0.0, rangemax=[1.0] * 25 + [2.0] * 25, gauss_sigma=5.0)
+            self.genomes.append(genome)
+
+    def assertInBounds(self, genome):
+        self.assertTrue(all(0.0 <= gene <= 1.0 for gene in genome[:25]))
+        self.assertTrue(all(0.0 <= gene <= 2.0 for gene in genome[25:]))
+
+    def test_gaussian_bound_handling(self):
+        for mode in Consts.boundHandlingType.values():
+            genome = self.genomes[0].clone()
+            genome.setParams(bound_handling=mode)
+            self.assertEqual(Mutators.G1DListMutatorRealGaussianBounded(genome, pmut=1.0), 50)
+            self.assertInBounds(genome)
+
+    def test_gaussian_reflect_doesnt_stick_to_bounds(self):
+        genome = self.genomes[0]
+        genome.setParams(bound_handling=Consts.boundHandlingType["reflect"])
+        Mutators.G1DListMutatorRealGaussianBounded(genome, pmut=1.0)
+        self.assertTrue(sum(1 for gene in genome if gene in (0.0, 1.0, 2.0)) < 5)
+
+    def test_polynomial_mutator(self):
+        genome = self.genomes[0]
+        genome.setParams(poly_eta=5)
+        self.assertEqual(Mutators.G1DListMutatorRealPolynomial(genome, pmut=1.0), 50)
+        self.assertInBounds(genome)
+        self.assertTrue(all(gene != 0.9 for gene in genome))
+        self.assertEqual(Mutators.G1DListMutatorRealPolynomial(genome, pmut=0.0), 0)
+
+    def test_batch_mutators(self):
+        for mutator in (Mutators.G1DListMutatorRealGaussianBoundedBatch, Mutators.G1DListMutatorRealPolynomialBatch):
+            genomes = [genome.clone() for genome in self.genomes]
+            counts = mutator(genomes, pmut=0.2)
+            self.assertEqual(len(counts), 20)
+            for count, genome in zip(counts, genomes):
+                self.assertEqual(count, sum(1 for gene in genome if gene != 0.9))
+                self.assertInBounds(genome)
+
+    def test_mutators_log_changes(self):
+        genome = self.genomes[0]
+        genome.changeLog = []
+        mutations = Mutators.G1DListMutatorRealPolynomial(genome, pmut=0.3)
+        self.assertEqual(len(genome.changeLog), mutations)
+        for index, old, new in genome.changeLog:
+            self.assertEqual(old, 0.9)
+            self.assertEqual(genome[index], new)
+
+
+class BatchMutatorsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.genomes = []
+        for i in xrange(20):
+            genome = G1DList(10)
+            genome.genomeList = [0] * 10
+            genome.setParams(rangemin=1, rangemax=5)
+            self.genomes.append(genome)
+
+    def assertCounts(self, counts, genomes, reference):
+        self.assertEqual(len(counts), len(genomes))
+        for count, genome in zip(counts, genomes):
+            self.assertEqual(count, sum(1 for gene in genome if gene != reference))
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_integer_range_batch(self):
+        counts = Mutators.G1DListMutatorIntegerRangeBatch(self.genomes, pmut=0.2)
+        self.assertCounts(counts, self.genomes, 0)
+        self.assertTrue(sum(counts) > 0)
+        for genome in self.genomes:
+            self.assertTrue(all(gene == 0 or 1 <= gene <= 5 for gene in genome))
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_real_gaussian_batch_respects_range(self):
+        for genome in self.genomes:
+            genome.genomeList = [3.0] * 10
+            genome.setParams(gauss_sigma=100.0)
+        counts = Mutators.G1DListMutatorRealGaussianBatch(self.genomes, pmut=0.5)
+        self.assertCounts(counts, self.genomes, 3.0)
+        for genome in self.genomes:
+            self.assertTrue(all(1 <= gene <= 5 for gene in genome))
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_flip_batch(self):
+        genomes = []
+        for i in xrange(10):
+            genome = G1DBinaryString(8)
+            genome.genomeList = [0] * 8
+            genomes.append(genome)
+        counts = Mutators.G1DBinaryStringMutatorFlipBatch(genomes, pmut=1.0)
+        self.assertEqual(counts, [8] * 10)
+        self.assertTrue(all(genome.genomeList == [1] * 8 for genome in genomes))
+
+    @patch("pyevolve.Util.numpyRandomState", lambda: None)
+    def test_batch_without_numpy(self):
+        counts = Mutators.G1DListMutatorIntegerRangeBatch(self.genomes, pmut=0.2)
+        self.assertEqual(len(counts), 20)
+        for count, genome in zip(counts, self.genomes):
+            self.assertTrue(count >= sum(1 for gene in genome if gene != 0))
+            self.assertTrue(all(gene == 0 or 1 <= gene <= 5 for gene in genome))
+        genomes = []
+        for i in xrange(10):
+            genome = G1DBinaryString(8)
+            genome.genomeList = [0] * 8
+            genomes.append(genome)
+        self.assertEqual(len(Mutators.G1DBinaryStringMutatorFlipBatch(genomes, pmut=1.0)), 10)
+
+    def test_zero_rate(self):
+        counts = Mutators.G1DListMutatorIntegerRangeBatch(self.genomes, pmut=0.0)
+        self.assertEqual(counts, [0] * 20)
+
+    def test_engine_batch_mode(self):
+        genome = G1DList(10)
+        genome.setParams(rangemin=0, rangemax=10)
+        genome.mutator.set(Mutators.G1DListMutatorIntegerRange)
+        genome.evaluator.set(lambda chromosome: sum(chromosome))
+        ga = GSimpleGA.GSimpleGA(genome)
+        ga.setBatchMode(True)
+        ga.setPopulationSize(21)
+        ga.setGenerations(5)
+        ga.evolve()
+        self.assertEqual(len(ga.getPopulation()), 21)
+        self.assertRaises(TypeError, ga.setBatchMode, "true")
@@ -0,0 +1,338 @@
+import random
+import socket
+import threading
+import time
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+from mock import patch
+
+from pyevolve import Consts, GSimpleGA, Migration, Network, Util
+from pyevolve.G1DBinaryString import G1DBinaryString
+from pyevolve.G1DList import G1DList
+from pyevolve.G2DArray import G2DArray, G2DBinaryArray
+from pyevolve.G2DBinaryString import G2DBinaryString
+from pyevolve.G2DList import G2DList
+from pyevolve.GTree import GTree, GTreeNode, GTreeGP, GTreeNodeGP
+
+TERMINAL = Consts.nodeType["TERMINAL"]
+NONTERMINAL = Consts.nodeType["NONTERMINAL"]
+
+
+class MyList(G1DList):
+    __slots__ = []
+
+    def clone(self):
+        newcopy = MyList(self.genomeSize, True)
+        self.copy(newcopy)
+        return newcopy
+
+
+def buildTree(expr, parent=None):
+    if isinstance(expr, tuple):
+        node = GTreeNodeGP(expr[0], NONTERMINAL, parent)
+        for child in expr[1:]:
+            node.addChild(buildTree(child, node))
+    else:
+        node = GTreeNodeGP(expr, TERMINAL, parent)
+    return node
+
+
+class GenomeCodecTestCase(unittest.TestCase):
+    def roundTrip(self, genome, level=-1):
+        genome.score = 12.5
+        genome.fitness = 3.25
+        decoded = Network.decodeGenome(Network.encodeGenome(genome, level), genome)
+        self.assertIsNot(decoded, genome)
+        self.assertIs(decoded.__class__, genome.__class__)
+        self.assertEqual((decoded.score, decoded.fitness), (12.5, 3.25))
+        self.assertIs(decoded.internalParams, genome.internalParams)
+        self.assertIs(decoded.evaluator, genome.evaluator)
+        return decoded
+
+    def test_g1dlist(self):
+        genome = G1DList(5)
+        for values in ([1, -2, 300, 0, 7], [1, 2 ** 40, 3, 4, 5], [0.5, 1.0, -2.25, 3.0, 4.0],
+                       [0.5, 1, -2.25], ["a", "b", None, 1, 2.0]):
+            genome.genomeList = values
+            decoded = self.roundTrip(genome)
+            self.assertEqual(decoded.genomeList, values)
+            self.assertEqual([type(v) for v in decoded.genomeList], [type(v) for v in values])
+            self.assertIsNot(decoded.genomeList, genome.genomeList)
+
+    def test_integer_widths(self):
+        self.assertEqual(len(Network.packNumbers([1, 2, 100])), 6 + 3)
+        self.assertEqual(len(Network.packNumbers([1, 2, 1000])), 6 + 6)
+        self.assertEqual(Network.unpackNumbers(Network.packNumbers([-129, 127]))[0], [-129, 127])
+
+    def test_binary_strings(self):
+        genome = G1DBinaryString(13)
+        genome.genomeList = [random.randint(0, 1) for i in xrange(13)]
+        decoded = self.roundTrip(genome, 6)
+        self.assertEqual(decoded.genomeList, genome.genomeList)
+        self.assertEqual(decoded.stringLength, 13)
+
+        genome = G2DBinaryString(3, 5)
+        genome.genomeString = [[random.randint(0, 1) for j in xrange(5)] for i in xrange(3)]
+        self.assertEqual(self.roundTrip(genome).genomeString, genome.genomeString)
+
+    def test_2d_genomes(self):
+        genome = G2DList(3, 4)
+        genome.genomeList = [[random.random() for j in xrange(4)] for i in xrange(3)]
+        self.assertEqual(self.roundTrip(genome).genomeList, genome.genomeList)
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_2d_arrays(self):
+        for genome in (G2DArray(4, 6), G2DBinaryArray(4, 6)):
+            genome.genomeArray[:] = numpy.arange(24).reshape(4, 6) % 2
+            decoded = self.roundTrip(genome)
+            self.assertEqual(decoded.genomeArray.dtype, genome.genomeArray.dtype)
+            self.assertTrue(numpy.array_equal(decoded.genomeArray, genome.genomeArray))
+
+    def test_trees(self):
+        genome = GTreeGP(buildTree(("add", ("mul", "x", "x"), ("add", "x", "1.5"))))
+        genome.processNodes()
+        decoded = self.roundTrip(genome)
+        self.assertEqual(decoded.getPreOrderExpression(), genome.getPreOrderExpression())
+        self.assertEqual(decoded.getHash(), genome.getHash())
+        self.assertEqual(decoded.getHeight(), genome.getHeight())
+        self.assertEqual([node.getType() for node in decoded.getAllNodes()],
+                         [node.getType() for node in genome.getAllNodes()])
+
+        root = GTreeNode(1)
+        for i in xrange(300):
+            root.addChild(GTreeNode(i, root))
+        genome = GTree(root)
+        genome.processNodes()
+        decoded = self.roundTrip(genome, 1)
+        self.assertEqual(decoded.getHash(), genome.getHash())
+        self.assertIs(decoded.getRoot().getChild(5).getParent(), decoded.getRoot())
+
+    def test_pickle_fallback_and_register(self):
+        genome = MyList(4)
+        genome.genomeList = [1, 2, 3, 4]
+        data = Network.encodeGenome(genome)
+        self.assertEqual(data[0], "P")
+        self.assertEqual(self.roundTripPickled(data).genomeList, [1, 2, 3, 4])
+
+        Network.registerGenomeCodec(MyList, "m", lambda g: Network.packNumbers(g.genomeList),
+                                    lambda template, data: self.decodeMyList(template, data))
+        self.assertEqual(Network.encodeGenome(genome)[0], "m")
+        self.assertEqual(self.roundTrip(genome).genomeList, [1, 2, 3, 4])
+        self.assertRaises(ValueError, Network.registerGenomeCodec, G1DBinaryString, "m", None, None)
+        self.assertRaises(ValueError, Network.decodeGenome, "?" + data[1:], genome)
+
+    def roundTripPickled(self, data):
+        return Network.decodeGenome(data, None)
+
+    def decodeMyList(self, template, data):
+        genome = template.clone()
+        genome.genomeList = Network.unpackNumbers(data)[0]
+        return genome
+
+    def test_pickle_and_compress_slots(self):
+        genome = G1DList(3)
+        genome.genomeList = [1, 2, 3]
+        self.assertEqual(Network.unpickleAndDecompress(Network.pickleAndCompress(genome)).genomeList, [1, 2, 3])
+
+
+class MultiprocessingCodecTestCase(unittest.TestCase):
+    @patch("pyevolve.GPopulation.MULTI_PROCESSING", True)
+    def test_lambda_evaluator(self):
+        genome = G1DList(20)
+        genome.setParams(rangemin=0, rangemax=10)
+        genome.evaluator.set(lambda chromosome: sum(chromosome) + 1)
+        for full_copy in (False, True):
+            ga = GSimpleGA.GSimpleGA(genome)
+            ga.setPopulationSize(10)
+            ga.setGenerations(2)
+            ga.setMultiProcessing(True, full_copy, 2)
+            ga.evolve()
+            for ind in ga.getPopulation():
+                self.assertEqual(ind.score, sum(ind.genomeList) + 1)
+
+
+class UDPThreadsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.server = Network.UDPThreadServer("127.0.0.1", 0, 3)
+        self.address = self.server.sock.getsockname()
+        self.sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sender.bind(("127.0.0.2", 0))
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.join(5)
+        self.sender.close()
+
+    def waitFor(self, condition):
+        limit = time.time() + 5
+        while not condition() and time.time() < limit:
+            time.sleep(0.01)
+        self.assertTrue(condition())
+
+    def test_server_pool_drops_oldest(self):
+        self.server.start()
+        for i in xrange(5):
+            self.sender.sendto("data %d" % i, self.address)
+        self.waitFor(lambda: self.server.getReceived() == 5)
+        self.assertEqual(self.server.getDropped(), 2)
+        self.assertEqual(self.server.poolLength(), 3)
+        self.assertEqual(self.server.popPool(), ("127.0.0.2", "data 4"))
+        self.assertEqual([self.server.popPool()[1] for i in xrange(2)], ["data 3", "data 2"])
+        self.assertFalse(self.server.isReady())
+
+    def test_server_waits_without_polling(self):
+        self.server.start()
+        cpu = time.clock()
+        time.sleep(0.3)
+        self.assertTrue(time.clock() - cpu < 0.05)
+        begin = time.time()
+        self.server.shutdown()
+        self.server.join(5)
+        self.assertFalse(self.server.isAlive())
+        self.assertTrue(time.time() - begin < 1)
+
+    def test_unicast_client(self):
+        self.server.start()
+        client = Network.UDPThreadUnicastClient("127.0.0.2", 0, 2)
+        client.setTargetHost(*self.address)
+        for i in xrange(3):
+            client.addData("data %d" % i)
+        self.assertEqual(client.getDropped(), 1)
+        client.start()
+        self.waitFor(lambda: self.server.getReceived() == 2)
+        self.assertEqual(sorted(self.server.popPool()[1] for i in xrange(2)), ["data 1", "data 2"])
+        client.addData("data 3")
+        self.waitFor(lambda: self.server.getReceived() == 3)
+        client.addData("data 4")
+        client.shutdown()
+        client.join(5)
+        self.assertFalse(client.isAlive())
+        self.assertEqual(client.getSent(), 4)
+
+
+class TCPThreadTransportTestCase(unittest.TestCase):
+    def setUp(self):
+        self.transports = []
+
+    def tearDown(self):
+        for transport in self.transports:
+            transport.shutdown()
+            if transport.isAlive():
+                transport.join(5)
+
+    def transport(self, *args):
+        transport = Network.TCPThreadTransport("127.0.0.1", 0, *args)
+        self.transports.append(transport)
+        return transport
+
+    def waitFor(self, condition):
+        limit = time.time() + 5
+        while not condition() and time.time() < limit:
+            time.sleep(0.01)
+        self.assertTrue(condition())
+
+    def test_frames(self):
+        source, target = self.transport(), self.transport()
+        address = ("127.0.0.1", target.getPort())
+        source.setTargets([address])
+        target.setTargets([("127.0.0.1", source.getPort())])
+        source.start()
+        target.start()
+        self.waitFor(lambda: source.isConnected(address))
+        big = "".join(chr(i % 256) for i in xrange(256)) * 20000
+        frames = ["small", big, "", "last"]
+        for data in frames:
+            source.send(data)
+        self.waitFor(lambda: target.poolLength() == 4)
+        self.assertEqual([target.popPool()[1] for data in frames], frames)
+        self.assertEqual(source.getSent(), 4)
+        self.assertFalse(target.isReady())
+        target.send("back")
+        self.waitFor(source.isReady)
+        self.assertEqual(source.popPool(), ("127.0.0.1", "back"))
+
+    def test_back_pressure(self):
+        source, target = self.transport(100, 3), self.transport(1)
+        address = ("127.0.0.1", target.getPort())
+        source.setTargets([address])
+        source.start()
+        target.start()
+        self.waitFor(lambda: source.isConnected(address))
+        data = "x" * (1024 * 1024)
+        for i in xrange(20):
+            source.send(data)
+        self.waitFor(lambda: source.getDropped() > 0)
+        self.assertTrue(target.poolLength() <= 2)
+        received = 0
+        while received < 20 - source.getDropped():
+            self.waitFor(target.isReady)
+            self.assertEqual(target.popPool()[1], data)
+            received += 1
+        self.assertEqual(source.getSent(), 20 - source.getDropped())
+
+    def test_queue_drops_oldest(self):
+        source = self.transport(10, 2)
+        source.setTargets([("127.0.0.1", 1)])
+        for i in xrange(3):
+            source.send("data %d" % i)
+        self.assertEqual(source.getDropped(), 1)
+        self.assertEqual(list(source.peers[0].queue), [Network._frameHeader.pack(6) + "data %d" % i for i in (1, 2)])
+
+    def test_shutdown(self):
+        source = self.transport()
+        source.setTargets([("127.0.0.1", 1)])
+        source.start()
+        self.assertRaises(Exception, source.setTargets, [])
+        time.sleep(0.2)
+        self.assertFalse(source.isConnected(("127.0.0.1", 1)))
+        begin = time.time()
+        source.shutdown()
+        source.join(5)
+        self.assertFalse(source.isAlive())
+        self.assertTrue(time.time() - begin < 1)
+
+
+class TCPMigrationTestCase(unittest.TestCase):
+    def test_without_topology(self):
+        migration = Migration.TCPMigration("127.0.0.1", 0, "group")
+        self.assertRaises(Exception, migration.start)
+        migration.transport.close()
+
+    def test_islands(self):
+        islands = [Migration.TCPMigration("127.0.0.1", 0, "group", 100, 100) for i in xrange(3)]
+        graph = Util.Graph()
+        for i, island in enumerate(islands):
+            graph.addEdge(island.getMyself(), islands[i - 1].getMyself())
+
+        engines = []
+        for island in islands:
+            island.setTopology(graph)
+            island.setGenomeCodec(True)
+            genome = G1DList(10)
+            genome.setParams(rangemin=0, rangemax=10)
+            genome.evaluator.set(lambda chromosome: sum(chromosome))
+            ga = GSimpleGA.GSimpleGA(genome)
+            ga.setPopulationSize(10)
+            ga.setGenerations(30)
+            ga.stepCallback.set(lambda ga: time.sleep(0.01))
+            ga.setMigrationAdapter(island)
+            island.setMigrationRate(2)
+            island.setNumIndividuals(2)
+            island.setNumReplacement(2)
+            engines.append(ga)
+
+        threads = [threading.Thread(target=ga.evolve) for ga in engines]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(30)
+            self.assertFalse(thread.isAlive())
+        for island in islands:
+            self.assertFalse(island.transport.isAlive())
+            self.assertEqual(island.transport.getDropped(), 0)
+            self.assertTrue(island.transport.getReceived() > 0)
+            self.assertEqual(len(island.transport.getTargets()), 2)
@@ -0,0 +1,127 @@
+import math
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+import pyevolve_graph
+from pyevolve import DBAdapters, GSimpleGA
+from pyevolve.G1DList import G1DList
+
+
+class GraphTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def evolve(self, adapter, generations=10):
+        genome = G1DList(10)
+        genome.setParams(rangemin=0, rangemax=10)
+        genome.evaluator.set(lambda chromosome: sum(chromosome))
+        ga = GSimpleGA.GSimpleGA(genome)
+        ga.setPopulationSize(20)
+        ga.setGenerations(generations)
+        ga.setDBAdapter(adapter)
+        ga.evolve()
+
+
+class SQLiteGraphTestCase(GraphTestCase):
+    def setUp(self):
+        super(SQLiteGraphTestCase, self).setUp()
+        self.conn = sqlite3.connect(os.path.join(self.directory, "pyevolve.db"))
+        self.conn.execute("create table statistics(identify text, generation integer, rawMax real, rawMin real, "
+                          "rawAve real, rawDev real, fitMax real, fitMin real, fitAve real)")
+        self.conn.execute("""create table population(identify text, generation integer,
+                             individual integer, fitness real, raw real)""")
+        for generation in xrange(5):
+            self.conn.execute("insert into statistics values ('run', ?, ?, ?, ?, 0, ?, ?, ?)",
+                              (generation, generation * 2, -generation, generation, generation * 2, -generation,
+                               generation))
+
+    def tearDown(self):
+        self.conn.close()
+        super(SQLiteGraphTestCase, self).tearDown()
+
+    def test_stats_buckets(self):
+        generations, series = pyevolve_graph.load_stats_sqlite(self.conn, "run", None, 2)
+        self.assertEqual(generations, 5)
+        self.assertEqual(series["generation"], [0, 3])
+        self.assertEqual(series["rawMax"], [4, 8])
+        self.assertEqual(series["rawMin"], [-2, -4])
+        self.assertEqual(series["rawAve"], [1.0, 3.5])
+
+        generations, series = pyevolve_graph.load_stats_sqlite(self.conn, "run", [1, 3], 1000)
+        self.assertEqual(generations, 3)
+        self.assertEqual(series["generation"], [1, 2, 3])
+        self.assertEqual(pyevolve_graph.load_stats_sqlite(self.conn, "other", None, 1000), None)
+
+    def test_population_missing_buckets(self):
+        for generation in xrange(2):
+            for individual in xrange(4):
+                if (generation, individual) != (1, 2):
+                    self.conn.execute("insert into population values ('run', ?, ?, ?, ?)",
+                                      (generation, individual, individual, individual * 10))
+        generations, pop = pyevolve_graph.load_population_sqlite(self.conn, "run", None, None, "raw", 1000)
+        self.assertEqual(generations, 2)
+        self.assertEqual(pop[0], [0, 10, 20, 30])
+        self.assertEqual(len(pop[1]), 4)
+        self.assertTrue(math.isnan(pop[1][2]))
+
+    def test_population_sample(self):
+        self.conn.close()
+        dbname = os.path.join(self.directory, "sample.db")
+        self.evolve(DBAdapters.DBSQLite(dbname=dbname, identify="run", resetDB=True, pop_sample=5))
+        self.conn = sqlite3.connect(dbname)
+        generations, pop = pyevolve_graph.load_population_sqlite(self.conn, "run", None, None, "raw", 1000)
+        self.assertEqual(generations, 10)
+        self.assertEqual([len(row) for row in pop], [5] * 10)
+        generations, pop = pyevolve_graph.load_population_sqlite(self.conn, "run", None, None, "fitness", 3)
+        self.assertEqual(generations, 10)
+        self.assertEqual(len(pop), 3)
+        self.assertTrue(all(len(row) == len(pop[0]) for row in pop))
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class BinaryLogGraphTestCase(GraphTestCase):
+    def setUp(self):
+        super(BinaryLogGraphTestCase, self).setUp()
+        self.filename = os.path.join(self.directory, "run.bin")
+        self.evolve(DBAdapters.DBBinaryLog(filename=self.filename, scores=True))
+        self.records = DBAdapters.readBinaryLog(self.filename)[1]
+
+    def test_buckets(self):
+        starts, counts = pyevolve_graph.binary_log_buckets(numpy, numpy.array([0, 1, 1, 2, 3, 4]), 2)
+        self.assertEqual(starts.tolist(), [0, 4])
+        self.assertEqual(counts.tolist(), [4, 2])
+
+    def test_stats_buckets(self):
+        generations, series = pyevolve_graph.load_stats_binary_log(self.filename, None, 3)
+        self.assertEqual(generations, 10)
+        self.assertEqual(series["generation"], [0, 4, 8])
+        self.assertEqual(series["rawMax"][0], self.records["rawMax"][:4].max())
+        self.assertEqual(series["rawMin"][1], self.records["rawMin"][4:8].min())
+        self.assertAlmostEqual(series["rawAve"][2], self.records["rawAve"][8:].mean())
+
+        generations, series = pyevolve_graph.load_stats_binary_log(self.filename, [2, 5], 1000)
+        self.assertEqual(generations, 4)
+        self.assertEqual(series["generation"], [2, 3, 4, 5])
+
+    def test_population_buckets(self):
+        generations, pop = pyevolve_graph.load_population_binary_log(self.filename, None, None, "raw", 5)
+        self.assertEqual(generations, 10)
+        self.assertEqual(numpy.shape(pop), (5, 5))
+        self.assertAlmostEqual(pop[0][0], self.records["raw"][:2, :4].mean())
+
+    def test_appended_runs(self):
+        self.evolve(DBAdapters.DBBinaryLog(filename=self.filename, scores=True, reset=False), generations=4)
+        generations, series = pyevolve_graph.load_stats_binary_log(self.filename, None, 1000)
+        self.assertEqual(generations, 4)
+        self.assertEqual(series["generation"], [0, 1, 2, 3])
@@ -1,6 +1,6 @@
 from unittest import TestCase
 
-from pyevolve import GSimpleGA, G1DList, Consts
+from pyevolve import GSimpleGA, G1DList, G1DBinaryString, Consts
 from pyevolve.GTree import GTreeGP
 
 
@@ -67,4 +67,111 @@ class GSimpleGATestCase(TestCase):
             ga.nElitismReplacement,
             ga.dbAdapter,
         ]:
-            self.assertIn(str(param), ga_repr)
\ No newline at end of file
+            self.assertIn(str(param), ga_repr)
+
+    def test_population_initialization_is_duplicate_free(self):
+        genome = G1DList.G1DList(3)
+        genome.setParams(rangemin=0, rangemax=4)
+        ga = GSimpleGA.GSimpleGA(genome)
+        ga.setPopulationSize(100)
+        ga.initialize()
+        self.assertEqual(len(set(ind.getHash() for ind in ga.getPopulation())), 100)
+
+    def test_reject_duplicated_offspring(self):
+        genome = G1DList.G1DList(10)
+        genome.evaluator.set(lambda chromosome: sum(chromosome))
+        ga = GSimpleGA.GSimpleGA(genome)
+        ga.setPopulationSize(20)
+        ga.setMutationRate(0.3)
+        ga.setDuplicateOffspring(Consts.duplicateOffspringType["reject"])
+        ga.setElitism(False)
+        ga.initialize()
+        ga.internalPop.evaluate()
+        ga.step()
+        self.assertEqual(len(ga.getPopulation()), 20)
+        self.assertEqual(len(set(ind.getHash() for ind in ga.getPopulation())), 20)
+
+    def test_penalize_duplicated_offspring(self):
+        genome = G1DList.G1DList(10)
+        evaluated = []
+        genome.evaluator.set(lambda chromosome: evaluated.append(chromosome) or sum(chromosome) + 1)
+        ga = GSimpleGA.GSimpleGA(genome)
+        ga.setPopulationSize(21)
+        ga.setCrossoverRate(0.0)
+        ga.setMutationRate(0.0)
+        ga.setDuplicateOffspring(Consts.duplicateOffspringType["penalize"])
+        ga.setElitism(False)
+        ga.initialize()
+        ga.internalPop.evaluate()
+        worst_score = ga.internalPop.worstRaw().score
+        del evaluated[:]
+        ga.step()
+        # without crossover and mutation all the offspring are clones of the parents
+        self.assertEqual(len(ga.getPopulation()), 21)
+        self.assertEqual(len(evaluated), 0)
+        for ind in ga.getPopulation():
+            self.assertEqual(ind.score, worst_score)
+
+    def test_exception_on_wrong_duplicated_offspring_mode(self):
+        self.assertRaises(TypeError, self.ga.setDuplicateOffspring, 10)
+
+
+def onemax(chromosome):
+    return sum(chromosome) + 1
+
+
+def onemax_delta(chromosome, **args):
+    return sum(new - old for position, old, new in chromosome.changeLog)
+
+
+class DeltaEvaluationTestCase(TestCase):
+    def setUp(self):
+        self.evaluated = []
+        self.genome = G1DBinaryString.G1DBinaryString(50)
+        self.genome.evaluator.set(lambda chromosome: self.evaluated.append(chromosome) or onemax(chromosome))
+        self.genome.deltaEvaluator.set(onemax_delta)
+
+    def test_changes_are_logged(self):
+        self.genome.initialize()
+        self.genome.evaluate()
+        self.assertEqual(self.genome.changeLog, [])
+        old = self.genome[3]
+        self.genome[3] = 1 - old
+        self.assertEqual(self.genome.changeLog, [(3, old, 1 - old)])
+        self.genome.setInternalList([0] * 50)
+        self.assertEqual(self.genome.changeLog, None)
+
+    def test_delta_evaluation_after_mutation(self):
+        self.genome.initialize()
+        self.genome.evaluate()
+        del self.evaluated[:]
+        for i in xrange(20):
+            child = self.genome.clone()
+            self.assertTrue(child.mutate(pmut=0.05) > 0)
+            child.evaluate()
+            self.assertEqual(child.score, onemax(child))
+        self.assertEqual(len(self.evaluated), 0)
+
+    def test_unlogged_mutation_invalidates_log(self):
+        def unlogged_mutator(chromosome, **args):
+            chromosome.genomeList[0] = 1 - chromosome.genomeList[0]
+            return 1
+        self.genome.mutator.set(unlogged_mutator)
+        self.genome.initialize()
+        self.genome.evaluate()
+        self.genome.mutate(pmut=1.0)
+        self.assertEqual(self.genome.changeLog, None)
+        del self.evaluated[:]
+        self.genome.evaluate()
+        self.assertEqual(len(self.evaluated), 1)
+        self.assertEqual(self.genome.score, onemax(self.genome))
+
+    def test_engine_scores_match_full_evaluation(self):
+        ga = GSimpleGA.GSimpleGA(self.genome)
+        ga.setPopulationSize(20)
+        ga.setGenerations(10)
+        ga.setMutationRate(0.05)
+        ga.setCrossoverRate(0.5)
+        ga.evolve()
+        for ind in ga.getPopulation():
+            self.assertEqual(ind.score, onemax(ind))
@@ -1,6 +1,12 @@
-from unittest import TestCase
+from unittest import TestCase, skipIf
 
-from pyevolve import Util
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from pyevolve import Util, Consts
+from pyevolve.G1DList import G1DList
 
 
 class UtilTestCase(TestCase):
@@ -13,7 +19,49 @@ class UtilTestCase(TestCase):
         self.assertEqual(Util.randomFlipCoin(0.0), False)
         self.assertEqual(Util.randomFlipCoin(1.0), True)
 
+    def test_randomFlipCoinPositions_border_cases(self):
+        self.assertEqual(Util.randomFlipCoinPositions(0.0, 10), [])
+        self.assertEqual(Util.randomFlipCoinPositions(1.0, 5), [0, 1, 2, 3, 4])
+        self.assertEqual(Util.randomFlipCoinPositions(0.5, 0), [])
+
+    def test_randomFlipCoinPositions_distribution(self):
+        counts = [0] * 10
+        total = 0
+        for i in xrange(20000):
+            positions = Util.randomFlipCoinPositions(0.05, 10)
+            self.assertEqual(positions, sorted(set(positions)))
+            self.assertTrue(all(0 <= pos < 10 for pos in positions))
+            for pos in positions:
+                counts[pos] += 1
+            total += len(positions)
+        # 10000 expected mutations, 1000 per position
+        self.assertTrue(9500 < total < 10500)
+        self.assertTrue(all(850 < count < 1150 for count in counts))
+
     def test_list2DSwapElement(self):
         _list = [[1, 2, 3], [4, 5, 6]]
         Util.list2DSwapElement(_list, (0, 1), (1, 1))
-        self.assertEqual(_list, [[1, 5, 3], [4, 2, 6]])
\ No newline at end of file
+        self.assertEqual(_list, [[1, 5, 3], [4, 2, 6]])
+
+    @skipIf(numpy is None, "numpy is not installed")
+    def test_boundValues(self):
+        values = numpy.array([-0.5, 0.25, 1.25, 3.5])
+        clipped = Util.boundValues(values.copy(), 0.0, 1.0, Consts.boundHandlingType["clip"])
+        self.assertEqual(clipped.tolist(), [0.0, 0.25, 1.0, 1.0])
+        reflected = Util.boundValues(values.copy(), 0.0, 1.0, Consts.boundHandlingType["reflect"])
+        self.assertEqual(reflected.tolist(), [0.5, 0.25, 0.75, 0.5])
+        resampled = Util.boundValues(values.copy(), 0.0, 1.0, Consts.boundHandlingType["resample"],
+                                     lambda mask: numpy.full(mask.sum(), 0.125))
+        self.assertEqual(resampled.tolist(), [0.125, 0.25, 0.125, 0.125])
+        self.assertRaises(ValueError, Util.boundValues, values, 0.0, 1.0, 99)
+
+    @skipIf(numpy is None, "numpy is not installed")
+    def test_realGeneBounds(self):
+        genome = G1DList(3)
+        genome.genomeList = [0.0] * 3
+        genome.setParams(rangemin=-1.0, rangemax=[1.0, 2.0, 3.0])
+        lower, upper = Util.realGeneBounds(genome)
+        self.assertEqual(lower.tolist(), [-1.0] * 3)
+        self.assertEqual(upper.tolist(), [1.0, 2.0, 3.0])
+        genome.setParams(rangemax=[1.0, 2.0])
+        self.assertRaises(ValueError, Util.realGeneBounds, genome)